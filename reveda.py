@@ -54,6 +54,7 @@
 
 import argparse
 import logging
+import multiprocessing
 import os
 import platform
 import subprocess
@@ -770,4 +771,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # GDS import converts cells in spawned worker processes
+    multiprocessing.freeze_support()
     main()
@@ -57,6 +57,17 @@ class layLayer:
                 return layer
         return cls()
 
+    @staticmethod
+    def gdsLayerIndexMap(layer_list) -> dict[tuple[int, int], int]:
+        """
+        Map each (gdsLayer, datatype) pair to the index of its first layer in
+        layer_list, so repeated lookups do not scan the list.
+        """
+        indexMap = {}
+        for index, layer in enumerate(layer_list):
+            indexMap.setdefault((layer.gdsLayer, layer.datatype), index)
+        return indexMap
+
 
 @dataclass
 class editModes:
@@ -9,21 +9,40 @@
 # under their own separate licenses.
 
 import json
+import os
 # schematic editor backend
 import pathlib
 import shutil
 from pathlib import Path
-from typing import Union, Optional
+from typing import Callable, Dict, Iterable, List, Union, Optional
 
-from PySide6.QtCore import (Qt, )
-from PySide6.QtGui import (QStandardItem, )
+from PySide6.QtCore import (Qt, QModelIndex, )
+from PySide6.QtGui import (QStandardItem, QStandardItemModel, )
 from PySide6.QtWidgets import QMessageBox, QWidget
 
+import revedaEditor.fileio.layoutBinary as lbin
+
+
+def scanCellNames(libraryPath: pathlib.Path) -> List[str]:
+    """Names of the cell directories of a library, sorted."""
+    with os.scandir(libraryPath) as entries:
+        return sorted(entry.name for entry in entries if entry.is_dir())
+
+
+def scanViewNames(cellPath: pathlib.Path) -> List[str]:
+    """File names of the json cell views of a cell, sorted."""
+    with os.scandir(cellPath) as entries:
+        return sorted(entry.name for entry in entries
+                      if os.path.splitext(entry.name)[1] == ".json")
+
 
 class libraryItem(QStandardItem):
     def __init__(self, libraryPath: pathlib.Path):  # path is a pathlib.Path object
         self._libraryPath = libraryPath
         self._libraryName = libraryPath.name
+        # The cells are scanned by loadCells, or by the model when the
+        # library is expanded, if set.
+        self.cellsPending = False
         super().__init__(self.libraryName)
         self.setEditable(False)
         self.setData(libraryPath, Qt.ItemDataRole.UserRole + 2)
@@ -53,11 +72,42 @@ class libraryItem(QStandardItem):
     def libraryName(self) -> str:
         return self._libraryName
 
+    def loadCells(self) -> None:
+        """Scan the cells now if they have not been added yet."""
+        if self.cellsPending:
+            try:
+                cellNames = scanCellNames(self.libraryPath)
+            except OSError:
+                cellNames = []
+            self.addCells(cellNames)
+
+    def addCells(self, cellNames: Iterable[str]) -> List["cellItem"]:
+        """
+        Add the scanned cells of a pending library; their views are left
+        pending. Does nothing once the cells have been added.
+        """
+        if not self.cellsPending:
+            return []
+        self.cellsPending = False
+        existing = {self.child(row).text() for row in range(self.rowCount())}
+        cellItems = []
+        for cellName in cellNames:
+            if cellName not in existing:
+                newCellItem = cellItem(self.libraryPath.joinpath(cellName))
+                newCellItem.viewsPending = True
+                cellItems.append(newCellItem)
+        if cellItems:
+            self.appendRows(cellItems)
+        return cellItems
+
 
 class cellItem(QStandardItem):
     def __init__(self, cellPath: pathlib.Path) -> None:
         self.cellPath = cellPath
         self._cellName = cellPath.stem
+        # The views are scanned by loadViews, or by the model when the cell
+        # is expanded, if set.
+        self.viewsPending = False
         super().__init__(self.cellName)
         self.setEditable(False)
         self.setData("cell", Qt.ItemDataRole.UserRole + 1)
@@ -89,6 +139,32 @@ class cellItem(QStandardItem):
     def cellName(self):
         return self._cellName
 
+    def loadViews(self) -> None:
+        """Scan the views now if they have not been added yet."""
+        if self.viewsPending:
+            try:
+                viewNames = scanViewNames(self.cellPath)
+            except OSError:
+                viewNames = []
+            self.addViews(viewNames)
+
+    def addViews(self, viewNames: Iterable[str]) -> None:
+        """
+        Add the scanned views of a pending cell, once, leaving out the views
+        the model of the cell does not show.
+        """
+        if not self.viewsPending:
+            return
+        self.viewsPending = False
+        model = self.model()
+        existing = {self.child(row).text() for row in range(self.rowCount())}
+        viewItems = [viewItem(self.cellPath.joinpath(viewName)) for viewName in viewNames
+                     if pathlib.Path(viewName).stem not in existing
+                     and (not isinstance(model, indexedLibraryModel)
+                          or model.viewFilter(viewName))]
+        if viewItems:
+            self.appendRows(viewItems)
+
     def clone(self):
         """
         Clone the cell item and return a new cell item with the same path.
@@ -100,6 +176,7 @@ class cellItem(QStandardItem):
 
     def refreshCellViews(self) -> None:
         """Refresh all view children of a cell item from filesystem."""
+        self.viewsPending = False
         self.removeRows(0, self.rowCount())
         cellPath = self.cellPath
         for viewPath in cellPath.glob("*.json"):
@@ -169,6 +246,118 @@ class viewItem(QStandardItem):
         newViewItem.setData(self, Qt.ItemDataRole.UserRole + 10)
         return newViewItem
 
+
+def childrenPending(item: QStandardItem) -> bool:
+    """Whether the cells of a library item or the views of a cell item are not loaded."""
+    return getattr(item, "cellsPending", False) or getattr(item, "viewsPending", False)
+
+
+def loadChildren(item: Optional[QStandardItem]) -> None:
+    """
+    Load the pending cells of a library item or views of a cell item. Code
+    walking the children of an item it did not get from the model lookups
+    calls this first; the items do not load their children by themselves.
+    """
+    if isinstance(item, libraryItem):
+        item.loadCells()
+    elif isinstance(item, cellItem):
+        item.loadViews()
+
+
+class indexedLibraryModel(QStandardItemModel):
+    """
+    Item model with dictionary lookups of libraries by name, cells by cell
+    name and views by view name. The name -> item dictionary of a parent is
+    built on its first lookup and dropped when rows are added to or removed
+    from it or when the names of its children change. Pending libraries and
+    cells are loaded through fetchMore when a view expands them.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # id(parent item), None for the libraries -> name -> first child of that name
+        self._childIndex: Dict[Optional[int], Dict[str, QStandardItem]] = {}
+        self.rowsInserted.connect(self._rowsInserted)
+        self.rowsAboutToBeRemoved.connect(self._rowsAboutToBeRemoved)
+        self.dataChanged.connect(self._dataChanged)
+        self.layoutChanged.connect(self._childIndex.clear)
+        self.modelReset.connect(self._childIndex.clear)
+
+    def viewFilter(self, viewName: str) -> bool:
+        """Whether a view file belongs in the model."""
+        return True
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        # Pending libraries and cells show an expand arrow before they are loaded.
+        if parent.isValid() and childrenPending(self.itemFromIndex(parent)):
+            return True
+        return super().hasChildren(parent)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return parent.isValid() and childrenPending(self.itemFromIndex(parent))
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        if parent.isValid():
+            loadChildren(self.itemFromIndex(parent))
+
+    def findLibraryItem(self, libraryName: str) -> Optional[libraryItem]:
+        return self._lookup(None, self.invisibleRootItem(), libraryName, self._libraryKey)
+
+    def findCellItem(self, libItem: libraryItem, cellName: str) -> Optional["cellItem"]:
+        return self._lookup(id(libItem), libItem, cellName,
+                            lambda item: getattr(item, "cellName", None))
+
+    def findViewItem(self, cellItem: "cellItem", viewName: str) -> Optional["viewItem"]:
+        return self._lookup(id(cellItem), cellItem, viewName, QStandardItem.text)
+
+    @staticmethod
+    def _libraryKey(item: QStandardItem) -> Optional[str]:
+        if item.data(Qt.ItemDataRole.UserRole + 1) == "library":
+            return item.text()
+        return None
+
+    def _lookup(self, key: Optional[int], parentItem: QStandardItem, name: str,
+                nameOf: Callable[[QStandardItem], Optional[str]]):
+        """
+        Return the child of parentItem called name. Its pending children are
+        loaded, as callers usually go on to walk them.
+        """
+        children = self._childIndex.get(key)
+        if children is None:
+            children = {}
+            loadChildren(parentItem)
+            for row in range(parentItem.rowCount()):
+                child = parentItem.child(row)
+                if child is not None:
+                    childName = nameOf(child)
+                    if childName is not None:
+                        children.setdefault(childName, child)
+            self._childIndex[key] = children
+        child = children.get(name)
+        loadChildren(child)
+        return child
+
+    def _parentKey(self, parent: QModelIndex) -> Optional[int]:
+        return id(self.itemFromIndex(parent)) if parent.isValid() else None
+
+    def _rowsInserted(self, parent: QModelIndex, first: int, last: int):
+        self._childIndex.pop(self._parentKey(parent), None)
+
+    def _rowsAboutToBeRemoved(self, parent: QModelIndex, first: int, last: int):
+        parentItem = self.itemFromIndex(parent) if parent.isValid() else self.invisibleRootItem()
+        self._childIndex.pop(self._parentKey(parent), None)
+        # Drop the dictionaries of the removed items and their children.
+        removed = [parentItem.child(row) for row in range(first, last + 1)]
+        while removed:
+            item = removed.pop()
+            if item is not None:
+                self._childIndex.pop(id(item), None)
+                removed.extend(item.child(row) for row in range(item.rowCount()))
+
+    def _dataChanged(self, topLeft: QModelIndex, bottomRight: QModelIndex, roles=()):
+        self._childIndex.pop(self._parentKey(topLeft.parent()), None)
+
+
 def createLibrary(parent, model, libraryDir: str, libraryName: str) -> Union[
     libraryItem, None]:
     """
@@ -254,6 +443,32 @@ def createCellView(parent: QWidget, viewName: str, cellItem: cellItem) -> viewIt
     return newViewItem
 
 
+def updateViewField(viewPath, key: str, oldValue: str, newValue: str) -> bool:
+    """
+    Set key to newValue in the records of a view file where it is oldValue.
+    Binary layout views are written back in the binary format. Return True if
+    the file was changed.
+    """
+    binary = lbin.isLayoutBinary(viewPath)
+    if binary:
+        data = lbin.readLayoutFile(viewPath)
+    else:
+        with open(viewPath, "r") as f:
+            data = json.load(f)
+    updated = False
+    for item in data:
+        if item.get(key) == oldValue:
+            updated = True
+            item[key] = newValue
+    if updated:
+        if binary:
+            lbin.writeLayoutFile(viewPath, data)
+        else:
+            with open(viewPath, "w") as f:
+                json.dump(data, f, indent=4)
+    return updated
+
+
 def createCellviewItem(viewName, viewPath)->viewItem:
     newViewItem = viewItem(viewPath)
     viewPath.touch()  # create empty cell view path
@@ -21,6 +21,8 @@ import revedaEditor.backend.libBackEnd as scb
 def getLibItem(
         libraryModel: QStandardItemModel, libName: str
 ) -> Union[scb.libraryItem, None]:
+    if isinstance(libraryModel, scb.indexedLibraryModel):
+        return libraryModel.findLibraryItem(libName)
     return next((item for item in libraryModel.findItems(libName)
                  if item.data(Qt.ItemDataRole.UserRole + 1) == "library"), None)
 
@@ -30,6 +32,9 @@ def getCellItem(
 ) -> Union[scb.cellItem, None]:
     if libItem is None:
         return None
+    model = libItem.model()
+    if isinstance(model, scb.indexedLibraryModel):
+        return model.findCellItem(libItem, cellNameInp)
     return next((libItem.child(i) for i in range(libItem.rowCount())
                  if libItem.child(i) and libItem.child(i).cellName == cellNameInp), None)
 
@@ -38,6 +43,9 @@ def getViewItem(cellItem: Union[scb.cellItem, None], viewNameInp: str) -> Union[
     scb.viewItem, None]:
     if cellItem is None:
         return None
+    model = cellItem.model()
+    if isinstance(model, scb.indexedLibraryModel):
+        return model.findViewItem(cellItem, viewNameInp)
     return next((cellItem.child(i) for i in range(cellItem.rowCount())
                  if cellItem.child(i) and cellItem.child(i).text() == viewNameInp), None)
 
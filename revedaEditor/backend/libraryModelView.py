@@ -14,7 +14,7 @@ import pathlib
 import shutil
 from typing import Any, Dict, List, Optional
 
-from PySide6.QtCore import Qt, QPoint
+from PySide6.QtCore import Qt, QPoint, QRunnable, QThreadPool, Signal, Slot
 from PySide6.QtGui import (QAction, QStandardItemModel, QStandardItem, )
 from PySide6.QtWidgets import (QAbstractItemView, QDialog, QMenu, QMessageBox, QTreeView,
                                QWidget, QApplication, QListView, QHBoxLayout, QVBoxLayout,
@@ -23,11 +23,15 @@ from PySide6.QtWidgets import (QAbstractItemView, QDialog, QMenu, QMessageBox, Q
 import revedaEditor.backend.dataDefinitions as ddef
 import revedaEditor.backend.libBackEnd as libb
 import revedaEditor.backend.libraryMethods as libm
+from revedaEditor.backend.startThread import workerSignals
 import revedaEditor.gui.fileDialogues as fd
 import revedaEditor.gui.layoutDialogues as ldlg
 import revedaEditor.gui.textEditor as ted
 from revedaEditor.gui.configEditor import configEditor
 
+# Number of cells whose views are reported together by the library scan.
+SCAN_BATCH = 256
+
 
 class BaseDesignLibrariesView(QWidget):
     def __init__(self, parent):
@@ -47,7 +51,7 @@ class BaseDesignLibrariesView(QWidget):
         self.selectedView = None
 
         # Initialize the model (to be implemented by child classes)
-        self.libraryModel = designLibrariesModel(self.libraryDict)
+        self.libraryModel = designLibrariesModel(self.libraryDict, shared=True)
 
     def removeLibrary(self, selectedLib: libb.libraryItem) -> None:
         try:
@@ -111,6 +115,7 @@ class BaseDesignLibrariesView(QWidget):
         elif itemTuple.viewItem.viewType == "spice":
             self._handle_spice_view(itemTuple)
         elif itemTuple.viewItem.viewType == "config":
+            libb.loadChildren(itemTuple.cellItem)
             schViewsList = [itemTuple.cellItem.child(row).viewName for row in
                             range(itemTuple.cellItem.rowCount()) if
                             itemTuple.cellItem.child(row).viewType == "schematic"]
@@ -268,6 +273,13 @@ class BaseDesignLibrariesView(QWidget):
         if viewNameT in self.appMainW.openViews.keys():
             self.appMainW.openViews[viewNameT].show()
             return viewNameT
+        editor = self.appMainW.editorPool.take(viewNameT)
+        if editor is not None:
+            editor.leaveHierarchy()
+            editor.show()
+            editor.raise_()
+            self.appMainW.openViews[viewNameT] = editor
+            return viewNameT
 
         view_type = viewItemT.viewItem.viewType
 
@@ -394,6 +406,7 @@ class designLibrariesColumnView(BaseDesignLibrariesView):
 
         # Get the selected item and its children
         self.selectedLib = self.libraryModel.itemFromIndex(indexes[0])
+        libb.loadChildren(self.selectedLib)
 
         children = [self.selectedLib.child(i) for i in range(self.selectedLib.rowCount())]
         if self.selectedLib and self.selectedLib.hasChildren():
@@ -409,6 +422,7 @@ class designLibrariesColumnView(BaseDesignLibrariesView):
     def recursive_clone(self, item):
         """Recursively clone an item and all its children."""
         clonedItem = item.clone()
+        libb.loadChildren(item)
         # Store reference to original item
         clonedItem.setData(item,
                            Qt.ItemDataRole.UserRole + 10)  # Use a custom role to store the original item
@@ -446,6 +460,7 @@ class designLibrariesColumnView(BaseDesignLibrariesView):
         viewsModel.setHorizontalHeaderLabels(["Cell Views"])
         viewsModel.setSortRole(Qt.ItemDataRole.UserRole + 3)
 
+        libb.loadChildren(cellItem)
         if cellItem and cellItem.hasChildren():
             for i in range(cellItem.rowCount()):
                 child = cellItem.child(i)
@@ -470,7 +485,7 @@ class designLibrariesColumnView(BaseDesignLibrariesView):
             pass
 
         # Create new model and set it
-        self.libraryModel = designLibrariesModel(libraryDict)
+        self.libraryModel = designLibrariesModel(libraryDict, shared=True)
         self.libsListView.setModel(self.libraryModel)
 
         # Reconnect selection signals
@@ -582,6 +597,7 @@ class designLibrariesColumnView(BaseDesignLibrariesView):
                                                      dlg.selectedLibPath, )
                 if success:
                     cloneItem = newCellItem.clone()
+                    libb.loadChildren(selectedCellItem)
                     if selectedCellItem.hasChildren():
                         for i in range(selectedCellItem.rowCount()):
                             child = selectedCellItem.child(i)
@@ -937,7 +953,7 @@ class designLibrariesTreeView(BaseDesignLibrariesView):
         """
         Recreate library model from libraryDict.
         """
-        self.libraryModel = designLibrariesModel(libraryDict)
+        self.libraryModel = designLibrariesModel(libraryDict, shared=True)
         self.setModel(self.libraryModel)
         self.libBrowsW.libraryModel = self.libraryModel
         self.appMainW.libraryModel = self.libraryModel
@@ -995,34 +1011,196 @@ class designLibrariesTreeView(BaseDesignLibrariesView):
             menu.exec(event.globalPos())
 
 
-class designLibrariesModel(QStandardItemModel):
-    def __init__(self, libraryDict):
+class libraryScanSignals(workerSignals):
+    """workerSignals with the scanned cells and cell views of a library."""
+    cellsScanned = Signal(object, list)
+    viewsScanned = Signal(object, list)
+
+
+class libraryScanWorker(QRunnable):
+    """
+    List the cells of the libraries and then the views of each cell in a
+    thread pool. Views are reported in batches of (cell name, view file
+    names) so that the model fills while the scan goes on.
+    """
+
+    def __init__(self, libraryPaths: List[pathlib.Path]) -> None:
+        super().__init__()
+        self.libraryPaths = list(libraryPaths)
+        self.signals = libraryScanSignals()
+        self._cancelled = False
+
+    @property
+    def isCancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self):
+        self._cancelled = True
+
+    @Slot()
+    def run(self) -> None:
+        try:
+            libraryCells = []
+            for libraryPath in self.libraryPaths:
+                if self._cancelled:
+                    return
+                try:
+                    cellNames = libb.scanCellNames(libraryPath)
+                except OSError:
+                    continue
+                libraryCells.append((libraryPath, cellNames))
+                self.signals.cellsScanned.emit(libraryPath, cellNames)
+            for libraryPath, cellNames in libraryCells:
+                batch = []
+                for cellName in cellNames:
+                    if self._cancelled:
+                        return
+                    try:
+                        viewNames = libb.scanViewNames(libraryPath.joinpath(cellName))
+                    except OSError:
+                        continue
+                    batch.append((cellName, viewNames))
+                    if len(batch) >= SCAN_BATCH:
+                        self.signals.viewsScanned.emit(libraryPath, batch)
+                        batch = []
+                if batch:
+                    self.signals.viewsScanned.emit(libraryPath, batch)
+        except Exception as e:
+            self.signals.error.emit((type(e), e.args, str(e)))
+        finally:
+            self.signals.finished.emit()
+
+
+class designLibrariesModel(libb.indexedLibraryModel):
+    # Model of the library browser. It is filled by a background scan, the
+    # other models copy their items from it instead of walking the disk.
+    sharedModel: Optional["designLibrariesModel"] = None
+
+    def __init__(self, libraryDict, shared: bool = False):
         self.libraryDict = libraryDict
         super().__init__()
+        self.logger = logging.getLogger("reveda")
+        self._shared = shared
+        self._scanWorker: Optional[libraryScanWorker] = None
+        # library path -> cell name -> cell item, while the scan runs
+        self._scanCells: Dict[pathlib.Path, Dict[str, libb.cellItem]] = {}
+        if shared:
+            if designLibrariesModel.sharedModel is not None:
+                designLibrariesModel.sharedModel.stopScan()
+            designLibrariesModel.sharedModel = self
 
         self.setHorizontalHeaderLabels(["Libraries"])
         self.initModel()
-        self.logger = logging.getLogger("reveda")
 
     def initModel(self):
         for designPath in self.libraryDict.values():
             self.populateLibrary(designPath)
+        if self._shared:
+            self.startScan()
 
     def populateLibrary(self, designPath: pathlib.Path) -> None:  # designPath: Path
         """
-        Populate library view.
+        Populate library view. The cells of the shared model are left to
+        the background scan; other models copy them from the shared model.
         """
         if designPath.joinpath("reveda.lib").exists():
             libraryItem = self.addLibraryToModel(designPath)
-            cellList = [cell.name for cell in designPath.iterdir() if cell.is_dir()]
-            for cell in cellList:
-                cellItem = self.addCellToModel(designPath.joinpath(cell), libraryItem)
-                viewList = [view.name for view in designPath.joinpath(cell).iterdir() if
-                            view.suffix == ".json"]
-                for view in viewList:
-                    self.addViewToModel(designPath.joinpath(cell, view), cellItem)
-                cellItem.sortChildren(0)
-            libraryItem.sortChildren(0)
+            if self._shared:
+                libraryItem.cellsPending = True
+            else:
+                self._copyLibrary(libraryItem)
+
+    def _copyLibrary(self, libraryItem: libb.libraryItem) -> None:
+        """
+        Copy the cells and views the shared model has scanned so far. What
+        the scan has not reached yet is left pending in this model and loaded
+        on demand, as in the shared model, instead of scanning it here.
+        """
+        sourceItem = self._sharedLibraryItem(libraryItem.libraryPath)
+        if sourceItem is None or sourceItem.cellsPending:
+            libraryItem.cellsPending = True
+            return
+        cellItems = []
+        for row in range(sourceItem.rowCount()):
+            sourceCell = sourceItem.child(row)
+            cellItem = libb.cellItem(sourceCell.cellPath)
+            if sourceCell.viewsPending:
+                cellItem.viewsPending = True
+            else:
+                viewItems = [libb.viewItem(viewPath) for viewPath in
+                             (sourceCell.child(viewRow).viewPath
+                              for viewRow in range(sourceCell.rowCount()))
+                             if self.viewFilter(viewPath.name)]
+                if viewItems:
+                    cellItem.appendRows(viewItems)
+            cellItems.append(cellItem)
+        if cellItems:
+            libraryItem.appendRows(cellItems)
+
+    @staticmethod
+    def _sharedLibraryItem(libraryPath: pathlib.Path) -> Optional[libb.libraryItem]:
+        sharedModel = designLibrariesModel.sharedModel
+        if sharedModel is None:
+            return None
+        try:
+            return sharedModel._libraryItem(libraryPath)
+        except RuntimeError:  # the shared model was deleted
+            return None
+
+    def _libraryItem(self, libraryPath: pathlib.Path) -> Optional[libb.libraryItem]:
+        rootItem = self.invisibleRootItem()
+        for row in range(rootItem.rowCount()):
+            item = rootItem.child(row)
+            if isinstance(item, libb.libraryItem) and item.libraryPath == libraryPath:
+                return item
+        return None
+
+    def startScan(self) -> None:
+        """Scan the cells and views of the pending libraries in the thread pool."""
+        self.stopScan()
+        rootItem = self.invisibleRootItem()
+        libraryPaths = [rootItem.child(row).libraryPath for row in range(rootItem.rowCount())
+                        if getattr(rootItem.child(row), "cellsPending", False)]
+        if not libraryPaths:
+            return
+        self._scanWorker = libraryScanWorker(libraryPaths)
+        self._scanWorker.signals.cellsScanned.connect(self._cellsScanned)
+        self._scanWorker.signals.viewsScanned.connect(self._viewsScanned)
+        self._scanWorker.signals.error.connect(self._scanFailed)
+        self._scanWorker.signals.finished.connect(self._scanCells.clear)
+        QThreadPool.globalInstance().start(self._scanWorker)
+
+    def stopScan(self) -> None:
+        if self._scanWorker is not None:
+            self._scanWorker.cancel()
+
+    def _cellsScanned(self, libraryPath: pathlib.Path, cellNames: List[str]) -> None:
+        libraryItem = self._libraryItem(libraryPath)
+        if libraryItem is not None:
+            # Ignored if the cells were loaded on demand in the meantime.
+            libraryItem.addCells(cellNames)
+
+    def _viewsScanned(self, libraryPath: pathlib.Path, cellViews: list) -> None:
+        cellItems = self._scanCells.get(libraryPath)
+        if cellItems is None:
+            libraryItem = self._libraryItem(libraryPath)
+            if libraryItem is None:
+                return
+            cellItems = self._scanCells[libraryPath] = {
+                cellItem.cellName: cellItem for cellItem in
+                (libraryItem.child(row) for row in range(libraryItem.rowCount()))
+                if isinstance(cellItem, libb.cellItem)}
+        for cellName, viewNames in cellViews:
+            cellItem = cellItems.get(cellName)
+            if cellItem is None:
+                continue
+            try:
+                cellItem.addViews(viewNames)
+            except RuntimeError:  # the cell was deleted during the scan
+                continue
+
+    def _scanFailed(self, errorTuple: tuple) -> None:
+        self.logger.error(f"Library scan failed: {errorTuple[2]}")
 
     def addLibraryToModel(self, designPath: pathlib.Path) -> libb.libraryItem:
         libraryEntry = libb.libraryItem(designPath)
@@ -1097,20 +1275,8 @@ class symbolViewsModel(designLibrariesModel):
         self.symbolViews = symbolViews
         super().__init__(libraryDict)
 
-    def populateLibrary(self, designPath):  # designPath: Path
-        """
-        Populate library view.
-        """
-        if designPath.joinpath("reveda.lib").exists():
-            libraryItem = self.addLibraryToModel(designPath)
-            cellList = [cell.name for cell in designPath.iterdir() if cell.is_dir()]
-            for cell in cellList:
-                cellItem = self.addCellToModel(designPath.joinpath(cell), libraryItem)
-                viewList = [view.name for view in designPath.joinpath(cell).iterdir() if
-                            view.suffix == ".json" and any(
-                                x in view.name for x in self.symbolViews)]
-                for view in viewList:
-                    self.addViewToModel(designPath.joinpath(cell, view), cellItem)
+    def viewFilter(self, viewName: str) -> bool:
+        return any(x in viewName for x in self.symbolViews)
 
 
 class layoutViewsModel(designLibrariesModel):
@@ -1118,20 +1284,8 @@ class layoutViewsModel(designLibrariesModel):
         self.layoutViews = layoutViews
         super().__init__(libraryDict)
 
-    def populateLibrary(self, designPath):  # designPath: Path
-        """
-        Populate library view.
-        """
-        if designPath.joinpath("reveda.lib").exists():
-            libraryItem = self.addLibraryToModel(designPath)
-            cellList = [cell.name for cell in designPath.iterdir() if cell.is_dir()]
-            for cell in cellList:
-                cellItem = self.addCellToModel(designPath.joinpath(cell), libraryItem)
-                viewList = [view.name for view in designPath.joinpath(cell).iterdir() if
-                            view.suffix == ".json" and any(
-                                x in view.name for x in self.layoutViews)]
-                for view in viewList:
-                    self.addViewToModel(designPath.joinpath(cell, view), cellItem)
+    def viewFilter(self, viewName: str) -> bool:
+        return any(x in viewName for x in self.layoutViews)
 
 
 class schematicViewsModel(designLibrariesModel):
@@ -1140,20 +1294,8 @@ class schematicViewsModel(designLibrariesModel):
         self.schematicViews = ["schematic"]
         super().__init__(libraryDict)
 
-    def populateLibrary(self, designPath):  # designPath: Path
-        """
-        Populate library with schematic views.
-        """
-        if designPath.joinpath("reveda.lib").exists():
-            libraryItem = self.addLibraryToModel(designPath)
-            cellList = [cell.name for cell in designPath.iterdir() if cell.is_dir()]
-            for cell in cellList:
-                cellItem = self.addCellToModel(designPath.joinpath(cell), libraryItem)
-                viewList = [view.name for view in designPath.joinpath(cell).iterdir() if
-                            view.suffix == ".json" and any(
-                                x in view.name for x in self.schematicViews)]
-                for view in viewList:
-                    self.addViewToModel(designPath.joinpath(cell, view), cellItem)
+    def viewFilter(self, viewName: str) -> bool:
+        return any(x in viewName for x in self.schematicViews)
 
 
 class libraryCheckListView(QListView):
@@ -1193,26 +1335,16 @@ def updateJSONFieldInLibrary(model: "designLibrariesModel", libraryName: str, ke
         oldValue: The old value to match
         newValue: The new value to set for the key
     """
-    import json
     libItem = libm.getLibItem(model, libraryName)
     if libItem.hasChildren():
         for row in range(libItem.rowCount()):
             cellItem = libItem.child(row)
+            libb.loadChildren(cellItem)
             if cellItem.hasChildren():
                 for row in range(cellItem.rowCount()):
                     viewItem = cellItem.child(row)
                     try:
-                        with open(viewItem.viewPath, "r") as f:
-                            data = json.load(f)
-                            updated = False
-                            for item in data:
-                                if item.get(key) == oldValue:
-                                    updated = True
-                                    item[key] = newValue
-
-                        if updated:
-                            with open(viewItem.viewPath, "w") as f:
-                                json.dump(data, f, indent=4)
+                        libb.updateViewField(viewItem.viewPath, key, oldValue, newValue)
                     except Exception as e:
                         print(f"Error updating {viewItem.viewPath}: {str(e)}")
 
@@ -1230,7 +1362,6 @@ def updateJSONFieldInCell(model: "designLibrariesModel", libraryName: str, cellN
         oldValue: The old value to match
         newValue: The new value to set for the key
     """
-    import json
     libItem = libm.getLibItem(model, libraryName)
     cellItem = libm.getCellItem(libItem, cellName)
 
@@ -1238,16 +1369,6 @@ def updateJSONFieldInCell(model: "designLibrariesModel", libraryName: str, cellN
         for row in range(cellItem.rowCount()):
             viewItem = cellItem.child(row)
             try:
-                with open(viewItem.viewPath, "r") as f:
-                    data = json.load(f)
-                    updated = False
-                    for item in data:
-                        if item.get(key) == oldValue:
-                            updated = True
-                            item[key] = newValue
-
-                if updated:
-                    with open(viewItem.viewPath, "w") as f:
-                        json.dump(data, f, indent=4)
+                libb.updateViewField(viewItem.viewPath, key, oldValue, newValue)
             except Exception as e:
                 print(f"Error updating {viewItem.viewPath}: {str(e)}")
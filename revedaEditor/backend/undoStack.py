@@ -20,6 +20,19 @@ import revedaEditor.common.layoutShapes as lshp
 import revedaEditor.common.shapes as shp
 
 
+def _notifyMoved(scene, items):
+    """
+    Report moved items to the scene connectivity graph, if it keeps one, and
+    to the saved records of the scene.
+    """
+    connectivity = getattr(scene, "connectivity", None)
+    if connectivity is not None:
+        connectivity.itemsMoved(items)
+    savedRecords = getattr(scene, "savedRecords", None)
+    if savedRecords is not None:
+        savedRecords.itemsChanged(items)
+
+
 class undoStack(QUndoStack):
     def __init__(self):
         super().__init__()
@@ -209,9 +222,11 @@ class moveShapeUndo(QUndoCommand):
 
     def undo(self):
         setattr(self._item, self._attribute, self._oldPosition)
+        _notifyMoved(self._scene, (self._item,))
 
     def redo(self):
         setattr(self._item, self._attribute, self._newPosition)
+        _notifyMoved(self._scene, (self._item,))
 
 
 class undoRotateShape(QUndoCommand):
@@ -234,11 +249,13 @@ class undoRotateShape(QUndoCommand):
         rotationOriginPoint = self._shape.mapFromScene(self._point)
         self._shape.setTransformOriginPoint(rotationOriginPoint)
         self._shape.angle -= self._angle
+        _notifyMoved(self._scene, (self._shape,))
 
     def redo(self) -> None:
         rotationOriginPoint = self._shape.mapFromScene(self._point)
         self._shape.setTransformOriginPoint(rotationOriginPoint)
         self._shape.angle += self._angle
+        _notifyMoved(self._scene, (self._shape,))
 
 
 class undoMoveByCommand(QUndoCommand):
@@ -260,10 +277,12 @@ class undoMoveByCommand(QUndoCommand):
             newPos = oldPos + QPoint(int(self.dx), int(self.dy))
             self.oldPositions.append((item, oldPos))
             item.setPos(newPos)
+        _notifyMoved(self.scene, self.items)
 
     def undo(self):
         for item, oldPos in self.oldPositions:
             item.setPos(oldPos)
+        _notifyMoved(self.scene, self.items)
 
 
 class undoStretchShape(QUndoCommand):
@@ -282,9 +301,11 @@ class undoStretchShape(QUndoCommand):
 
     def undo(self):
         self._item.restoreGeometry(self._oldGeometry)
+        _notifyMoved(self._scene, (self._item,))
 
     def redo(self):
         self._item.restoreGeometry(self._newGeometry)
+        _notifyMoved(self._scene, (self._item,))
 
 
 class undoGroupMove(QUndoCommand):
@@ -300,7 +321,9 @@ class undoGroupMove(QUndoCommand):
     def redo(self):
         for item, oldPos in zip(self.items, self.oldPosList):
             item.setPos(oldPos + self.posDiff)
+        _notifyMoved(self.scene, self.items)
 
     def undo(self):
         for item, oldPos in zip(self.items, self.oldPosList):
             item.setPos(oldPos)
+        _notifyMoved(self.scene, self.items)
@@ -8,12 +8,74 @@
 # If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 #
-from itertools import combinations
-from typing import Set
+import math
+from collections import Counter
+from itertools import combinations, product
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QLineF, QPoint, QPointF, QRectF
 
 from revedaEditor.common.shapes import schematicSymbol
 
 
+class sceneRectIndex:
+    """
+    Broad phase for schematic checks. Items are bucketed on a uniform grid by
+    their scene bounding rects, taken once when the index is built, so pair
+    and region queries only compare items sharing a grid cell.
+    """
+
+    def __init__(self, items: Iterable, cellSize: Optional[float] = None):
+        self._items = list(items)
+        self._rects = [item.sceneBoundingRect() for item in self._items]
+        if cellSize is None:
+            # Twice the median item size keeps most items in a few cells.
+            sizes = sorted(max(rect.width(), rect.height()) for rect in self._rects)
+            cellSize = 2 * sizes[len(sizes) // 2] if sizes else 1.0
+        self._cellSize = max(float(cellSize), 1.0)
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        for index, rect in enumerate(self._rects):
+            for cell in self._cellRange(rect):
+                self._cells.setdefault(cell, []).append(index)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return math.floor(x / self._cellSize), math.floor(y / self._cellSize)
+
+    def _cellRange(self, rect: QRectF) -> Iterator[Tuple[int, int]]:
+        left, top = self._cell(rect.left(), rect.top())
+        right, bottom = self._cell(rect.right(), rect.bottom())
+        return product(range(left, right + 1), range(top, bottom + 1))
+
+    @staticmethod
+    def _overlap(rect1: QRectF, rect2: QRectF) -> bool:
+        # Touching rects count, so items meeting at an edge are still paired.
+        return (rect1.left() <= rect2.right() and rect2.left() <= rect1.right()
+                and rect1.top() <= rect2.bottom() and rect2.top() <= rect1.bottom())
+
+    def candidatePairs(self) -> Iterator[Tuple[object, object]]:
+        """Yield each pair of items with overlapping rects once."""
+        for cell, indices in self._cells.items():
+            for index1, index2 in combinations(indices, 2):
+                rect1, rect2 = self._rects[index1], self._rects[index2]
+                if not self._overlap(rect1, rect2):
+                    continue
+                # Report the pair only from the cell holding the top-left
+                # corner of the overlap, not from every cell both items share.
+                if self._cell(max(rect1.left(), rect2.left()),
+                              max(rect1.top(), rect2.top())) == cell:
+                    yield self._items[index1], self._items[index2]
+
+    def itemsIn(self, rect: QRectF) -> List[object]:
+        """Items whose rects overlap rect."""
+        indices = {index for cell in self._cellRange(rect)
+                   for index in self._cells.get(cell, ())}
+        return [self._items[index] for index in sorted(indices)
+                if self._overlap(self._rects[index], rect)]
+
+
 def checkSymbolOverlaps(symbolSet: Set[schematicSymbol]):
     """
     Checks if any symbol overlaps with other symbols.
@@ -21,24 +83,61 @@ def checkSymbolOverlaps(symbolSet: Set[schematicSymbol]):
     collisionRectSet = set()
     if symbolSet is None:
         return False, collisionRectSet
-    symbolSetCombos = combinations(symbolSet, 2)
-    if symbolSetCombos is None:
-        return False, collisionRectSet
-    for symbol1, symbol2 in symbolSetCombos:
+    scenePaths = {}
+
+    def scenePath(symbol):
+        path = scenePaths.get(id(symbol))
+        if path is None:
+            path = scenePaths[id(symbol)] = symbol.mapToScene(symbol.shape())
+        return path
+
+    # Only the symbols whose bounding rects overlap get an exact shape test.
+    for symbol1, symbol2 in sceneRectIndex(symbolSet).candidatePairs():
         if symbol1.collidesWithItem(symbol2):
-            path1 = symbol1.mapToScene(symbol1.shape())
-            path2 = symbol2.mapToScene(symbol2.shape())
-            collisionPath = path1.intersected(path2)
+            collisionPath = scenePath(symbol1).intersected(scenePath(symbol2))
             if not collisionPath.isEmpty():
                 collisionRectSet.add(collisionPath.boundingRect(
                 ).toRect())
     return True, collisionRectSet
 
 
-def checkUnconnectedNets(netSet: Set["schematicNet"]):
+def _pointOnNet(netItem, point: QPoint, tolerance: float = 1.0) -> bool:
+    start, end = netItem.sceneEndPoints
+    line = QLineF(QPointF(start), QPointF(end))
+    if line.length() == 0:
+        return QLineF(line.p1(), QPointF(point)).length() <= tolerance
+    # Distance of the point to the segment.
+    pointF = QPointF(point)
+    delta = line.p2() - line.p1()
+    ratio = QPointF.dotProduct(pointF - line.p1(), delta) / QPointF.dotProduct(delta, delta)
+    closest = line.pointAt(min(1.0, max(0.0, ratio)))
+    return QLineF(closest, pointF).length() <= tolerance
+
+
+def checkUnconnectedNets(netSet: Set["schematicNet"],
+                         connectorSet: Optional[Set] = None):
     """
-    Checks if any net is unconnected.
+    Checks if any net is unconnected. A net end is unconnected if no other
+    net ends on or passes through it and it is not on an item of
+    connectorSet, such as a symbol or schematic pin.
     """
-    netEndSet = set()
+    danglingEnds = set()
+    if not netSet:
+        return False, danglingEnds
+    endCounts = Counter()
+    for netItem in netSet:
+        endCounts.update({(point.x(), point.y()) for point in netItem.sceneEndPoints})
+    netIndex = sceneRectIndex(netSet)
+    connectorIndex = sceneRectIndex(connectorSet or ())
     for netItem in netSet:
-        netEndSet.update(netItem.sceneEndPoints)
+        for point in netItem.sceneEndPoints:
+            if endCounts[(point.x(), point.y())] > 1:
+                continue
+            pointRect = QRectF(point.x() - 1, point.y() - 1, 2, 2)
+            if any(otherNet is not netItem and _pointOnNet(otherNet, point)
+                   for otherNet in netIndex.itemsIn(pointRect)):
+                continue
+            if connectorIndex.itemsIn(pointRect):
+                continue
+            danglingEnds.add(point)
+    return bool(danglingEnds), danglingEnds
@@ -0,0 +1,214 @@
+#
+# Revolution EDA
+#
+# Copyright (c) 2026 Revolution Semiconductor
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0.
+# If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+##
+
+"""Spatial index of line segments for edge snapping.
+
+``edgeIndex`` keeps the edges of layout shapes as (x1, y1, x2, y2) rows of
+numpy arrays, one entry per shape and layer, in a hierarchy of uniform grids.
+An entry goes to the finest grid whose cells are at least as large as the
+entry, so it occupies at most four cells whatever its size and a query only
+visits the few cells around the query point on each level.
+
+An entry can also be resolved lazily: instead of its edges it holds its bounding
+box and a function returning the edges inside a query region. Layout instances
+use this to search the edge index of their master cell, shared by all of their
+placements, and via arrays to make only the cuts near the query point.
+"""
+
+import math
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QTransform
+
+Region = Tuple[float, float, float, float]
+# region, layer filter -> edges inside region
+EdgeResolver = Callable[[Region, Optional[Callable[[Any], bool]]], np.ndarray]
+
+# Each grid level has cells this many times larger than the one below it.
+LEVEL_FACTOR = 4
+
+NO_EDGES = np.empty((0, 4))
+
+
+def edgeArray(edges) -> np.ndarray:
+    """Convert (QPointF, QPointF) pairs to an (n, 4) array of segments."""
+    if not edges:
+        return NO_EDGES
+    return np.array([(p1.x(), p1.y(), p2.x(), p2.y()) for p1, p2 in edges],
+                    dtype=np.float64)
+
+
+def mapEdges(edges: np.ndarray, transform: QTransform) -> np.ndarray:
+    """Map segments through the affine part of a QTransform."""
+    if transform.isIdentity() or not len(edges):
+        return edges
+    m11, m12, m21, m22 = (transform.m11(), transform.m12(), transform.m21(),
+                          transform.m22())
+    dx, dy = transform.dx(), transform.dy()
+    xs, ys = edges[:, 0::2], edges[:, 1::2]
+    mapped = np.empty_like(edges)
+    mapped[:, 0::2] = m11 * xs + m21 * ys + dx
+    mapped[:, 1::2] = m12 * xs + m22 * ys + dy
+    return mapped
+
+
+def closestPoint(edges: np.ndarray, x: float, y: float) -> Tuple[float, float, float]:
+    """(x, y, distance) of the point of edges closest to (x, y)."""
+    ax, ay, bx, by = edges[:, 0], edges[:, 1], edges[:, 2], edges[:, 3]
+    dx, dy = bx - ax, by - ay
+    lengthSq = dx * dx + dy * dy
+    degenerate = lengthSq == 0
+    t = ((x - ax) * dx + (y - ay) * dy) / np.where(degenerate, 1.0, lengthSq)
+    t = np.where(degenerate, 0.0, np.clip(t, 0.0, 1.0))
+    cx, cy = ax + t * dx, ay + t * dy
+    distances = np.hypot(x - cx, y - cy)
+    index = int(np.argmin(distances))
+    return float(cx[index]), float(cy[index]), float(distances[index])
+
+
+class _edgeEntry:
+    __slots__ = ("layer", "edges", "bbox", "resolve", "level", "cells")
+
+    def __init__(self, layer: Any, edges: Optional[np.ndarray], bbox: Region,
+                 resolve: Optional[EdgeResolver]):
+        self.layer = layer
+        self.edges = edges
+        self.bbox = bbox
+        self.resolve = resolve
+        self.level = 0
+        self.cells: List[Tuple[int, int]] = []
+
+
+class edgeIndex:
+    def __init__(self, cellSize: float = 1000.0):
+        self._cellSize = max(float(cellSize), 1e-9)
+        # level -> (column, row) -> entry keys
+        self._grids: Dict[int, Dict[Tuple[int, int], Dict[tuple, None]]] = {}
+        self._entries: Dict[tuple, _edgeEntry] = {}
+        # owner -> keys of its entries
+        self._ownerKeys: Dict[Hashable, List[tuple]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, owner: Hashable) -> bool:
+        return owner in self._ownerKeys
+
+    def insert(self, owner: Hashable, layer: Any = None,
+               edges: Optional[np.ndarray] = None, bbox: Optional[Region] = None,
+               resolve: Optional[EdgeResolver] = None) -> None:
+        """
+        Add the edges of owner on a layer. Either give the edges, or the
+        bounding box of the owner and a function resolving its edges.
+        """
+        if resolve is None:
+            if edges is None or not len(edges):
+                return
+            bbox = (float(min(edges[:, 0].min(), edges[:, 2].min())),
+                    float(min(edges[:, 1].min(), edges[:, 3].min())),
+                    float(max(edges[:, 0].max(), edges[:, 2].max())),
+                    float(max(edges[:, 1].max(), edges[:, 3].max())))
+        elif bbox is None:
+            return
+        entry = _edgeEntry(layer, edges, bbox, resolve)
+        keys = self._ownerKeys.setdefault(owner, [])
+        key = (owner, len(keys))
+        keys.append(key)
+        self._entries[key] = entry
+
+        size = max(bbox[2] - bbox[0], bbox[3] - bbox[1])
+        level, cellSize = 0, self._cellSize
+        while cellSize < size:
+            level += 1
+            cellSize *= LEVEL_FACTOR
+        entry.level = level
+        grid = self._grids.setdefault(level, {})
+        for column in range(math.floor(bbox[0] / cellSize),
+                            math.floor(bbox[2] / cellSize) + 1):
+            for row in range(math.floor(bbox[1] / cellSize),
+                             math.floor(bbox[3] / cellSize) + 1):
+                grid.setdefault((column, row), {})[key] = None
+                entry.cells.append((column, row))
+
+    def remove(self, owner: Hashable) -> None:
+        for key in self._ownerKeys.pop(owner, ()):
+            entry = self._entries.pop(key)
+            grid = self._grids[entry.level]
+            for cell in entry.cells:
+                bucket = grid[cell]
+                del bucket[key]
+                if not bucket:
+                    del grid[cell]
+
+    def clear(self) -> None:
+        self._grids.clear()
+        self._entries.clear()
+        self._ownerKeys.clear()
+
+    def _candidates(self, region: Region) -> List[_edgeEntry]:
+        x0, y0, x1, y1 = region
+        keys = set()
+        for level, grid in self._grids.items():
+            cellSize = self._cellSize * LEVEL_FACTOR ** level
+            c0, c1 = math.floor(x0 / cellSize), math.floor(x1 / cellSize)
+            r0, r1 = math.floor(y0 / cellSize), math.floor(y1 / cellSize)
+            if (c1 - c0 + 1) * (r1 - r0 + 1) > len(grid):
+                for (column, row), bucket in grid.items():
+                    if c0 <= column <= c1 and r0 <= row <= r1:
+                        keys.update(bucket)
+            else:
+                for column in range(c0, c1 + 1):
+                    for row in range(r0, r1 + 1):
+                        bucket = grid.get((column, row))
+                        if bucket:
+                            keys.update(bucket)
+        entries = self._entries
+        candidates = []
+        for key in keys:
+            entry = entries[key]
+            bx0, by0, bx1, by1 = entry.bbox
+            if bx0 <= x1 and bx1 >= x0 and by0 <= y1 and by1 >= y0:
+                candidates.append(entry)
+        return candidates
+
+    def edges(self, region: Region,
+              layerFilter: Optional[Callable[[Any], bool]] = None) -> np.ndarray:
+        """Edges of the entries overlapping region on the layers passing layerFilter."""
+        parts = []
+        for entry in self._candidates(region):
+            if entry.layer is not None and layerFilter is not None and not layerFilter(
+                    entry.layer):
+                continue
+            if entry.resolve is not None:
+                part = entry.resolve(region, layerFilter)
+            else:
+                part = entry.edges
+            if len(part):
+                parts.append(part)
+        if not parts:
+            return NO_EDGES
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def closestPoint(self, point: QPointF, maxDistance: float,
+                     layerFilter: Optional[Callable[[Any], bool]] = None
+                     ) -> Optional[QPointF]:
+        """The point of an edge closest to point if it is nearer than maxDistance."""
+        x, y = point.x(), point.y()
+        edges = self.edges((x - maxDistance, y - maxDistance,
+                            x + maxDistance, y + maxDistance), layerFilter)
+        if not len(edges):
+            return None
+        cx, cy, distance = closestPoint(edges, x, y)
+        if distance >= maxDistance:
+            return None
+        return QPointF(cx, cy)
@@ -8,69 +8,208 @@
 # Add-ons and extensions developed for this software may be distributed
 # under their own separate licenses.
 
-"""File content caching with modification-time invalidation."""
+"""Design data caching with a byte budget and file validation.
+
+``designCache`` is the one cache for data derived from design files: parsed
+JSON of symbol, layout and pcell views, layout master cells, GDS cells built
+for export and layer texture pixmaps. Entries are evicted least recently used
+first once their estimated sizes exceed the budget, which is 256 MB unless the
+REVEDA_CACHE_MB environment variable sets another. An entry made from a file
+remembers the size and modification time of the file and is dropped when
+either changes, and saving a view drops only the entries made from its file.
+"""
 
 import logging
 import os
 import pathlib
-from typing import Any, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
 
 import orjson
 
 logger = logging.getLogger(__name__)
 
+# Parsed JSON takes several times the memory of its text.
+JSON_SIZE_FACTOR = 8
+
+FileStamp = Tuple[int, int]
+
+
+def fileStamp(filePath) -> Optional[FileStamp]:
+    """(size, modification time in ns) of a file, or None if it is missing."""
+    try:
+        stat = os.stat(filePath)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
 
-class FileCache:
-    """Singleton file content cache with mtime-based invalidation."""
+class _cacheEntry:
+    __slots__ = ("value", "path", "stamp", "size")
 
-    _instance: Optional["FileCache"] = None
+    def __init__(self, value: Any, path: Optional[str], stamp: Optional[FileStamp],
+                 size: int):
+        self.value = value
+        self.path = path
+        self.stamp = stamp
+        self.size = size
+
+
+class designCache:
+    """Singleton LRU cache of design data, bounded by estimated bytes."""
+
+    _instance: Optional["designCache"] = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance._cache: dict[str, tuple[float, Any]] = {}
-            cls._instance._max_size = 256
+            cls._instance._init()
         return cls._instance
 
-    def get_json(self, file_path: str | pathlib.Path) -> Optional[Any]:
-        """Load and cache JSON file contents, invalidating on mtime change."""
-        path_str = str(file_path)
-
+    def _init(self):
+        self._entries: OrderedDict[Hashable, _cacheEntry] = OrderedDict()
+        # file path -> keys of the entries made from it
+        self._pathKeys: Dict[str, Set[Hashable]] = {}
+        self._bytes = 0
         try:
-            mtime = os.path.getmtime(path_str)
-        except OSError:
-            self._cache.pop(path_str, None)
-            return None
+            self._budget = int(float(os.environ.get("REVEDA_CACHE_MB", 256)) * 2**20)
+        except ValueError:
+            self._budget = 256 * 2**20
+        self._lock = threading.RLock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
 
-        cached = self._cache.get(path_str)
-        if cached is not None and cached[0] == mtime:
-            return cached[1]
+    @property
+    def budget(self) -> int:
+        return self._budget
 
-        try:
-            with open(path_str, "rb") as f:
-                content = orjson.loads(f.read())
-        except (orjson.JSONDecodeError, OSError) as e:
-            logger.debug(f"Failed to load {path_str}: {e}")
-            self._cache.pop(path_str, None)
-            return None
+    @budget.setter
+    def budget(self, nbytes: int):
+        with self._lock:
+            self._budget = max(0, int(nbytes))
+            self._evict()
 
-        if len(self._cache) >= self._max_size:
-            to_remove = list(self._cache.keys())[:self._max_size // 4]
-            for key in to_remove:
-                del self._cache[key]
+    @property
+    def size(self) -> int:
+        """Estimated bytes held by the cache."""
+        return self._bytes
 
-        self._cache[path_str] = (mtime, content)
-        return content
+    def __len__(self) -> int:
+        return len(self._entries)
 
-    def invalidate(self, file_path: str | pathlib.Path) -> None:
-        """Remove a specific file from the cache."""
-        self._cache.pop(str(file_path), None)
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "invalidations": self.invalidations,
+                "entries": len(self._entries), "bytes": self._bytes,
+                "budget": self._budget}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value cached under key if its file is unchanged."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.path is not None and (
+                    fileStamp(entry.path) != entry.stamp):
+                self._drop(key)
+                self.invalidations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, size: int,
+            filePath=None, stamp: Optional[FileStamp] = None) -> Any:
+        """
+        Cache value under key with an estimated size in bytes. A value made
+        from filePath is checked against stamp, the fileStamp taken before
+        the file was read, or the current one if not given.
+        """
+        path = None
+        if filePath is not None:
+            path = os.fspath(filePath)
+            if stamp is None:
+                stamp = fileStamp(path)
+            if stamp is None:
+                return value
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self._budget:
+                return value
+            self._entries[key] = _cacheEntry(value, path, stamp, size)
+            self._bytes += size
+            if path is not None:
+                self._pathKeys.setdefault(path, set()).add(key)
+            self._evict()
+        return value
+
+    def load(self, key: Hashable, filePath, loader: Callable[[str], Any],
+             sizeOf: Callable[[Any, FileStamp], int]) -> Optional[Any]:
+        """
+        Return the value cached under key, or make it with loader(path) and
+        cache it. sizeOf(value, stamp) estimates its size. Loader results of
+        None are not cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        path = os.fspath(filePath)
+        stamp = fileStamp(path)
+        if stamp is None:
+            return None
+        value = loader(path)
+        if value is not None:
+            self.put(key, value, sizeOf(value, stamp), path, stamp)
+        return value
+
+    def getJson(self, filePath: str | pathlib.Path) -> Optional[Any]:
+        """Load and cache the contents of a JSON file."""
+        return self.load(("json", os.fspath(filePath)), filePath, _readJson,
+                         lambda value, stamp: stamp[0] * JSON_SIZE_FACTOR)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+                self.invalidations += 1
+
+    def invalidatePath(self, filePath: str | pathlib.Path) -> None:
+        """Remove every entry made from filePath."""
+        with self._lock:
+            for key in list(self._pathKeys.get(os.fspath(filePath), ())):
+                self._drop(key)
+                self.invalidations += 1
 
     def clear(self) -> None:
         """Clear all cached entries."""
-        self._cache.clear()
-
-    @property
-    def size(self) -> int:
-        """Return number of cached entries."""
-        return len(self._cache)
+        with self._lock:
+            self._entries.clear()
+            self._pathKeys.clear()
+            self._bytes = 0
+
+    def _drop(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        if entry.path is not None:
+            keys = self._pathKeys.get(entry.path)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._pathKeys[entry.path]
+
+    def _evict(self):
+        while self._bytes > self._budget and self._entries:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+
+def _readJson(path: str) -> Optional[Any]:
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except (orjson.JSONDecodeError, OSError) as e:
+        logger.debug(f"Failed to load {path}: {e}")
+        return None
@@ -8,7 +8,7 @@
 # Add-ons and extensions developed for this software may be distributed
 # under their own separate licenses.
 
-from typing import Tuple
+from typing import Optional, Tuple
 
 from PySide6.QtCore import (
     QPoint,
@@ -86,6 +86,8 @@ class symbolLabel(QGraphicsSimpleTextItem):
         "[@modelName]",
         "[@elementNum]",
     ]
+    # predefined labels taking their value from the instance name or number
+    instanceLabels = ("[@instName]", "[@elementNum]")
 
     def __init__(
             self,
@@ -144,6 +146,24 @@ class symbolLabel(QGraphicsSimpleTextItem):
             f" {self._labelUse})"
         )
 
+    def clone(self) -> "symbolLabel":
+        """Copy of the label keeping its evaluated name, value and text."""
+        label = symbolLabel(self._start, self._labelDefinition, self._labelType,
+                            self._labelHeight, self._labelAlign, self._labelOrient,
+                            self._labelUse)
+        label._labelName = self._labelName
+        label._labelValue = self._labelValue
+        label._labelText = self._labelText
+        label._labelVisible = self._labelVisible
+        label.setText(self._labelText)
+        label._updateVisibility()
+        label.setPos(self.pos())
+        label.setTransform(self.transform())
+        label.setRotation(self.rotation())
+        label._angle = self._angle
+        label._flipTuple = self._flipTuple
+        return label
+
     def sceneEvent(self, event) -> bool:
         """Block events when the active selection filter excludes labels."""
         if self.scene() and hasattr(self.scene(), 'selectModes'):
@@ -334,17 +354,10 @@ class symbolLabel(QGraphicsSimpleTextItem):
         It should be called when a label is defined or redefined.
         """
         self.prepareGeometryChange()
-
-        if self._labelType == symbolLabel.labelTypes[0]:  # normal label
-            # Set label name, value, and text to label definition
-            self._labelName = f"@{self._labelDefinition}"
-            self._labelValue = self._labelDefinition
-            self._labelText = self._labelDefinition
-        elif self._labelType == symbolLabel.labelTypes[1]:  # NLPLabel
-            (self._labelName, self._labelText, self._labelValue) = self.createNLPLabel(
-                self._labelDefinition, self._labelValue)
-        elif self._labelType == symbolLabel.labelTypes[2]:  # pyLabel
-            self.createPyLabel()
+        label = evaluateLabel(self._labelType, self._labelDefinition, self._labelValue,
+                              self.parentItem(), self._logger())
+        if label is not None:
+            self._labelName, self._labelText, self._labelValue = label
         self.setText(self._labelText)
 
     def createNLPLabel(self, labelDefinition: str, labelValue: str = "") -> Tuple[
@@ -359,109 +372,119 @@ class symbolLabel(QGraphicsSimpleTextItem):
         Returns:
             Tuple of (labelName, labelText, labelValue)
         """
-        try:
-            # Validate input format
-            if not labelDefinition.strip().startswith("[@"):
-                return ("", "", "")
-
-            # Extract expression from brackets
-            end_index = labelDefinition.find("]")
-            if end_index == -1:
-                return ("", "", "")
-
-            expression = labelDefinition[1:end_index]
-            parts = expression.split(":")
-            labelName = parts[0].strip()
-
-            # Symbol editor case
-            if self.parentItem() is None:
-                return (labelName, labelDefinition, labelValue)
-
-            # Predefined labels case
-            if labelDefinition in symbolLabel.predefinedLabels:
-                return self._createPredefinedLabels(labelDefinition)
-
-            # Handle different part counts
-            if len(parts) == 1:
-                return (labelName, labelName, labelValue)
-
-            # Extract format string and default value
-            formatString = parts[1].strip() if len(parts) > 1 else labelName
-            defaultValue = self._extractDefaultValue(parts[2].strip()) if len(
-                parts) > 2 else ""
-
-            # Use default value if no current value
-            finalValue = labelValue or defaultValue
-
-            # Generate label text
-            labelText = formatString.replace("%",
-                                             finalValue) if "%" in formatString else formatString
-
-            return (labelName, labelText, finalValue)
-
-        except Exception as e:
-            if self.scene():
-                self.scene().logger.error(
-                    f"Error parsing label definition: {labelDefinition}, {e}")
-            return ("", "", "")
+        return _nlpLabel(labelDefinition, labelValue, self.parentItem(), self._logger())
+
+    def _logger(self):
+        return self.scene().logger if self.scene() else None
 
-    def _extractDefaultValue(self, defaultString: str) -> str:
-        """Extract default value from default string, handling 'key=value' format."""
-        if "=" in defaultString:
-            return defaultString.split("=")[1].strip()
-        return defaultString
-
-    def _createPredefinedLabels(self, labelDefinition: str) -> Tuple[str, str, str]:
-        labelName = labelDefinition[1:-1]
-        labelValue = ""
-
-        match labelName:
-            case "@cellName":
-                # Set label name to "cellName" and value and text to parentW item's cell name
-                labelValue = self.parentItem().cellName
-            case "@instName":
-                # Set label name to "instName" and value and text to parentW item's counter with prefix "I"
-                labelValue = getattr(
-                    self.parentItem(), "instanceName", f"I{self.parentItem().counter}"
-                )
-
-            case "@libName":
-                # Set label name to "libName" and value and text to parentW item's library name
-                labelValue = self.parentItem().libraryName
-
-            case "@viewName":
-                # Set label name to "viewName" and value and text to parentW item's view name
-                labelValue = self.parentItem().viewName
-
-            case "@modelName":
-                # Set label name to "modelName" and value and text to parentW item's "modelName" attribute
-                labelValue = self.parentItem().symattrs.get("modelName", "")
-
-            case "@elementNum":
-                # Set label name to "elementNum" and value and text to parentW item's counter
-                labelValue = f"{self.parentItem().counter}"
-        return labelName, labelValue, labelValue
-
-    def createPyLabel(self):
-        """
-        Create a PyLabel using the label definition and parentW item information.
-        """
-        try:
-            labelName, labelFunction = map(str.strip, self._labelDefinition.split("="))
-            self._labelName = f"@{labelName}"
-            self._labelValue = "?"
-            parentItem = self.parentItem()
 
-            if parentItem and hasattr(parentItem, "cellName"):
-                callbackClass = getattr(cb, parentItem.cellName)
-                callbackObj = callbackClass(parentItem.labels)
-                if hasattr(callbackObj, labelFunction):
-                    self._labelValue = Quantity(
-                        getattr(callbackObj, labelFunction)()).render(prec=3)
+def evaluateLabel(labelType: str, labelDefinition: str, labelValue: str = "",
+                  parent=None, logger=None) -> Optional[Tuple[str, str, str]]:
+    """
+    Return (labelName, labelText, labelValue) of a label definition placed on
+    the symbol instance parent, or None if the label cannot be evaluated.
+    Labels of a symbol being edited have no parent.
 
-            self._labelText = f"{labelName}={self._labelValue}"
+    Only plain attributes of parent are read, so the same evaluation serves
+    the symbol labels of a scene and the netlisting data read from files.
+    """
+    if labelType == symbolLabel.labelTypes[0]:  # normal label
+        return f"@{labelDefinition}", labelDefinition, labelDefinition
+    if labelType == symbolLabel.labelTypes[1]:
+        return _nlpLabel(labelDefinition, labelValue, parent, logger)
+    if labelType == symbolLabel.labelTypes[2]:
+        return _pyLabel(labelDefinition, parent, logger)
+    return None
 
 
-        except Exception as e:
-            if self.scene():
-                self.scene().logger.error(f"PyLabel Error: {e}")
+def _nlpLabel(labelDefinition: str, labelValue: str, parent, logger
+              ) -> Tuple[str, str, str]:
+    try:
+        # Validate input format
+        if not labelDefinition.strip().startswith("[@"):
+            return ("", "", "")
+
+        # Extract expression from brackets
+        end_index = labelDefinition.find("]")
+        if end_index == -1:
+            return ("", "", "")
+
+        expression = labelDefinition[1:end_index]
+        parts = expression.split(":")
+        labelName = parts[0].strip()
+
+        # Symbol editor case
+        if parent is None:
+            return (labelName, labelDefinition, labelValue)
+
+        # Predefined labels case
+        if labelDefinition in symbolLabel.predefinedLabels:
+            labelName = labelDefinition[1:-1]
+            labelValue = _predefinedLabelValue(labelName, parent)
+            return labelName, labelValue, labelValue
+
+        # Handle different part counts
+        if len(parts) == 1:
+            return (labelName, labelName, labelValue)
+
+        # Extract format string and default value
+        formatString = parts[1].strip()
+        defaultValue = ""
+        if len(parts) > 2:
+            # handle 'key=value' defaults
+            defaultString = parts[2].strip()
+            defaultValue = (defaultString.split("=")[1].strip()
+                            if "=" in defaultString else defaultString)
+
+        # Use default value if no current value
+        finalValue = labelValue or defaultValue
+
+        # Generate label text
+        labelText = formatString.replace("%",
+                                         finalValue) if "%" in formatString else formatString
+
+        return (labelName, labelText, finalValue)
+
+    except Exception as e:
+        if logger:
+            logger.error(f"Error parsing label definition: {labelDefinition}, {e}")
+        return ("", "", "")
+
+
+def _predefinedLabelValue(labelName: str, parent) -> str:
+    match labelName:
+        case "@cellName":
+            return parent.cellName
+        case "@instName":
+            return getattr(parent, "instanceName", f"I{parent.counter}")
+        case "@libName":
+            return parent.libraryName
+        case "@viewName":
+            return parent.viewName
+        case "@modelName":
+            return parent.symattrs.get("modelName", "")
+        case "@elementNum":
+            return f"{parent.counter}"
+    return ""
+
+
+def _pyLabel(labelDefinition: str, parent, logger) -> Optional[Tuple[str, str, str]]:
+    """Evaluate a label with the PDK callback of the parent's cell."""
+    try:
+        labelName, labelFunction = map(str.strip, labelDefinition.split("="))
+    except ValueError as e:
+        if logger:
+            logger.error(f"PyLabel Error: {e}")
+        return None
+    labelValue = "?"
+    try:
+        if parent is not None and hasattr(parent, "cellName"):
+            callbackClass = getattr(cb, parent.cellName)
+            callbackObj = callbackClass(parent.labels)
+            if hasattr(callbackObj, labelFunction):
+                labelValue = Quantity(
+                    getattr(callbackObj, labelFunction)()).render(prec=3)
+    except Exception as e:
+        if logger:
+            logger.error(f"PyLabel Error: {e}")
+    return f"@{labelName}", f"{labelName}={labelValue}", labelValue
@@ -8,10 +8,11 @@
 # If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 #
+import inspect
 import itertools
 import math
 from pathlib import Path
-from typing import List, Tuple, Union
+from typing import List, Optional, Tuple, Union
 
 import numpy as np
 from PySide6.QtCore import (
@@ -46,19 +47,24 @@ from PySide6.QtWidgets import (
 )
 
 import revedaEditor.backend.dataDefinitions as ddef
+import revedaEditor.common.edgeIndex as eidx
 from revedaEditor.backend.pdkLoader import importPDKModule
+from revedaEditor.common.fileCache import FileStamp, designCache, fileStamp
 processDBU = importPDKModule('process').dbu
 
 class textureCache:
-    _file_content_cache = {}
-    _pixmap_cache = {}
+    """Layer texture patterns and pixmaps, kept in the design cache."""
 
     @classmethod
     def readFileContent(cls, filePath):
-        if filePath not in cls._file_content_cache:
+        filePath = str(filePath)
+        key = ("texture", filePath)
+        content = designCache().get(key)
+        if content is None:
             with open(filePath, "r") as file:
-                cls._file_content_cache[filePath] = file.read()
-        return cls._file_content_cache[filePath]
+                content = file.read()
+            designCache().put(key, content, len(content), filePath)
+        return content
 
     @classmethod
     def createImage(cls, filePath: Path, color: QColor, scale: int = 1) -> QImage:
@@ -100,22 +106,26 @@ class textureCache:
 
     @classmethod
     def getCachedPixmap(cls, texturePath, color):
-        cache_key = (str(texturePath), color.name())
-        if cache_key not in cls._pixmap_cache:
-            image = cls.createImage(texturePath, color, 1)
-            pixmap = QPixmap.fromImage(image)
-            cls._pixmap_cache[cache_key] = pixmap
-        return cls._pixmap_cache[cache_key]
-
-    @classmethod
-    def clearCaches(cls):
-        cls._file_content_cache.clear()
-        cls._pixmap_cache.clear()
+        cache_key = ("pixmap", str(texturePath), color.name())
+        pixmap = designCache().get(cache_key)
+        if pixmap is None:
+            pixmap = QPixmap.fromImage(cls.createImage(texturePath, color, 1))
+            designCache().put(cache_key, pixmap,
+                              pixmap.width() * pixmap.height() * 4, texturePath)
+        return pixmap
 
 
 class layoutShape(QGraphicsItem):
     # Class-level color cache
     _color_cache = {}
+    # changes moving the shape in the scene
+    _GEOMETRY_CHANGES = frozenset((
+        QGraphicsItem.ItemPositionHasChanged,
+        QGraphicsItem.ItemTransformHasChanged,
+        QGraphicsItem.ItemRotationHasChanged,
+        QGraphicsItem.ItemScaleHasChanged,
+        QGraphicsItem.ItemTransformOriginPointHasChanged,
+    ))
     # Class-level pen/brush lookup table
     _pen_brush_cache = {}
 
@@ -160,8 +170,32 @@ class layoutShape(QGraphicsItem):
             else:
                 if hasattr(self, "_originalZValue"):
                     self.setZValue(self._originalZValue)
+        elif change in self._GEOMETRY_CHANGES:
+            registry = getattr(self.scene(), "layerRegistry", None)
+            if registry is not None:
+                registry.geometryChanged(self)
+        elif change == QGraphicsItem.ItemSceneChange:
+            registry = getattr(self.scene(), "layerRegistry", None)
+            if registry is not None:
+                registry.remove(self)
+        elif change == QGraphicsItem.ItemSceneHasChanged:
+            registry = getattr(value, "layerRegistry", None)
+            if registry is not None:
+                registry.add(self)
         return super().itemChange(change, value)
 
+    def prepareGeometryChange(self):
+        super().prepareGeometryChange()
+        registry = getattr(self.scene(), "layerRegistry", None)
+        if registry is not None:
+            registry.geometryChanged(self)
+
+    def _layerChanged(self):
+        """Move the shape to its new layer in the layer registry of its scene."""
+        registry = getattr(self.scene(), "layerRegistry", None)
+        if registry is not None:
+            registry.add(self)
+
     def _definePensBrushes(self, layer):
         # Create cache key from layer properties
         cache_key = (
@@ -260,6 +294,14 @@ class layoutShape(QGraphicsItem):
         else:
             return None
 
+    def _viewScale(self, painter: QPainter) -> float:
+        """Zoom of the first view, or of the painter when there is no view."""
+        scene = self.scene()
+        views = scene.views() if scene is not None else []
+        if views:
+            return views[0].transform().m11()
+        return painter.worldTransform().m11()
+
     @property
     def offset(self):
         return self._offset
@@ -343,6 +385,30 @@ class layoutShape(QGraphicsItem):
         self.prepareGeometryChange()
         self._layer = value
         self._definePensBrushes(self._layer)
+        self._layerChanged()
+
+    def clone(self) -> "layoutShape":
+        """
+        Copy of the shape with the same geometry and placement. Layers, via
+        definitions and instance masters are shared with the original.
+        Must be implemented in subclasses.
+        """
+        raise NotImplementedError("Subclasses must implement clone")
+
+    def _copyPlacement(self, source: "layoutShape") -> "layoutShape":
+        """Place the shape like source without going through the setters."""
+        # Each setter notifies itemChange; skip the ones left at their default.
+        if not source.pos().isNull():
+            self.setPos(source.pos())
+        if source.transformOriginPoint() != self.transformOriginPoint():
+            self.setTransformOriginPoint(source.transformOriginPoint())
+        if not source.transform().isIdentity():
+            self.setTransform(source.transform())
+        if source.rotation() != self.rotation():
+            self.setRotation(source.rotation())
+        self._angle = source._angle
+        self._flipTuple = source._flipTuple
+        return self
 
 
 class layoutRect(layoutShape):
@@ -380,6 +446,10 @@ class layoutRect(layoutShape):
     def __repr__(self) -> str:
         return f"layoutRect({self._start}, {self._end}, {self._layer})"
 
+    def clone(self) -> "layoutRect":
+        return layoutRect(self._rect.topLeft(), self._rect.bottomRight(),
+                          self._layer)._copyPlacement(self)
+
     def paint(self, painter, option, widget) -> None:
         rect = self._rect
 
@@ -516,6 +586,7 @@ class layoutRect(layoutShape):
     def layer(self, layer: ddef.layLayer):
         self.prepareGeometryChange()
         self._layer = layer
+        self._layerChanged()
 
     def mousePressEvent(self, event: QGraphicsSceneMouseEvent) -> None:
         super().mousePressEvent(event)
@@ -575,13 +646,201 @@ class layoutRect(layoutShape):
             self.setCursor(Qt.ArrowCursor)
 
 
+class layoutMasterCell:
+    """
+    Geometry of a layout cell, built once and shared by all of its placements.
+
+    The shapes of the cell are kept as prototype items that are never added to a
+    scene. Their outlines are merged into one fill path and one line path per
+    layer so that a layoutInstance paints the whole cell with a few draw calls
+    through its own transform. Nested layout instances keep a reference to their
+    own master instead of being flattened, so a master also records the file
+    stamps of the cells placed in it and is stale when any of them changes.
+    """
+
+    def __init__(self, shapes: list[layoutShape],
+                 sources: Optional[dict[str, FileStamp]] = None):
+        self._shapes = shapes
+        # file path -> stamp of the cell files the geometry was built from
+        self._sources = dict(sources or {})
+        # (layer name, purpose) -> [layer, pen, brush, fill path, line path]
+        self._layers: dict[tuple[str, str], list] = {}
+        self._labels: list[layoutLabel] = []
+        self._children: list[tuple[QTransform, "layoutMasterCell"]] = []
+        self._brushCache: dict[tuple[str, str], tuple[float, QBrush]] = {}
+        self._layerKeys = None
+        self._edgeIndex = None
+        for shape in shapes:
+            self._collectShape(shape)
+        for _, child in self._children:
+            self._sources.update(child._sources)
+        self._layerOrder = sorted(self._layers, key=lambda key: self._layers[key][0].z)
+        self._boundingRect = self._calculateBoundingRect()
+
+    def __repr__(self) -> str:
+        return f"layoutMasterCell({len(self._shapes)} shapes, {len(self._layers)} layers)"
+
+    def _layerEntry(self, shape: layoutShape) -> list:
+        key = (shape.layer.name, shape.layer.purpose)
+        entry = self._layers.get(key)
+        if entry is None:
+            fillPath = QPainterPath()
+            fillPath.setFillRule(Qt.WindingFill)
+            entry = [shape.layer, shape.pen, shape.brush, fillPath, QPainterPath()]
+            self._layers[key] = entry
+        return entry
+
+    def _collectShape(self, shape) -> None:
+        if isinstance(shape, layoutInstance):
+            if shape.master is not None:
+                self._children.append((shape.sceneTransform(), shape.master))
+            else:
+                # pcells and other instances owning their shapes are flattened.
+                for childShape in shape.shapes:
+                    self._collectShape(childShape)
+            return
+        if isinstance(shape, layoutViaArray):
+            transform = shape.sceneTransform()
+            _, _, _, fillPath, linePath = self._layerEntry(shape)
+            for cutRect in shape.cutRects():
+                fillPath.addPolygon(self._orientedPolygon(transform.map(QPolygonF(cutRect))))
+                fillPath.closeSubpath()
+                linePath.moveTo(transform.map(cutRect.bottomLeft()))
+                linePath.lineTo(transform.map(cutRect.topRight()))
+                linePath.moveTo(transform.map(cutRect.topLeft()))
+                linePath.lineTo(transform.map(cutRect.bottomRight()))
+            return
+        if isinstance(shape, layoutLabel):
+            self._labels.append(shape)
+            return
+        if isinstance(shape, (layoutRect, layoutPin, layoutVia)):
+            outline = QPolygonF(QRectF(shape.rect))
+        elif isinstance(shape, layoutPath):
+            outline = QPolygonF(QRectF(shape._rect))
+        elif isinstance(shape, layoutPolygon):
+            outline = shape.polygon
+        else:
+            return
+        transform = shape.sceneTransform()
+        _, _, _, fillPath, linePath = self._layerEntry(shape)
+        fillPath.addPolygon(self._orientedPolygon(transform.map(outline)))
+        fillPath.closeSubpath()
+        if isinstance(shape, layoutPath):
+            linePath.moveTo(transform.map(shape.draftLine.p1()))
+            linePath.lineTo(transform.map(shape.draftLine.p2()))
+        elif isinstance(shape, layoutVia):
+            viaRect = QRectF(shape.rect)
+            linePath.moveTo(transform.map(viaRect.bottomLeft()))
+            linePath.lineTo(transform.map(viaRect.topRight()))
+            linePath.moveTo(transform.map(viaRect.topLeft()))
+            linePath.lineTo(transform.map(viaRect.bottomRight()))
+
+    @staticmethod
+    def _orientedPolygon(polygon: QPolygonF) -> QPolygonF:
+        """
+        Return the polygon with a positive signed area so that overlapping shapes
+        on the same layer add up instead of cancelling under the winding fill rule.
+        """
+        points = [polygon.at(index) for index in range(polygon.count())]
+        area = sum(
+            p1.x() * p2.y() - p2.x() * p1.y()
+            for p1, p2 in zip(points, points[1:] + points[:1])
+        )
+        if area < 0:
+            return QPolygonF(points[::-1])
+        return polygon
+
+    def _calculateBoundingRect(self) -> QRectF:
+        rect = QRectF()
+        for _, _, _, fillPath, linePath in self._layers.values():
+            rect = rect.united(fillPath.boundingRect())
+            if not linePath.isEmpty():
+                rect = rect.united(linePath.boundingRect())
+        for label in self._labels:
+            rect = rect.united(label.sceneBoundingRect())
+        for transform, child in self._children:
+            rect = rect.united(transform.mapRect(child.boundingRect))
+        return rect
+
+    def _scaledBrush(self, key: tuple[str, str], brush: QBrush, scale: float) -> QBrush:
+        roundedScale = max(round(scale, 2), 0.01)
+        cached = self._brushCache.get(key)
+        if cached is None or cached[0] != roundedScale:
+            scaledBrush = QBrush(brush)
+            scaledBrush.setTransform(QTransform().scale(1 / roundedScale, 1 / roundedScale))
+            cached = (roundedScale, scaledBrush)
+            self._brushCache[key] = cached
+        return cached[1]
+
+    def paint(self, painter: QPainter, option, widget, scale: float) -> None:
+        for transform, child in self._children:
+            painter.save()
+            painter.setTransform(transform, True)
+            child.paint(painter, option, widget, scale)
+            painter.restore()
+        for key in self._layerOrder:
+            layer, pen, brush, fillPath, linePath = self._layers[key]
+            if not layer.visible:
+                continue
+            painter.setPen(pen)
+            painter.setBrush(self._scaledBrush(key, brush, scale))
+            painter.drawPath(fillPath)
+            if not linePath.isEmpty():
+                painter.setBrush(Qt.NoBrush)
+                painter.drawPath(linePath)
+        for label in self._labels:
+            if label.layer.visible:
+                painter.save()
+                painter.setTransform(label.sceneTransform(), True)
+                label.paint(painter, option, widget)
+                painter.restore()
+
+    @property
+    def shapes(self) -> list[layoutShape]:
+        return self._shapes
+
+    @property
+    def boundingRect(self) -> QRectF:
+        return self._boundingRect
+
+    @property
+    def sources(self) -> dict[str, FileStamp]:
+        return self._sources
+
+    def isCurrent(self) -> bool:
+        """True if none of the cell files the master was built from has changed."""
+        return all(fileStamp(path) == stamp for path, stamp in self._sources.items())
+
+    @property
+    def edgeIndex(self) -> eidx.edgeIndex:
+        """Edges of the cell in its own coordinates, built on first use."""
+        if self._edgeIndex is None:
+            rect = self._boundingRect
+            self._edgeIndex = eidx.edgeIndex(max(rect.width(), rect.height(), 1.0) / 64)
+            for shape in self._shapes:
+                layoutRuler.indexItemEdges(self._edgeIndex, shape, True)
+        return self._edgeIndex
+
+    @property
+    def layerKeys(self) -> frozenset[tuple[str, str]]:
+        if self._layerKeys is None:
+            keys = set(self._layers)
+            keys.update((label.layer.name, label.layer.purpose) for label in self._labels)
+            for _, child in self._children:
+                keys |= child.layerKeys
+            self._layerKeys = frozenset(keys)
+        return self._layerKeys
+
+
 class layoutInstance(layoutShape):
     _lodThreshold = 0.002
-    def __init__(self, shapes: list[layoutShape]):
+    def __init__(self, shapes: list[layoutShape], master: layoutMasterCell = None):
         super().__init__()
 
         # Direct attribute initialization
         self._shapes = shapes
+        # Instances created from a shared master paint it instead of owning children.
+        self._master = master
         self._draft = False
         self._libraryName = self._cellName = self._viewName = self._instanceName = ""
         self._counter = 0
@@ -606,7 +865,7 @@ class layoutInstance(layoutShape):
             self.setShapes()
 
     def setShapes(self):
-        if self._shapes_set or not self._shapes:
+        if self._master is not None or self._shapes_set or not self._shapes:
             return
 
         # Batch process all shapes
@@ -621,6 +880,8 @@ class layoutInstance(layoutShape):
 
     def removeShapes(self):
         self.prepareGeometryChange()
+        self._master = None
+        self._layerChanged()
         scene = self.scene()
         for item in self._shapes:
             item.setParentItem(None)
@@ -632,9 +893,33 @@ class layoutInstance(layoutShape):
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self._libraryName}, {self._cellName}, {self._viewName}, {self._instanceName})"
 
+    def clone(self) -> "layoutInstance":
+        """
+        Copy of the instance. Instances of a master cell share the master with
+        the original, the others get clones of its shapes.
+        """
+        if self._master is not None:
+            instance = layoutInstance([], self._master)
+        else:
+            instance = layoutInstance([shape.clone() for shape in self._shapes])
+        return self._copyInstanceState(instance)
+
+    def _copyInstanceState(self, instance: "layoutInstance") -> "layoutInstance":
+        instance._libraryName = self._libraryName
+        instance._cellName = self._cellName
+        instance._viewName = self._viewName
+        instance._instanceName = self._instanceName
+        instance._counter = self._counter
+        instance._draft = self._draft
+        return instance._copyPlacement(self)
+
+    def _contentRect(self) -> QRectF:
+        if self._master is not None:
+            return self._master.boundingRect
+        return self.childrenBoundingRect()
 
     def boundingRect(self) -> QRectF:
-        return self.childrenBoundingRect().adjusted(-2, -2, 2, 2)
+        return self._contentRect().adjusted(-2, -2, 2, 2)
 
     def paint(self, painter, option, widget) -> None:
         lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(
@@ -648,7 +933,7 @@ class layoutInstance(layoutShape):
                     child.setVisible(False)
                 self._childrenHidden = True
 
-            rect = self.childrenBoundingRect()
+            rect = self._contentRect()
             painter.setPen(QPen(QColor(150, 150, 150), 0))
             painter.setBrush(QColor(100, 100, 100, 60))
             painter.drawRect(rect)
@@ -665,9 +950,13 @@ class layoutInstance(layoutShape):
                 self._childrenHidden = False
 
             painter.setRenderHint(QPainter.NonCosmeticBrushPatterns)
+            if self._master is not None:
+                self._master.paint(painter, option, widget,
+                                   self._viewScale(painter))
             if option.state & QStyle.State_Selected:
                 painter.setPen(self._selectedPen)
-                rect = self.childrenBoundingRect()
+                painter.setBrush(Qt.NoBrush)
+                rect = self._contentRect()
                 painter.drawRect(rect)
 
     def sceneEvent(self, event):
@@ -721,6 +1010,8 @@ class layoutInstance(layoutShape):
 
     @property
     def shapes(self):
+        if self._master is not None:
+            return self._master.shapes
         return self._shapes
 
     @shapes.setter
@@ -729,10 +1020,14 @@ class layoutInstance(layoutShape):
         self._shapes = value
         self.setShapes()
 
+    @property
+    def master(self) -> layoutMasterCell:
+        return self._master
+
     @property
     def start(self):
         if self._start is None:
-            self._start = self.childrenBoundingRect().bottomLeft()
+            self._start = self._contentRect().bottomLeft()
         return self._start.toPoint()
 
     @property
@@ -756,6 +1051,21 @@ class layoutPcell(layoutInstance):
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self._libraryName}, {self._cellName}, {self._viewName}, {self._instanceName})"
 
+    def pcellParams(self) -> dict:
+        """Current values of the arguments of the pcell constructor."""
+        initArgs = inspect.signature(self.__class__.__init__).parameters
+        return {arg: getattr(self, arg) for arg in initArgs
+                if arg != "self" and hasattr(self, arg)}
+
+    def clone(self) -> "layoutPcell":
+        """
+        Copy of the pcell with the same parameters. The generated shapes are
+        cloned instead of being generated again.
+        """
+        pcell = self.__class__(**self.pcellParams())
+        pcell.shapes = [shape.clone() for shape in self._shapes]
+        return self._copyInstanceState(pcell)
+
 
 class layoutLine(layoutShape):
     def __init__(
@@ -790,6 +1100,10 @@ class layoutLine(layoutShape):
     def __repr__(self) -> str:
         return f"layoutLine({self._draftLine}, {self._width}, {self._mode})"
 
+    def clone(self) -> "layoutLine":
+        return layoutLine(QLineF(self._draftLine), self._width,
+                          self._mode)._copyPlacement(self)
+
     def _determineAngle(self, angle: float):
         match self._mode:
             case 0:  # manhattan
@@ -934,6 +1248,12 @@ class layoutPath(layoutShape):
             f"{self._width}, {self._startExtend}, {self._endExtend}, {self._mode})"
         )
 
+    def clone(self) -> "layoutPath":
+        path = layoutPath(QLineF(self._draftLine), self._layer, self._width,
+                          self._startExtend, self._endExtend, self._mode)
+        path._name = self._name
+        return path._copyPlacement(self)
+
     def _rectCorners(self, angle: float):
         match self._mode:
             case 0:  # manhattan
@@ -1117,6 +1437,7 @@ class layoutPath(layoutShape):
     def layer(self, layer: ddef.layLayer):
         self.prepareGeometryChange()
         self._layer = layer
+        self._layerChanged()
 
     @property
     def sceneEndPoints(self):
@@ -1202,6 +1523,11 @@ class layoutRuler(layoutShape):
             f"{self._tickLength}, {self._tickFont}, {self._mode})"
         )
 
+    def clone(self) -> "layoutRuler":
+        return layoutRuler(QLineF(self._draftLine), self._width, self._tickGap,
+                           self._tickLength, self._tickFont, self._mode
+                           )._copyPlacement(self)
+
     def _determineAngle(self, angle: float):
         match self._mode:
             case 0:  # manhattan
@@ -1260,9 +1586,37 @@ class layoutRuler(layoutShape):
         return aF + ab * t
 
     @staticmethod
-    def _extractItemEdges(item) -> List[Tuple[QPointF, QPointF]]:
+    def _extractItemEdges(
+            item, parentTransform: Optional[QTransform] = None,
+            region: Optional[QRectF] = None,
+    ) -> List[Tuple[QPointF, QPointF]]:
+        """
+        Return the scene-space edges of an item. parentTransform maps the
+        coordinates of master cell prototypes, which are not in a scene, to the
+        scene. With a scene region, via arrays only return the cuts near it.
+        """
         edges = []
         transform = item.sceneTransform()
+        if parentTransform is not None:
+            transform = transform * parentTransform
+        if isinstance(item, layoutInstance) and item.master is not None:
+            for shape in item.master.shapes:
+                edges.extend(layoutRuler._extractItemEdges(shape, transform, region))
+            return edges
+        if isinstance(item, layoutViaArray):
+            localRegion = None
+            if region is not None:
+                localRegion = transform.inverted()[0].mapRect(region)
+            for cutRect in item.cutRects(localRegion):
+                corners = transform.map(QPolygonF(cutRect))
+                pts = [QPointF(corners.at(index)) for index in range(4)]
+                edges.extend(zip(pts, pts[1:] + pts[:1]))
+            return edges
+        if parentTransform is not None and isinstance(item, layoutInstance):
+            # Children of a prototype already carry its transform.
+            for child in item.childItems():
+                edges.extend(layoutRuler._extractItemEdges(child, parentTransform))
+            return edges
         if hasattr(item, "rect") and isinstance(item.rect, (QRectF, QRect)):
             r = QRectF(item.rect)
             poly = transform.map(r)
@@ -1281,6 +1635,8 @@ class layoutRuler(layoutShape):
                     edges.append((pts[i], pts[(i + 1) % n]))
         elif hasattr(item, "sceneEndPoints") and len(item.sceneEndPoints) == 2:
             p1, p2 = QPointF(item.sceneEndPoints[0]), QPointF(item.sceneEndPoints[1])
+            if parentTransform is not None:
+                p1, p2 = parentTransform.map(p1), parentTransform.map(p2)
             edges.append((p1, p2))
         else:
             br = item.boundingRect()
@@ -1294,11 +1650,59 @@ class layoutRuler(layoutShape):
                     edges.append((pts[i], pts[(i + 1) % n]))
         return edges
 
+    @staticmethod
+    def indexItemEdges(index: eidx.edgeIndex, item, withChildren: bool = False) -> None:
+        """
+        Add the scene-space edges of an item to an edge index. Instances of a
+        master cell and via arrays are resolved when a query reaches them, the
+        first through the edge index of the master. withChildren adds the
+        children of instances owning their shapes, which are not scene items
+        of their own inside master cells.
+        """
+        if isinstance(item, layoutRuler):
+            return
+        if isinstance(item, layoutInstance) and item.master is not None:
+            master = item.master
+
+            def resolveInstance(region, layerFilter):
+                transform = item.sceneTransform()
+                localRegion = transform.inverted()[0].mapRect(
+                    QRectF(QPointF(region[0], region[1]), QPointF(region[2], region[3])))
+                edges = master.edgeIndex.edges(
+                    (localRegion.left(), localRegion.top(), localRegion.right(),
+                     localRegion.bottom()), layerFilter)
+                return eidx.mapEdges(edges, transform)
+
+            rect = item.mapRectToScene(master.boundingRect)
+            index.insert(item, None, bbox=(rect.left(), rect.top(), rect.right(),
+                                           rect.bottom()), resolve=resolveInstance)
+            return
+        if isinstance(item, layoutViaArray):
+
+            def resolveViaArray(region, layerFilter):
+                return eidx.edgeArray(layoutRuler._extractItemEdges(
+                    item, region=QRectF(QPointF(region[0], region[1]),
+                                        QPointF(region[2], region[3]))))
+
+            rect = item.sceneBoundingRect()
+            index.insert(item, item.layer, bbox=(rect.left(), rect.top(), rect.right(),
+                                                 rect.bottom()), resolve=resolveViaArray)
+            return
+        if withChildren and isinstance(item, layoutInstance):
+            for child in item.childItems():
+                layoutRuler.indexItemEdges(index, child, True)
+            return
+        index.insert(item, getattr(item, "layer", None),
+                     eidx.edgeArray(layoutRuler._extractItemEdges(item)))
+
     def snapPointToClosestEdge(self, point, maxDistance: float = 50.0) -> QPointF:
         pointF = QPointF(point)
         scene = self.scene()
         if scene is None:
             return pointF
+        registry = getattr(scene, "layerRegistry", None)
+        if registry is not None:
+            return registry.closestEdgePoint(pointF, maxDistance)
         searchRect = QRectF(
             pointF.x() - maxDistance,
             pointF.y() - maxDistance,
@@ -1311,7 +1715,7 @@ class layoutRuler(layoutShape):
         for item in items:
             if item is self or isinstance(item, layoutRuler):
                 continue
-            edges = self._extractItemEdges(item)
+            edges = self._extractItemEdges(item, region=searchRect)
             for p1, p2 in edges:
                 ptOnEdge = self._closestPointOnSegment(pointF, p1, p2)
                 dist = QLineF(pointF, ptOnEdge).length()
@@ -1589,6 +1993,11 @@ class layoutLabel(layoutShape):
             f"{self._labelOrient}, {self._layer})"
         )
 
+    def clone(self) -> "layoutLabel":
+        return layoutLabel(self._start, self._labelText, self._fontFamily,
+                           self._fontStyle, self._fontHeight, self._labelAlign,
+                           self._labelOrient, self._layer)._copyPlacement(self)
+
     def setOrient(self):
         self.setTransformOriginPoint(self.mapFromScene(self._start))
         if self._labelOrient == layoutLabel.LABEL_ORIENTS[0]:
@@ -1761,6 +2170,11 @@ class layoutPin(layoutShape):
             f"{self._pinType}, {self._layer})"
         )
 
+    def clone(self) -> "layoutPin":
+        return layoutPin(self._rect.topLeft(), self._rect.bottomRight(),
+                         self._pinName, self._pinDir, self._pinType,
+                         self._layer)._copyPlacement(self)
+
     def paint(self, painter, option, widget) -> None:
         # Get scale once and cache it
         scale = self.scene().views()[0].transform().m11()
@@ -1930,6 +2344,10 @@ class layoutVia(layoutShape):
     def __repr__(self) -> str:
         return f"layoutVia({self._start}, {self._end}, {self._layer})"
 
+    def clone(self) -> "layoutVia":
+        return layoutVia(self._start, self._viaDefTuple, self._width,
+                         self._height)._copyPlacement(self)
+
     def paint(self, painter, option, widget) -> None:
         scale = self.scene().views()[0].transform().m11()
         if self.isSelected():
@@ -2005,6 +2423,12 @@ class layoutVia(layoutShape):
 
 
 class layoutViaArray(layoutShape):
+    """
+    A rectangular array of via cuts. Only the prototype via and the array
+    parameters are kept; the cuts are computed when they are painted or
+    exported, so an array is a single scene item whatever its size.
+    """
+
     def __init__(
             self,
             start: QPoint,
@@ -2027,11 +2451,15 @@ class layoutViaArray(layoutShape):
             self._prototype_via.width,
             self._prototype_via.height,
         )
-        self._via_array = []
-        self._create_array()
-        self.setFiltersChildEvents(True)
-        self.setHandlesChildEvents(True)
-        self.setFlag(QGraphicsItem.ItemContainsChildrenInShape, True)
+        self._layer = self._via.layer
+        self._definePensBrushes(self._layer)
+        self.setZValue(self._layer.z)
+        self._arrayRect = QRectF(
+            self._start.x(),
+            self._start.y(),
+            self._xnum * self.xStep - self._xs,
+            self._ynum * self.yStep - self._ys,
+        )
         self._selectedPen = QPen(QColor("yellow"), 4, Qt.DashLine)
         self._selectedPen.setCosmetic(True)
 
@@ -2040,56 +2468,81 @@ class layoutViaArray(layoutShape):
                 f"{self._ynum}, {self._xs}, "
                 f"{self._ys}, {self._start}, {self._via})")
 
-    def _create_array(self):
-        # Pre-calculate constants
-        x_step = self._xs + self._prototype_via.width
-        y_step = self._ys + self._prototype_via.height
-        start_x, start_y = self._start.x(), self._start.y()
-        via_def = self._prototype_via.viaDefTuple
-        via_width = self._prototype_via.width
-        via_height = self._prototype_via.height
-
-        # Create flat list using itertools.product
-        vias = [
-            self._create_via(
-                start_x + col * x_step,
-                start_y + row * y_step,
-                via_def,
-                via_width,
-                via_height,
-            )
-            for row, col in itertools.product(range(self._ynum), range(self._xnum))
-        ]
+    def clone(self) -> "layoutViaArray":
+        return layoutViaArray(self._start, self._prototype_via, self._xs, self._ys,
+                              self._xnum, self._ynum)._copyPlacement(self)
 
-        # Reshape into 2D array
-        self._via_array = [
-            vias[i: i + self._xnum] for i in range(0, len(vias), self._xnum)
+    @staticmethod
+    def _cutRange(origin: float, step: float, size: float, count: int,
+                  low: float, high: float) -> range:
+        """Indices of the cuts along one axis that overlap [low, high]."""
+        if step <= 0:
+            return range(count)
+        first = max(0, math.ceil((low - origin - size) / step))
+        last = min(count - 1, math.floor((high - origin) / step))
+        return range(first, last + 1)
+
+    def cutRects(self, region: Optional[QRectF] = None) -> List[QRectF]:
+        """
+        Return the via cut rectangles in item coordinates, only those
+        overlapping region if it is given.
+        """
+        width, height = self._via.width, self._via.height
+        startX, startY = self._start.x(), self._start.y()
+        xStep, yStep = self.xStep, self.yStep
+        if region is None:
+            columns, rows = range(self._xnum), range(self._ynum)
+        else:
+            columns = self._cutRange(startX, xStep, width, self._xnum,
+                                     region.left(), region.right())
+            rows = self._cutRange(startY, yStep, height, self._ynum,
+                                  region.top(), region.bottom())
+        return [
+            QRectF(startX + column * xStep, startY + row * yStep, width, height)
+            for row, column in itertools.product(rows, columns)
         ]
 
-    def _create_via(self, x, y, via_def, width, height):
-        via = layoutVia(QPoint(x, y), via_def, width, height)
-        via.setFlag(QGraphicsItem.ItemIsSelectable, False)
-        via.setFlag(QGraphicsItem.ItemStacksBehindParent, True)
-        via.setParentItem(self)
-        return via
-
     def boundingRect(self) -> QRectF:
-        return self.childrenBoundingRect()
+        return self._arrayRect.adjusted(-2, -2, 2, 2)
 
     def shape(self) -> QPainterPath:
         path = QPainterPath()
-        path.addRect(self.childrenBoundingRect())
+        path.addRect(self.boundingRect())
         return path
 
     def paint(self, painter, option, widget) -> None:
         painter.setRenderHint(QPainter.NonCosmeticBrushPatterns)
+        self._updateTransformedBrush(self._brush, self._viewScale(painter))
+        painter.setPen(self._pen)
+        painter.setBrush(self._transformedBrush)
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(
+            painter.worldTransform()
+        )
+        if min(self._via.width, self._via.height) * lod < 2:
+            # Cuts smaller than two pixels would only blur into the array outline.
+            painter.drawRect(self._arrayRect)
+        else:
+            # Only the cuts inside both the exposed rect and the paint device.
+            deviceRect = painter.worldTransform().inverted()[0].mapRect(
+                QRectF(painter.device().rect()))
+            rects = self.cutRects(option.exposedRect.intersected(deviceRect))
+            painter.drawRects(rects)
+            painter.drawLines(
+                [QLineF(rect.bottomLeft(), rect.topRight()) for rect in rects]
+                + [QLineF(rect.topLeft(), rect.bottomRight()) for rect in rects]
+            )
         if option.state & QStyle.State_Selected:
             painter.setPen(self._selectedPen)
-            painter.drawRect(self.childrenBoundingRect())
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(self.boundingRect())
+
+    @property
+    def xStep(self) -> float:
+        return self._xs + self._via.width
 
     @property
-    def via_array(self):
-        return self._via_array
+    def yStep(self) -> float:
+        return self._ys + self._via.height
 
     @property
     def ynum(self):
@@ -2142,6 +2595,9 @@ class layoutPolygon(layoutShape):
     def __repr__(self) -> str:
         return f"layoutPolygon({self._points}, {self._layer})"
 
+    def clone(self) -> "layoutPolygon":
+        return layoutPolygon(list(self._points), self._layer)._copyPlacement(self)
+
     def paint(self, painter, option, widget) -> None:
         # Cache frequently accessed values
         selected = self.isSelected()
@@ -2178,6 +2634,7 @@ class layoutPolygon(layoutShape):
     def layer(self, layer: ddef.layLayer):
         self.prepareGeometryChange()
         self._layer = layer
+        self._layerChanged()
 
     @property
     def points(self) -> list:
@@ -2272,6 +2729,10 @@ class alignLine(layoutShape):
     def __repr__(self) -> str:
         return f"alignLine({self._draftLine}, {self._width}, {self._mode})"
 
+    def clone(self) -> "alignLine":
+        return alignLine(QLineF(self._draftLine), self._width,
+                         self._mode)._copyPlacement(self)
+
     def _determineAngle(self, angle: float):
         match self._mode:
             case 0:  # horizontal
@@ -100,6 +100,16 @@ class schematicNet(QGraphicsItem):
         nameItem.setParentItem(self)
         return nameItem
 
+    def clone(self) -> "schematicNet":
+        """Copy of the net between the same scene points, keeping its name."""
+        netItem = schematicNet(self.mapToScene(self._draftLine.p1()).toPoint(),
+                               self.mapToScene(self._draftLine.p2()).toPoint(),
+                               self._width, self._mode)
+        netItem._nameItem.name = self._nameItem.name
+        netItem._nameItem.nameStrength = self._nameItem.nameStrength
+        netItem._nameItem.setPos(netItem._draftLine.center())
+        return netItem
+
     @property
     def draftLine(self) -> QLineF:
         return self._draftLine
@@ -144,6 +154,10 @@ class schematicNet(QGraphicsItem):
         self.setTransformOriginPoint(origin_point)
         self.setRotation(-self._angle)
 
+        connectivity = getattr(scene, "connectivity", None)
+        if connectivity is not None:
+            connectivity.itemsMoved((self,))
+
     @cached_property
     def _extractRect(self) -> QRectF:
         p1 = self._draftLine.p1()
@@ -263,7 +277,7 @@ class schematicNet(QGraphicsItem):
             # Probe mode: clicking a net adds a probe for that net name
             if (hasattr(scene, 'probeMode') and scene.probeMode
                     and event.button() == Qt.MouseButton.LeftButton):
-                scene.nameSceneNets()
+                scene.updateNetNames()
                 scene.addProbe(self.name)
                 event.accept()
                 return
@@ -271,7 +285,7 @@ class schematicNet(QGraphicsItem):
             if (hasattr(scene, 'removeProbeMode_') and scene.removeProbeMode_
                     and event.button() == Qt.MouseButton.LeftButton):
                 if self._probed:
-                    scene.nameSceneNets()
+                    scene.updateNetNames()
                     # Find which probe this net belongs to
                     for probeName, netSet in scene._probedNets.items():
                         if self in netSet:
@@ -467,11 +481,8 @@ class schematicNet(QGraphicsItem):
         # Check if highlightNets flag is set in the scene
         if scene.highlightNets:
             self._highlighted = True
-            scene.nameSceneNets()  # first name all the nets in the scene.
-            sceneNetsSet = scene.findSceneNetsSet()
-            self._connectedNetsSet = {
-                net for net in sceneNetsSet if self._namesMatch(net.name, self.name)
-            }
+            scene.updateNetNames()  # first bring the net names up to date.
+            self._connectedNetsSet = set(scene.connectivity.netsNamed(self.name))
 
             # Highlight the connected netItems
             for netItem in self._connectedNetsSet:
@@ -529,8 +540,7 @@ class schematicNet(QGraphicsItem):
         """
 
         def resolve_name(weakNet: "schematicNet", strongNet: "schematicNet"):
-            weakNet.name = strongNet.name
-            weakNet.nameStrength = netNameStrengthEnum.INHERIT
+            weakNet._setName(strongNet.name, netNameStrengthEnum.INHERIT)
 
         self_strength = self.nameStrength.value
         other_strength = otherNet.nameStrength.value
@@ -561,8 +571,7 @@ class schematicNet(QGraphicsItem):
         if self_strength == 1:  # WEAK
             match other_strength:
                 case 0:  # NONAME
-                    otherNet.nameStrength = netNameStrengthEnum.WEAK
-                    otherNet.name = self.name
+                    otherNet._setName(self.name, netNameStrengthEnum.WEAK)
                     return True
                 case 1:  # WEAK
                     if self.name != otherNet.name:
@@ -599,8 +608,7 @@ class schematicNet(QGraphicsItem):
         - If self already has higher strength, self keeps its name, returns True.
         """
         if otherNet.nameStrength > self.nameStrength:
-            self.name = otherNet.name
-            self.nameStrength = netNameStrengthEnum.INHERIT
+            self._setName(otherNet.name, netNameStrengthEnum.INHERIT)
             return True
         elif otherNet.nameStrength == self.nameStrength:
             if otherNet.name != self.name:
@@ -616,12 +624,10 @@ class schematicNet(QGraphicsItem):
         Clear the net name and set its strength to NONAME.
         """
         if self.nameStrength.value < 3:
-            self.name = ""
-            self.nameStrength = netNameStrengthEnum.NONAME
+            self._setName("", netNameStrengthEnum.NONAME)
 
     def inherit(self, otherNet):
-        self.name = otherNet.name
-        self.nameStrength = otherNet.nameStrength
+        self._setName(otherNet.name, otherNet.nameStrength)
 
     @property
     def name(self) -> str:
@@ -636,10 +642,7 @@ class schematicNet(QGraphicsItem):
     @name.setter
     def name(self, name: str):
         if name:
-            self.prepareGeometryChange()
-            self._nameItem.name = name
-            self._nameItem.nameStrength = netNameStrengthEnum.SET
-            self._nameItem.setPos(self._draftLine.center())
+            self._setName(name, netNameStrengthEnum.SET)
 
     @property
     def nameStrength(self) -> int:
@@ -650,7 +653,32 @@ class schematicNet(QGraphicsItem):
 
     @nameStrength.setter
     def nameStrength(self, value: netNameStrengthEnum):
-        self._nameItem.nameStrength = value
+        self._setName("", value)
+
+    def _setName(self, name: str, strength: netNameStrengthEnum):
+        """
+        Set the name, or keep it if name is empty, together with its strength.
+        The saved record is reported out of date only if the resulting pair
+        differs from the previous one.
+        """
+        name = name or self._nameItem.name
+        if (name, strength) == (self._nameItem.name, self._nameItem.nameStrength):
+            return
+        if name != self._nameItem.name:
+            self.prepareGeometryChange()
+            self._nameItem.name = name
+            self._nameItem.setPos(self._draftLine.center())
+            connectivity = getattr(self.scene(), "connectivity", None)
+            if connectivity is not None:
+                connectivity.namesChanged()
+        self._nameItem.nameStrength = strength
+        self._reportChanged()
+
+    def _reportChanged(self):
+        """Tell the scene the saved record of the net is out of date."""
+        savedRecords = getattr(self.scene(), "savedRecords", None)
+        if savedRecords is not None:
+            savedRecords.itemsChanged((self,))
 
     @property
     def nameConflict(self) -> bool:
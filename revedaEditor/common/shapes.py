@@ -211,6 +211,28 @@ class symbolShape(QGraphicsItem):
         self.setTransform(transform)
         self._flipTuple = (transform.m11(), transform.m22())
 
+    def clone(self) -> "symbolShape":
+        """
+        Copy of the shape with the same geometry and placement.
+        Must be implemented in subclasses.
+        """
+        raise NotImplementedError("Subclasses must implement clone")
+
+    def _copyPlacement(self, source: "symbolShape") -> "symbolShape":
+        """Place the shape like source without going through the setters."""
+        # Each setter notifies itemChange; skip the ones left at their default.
+        if not source.pos().isNull():
+            self.setPos(source.pos())
+        if source.transformOriginPoint() != self.transformOriginPoint():
+            self.setTransformOriginPoint(source.transformOriginPoint())
+        if not source.transform().isIdentity():
+            self.setTransform(source.transform())
+        if source.rotation() != self.rotation():
+            self.setRotation(source.rotation())
+        self._angle = source._angle
+        self._flipTuple = source._flipTuple
+        return self
+
 
 class symbolRectangle(symbolShape):
     """
@@ -258,6 +280,10 @@ class symbolRectangle(symbolShape):
     def __repr__(self) -> str:
         return f"symbolRectangle({self._start},{self._end})"
 
+    def clone(self) -> "symbolRectangle":
+        return symbolRectangle(self._rect.topLeft(),
+                               self._rect.bottomRight())._copyPlacement(self)
+
     @property
     def rect(self):
         return self._rect
@@ -463,6 +489,10 @@ class symbolCircle(symbolShape):
     def __repr__(self) -> str:
         return f"symbolCircle({self._centre},{self._end})"
 
+    def clone(self) -> "symbolCircle":
+        return symbolCircle(self._centre, self._centre + QPoint(self._radius, 0)
+                            )._copyPlacement(self)
+
     @property
     def radius(self):
         return self._radius
@@ -705,6 +735,11 @@ class symbolArc(symbolShape):
     def __repr__(self) -> str:
         return f"symbolArc({self._start},{self._end})"
 
+    def clone(self) -> "symbolArc":
+        arc = symbolArc(self._start, self._end)
+        arc._arcType = self._arcType
+        return arc._copyPlacement(self)
+
     @property
     def start(self) -> QPoint:
         return self._start
@@ -875,6 +910,9 @@ class symbolLine(symbolShape):
     def __repr__(self) -> str:
         return f"symbolLine({self._start}, {self._end})"
 
+    def clone(self) -> "symbolLine":
+        return symbolLine(self._start, self._end)._copyPlacement(self)
+
     def _updateGeometry(self):
         self._line = QLine(self._start, self._end)
         self._rect = QRect(self._start, self._end).normalized()
@@ -1010,6 +1048,9 @@ class symbolPolygon(symbolShape):
     def __repr__(self) -> str:
         return f"symbolPolygon({self._points})"
 
+    def clone(self) -> "symbolPolygon":
+        return symbolPolygon(list(self._points))._copyPlacement(self)
+
     def paint(self, painter, option, widget) -> None:
         is_selected = self.isSelected()
         if is_selected:
@@ -1168,6 +1209,11 @@ class symbolPin(symbolShape):
     def __repr__(self) -> str:
         return f"pin({self._start},{self._pinName}, {self._pinDir}, {self._pinType})"
 
+    def clone(self) -> "symbolPin":
+        pin = symbolPin(self._start, self._pinName, self._pinDir, self._pinType)
+        pin._pinNameItem.setTransform(self._pinNameItem.transform())
+        return pin._copyPlacement(self)
+
     # def mouseReleaseEvent(self, event: QGraphicsSceneMouseEvent) -> None:
     #     super().mouseReleaseEvent(event)
 
@@ -1330,6 +1376,11 @@ class text(symbolShape):
             f" {self._textFont.style()}, {self._textHeight}, {self._textAlign},"
             f"{self._textOrient})")
 
+    def clone(self) -> "text":
+        return text(self._start, self._textContent, self.fontFamily, self.fontStyle,
+                    self._textHeight, self._textAlign, self._textOrient
+                    )._copyPlacement(self)
+
     def sceneEvent(self, event) -> bool:
         if self.scene() and hasattr(self.scene(), 'selectModes'):
             if hasattr(self.scene().selectModes, 'selectText'):
@@ -1551,6 +1602,31 @@ class schematicSymbol(symbolShape):
     def __repr__(self) -> str:
         return f"schematicSymbol({self._instanceName})"
 
+    def clone(self) -> "schematicSymbol":
+        """
+        Copy of the instance built from its own shapes, sharing the symbol
+        attributes. The symbol file is not read again and the labels keep their
+        values; callers renaming the copy call relabelInstance.
+        """
+        symbol = schematicSymbol([shape.clone() for shape in self._shapes],
+                                 self._symattrs)
+        symbol._libraryName = self._libraryName
+        symbol._cellName = self._cellName
+        symbol._viewName = self._viewName
+        symbol._instanceName = self._instanceName
+        symbol._counter = self._counter
+        symbol._netlistIgnore = self._netlistIgnore
+        symbol._instProps = dict(self._instProps)
+        if self._draft:
+            symbol.draft = True
+        return symbol._copyPlacement(self)
+
+    def relabelInstance(self):
+        """Evaluate again the labels showing the instance name or number."""
+        for label in self._labels.values():
+            if label.labelDefinition in symbolLabel.instanceLabels:
+                label.labelDefs()
+
     def shape(self) -> QPainterPath:
         if self._cachedShape is not None:
             return self._cachedShape
@@ -2045,6 +2121,11 @@ class schematicPin(symbolShape):
         return (f"schematicPin({self._start}, {self._pinName}, {self._pinDir}, "
                 f"{self._pinType})")
 
+    def clone(self) -> "schematicPin":
+        pin = schematicPin(self._start, self._pinName, self._pinDir, self._pinType)
+        pin._pinItem.setTransform(self._pinItem.transform())
+        return pin._copyPlacement(self)
+
     def sceneEvent(self, event) -> bool:
         scene = self.scene()
         if scene is None:
@@ -2380,6 +2461,10 @@ class alignLine(symbolShape):
             f"alignLine({self._draftLine}, {self._width}, {self._mode})"
         )
 
+    def clone(self) -> "alignLine":
+        return alignLine(QLineF(self._draftLine), self._width,
+                         self._mode)._copyPlacement(self)
+
     def _determineAngle(self, angle: float):
         match self._mode:
             case 0:  # horizontal
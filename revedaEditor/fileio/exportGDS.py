@@ -12,32 +12,66 @@
 import inspect
 import logging
 import math
+import threading
 from pathlib import Path
-from typing import List, Any, Tuple
+from typing import List, Any, Optional
 
 import gdstk
+import orjson
+from PySide6.QtCore import QObject, QPoint, QPointF, QRunnable, Signal, Slot
 
 import revedaEditor.common.layoutShapes as lshp
+from revedaEditor.common.fileCache import designCache, fileStamp
+import revedaEditor.fileio.layoutBinary as lbin
 from revedaEditor.backend.pdkLoader import importPDKModule
+from revedaEditor.backend.startThread import workerSignals
 
 logger = logging.getLogger("reveda")
 pcells = importPDKModule('pcells')
+laylyr = importPDKModule('layoutLayers')
+fabproc = importPDKModule('process')
+
+# Progress is reported once per this many resolved or written cells.
+PROGRESS_STEP = 500
 
 # Module-level cache: maps a pcell class -> list of __init__ param names to extract.
 # Avoids repeated inspect.signature() calls for identical pcell types.
 _pcell_param_cache: dict = {}
 
+# (font family, style, height, text, alignment, orientation) -> centre of the
+# label text box relative to the label start. Only made on the GUI thread.
+_labelOffsets: dict = {}
+
+# GDS cells built from a layout file take about this many times its size.
+GDS_SIZE_FACTOR = 2
+# Estimated bytes of a GDS cell generated for a pcell.
+PCELL_CELL_SIZE = 64 * 1024
+
+
+def _sourcesCurrent(sources: dict) -> bool:
+    return all(fileStamp(path) == stamp for path, stamp in sources.items())
+
 
 class gdsExporter:
     __slots__ = ('_cellname', '_items', '_outputFileObj', '_libraryName',
-                 '_unit', '_precision', '_dbu', '_topCell', '_itemCounter',
-                 '_cellCache', '_instanceCache')
+                 '_unit', '_precision', '_dbu', '_topCell', '_cellCache',
+                 '_libraryDict', '_scratch', '_childKeys', '_diskCells',
+                 '_pcellCells', '_qtParts')
 
     DEFAULT_UNIT = 1e-9
     DEFAULT_PRECISION = 1e-9
     DEFAULT_DBU = 1000
 
-    def __init__(self, cellname: str, items: List[Any], outputFileObj: Path):
+    def __init__(self, cellname: str, items: List[Any], outputFileObj: Path,
+                 libraryDict: Optional[dict] = None):
+        """
+        The items are converted directly to the GDS top cell on the GUI
+        thread. Instances are exported hierarchically: each cell placed,
+        directly or below another cell, is built from its layout.json found
+        through libraryDict and kept in the design cache. Sub-cells are
+        referenced by name, so editing a leaf cell only rebuilds that cell and
+        not the cells placing it.
+        """
         self._unit = gdsExporter.DEFAULT_UNIT
         self._precision = gdsExporter.DEFAULT_PRECISION
         self._dbu: int = gdsExporter.DEFAULT_DBU
@@ -46,193 +80,459 @@ class gdsExporter:
         self._outputFileObj = outputFileObj
         self._libraryName = None
         self._topCell = None
-        self._itemCounter = 0
         self._cellCache = {}
-        self._instanceCache: dict = {}  # (lib, cell, view) -> gdstk.Cell
+        self._libraryDict = libraryDict
+        # via cells of the top cell
+        self._scratch = gdstk.Library()
+        # (lib, cell, view) of the cells placed in the top cell
+        self._childKeys = set()
+        # (lib, cell, view) -> (cell, owned cells, child keys, pcell sources)
+        # of the cells used by this export, None if it cannot be built. The
+        # owned cells are the via and pcell cells the cell references, the
+        # sources the pcell definition files they were generated from.
+        self._diskCells: dict = {}
+        # pcell key -> entry of the same form for the generated pcells
+        self._pcellCells: dict = {}
+        self._qtParts = None
 
-    def _buildLibrary(self) -> gdstk.Library:
-        """Build and populate the gdstk.Library from self._items. Shared by all exporters."""
-        self._outputFileObj.parent.mkdir(parents=True, exist_ok=True)
-        lib = gdstk.Library(unit=self._unit, precision=self._precision)
-        self._topCell = lib.new_cell(self._cellname)
+    def gdsExportThreaded(self, threadPool) -> "gdsExportWorker":
+        worker = self.exportWorker("GDS")
+        threadPool.start(worker)
+        return worker
+
+    def oasExportThreaded(self, threadPool) -> "gdsExportWorker":
+        worker = self.exportWorker("OAS")
+        threadPool.start(worker)
+        return worker
+
+    @property
+    def _settings(self) -> tuple:
+        """Export settings the cached cells were converted with."""
+        return self._unit, self._precision, self._dbu
+
+    def _cellFilePath(self, key: tuple) -> Optional[Path]:
+        if self._libraryDict is None:
+            return None
+        libraryPath = self._libraryDict.get(key[0])
+        if libraryPath is None:
+            return None
+        return Path(libraryPath) / key[1] / f"{key[2]}.json"
+
+    def exportWorker(self, fileFormat: str = "GDS") -> "gdsExportWorker":
+        """
+        Convert the items to the top cell and return a worker that reads the
+        placed cells and writes the file. Call on the GUI thread.
+        """
+        self._qtParts = qtPartsMaker(self)
+        self.snapshotCell()
+        return gdsExportWorker(self, fileFormat)
+
+    # GUI thread: the scene items and everything that needs Qt.
+
+    def snapshotCell(self) -> gdstk.Cell:
+        """
+        Convert the items straight to the GDS top cell. This is the only step
+        that reads the scene items, so it runs on the GUI thread; the cell is
+        plain gdstk data the worker can take over.
+        """
+        self._topCell = gdstk.Cell(self._cellname)
         for item in self._items:
-            self.createCells(lib, item, self._topCell)
-        return lib
-
-    def gdsExport(self):
-        lib = self._buildLibrary()
-        lib.write_gds(self._outputFileObj)
-
-    def gdsExportThreaded(self, threadPool):
-        lib = self._buildLibrary()
-        from revedaEditor.backend.startThread import startThread
-        writer = startThread(lib.write_gds, str(self._outputFileObj))
-        threadPool.start(writer)
-
-    def oasExportThreaded(self, threadPool):
-        lib = self._buildLibrary()
-        from revedaEditor.backend.startThread import startThread
-        writer = startThread(lib.write_oas, str(self._outputFileObj))
-        threadPool.start(writer)
-
-    def createCells(self, library: gdstk.Library, item: lshp.layoutShape,
-                    parentCell: gdstk.Cell, offset: Tuple[float, float] = (0.0, 0.0)):
-        item_type = type(item)
-        if item_type == lshp.layoutInstance:
-            self._processInstance(library, item, parentCell)
-        elif item_type in (lshp.layoutRect, lshp.layoutPin):
-            self._processRectPin(item, parentCell, offset)
-        elif item_type == lshp.layoutPath:
-            self.processPath(item, parentCell, offset)
-        elif item_type == lshp.layoutLabel:
-            self._processLabel(item, parentCell, offset)
-        elif item_type == lshp.layoutPolygon:
-            self._processPolygon(item, parentCell, offset)
-        elif item_type == lshp.layoutViaArray:
-            self._processViaArray(library, item, parentCell, offset)
-        else:
-            self._process_custom_layout(library, item, parentCell)
-
-    def _processInstance(self, library, item, parentCell):
-        cache_key = (item.libraryName, item.cellName, item.viewName)
-        if cache_key not in self._instanceCache:
-            # Name the GDS cell libraryName_cellName_viewName; the LVS script maps
-            # this back to the schematic subcircuit name via substring matching.
-            cellGDSName = f"{item.libraryName}_{item.cellName}_{item.viewName}"
-            cellGDS = library.new_cell(cellGDSName)
-            # Child shapes are in sub-cell local coordinates — no offset needed.
-            for shape in item.shapes:
-                self.createCells(library, shape, cellGDS)
-            self._instanceCache[cache_key] = cellGDS
-        else:
-            cellGDS = self._instanceCache[cache_key]
+            self._itemToCell(self._scratch, item, item.sceneTransform(),
+                             self._topCell, self._childKeys)
+        return self._topCell
 
-        # Qt rotation is clockwise-positive; GDS is counter-clockwise-positive.
-        angle_rad = math.radians(-item.angle)
-        # flipTuple = (sx, sy); x_reflection in GDS means flip around X axis (negate Y).
-        x_reflection = (item.flipTuple[1] == -1)
-        pos = item.pos()
-        ref = gdstk.Reference(
-            cellGDS,
-            origin=(pos.x(), pos.y()),
-            rotation=angle_rad,
-            x_reflection=x_reflection,
-        )
-        parentCell.add(ref)
-
-    def _processRectPin(self, item, parentCell, offset: Tuple[float, float] = (0.0, 0.0)):
-        ox, oy = offset
-        rect = gdstk.rectangle(
-            corner1=(item.start.x() - ox, item.start.y() - oy),
-            corner2=(item.end.x() - ox, item.end.y() - oy),
-            layer=item.layer.gdsLayer,
-            datatype=item.layer.datatype,
-        )
-        parentCell.add(rect)
-
-    def processPath(self, item, parentCell, offset: Tuple[float, float] = (0.0, 0.0)):
-        ox, oy = offset
-        # draftLine is stored in item-local coordinates where the line is always
-        # horizontal (angle reset to 0); the actual direction is carried by the
-        # item's Qt rotation transform.  mapToParent() applies that rotation to
-        # recover the true endpoints in the parent coordinate system.
-        p1 = item.mapToParent(item.draftLine.p1())
-        p2 = item.mapToParent(item.draftLine.p2())
-        path = gdstk.FlexPath(
-            points=[(p1.x() - ox, p1.y() - oy), (p2.x() - ox, p2.y() - oy)],
-            width=item.width,
-            ends=(item.startExtend, item.endExtend),
+    def _itemToCell(self, scratch: gdstk.Library, item, transform, cellGDS: gdstk.Cell,
+                    childKeys: set):
+        """Add a layout item, mapped by transform, to cellGDS."""
+        if isinstance(item, lshp.layoutPcell):
+            entry = self.pcellEntry(self._pcellKey(
+                item.libraryName, item.cellName, item.viewName, item.pcellParams()), item)
+            if entry is not None:
+                self._addReference(cellGDS, entry[0], item.pos().toTuple(), item.angle,
+                                   item.flipTuple)
+        elif isinstance(item, lshp.layoutInstance):
+            childKey = (item.libraryName, item.cellName, item.viewName)
+            childKeys.add(childKey)
+            self._addReference(cellGDS, self._cellName(childKey), item.pos().toTuple(),
+                               item.angle, item.flipTuple)
+        elif isinstance(item, (lshp.layoutRect, lshp.layoutPin)):
+            self._addRect(cellGDS, item.layer,
+                          transform.map(QPointF(item.rect.topLeft())).toTuple(),
+                          transform.map(QPointF(item.rect.bottomRight())).toTuple())
+        elif isinstance(item, lshp.layoutPath):
+            self._addPath(cellGDS, item.layer,
+                          transform.map(QPointF(item.draftLine.p1())).toTuple(),
+                          transform.map(QPointF(item.draftLine.p2())).toTuple(),
+                          item.width, item.startExtend, item.endExtend)
+        elif isinstance(item, lshp.layoutPolygon):
+            self._addPolygon(cellGDS, item.layer,
+                             [transform.map(QPointF(point)).toTuple()
+                              for point in item.points])
+        elif isinstance(item, lshp.layoutLabel):
+            self._addLabel(cellGDS, item.layer, item.labelText,
+                           transform.map(QPointF(item.start)).toTuple(),
+                           self.labelOffset(item.fontFamily, item.fontStyle,
+                                            item.fontHeight, item.labelText,
+                                            item.labelAlign, item.labelOrient),
+                           item.fontHeight, item.angle)
+        elif isinstance(item, lshp.layoutViaArray):
+            via = item.via
+            self._addViaArray(scratch, cellGDS, via.layer, via.width, via.height,
+                              transform.map(QPointF(item.start)).toTuple(),
+                              item.xnum, item.ynum, item.xs, item.ys)
+
+    @staticmethod
+    def labelOffset(fontFamily: str, fontStyle: str, fontHeight: str, text: str,
+                    align: str, orient: str) -> tuple:
+        """Centre of a label text box relative to its start, made once."""
+        labelKey = (fontFamily, fontStyle, fontHeight, text, align, orient)
+        offset = _labelOffsets.get(labelKey)
+        if offset is None:
+            label = lshp.layoutLabel(QPoint(0, 0), text, fontFamily, fontStyle,
+                                     fontHeight, align, orient, laylyr.pdkAllLayers[0])
+            offset = label.boundingRect().center().toTuple()
+            _labelOffsets[labelKey] = offset
+        return offset
+
+    def pcellEntry(self, pcellKey: tuple, pcellItem: Optional[lshp.layoutPcell] = None
+                   ) -> Optional[tuple]:
+        """
+        Return the GDS cell entry of a pcell, generating the pcell from its
+        definition unless pcellItem is given. Entries are cached against the
+        definition file and the export settings.
+        """
+        if pcellKey in self._pcellCells:
+            return self._pcellCells[pcellKey]
+        filePath = self._cellFilePath(pcellKey[:3])
+        cacheKey = ("gdsPcell", str(filePath), pcellKey[3], self._settings)
+        entry = designCache().get(cacheKey) if filePath is not None else None
+        if entry is None:
+            stamp = fileStamp(filePath) if filePath is not None else None
+            if pcellItem is None:
+                pcellItem = self._makePcell(pcellKey, filePath)
+            if pcellItem is not None:
+                sources = {str(filePath): stamp} if stamp is not None else {}
+                entry = (*self._buildPcellCell(pcellItem), sources)
+                if stamp is not None:
+                    designCache().put(cacheKey, entry, PCELL_CELL_SIZE, filePath, stamp)
+        self._pcellCells[pcellKey] = entry
+        return entry
+
+    @staticmethod
+    def _makePcell(pcellKey: tuple, filePath: Optional[Path]
+                   ) -> Optional[lshp.layoutPcell]:
+        pcellDef = designCache().getJson(filePath) if filePath is not None else None
+        if not pcellDef:
+            return None
+        pcellClass = pcells.pcells.get(pcellDef[1].get("reference"))
+        if pcellClass is None:
+            return None
+        pcellItem = pcellClass()
+        pcellItem(**orjson.loads(pcellKey[3]))
+        pcellItem.libraryName, pcellItem.cellName, pcellItem.viewName = pcellKey[:3]
+        return pcellItem
+
+    def _buildPcellCell(self, pcellItem: lshp.layoutPcell) -> tuple:
+        pcellNameSuffix = "_".join(
+            f"{key}_{value}".replace(".", "p")
+            for key, value in self.extractPcellInstanceParameters(pcellItem).items())
+        pcellGDS = gdstk.Cell(f"{pcellItem.libraryName}_{type(pcellItem).__name__}_"
+                              f"{pcellNameSuffix}")
+        scratch = gdstk.Library()
+        childKeys = set()
+        cellCache = self._cellCache
+        self._cellCache = {}
+        try:
+            # The shapes are placed in the pcell's own coordinates; the
+            # reference carries its placement.
+            for shape in pcellItem.shapes:
+                self._itemToCell(scratch, shape, shape.itemTransform(pcellItem)[0],
+                                 pcellGDS, childKeys)
+        finally:
+            self._cellCache = cellCache
+        return pcellGDS, list(scratch.cells), childKeys
+
+    def makeQtParts(self, labelRecords: list[dict], pcellKeys: list[tuple]):
+        """Make the label offsets and pcell cells the worker asked for."""
+        for record in labelRecords:
+            self.labelOffset(record["ff"], record["fs"], record["fh"], record["lt"],
+                             record["la"], record["lo"])
+        for pcellKey in pcellKeys:
+            self.pcellEntry(pcellKey)
+
+    @staticmethod
+    def _pcellKey(lib: str, cell: str, view: str, params: dict) -> tuple:
+        return lib, cell, view, orjson.dumps(params, option=orjson.OPT_SORT_KEYS)
+
+    # Worker thread: the placed cells, from their files.
+
+    def _diskCell(self, key: tuple, worker: Optional["gdsExportWorker"]
+                  ) -> Optional[tuple]:
+        """
+        Return the GDS cell entry of a layout cell, from the design cache or
+        built from its file. None if it cannot be built or the worker was
+        cancelled.
+        """
+        if key in self._diskCells:
+            return self._diskCells[key]
+        filePath = self._cellFilePath(key)
+        if filePath is None:
+            return None
+        cacheKey = ("gds", str(filePath), self._settings)
+        entry = designCache().get(cacheKey)
+        if entry is not None and not _sourcesCurrent(entry[3]):
+            # A pcell definition used by the cell has changed.
+            designCache().invalidate(cacheKey)
+            entry = None
+        if entry is None:
+            stamp = fileStamp(filePath)
+            try:
+                records = lbin.readLayoutFile(filePath)
+            except (orjson.JSONDecodeError, OSError, ValueError) as e:
+                logger.error(f"Cannot export {key[0]}/{key[1]}/{key[2]}: {e}")
+                return None
+            if not self._requestQtParts(records[2:], worker):
+                return None
+            entry = self._buildDiskCell(key, filePath, records)
+            if stamp is not None:
+                designCache().put(cacheKey, entry, stamp[0] * GDS_SIZE_FACTOR,
+                                  filePath, stamp)
+        self._diskCells[key] = entry
+        return entry
+
+    def _requestQtParts(self, records: list[dict],
+                        worker: Optional["gdsExportWorker"]) -> bool:
+        """
+        Have the GUI thread make the label offsets and pcell cells records
+        need and that are not made yet. False if the worker was cancelled.
+        """
+        labelRecords, pcellKeys = [], set()
+        for record in records:
+            match record.get("type"):
+                case "Label":
+                    if (record["ff"], record["fs"], record["fh"], record["lt"],
+                            record["la"], record["lo"]) not in _labelOffsets:
+                        labelRecords.append(record)
+                case "Pcell":
+                    pcellKey = self._recordPcellKey(record)
+                    if pcellKey not in self._pcellCells:
+                        pcellKeys.add(pcellKey)
+        if not labelRecords and not pcellKeys:
+            return True
+        if self._qtParts is None:
+            # Not started through exportWorker: already on the GUI thread.
+            self.makeQtParts(labelRecords, list(pcellKeys))
+            return True
+        return self._qtParts.make(labelRecords, list(pcellKeys), worker)
+
+    def _buildDiskCell(self, key: tuple, filePath: Path, records: list) -> tuple:
+        """Convert the records of a layout.json file into a gdstk.Cell."""
+        # Via cells go to a scratch library so they can be kept with the entry
+        # and added to every export that uses the cell.
+        scratch = gdstk.Library()
+        cellGDS = gdstk.Cell(self._cellName(key))
+        childKeys = set()
+        pcellEntries = {}
+        cellCache = self._cellCache
+        self._cellCache = {}
+        try:
+            for record in records[2:]:
+                try:
+                    self._recordToCell(scratch, record, cellGDS, childKeys, pcellEntries)
+                except (KeyError, IndexError, TypeError, ValueError) as e:
+                    logger.warning(f"Skipped layout record in {filePath}: {e}")
+        finally:
+            self._cellCache = cellCache
+        ownedCells = list(scratch.cells)
+        sources = {}
+        for pcellGDS, pcellOwned, pcellChildKeys, pcellSources in pcellEntries.values():
+            ownedCells.extend((pcellGDS, *pcellOwned))
+            childKeys |= pcellChildKeys
+            sources.update(pcellSources)
+        return cellGDS, ownedCells, childKeys, sources
+
+    def _recordToCell(self, scratch: gdstk.Library, record: dict, cellGDS: gdstk.Cell,
+                      childKeys: set, pcellEntries: dict):
+        match record.get("type"):
+            case "Inst":
+                childKey = (record["lib"], record["cell"], record["view"])
+                childKeys.add(childKey)
+                self._addReference(cellGDS, self._cellName(childKey), record["loc"],
+                                   record.get("ang", 0), record.get("fl", (1, 1)))
+            case "Rect" | "Pin":
+                self._addRect(cellGDS, laylyr.pdkAllLayers[record["ln"]],
+                              tuple(record["tl"]), tuple(record["br"]))
+            case "Path":
+                self._addPath(cellGDS, laylyr.pdkAllLayers[record["ln"]],
+                              tuple(record["dfl1"]), tuple(record["dfl2"]),
+                              record["w"], record["se"], record["ee"])
+            case "Polygon":
+                self._addPolygon(cellGDS, laylyr.pdkAllLayers[record["ln"]],
+                                 [tuple(point) for point in record["ps"]])
+            case "Label":
+                self._addLabel(cellGDS, laylyr.pdkAllLayers[record["ln"]], record["lt"],
+                               record["st"], _labelOffsets[
+                                   (record["ff"], record["fs"], record["fh"],
+                                    record["lt"], record["la"], record["lo"])],
+                               record["fh"], record.get("ang", 0))
+            case "Via":
+                viaRecord = record["via"]
+                layer = fabproc.processVias[
+                    fabproc.processViaNames.index(viaRecord["vdt"])].layer
+                self._addViaArray(scratch, cellGDS, layer, viaRecord["w"], viaRecord["h"],
+                                  tuple(record["st"]), record["xn"], record["yn"],
+                                  record["xs"], record["ys"])
+            case "Pcell":
+                pcellKey = self._recordPcellKey(record)
+                entry = self._pcellCells.get(pcellKey)
+                if entry is not None:
+                    pcellEntries[pcellKey] = entry
+                    self._addReference(cellGDS, entry[0], record["loc"],
+                                       record.get("ang", 0), record.get("fl", (1, 1)))
+
+    @classmethod
+    def _recordPcellKey(cls, record: dict) -> tuple:
+        return cls._pcellKey(record["lib"], record["cell"], record["view"],
+                             record.get("params", {}))
+
+    # Geometry shared by the scene items and the layout records.
+
+    @staticmethod
+    def _cellName(key: tuple) -> str:
+        return f"{key[0]}_{key[1]}_{key[2]}"
+
+    @staticmethod
+    def _addRect(cellGDS: gdstk.Cell, layer, topLeft: tuple, bottomRight: tuple):
+        cellGDS.add(gdstk.rectangle(topLeft, bottomRight, layer=layer.gdsLayer,
+                                    datatype=layer.datatype))
+
+    @staticmethod
+    def _addPath(cellGDS: gdstk.Cell, layer, start: tuple, end: tuple, width,
+                 startExtend, endExtend):
+        cellGDS.add(gdstk.FlexPath(
+            points=[start, end],
+            width=width,
+            ends=(startExtend, endExtend),
             simple_path=True,
-            layer=item.layer.gdsLayer,
-            datatype=item.layer.datatype,
-        )
-        parentCell.add(path)
-
-    def _processLabel(self, item, parentCell, offset: Tuple[float, float] = (0.0, 0.0)):
-        ox, oy = offset
-        centre = item.boundingRect().center()
-        label = gdstk.Label(
-            text=item.labelText,
-            # origin=(item.start.x() - ox, item.start.y() - oy),
-            origin=(centre.x()-ox, centre.y()-oy),
-            magnification=float(item.fontHeight * self._dbu),
-            rotation=item.angle,
-            layer=item.layer.gdsLayer,
-            texttype=item.layer.datatype,
-        )
-        parentCell.add(label)
-
-    def _processPolygon(self, item, parentCell, offset: Tuple[float, float] = (0.0, 0.0)):
-        ox, oy = offset
-        points = [(pt.x() - ox, pt.y() - oy) for pt in item.points]
-        polygon = gdstk.Polygon(
-            points=points,
-            layer=item.layer.gdsLayer,
-            datatype=item.layer.datatype,
-        )
-        parentCell.add(polygon)
-
-    def _processViaArray(self, library, item, parentCell, offset: Tuple[float, float] = (0.0, 0.0)):
-        via_key = (item.via.width, item.via.height, item.via.layer.name,
-                   item.via.layer.purpose)
-        if via_key not in self._cellCache:
-            viaName = f"via_{item.via.width}_{item.via.height}_{item.via.layer.name}_{item.via.layer.purpose}"
-            viaCell = library.new_cell(viaName)
-            # Define single via at (0, 0) in cell-local coordinates.
-            # The Reference origin carries the scene position; mixing both causes a double-offset.
-            via = gdstk.rectangle(
-                (0, 0),
-                (item.via.width, item.via.height),
-                layer=item.via.layer.gdsLayer,
-                datatype=item.via.layer.datatype,
-            )
-            viaCell.add(via)
-            self._cellCache[via_key] = viaCell
-        else:
-            viaCell = self._cellCache[via_key]
-
-        ox, oy = offset
-        viaArray = gdstk.Reference(
+            layer=layer.gdsLayer,
+            datatype=layer.datatype,
+        ))
+
+    @staticmethod
+    def _addPolygon(cellGDS: gdstk.Cell, layer, points: list):
+        cellGDS.add(gdstk.Polygon(points, layer=layer.gdsLayer, datatype=layer.datatype))
+
+    def _addLabel(self, cellGDS: gdstk.Cell, layer, text: str, start, offset: tuple,
+                  fontHeight, angle):
+        cellGDS.add(gdstk.Label(
+            text=text,
+            origin=(start[0] + offset[0], start[1] + offset[1]),
+            magnification=float(fontHeight) * self._dbu,
+            rotation=angle,
+            layer=layer.gdsLayer,
+            texttype=layer.datatype,
+        ))
+
+    def _addViaArray(self, scratch: gdstk.Library, cellGDS: gdstk.Cell, layer, width,
+                     height, start: tuple, columns: int, rows: int, xs, ys):
+        viaKey = (width, height, layer.name, layer.purpose)
+        viaCell = self._cellCache.get(viaKey)
+        if viaCell is None:
+            viaCell = scratch.new_cell(
+                f"via_{width}_{height}_{layer.name}_{layer.purpose}")
+            # A single via at (0, 0); the reference origin carries the position.
+            viaCell.add(gdstk.rectangle((0, 0), (width, height),
+                                        layer=layer.gdsLayer, datatype=layer.datatype))
+            self._cellCache[viaKey] = viaCell
+        cellGDS.add(gdstk.Reference(
             cell=viaCell,
-            origin=(item.start.x() - ox, item.start.y() - oy),
-            columns=item.xnum,
-            rows=item.ynum,
-            spacing=(item.xs + item.width, item.ys + item.height),
-        )
-        parentCell.add(viaArray)
-
-    def _process_custom_layout(self, library, item, parentCell):
-        if pcells is not None and isinstance(item, pcells.baseCell):
-            pcellParamDict = self.extractPcellInstanceParameters(item)
-            pcellNameSuffix = "_".join(
-                f"{key}_{value}".replace(".", "p") for key, value in pcellParamDict.items()
-            )
-            pcellName = (f"{item.libraryName}_{type(item).__name__}_"
-                         f"{pcellNameSuffix}_{self._itemCounter}")
-            self._itemCounter += 1
-            pcellGDS = library.new_cell(pcellName)
-            # Pcell shapes store coordinates in the pcell's local coordinate system
-            # (Qt child items; toSceneCoord only scales by dbu, no translation).
-            # Place them in the GDS cell without any offset, then put the Reference
-            # at the pcell's scene position.
-            for shape in item.shapes:
-                self.createCells(library, shape, pcellGDS)
-
-            # Use pos() (local coords relative to Qt parent) not scenePos().
-            # The Reference lives inside the parent GDS cell whose own Reference
-            # already carries the parent's scene translation; using scenePos()
-            # would double-offset.  pos() == scenePos() when the pcell is at
-            # the top level, so this is correct in both cases.
-            pos = item.pos()
-            angle_rad = math.radians(-getattr(item, 'angle', 0.0))
-            x_reflection = (getattr(item, 'flipTuple', (1, 1))[1] == -1)
-            ref = gdstk.Reference(
-                pcellGDS,
-                origin=(pos.x(), pos.y()),
-                rotation=angle_rad,
-                x_reflection=x_reflection,
-            )
-            parentCell.add(ref)
+            origin=start,
+            columns=columns,
+            rows=rows,
+            spacing=(xs + width, ys + height),
+        ))
+
+    @staticmethod
+    def _addReference(cellGDS: gdstk.Cell, cell, origin, angle, flip):
+        # Qt rotation is clockwise-positive; GDS is counter-clockwise-positive.
+        # flipTuple = (sx, sy); x_reflection in GDS means flip around X axis.
+        cellGDS.add(gdstk.Reference(
+            cell,
+            origin=(origin[0], origin[1]),
+            rotation=math.radians(-angle),
+            x_reflection=(flip[1] == -1),
+        ))
+
+    def writeLibrary(self, fileFormat: str = "GDS",
+                     worker: Optional["gdsExportWorker"] = None) -> bool:
+        """
+        Resolve the cells placed in the top cell from disk and write the file.
+        GDS cells are streamed to the file one at a time. Returns False,
+        leaving no file behind, if the worker was cancelled.
+        """
+        self._outputFileObj.parent.mkdir(parents=True, exist_ok=True)
+        pending = list(self._childKeys)
+        for entry in self._pcellCells.values():
+            if entry is not None:
+                pending.extend(entry[2])
+        resolved = 0
+        while pending:
+            if worker is not None and worker.isCancelled:
+                return False
+            key = pending.pop()
+            if key in self._diskCells:
+                continue
+            entry = self._diskCell(key, worker)
+            if entry is None:
+                if worker is not None and worker.isCancelled:
+                    return False
+                self._diskCells[key] = None
+                logger.warning(f"{key[0]}/{key[1]}/{key[2]} is not exported; its "
+                               f"references are left unresolved.")
+                continue
+            pending.extend(entry[2])
+            resolved += 1
+            if resolved % PROGRESS_STEP == 0 and worker is not None:
+                worker.signals.progress.emit(resolved, resolved + len(pending))
+
+        cells = {}
+        for entry in (*self._diskCells.values(), *self._pcellCells.values()):
+            if entry is not None:
+                for cell in (entry[0], *entry[1]):
+                    cells.setdefault(cell.name, cell)
+        for cell in self._scratch.cells:
+            cells.setdefault(cell.name, cell)
+        cells[self._cellname] = self._topCell
+        total = resolved + len(cells)
+        outputPath = str(self._outputFileObj)
+        if fileFormat.upper() == "OAS":
+            # gdstk has no OASIS stream writer; the file is written in one call.
+            library = gdstk.Library(unit=self._unit, precision=self._precision)
+            for cell in cells.values():
+                library.add(cell)
+            library.write_oas(outputPath)
+            if worker is not None:
+                worker.signals.progress.emit(total, total)
+            return True
+
+        writer = gdstk.GdsWriter(outputPath, name=self._cellname, unit=self._unit,
+                                 precision=self._precision)
+        written = False
+        try:
+            for index, cell in enumerate(cells.values(), resolved):
+                if index % PROGRESS_STEP == 0 and worker is not None:
+                    if worker.isCancelled:
+                        return False
+                    worker.signals.progress.emit(index, total)
+                writer.write(cell)
+            written = True
+        finally:
+            writer.close()
+            if not written:
+                self._outputFileObj.unlink(missing_ok=True)
+        if worker is not None:
+            worker.signals.progress.emit(total, total)
+        return True
 
     @staticmethod
     def extractPcellInstanceParameters(instance: lshp.layoutPcell) -> dict:
@@ -267,3 +567,84 @@ class gdsExporter:
     @dbu.setter
     def dbu(self, value: int):
         self._dbu = value
+
+
+class qtPartsMaker(QObject):
+    """
+    Make on the GUI thread what the export worker needs Qt items for: the
+    text box offsets of labels and the generated pcell cells. Created on the
+    GUI thread; make() called from the worker waits for the GUI thread.
+    """
+    requested = Signal()
+
+    def __init__(self, exporter: gdsExporter):
+        super().__init__()
+        self._exporter = exporter
+        self._request = None
+        self._error = None
+        self._done = threading.Event()
+        # Queued when emitted from the worker, direct on the GUI thread.
+        self.requested.connect(self._make)
+
+    def make(self, labelRecords: list[dict], pcellKeys: list[tuple],
+             worker: Optional["gdsExportWorker"] = None) -> bool:
+        """Return when the parts are made, or False if the worker was cancelled."""
+        self._request = (labelRecords, pcellKeys)
+        self._error = None
+        self._done.clear()
+        self.requested.emit()
+        while not self._done.wait(0.05):
+            if worker is not None and worker.isCancelled:
+                return False
+        if self._error is not None:
+            raise self._error
+        return True
+
+    @Slot()
+    def _make(self):
+        try:
+            self._exporter.makeQtParts(*self._request)
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done.set()
+
+
+class exportWorkerSignals(workerSignals):
+    """workerSignals with conversion progress as (done, total) steps."""
+    progress = Signal(int, int)
+    cancelled = Signal()
+
+
+class gdsExportWorker(QRunnable):
+    """
+    Read the cells placed in a layout snapshot and write it as GDS or OASIS
+    in a thread pool. result is emitted with the output path when the file
+    is written, cancelled when cancel() stopped the export.
+    """
+
+    def __init__(self, exporter: gdsExporter, fileFormat: str = "GDS") -> None:
+        super().__init__()
+        self.exporter = exporter
+        self.fileFormat = fileFormat
+        self.signals = exportWorkerSignals()
+        self._cancelled = False
+
+    @property
+    def isCancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self):
+        self._cancelled = True
+
+    @Slot()
+    def run(self) -> None:
+        try:
+            if self.exporter.writeLibrary(self.fileFormat, self):
+                self.signals.result.emit(self.exporter._outputFileObj)
+            else:
+                self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.error.emit((type(e), e.args, str(e)))
+        finally:
+            self.signals.finished.emit()
@@ -1,10 +1,11 @@
-import json
+import concurrent.futures
+import multiprocessing
+import os
 import pathlib
 
 import gdstk
-from PySide6.QtCore import (
-    QPoint,
-)
+import numpy as np
+import orjson
 from PySide6.QtWidgets import (
     QMainWindow,
 )
@@ -12,8 +13,6 @@ from numpy import pi
 
 import revedaEditor.backend.dataDefinitions as ddef
 import revedaEditor.backend.libBackEnd as libb
-import revedaEditor.common.layoutShapes as lshp
-import revedaEditor.fileio.layoutEncoder as layenc
 from revedaEditor.backend.pdkLoader import importPDKModule
 
 fabproc = importPDKModule("process")
@@ -25,6 +24,65 @@ majorGrid = float(fabproc.majorGrid)
 gdsUnit = float(fabproc.gdsUnit)
 gdsPrecision = float(fabproc.gdsPrecision)
 
+# Cells are written in worker processes only when there are at least this many;
+# for smaller libraries the process start-up costs more than it saves.
+POOL_MIN_CELLS = 16
+
+
+def _cellPayload(cell: gdstk.Cell) -> tuple[list, list, list]:
+    """Extract the geometry of a GDS cell as plain, picklable data."""
+    references = [(ref.cell_name, tuple(ref.origin), ref.rotation)
+                  for ref in cell.references]
+    polygons = [(polygon.layer, polygon.datatype, polygon.points)
+                for polygon in cell.polygons]
+    for path in cell.paths:
+        polygons.extend((polygon.layer, polygon.datatype, polygon.points)
+                        for polygon in path.to_polygons())
+    labels = [(label.layer, label.text, tuple(label.origin), label.rotation)
+              for label in cell.labels]
+    return references, polygons, labels
+
+
+def _cellRecords(libraryName: str, payload: tuple, layerIndex: dict[tuple[int, int], int],
+                 scale: float) -> list[dict]:
+    """Map the geometry of a cell directly to layout JSON records."""
+    references, polygons, labels = payload
+    records = []
+    for cellName, origin, rotation in references:
+        records.append({"type": "Inst", "lib": libraryName, "cell": cellName,
+                        "view": "layout", "nam": "I1", "ic": 1,
+                        "loc": [round(origin[0] * scale), round(origin[1] * scale)],
+                        "ang": rotation * 180 / pi, "fl": [1, 1]})
+    for layer, datatype, points in polygons:
+        layerNumber = layerIndex.get((layer, datatype))
+        if layerNumber is not None:
+            records.append({"type": "Polygon",
+                            "ps": np.rint(points * scale).astype(np.int64),
+                            "ln": layerNumber, "ang": 0, "fl": [1, 1]})
+    for layer, text, origin, rotation in labels:
+        layerNumber = layerIndex.get((layer, 0))
+        if layerNumber is not None:
+            records.append({"type": "Label",
+                            "st": [round(origin[0] * scale), round(origin[1] * scale)],
+                            "lt": text, "ff": "Arial", "fs": "Regular", "fh": "10",
+                            "la": "Center", "lo": "R0", "ln": layerNumber,
+                            "ang": rotation * 180 / pi, "fl": [1, 1]})
+    return records
+
+
+def _writeCellView(viewPath: str, libraryName: str, payload: tuple,
+                   layerIndex: dict[tuple[int, int], int], scale: float,
+                   gridTuple: tuple) -> int:
+    """Write the layout view of one cell. Runs in a worker process for large imports."""
+    records = [{"viewType": "layout"}, {"snapGrid": gridTuple}]
+    records.extend(_cellRecords(libraryName, payload, layerIndex, scale))
+    with open(viewPath, "wb") as file:
+        file.write(b"[\n")
+        file.write(b",\n".join(orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY)
+                               for record in records))
+        file.write(b"\n]")
+    return len(records) - 2
+
 
 class gdsImporter:
     def __init__(
@@ -32,102 +90,86 @@ class gdsImporter:
             parent: QMainWindow,
             inputFile: pathlib.Path,
             importLibItem: libb.libraryItem,
+            workers: int | None = None,
     ):
         self._parent = parent
         self.inputFile = inputFile
-        self._gdsLibrary = gdstk.read_gds(str(inputFile))
+        if inputFile.suffix.lower() in (".oas", ".oasis"):
+            self._gdsLibrary = gdstk.read_oas(str(inputFile))
+        else:
+            self._gdsLibrary = gdstk.read_gds(str(inputFile))
         self._gdsLibrary.set_property("name", str(inputFile.stem))
         self._libraryModel = self._parent.libraryBrowser.designView.libraryModel
         self._libItem = importLibItem
 
         self._topCells = self._gdsLibrary.top_level()
         self._unit = 1
+        # (gdsLayer, datatype) -> index in laylyr.pdkAllLayers
+        self._layerIndex = ddef.layLayer.gdsLayerIndexMap(laylyr.pdkAllLayers)
+        self._workers = workers if workers is not None else (os.cpu_count() or 1)
+        # cell name -> (cellItem, layout viewItem) of cells already converted
+        self._convertedCells: dict[str, tuple[libb.cellItem, libb.viewItem]] = {}
+        # (layout viewItem, gdstk cell) pairs waiting to be written
+        self._pendingCells: list[tuple[libb.viewItem, gdstk.Cell]] = []
 
     def importGDS(self):
 
         for cell in self._topCells:
-            cellPath = self._libItem.libraryPath.joinpath(cell.name)
-            cellItem = libb.createNewCellItem(self._libItem, cellPath)
-            viewPath = cellItem.cellPath.joinpath("layout.json")
-            viewItem = libb.createCellviewItem("layout", viewPath)
-            self._processInstance(cell, viewItem)
-        self._parent.logger.info(f"Imported {self.inputFile.stem} GDS File")
+            self._convertCell(cell)
+        self._writeCellViews()
+        self._parent.logger.info(
+            f"Imported {self.inputFile.stem} GDS File "
+            f"({len(self._convertedCells)} cells)")
         self._parent.libraryBrowser.designView.reworkDesignLibrariesView(
             self._parent.libraryBrowser.designView.libraryModel.libraryDict)
 
-    def _processInstance(self, cell: gdstk.Cell, viewItem: libb.viewItem):
-        # Open file in context manager and write header
-        with viewItem.viewPath.open("w") as file:
-            file.write("[\n")
-            file.write('    {"viewType": "layout"},\n')
-            gridString = f"[{fabproc.majorGrid}, {fabproc.snapGrid}]"
-            snapGridLine = '    {"snapGrid": ' + gridString + '},\n'
-            file.write(snapGridLine)
-            # Track if we need to write comma between items
-            need_comma = False
-
-            # Process instances
-            for shape in self._processShapes(cell, viewItem):
-                if need_comma:
-                    file.write(",\n")
-                json.dump(shape, file, cls=layenc.gdsImportEncoder, indent=4)
-                need_comma = True
-
-            # Close the JSON array
-            file.write("\n]")
-
-        return True  # Or return some status if needed
-
-    def _processShapes(self, cell: gdstk.Cell, viewItem: libb.viewItem):
-        """Generator that yields shapes one at a time."""
-        # Process references
+    def _convertCell(self, cell: gdstk.Cell) -> tuple[libb.cellItem, libb.viewItem]:
+        """
+        Create the cell and its layout view for a GDS cell once, together with
+        those of the cells it references. Later references to the same cell
+        reuse the converted items.
+        """
+        converted = self._convertedCells.get(cell.name)
+        if converted is not None:
+            return converted
+        cellPath = self._libItem.libraryPath.joinpath(cell.name)
+        cellItem = libb.createNewCellItem(self._libItem, cellPath)
+        viewPath = cellItem.cellPath.joinpath("layout.json")
+        viewItem = libb.createCellviewItem("layout", viewPath)
+        # Mark as visited before descending so that the cell is never written twice.
+        self._convertedCells[cell.name] = (cellItem, viewItem)
+        self._pendingCells.append((viewItem, cell))
         for ref in cell.references:
-            cellPath = self._libItem.libraryPath.joinpath(ref.cell_name)
-            cellItem = libb.createNewCellItem(self._libItem, cellPath)
-            viewPath = cellItem.cellPath.joinpath("layout.json")
-            # Process nested instance first
-            self._processInstance(ref.cell, libb.createCellviewItem("layout", viewPath))
-
-            layoutInstance = lshp.layoutInstance([])
-            layoutInstance.libraryName = cellItem.parent().libraryName
-            layoutInstance.cellName = cellItem.cellName
-            layoutInstance.viewName = viewItem.viewName
-            layoutInstance.counter = 1
-            layoutInstance.instanceName = 'I1'
-            layoutInstance.setPos(ref.origin[0] * dbu, ref.origin[1] * dbu)
-            layoutInstance.angle = ref.rotation * 180 / pi
-            layoutInstance.flipTuple = (1, 1)
-            yield layoutInstance
-
-        # Process polygons
-        for polygon in cell.polygons:
-            layoutLayer = ddef.layLayer.filterByGDSLayer(
-                laylyr.pdkAllLayers, polygon.layer, polygon.datatype
-            )
-            if layoutLayer:
-                points = [QPoint(point[0] * dbu, point[1] * dbu) for point in
-                          polygon.points]
-                yield lshp.layoutPolygon(points, layoutLayer)
-
-        # Process paths
-        for path in cell.paths:
-            for polygon in path.to_polygons():
-                layoutLayer = ddef.layLayer.filterByGDSLayer(
-                    laylyr.pdkAllLayers, polygon.layer, polygon.datatype
-                )
-                if layoutLayer:
-                    points = [QPoint(point[0] * dbu, point[1] * dbu) for point in
-                              polygon.points]
-                    yield lshp.layoutPolygon(points, layoutLayer)
-        # Process labels
-        for gds_label in cell.labels:
-            textLayer = ddef.layLayer.filterByGDSLayer(
-                laylyr.pdkAllLayers, gds_label.layer, 0)
-            if not textLayer:
-                continue
-            origin = QPoint(gds_label.origin[0] * dbu, gds_label.origin[1] * dbu)
-            angle = gds_label.rotation * 180 / pi
-            layout_label = lshp.layoutLabel(origin, gds_label.text, "Arial", "Regular",
-                                            "10", "Center", "R0", textLayer)
-            layout_label.angle = angle
-            yield layout_label
+            if isinstance(ref.cell, gdstk.Cell):
+                self._convertCell(ref.cell)
+        return cellItem, viewItem
+
+    def _writeCellViews(self):
+        """
+        Write the layout views of the converted cells, in a process pool when
+        there are enough cells to make it worthwhile. At most two cells per
+        worker are in flight so memory use does not grow with the file size.
+        """
+        libraryName = self._libItem.libraryName
+        gridTuple = (fabproc.majorGrid, fabproc.snapGrid)
+        jobs = ((str(viewItem.viewPath), libraryName, _cellPayload(cell),
+                 self._layerIndex, dbu, gridTuple)
+                for viewItem, cell in self._pendingCells)
+        if self._workers < 2 or len(self._pendingCells) < POOL_MIN_CELLS:
+            for job in jobs:
+                _writeCellView(*job)
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context("spawn")) as executor:
+                pending = set()
+                for job in jobs:
+                    if len(pending) >= 2 * self._workers:
+                        done, pending = concurrent.futures.wait(
+                            pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    pending.add(executor.submit(_writeCellView, *job))
+                for future in concurrent.futures.as_completed(pending):
+                    future.result()
+        self._pendingCells.clear()
@@ -10,6 +10,7 @@
 
 from collections import Counter
 import logging
+import mmap
 import re
 from typing import List, Dict, Any, Optional, Iterator, Tuple
 
@@ -21,6 +22,13 @@ from PySide6.QtWidgets import QGraphicsRectItem
 
 logger = logging.getLogger("reveda")
 
+# Tokens of the S-expression format: parentheses, quoted strings and atoms.
+_TOKEN_RE = re.compile(rb'\(|\)|"[^"]*"|\'[^\']*\'|[^\s()\'"]+')
+# Only what changes the nesting depth, as runs of parentheses; atoms are
+# skipped by the regex engine.
+_NEST_RE = re.compile(rb'(\(+)|(\)+)|"[^"]*"|\'[^\']*\'')
+_HEADER_RE = re.compile(rb'#%lvsdb-klayout(?:-([\d.]+))?')
+
 
 class LVSErrorRect(QGraphicsRectItem):
     def __init__(self, rect: QRect) -> None:
@@ -55,9 +63,15 @@ class LVSDBParser:
 
     When pdk_module is provided, resolves GDS layers to PDK layer names
     using the PDK's layer definitions (e.g., layoutLayers.py).
+
+    The file is not parsed as a whole. load() memory-maps it and records the
+    byte offsets of the entries of each top-level section, e.g. every
+    X(cell ...) block of the J and H sections, in one iterative pass. Only
+    the small sections and the cells that are asked for are turned into
+    nested lists.
     """
 
-    def __init__(self, filepath: str, pdk_module=None):
+    def __init__(self, filepath: str, pdk_module=None, use_mmap: bool = True):
         """
         Initialize the LVSDB parser.
 
@@ -65,11 +79,12 @@ class LVSDBParser:
             filepath: Path to the .lvsdb file to parse.
             pdk_module: Optional PDK module with layer definitions (e.g., layoutLayers).
                         When provided, enables resolution of GDS layer numbers to PDK layer names.
+            use_mmap: Memory-map the file instead of reading it into memory.
 
         Attributes:
             layer_map: Mapping from LVSDB internal layer IDs to GDS strings (layer/datatype).
             gds_to_pdk: Mapping from (gdsLayer, datatype) tuples to PDK layer names.
-            data: Raw parsed S-expression data from the file.
+            data: Raw parsed S-expression data of the whole file, built on first access.
             layout_cells: Cache of parsed layout cell data.
             schematic_cells: Cache of parsed schematic cell data.
             crossrefs: Cross-reference mappings between layout and schematic cells.
@@ -79,7 +94,19 @@ class LVSDBParser:
         self.layer_map: Dict[str, Optional[str]] = {}  # lvsdb_id -> gds_string
         self.gds_to_pdk: Dict[Tuple[int, int], str] = {}  # (layer, datatype) -> pdk_name
         self.unit_scale: float = 1.0
-        self.data: List[Any] = []
+        self.use_mmap = use_mmap
+        self._data: Optional[List[Any]] = None
+        self._buffer = None
+        self._file = None
+        self._body_start = 0
+        # (section tag, start, end) byte spans of the top-level sections, in file order
+        self._sections: List[Tuple[str, int, int]] = []
+        # section tag -> (start, end) of its first occurrence
+        self._section_spans: Dict[str, Tuple[int, int]] = {}
+        # section tag -> [(entry tag, start, end, first atom)] of its entries
+        self._section_entries: Dict[str, List[Tuple[Optional[str], int, int, Optional[str]]]] = {}
+        # section tag -> cell name -> (start, end) of its X(...) block
+        self._cell_spans: Dict[str, Dict[str, Tuple[int, int]]] = {}
         self.layout_cells: Dict[str, Dict] = {}
         self.schematic_cells: Dict[str, Dict] = {}
         self.crossrefs: Dict[str, Dict] = {}
@@ -107,10 +134,11 @@ class LVSDBParser:
 
     def parse_expression(self, tokens):
         """
-        Recursively build a tree from tokens.
+        Build a tree from tokens.
 
-        Parses a parenthesized S-expression into a nested list structure.
-        Handles nested expressions by recursively parsing content within parentheses.
+        Parses a parenthesized S-expression into a nested list structure. An
+        explicit stack is used instead of recursion, so deeply nested input
+        does not hit the recursion limit.
 
         Args:
             tokens: Iterator of tokens from tokenize().
@@ -119,65 +147,198 @@ class LVSDBParser:
             Nested list representing the parsed S-expression tree.
         """
         res = []
+        stack = [res]
         for token in tokens:
             if token == '(':
-                res.append(self.parse_expression(tokens))
+                child = []
+                stack[-1].append(child)
+                stack.append(child)
             elif token == ')':
-                return res
+                if len(stack) == 1:
+                    return res
+                stack.pop()
             else:
-                # Remove quotes if present
-                if (token.startswith("'") and token.endswith("'")) or \
-                   (token.startswith('"') and token.endswith('"')):
-                    token = token[1:-1]
-                res.append(token)
+                stack[-1].append(self._unquote(token))
         return res
 
+    @staticmethod
+    def _unquote(token: str) -> str:
+        # Remove quotes if present
+        if len(token) > 1 and token[0] == token[-1] and token[0] in "'\"":
+            return token[1:-1]
+        return token
+
+    def _atom(self, token: bytes) -> str:
+        return self._unquote(token.decode('utf-8', 'replace'))
+
     def load(self):
         """
-        Load and parse the LVSDB file.
+        Open the LVSDB file and index it.
 
-        Reads the file, strips the header, tokenizes the S-expression content,
-        and builds the parse tree. After loading, processes layer mappings
-        and cross-reference sections.
-
-        Returns:
-            The parsed data structure (list of S-expressions).
+        Maps the file (or reads it when use_mmap is False), strips the header
+        and records the byte spans of the top-level sections and of their
+        entries, without building the parse tree. Then processes the unit,
+        layer mapping and cross-reference sections.
 
         Raises:
             FileNotFoundError: If the filepath does not exist.
             IOError: If the file cannot be read.
         """
-        with open(self.filepath, 'r') as f:
-            content = f.read()
-            # Check and strip the LVSDB header, warn on unrecognized format
-            header_match = re.match(r'^#%lvsdb-klayout(?:-([\d.]+))?', content)
-            if header_match:
-                version = header_match.group(1)
-                if version is not None:
-                    logger.info(f"LVSDB format version: {version}")
-                content = content[header_match.end():].strip()
-            else:
-                logger.warning(
-                    f"Unrecognized LVSDB header in {self.filepath}; "
-                    "parsing may fail or produce incomplete results."
-                )
-            # Wrap in extra parens so all top-level sections are parsed as one list
-            tokens = self.tokenize('(' + content + ')')
-            result = self.parse_expression(tokens)
-            # Unwrap the outer list to get [tag, content, tag, content, ...]
-            self.data = result[0] if (isinstance(result, list) and len(result) == 1) else result
+        self.close()
+        self._file = open(self.filepath, 'rb')
+        try:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) \
+                if self.use_mmap else self._file.read()
+        except ValueError:
+            # An empty file cannot be mapped.
+            self._buffer = self._file.read()
+        if not isinstance(self._buffer, mmap.mmap):
+            self._file.close()
+            self._file = None
+
+        # Check and strip the LVSDB header, warn on unrecognized format
+        header_match = _HEADER_RE.match(self._buffer)
+        if header_match:
+            version = header_match.group(1)
+            if version is not None:
+                logger.info(f"LVSDB format version: {version.decode()}")
+            self._body_start = header_match.end()
+        else:
+            self._body_start = 0
+            logger.warning(
+                f"Unrecognized LVSDB header in {self.filepath}; "
+                "parsing may fail or produce incomplete results."
+            )
+        self._build_index()
 
         self._process_units()
         self._process_layers()
         self._process_crossrefs()
-        return self.data
+
+    def close(self):
+        """Release the file mapping. Cells already parsed stay available."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._file is not None:
+            self._file.close()
+        self._buffer = None
+        self._file = None
+
+    def _build_index(self):
+        """
+        Record the spans of the top-level sections and of their entries.
+
+        Tokens are only examined at the two outer levels. The body of each
+        section entry is skipped by matching parentheses, which leaves the
+        atoms inside to the regex engine.
+        """
+        buffer = self._buffer
+        self._sections.clear()
+        self._section_spans.clear()
+        self._section_entries.clear()
+        self._cell_spans.clear()
+        self._data = None
+        pos = self._body_start
+        depth = 0
+        last_atom = None
+        section_tag = None
+        section_start = 0
+        entries: List = []
+        while True:
+            match = _TOKEN_RE.search(buffer, pos)
+            if match is None:
+                break
+            token = match.group()
+            pos = match.end()
+            if token == b'(':
+                if depth == 0:
+                    section_tag = self._atom(last_atom) if last_atom else ''
+                    section_start = match.start()
+                    entries = []
+                    depth = 1
+                else:
+                    end = self._skip_block(match.start())
+                    name_match = _TOKEN_RE.search(buffer, pos, end)
+                    name = None
+                    if name_match and name_match.group() not in (b'(', b')'):
+                        name = self._atom(name_match.group())
+                    entry_tag = self._atom(last_atom) if last_atom else None
+                    entries.append((entry_tag, match.start(), end, name))
+                    pos = end
+                last_atom = None
+            elif token == b')':
+                if depth == 1:
+                    self._sections.append((section_tag, section_start, match.end()))
+                    # The first occurrence of a section wins, as in a linear search.
+                    if section_tag not in self._section_spans:
+                        self._section_spans[section_tag] = (section_start, match.end())
+                        self._section_entries[section_tag] = entries
+                    depth = 0
+                last_atom = None
+            else:
+                last_atom = token
+        for section_tag, entries in self._section_entries.items():
+            cells = self._cell_spans.setdefault(section_tag, {})
+            for entry_tag, start, end, name in entries:
+                if entry_tag == 'X' and name is not None:
+                    cells.setdefault(name, (start, end))
+
+    def _skip_block(self, start: int) -> int:
+        """Return the offset just past the parenthesis closing the one at start."""
+        depth = 0
+        for match in _NEST_RE.finditer(self._buffer, start):
+            group = match.lastindex
+            if group == 1:
+                depth += match.end() - match.start()
+            elif group == 2:
+                closed = match.end() - match.start()
+                if closed >= depth:
+                    return match.start() + depth
+                depth -= closed
+        return len(self._buffer)
+
+    def _parse_span(self, start: int, end: int) -> List:
+        """Build the nested list of the parenthesised block spanning start:end."""
+        root = []
+        stack = [root]
+        for match in _TOKEN_RE.finditer(self._buffer, start, end):
+            token = match.group()
+            if token == b'(':
+                child = []
+                stack[-1].append(child)
+                stack.append(child)
+            elif token == b')':
+                if len(stack) > 1:
+                    stack.pop()
+            else:
+                stack[-1].append(self._atom(token))
+        return root[0] if root and isinstance(root[0], list) else root
+
+    def _entry_items(self, section_tag: str, entry_tag: str) -> Iterator[List]:
+        """Parse the entries tagged entry_tag of a top-level section, in order."""
+        for tag, start, end, _name in self._section_entries.get(section_tag, ()):
+            if tag == entry_tag:
+                yield self._parse_span(start, end)
+
+    @property
+    def data(self) -> List[Any]:
+        """
+        The whole file as [tag, content, tag, content, ...]. Built on first
+        access only; the parser itself works from the section index.
+        """
+        if self._data is None:
+            self._data = []
+            if self._buffer is not None:
+                for tag, start, end in self._sections:
+                    self._data.extend([tag, self._parse_span(start, end)])
+        return self._data
 
     def _find_section(self, tag: str) -> Optional[List]:
-        """Return the content list immediately following the first occurrence of tag in self.data."""
-        for i in range(len(self.data) - 1):
-            if self.data[i] == tag and isinstance(self.data[i + 1], list):
-                return self.data[i + 1]
-        return None
+        """Return the content list of the first top-level section tagged tag."""
+        span = self._section_spans.get(tag)
+        if span is None or self._buffer is None:
+            return None
+        return self._parse_span(*span)
 
     def _process_units(self):
         """
@@ -188,17 +349,13 @@ class LVSDBParser:
         geometry is kept in raw LVSDB coordinates to match editor scene units.
         """
         self.unit_scale = 1.0
-        section = self._find_section('J')
-        if section is not None:
-            for j in range(len(section)):
-                if section[j] == 'U' and j + 1 < len(section):
-                    item = section[j + 1]
-                    if isinstance(item, list) and len(item) >= 1:
-                        try:
-                            self.unit_scale = float(item[0])
-                        except (ValueError, TypeError):
-                            self.unit_scale = 1.0
-                    return
+        for item in self._entry_items('J', 'U'):
+            if isinstance(item, list) and len(item) >= 1:
+                try:
+                    self.unit_scale = float(item[0])
+                except (ValueError, TypeError):
+                    self.unit_scale = 1.0
+            return
 
     def _process_crossrefs(self):
         """
@@ -212,15 +369,8 @@ class LVSDBParser:
         where L(...) carries optional diagnostics and Z(...) contains net, pin,
         and device correspondences.
         """
-        section = self._find_section('Z')
-        if section is None:
-            return
         # Z section has tag-pair format: X, (content), X, (content)...
-        for j in range(0, len(section), 2):
-            tag = self._safe_get(section, j)
-            if tag != 'X' or j + 1 >= len(section):
-                continue
-            item = section[j + 1]
+        for item in self._entry_items('Z', 'X'):
             if not isinstance(item, list) or len(item) < 3:
                 continue
             cell_name = self._safe_get(item, 0)
@@ -487,15 +637,8 @@ class LVSDBParser:
         Returns:
             List of layout cell name strings.
         """
-        cells = []
-        section = self._find_section('J')
-        if section is not None:
-            for j in range(len(section)):
-                if section[j] == 'X' and j + 1 < len(section):
-                    item = section[j + 1]
-                    if isinstance(item, list) and len(item) >= 1:
-                        cells.append(item[0])
-        return cells
+        return [name for tag, _start, _end, name in self._section_entries.get('J', ())
+                if tag == 'X' and name is not None]
 
     def get_all_schematic_cells(self) -> List[str]:
         """
@@ -507,15 +650,8 @@ class LVSDBParser:
         Returns:
             List of schematic cell name strings.
         """
-        cells = []
-        section = self._find_section('H')
-        if section is not None:
-            for j in range(len(section)):
-                if section[j] == 'X' and j + 1 < len(section):
-                    item = section[j + 1]
-                    if isinstance(item, list) and len(item) >= 1:
-                        cells.append(item[0])
-        return cells
+        return [name for tag, _start, _end, name in self._section_entries.get('H', ())
+                if tag == 'X' and name is not None]
 
     def _safe_get(self, lst: List, idx: int, default: Any = None) -> Any:
         """
@@ -603,18 +739,13 @@ class LVSDBParser:
 
         Populates self.layer_map with lvsdb_id -> gds_string mappings.
         """
-        section = self._find_section('J')
-        if section is None:
-            return
         # J section has alternating tag/content pairs: W, U, L, C, K, X, ...
-        for j in range(len(section)):
-            if section[j] == 'L' and j + 1 < len(section):
-                item = section[j + 1]
-                if isinstance(item, list) and len(item) >= 1:
-                    layer_id = item[0]
-                    gds = item[1] if len(item) > 1 else None
-                    if layer_id:
-                        self.layer_map[layer_id] = gds
+        for item in self._entry_items('J', 'L'):
+            if isinstance(item, list) and len(item) >= 1:
+                layer_id = item[0]
+                gds = item[1] if len(item) > 1 else None
+                if layer_id:
+                    self.layer_map[layer_id] = gds
 
     def get_nets(self, cell_name: str) -> List[Dict]:
         """
@@ -1047,7 +1178,7 @@ class LVSDBParser:
         Get parsed layout cell data, processing if not cached.
 
         Looks up the cell in the layout cell cache first. If not found,
-        searches the J section of the parsed data, parses the cell definition,
+        parses the X block at the offsets recorded for it in the J section
         and caches the result.
 
         Args:
@@ -1062,23 +1193,19 @@ class LVSDBParser:
         if cell_name in self.layout_cells:
             return self.layout_cells[cell_name]
 
-        section = self._find_section('J')
-        if section is not None:
-            for j in range(len(section)):
-                if section[j] == 'X' and j + 1 < len(section):
-                    item = section[j + 1]
-                    if isinstance(item, list) and len(item) >= 1 and item[0] == cell_name:
-                        cell_data = self._parse_layout_cell(item)
-                        self.layout_cells[cell_name] = cell_data
-                        return cell_data
-        return None
+        span = self._cell_spans.get('J', {}).get(cell_name)
+        if span is None or self._buffer is None:
+            return None
+        cell_data = self._parse_layout_cell(self._parse_span(*span))
+        self.layout_cells[cell_name] = cell_data
+        return cell_data
 
     def _get_schematic_cell(self, cell_name: str) -> Optional[Dict]:
         """
         Get parsed schematic cell data, processing if not cached.
 
         Looks up the cell in the schematic cell cache first. If not found,
-        searches the H section of the parsed data, parses the cell definition,
+        parses the X block at the offsets recorded for it in the H section
         and caches the result.
 
         Args:
@@ -1093,16 +1220,12 @@ class LVSDBParser:
         if cell_name in self.schematic_cells:
             return self.schematic_cells[cell_name]
 
-        section = self._find_section('H')
-        if section is not None:
-            for j in range(len(section)):
-                if section[j] == 'X' and j + 1 < len(section):
-                    item = section[j + 1]
-                    if isinstance(item, list) and len(item) >= 1 and item[0] == cell_name:
-                        cell_data = self._parse_schematic_cell(item)
-                        self.schematic_cells[cell_name] = cell_data
-                        return cell_data
-        return None
+        span = self._cell_spans.get('H', {}).get(cell_name)
+        if span is None or self._buffer is None:
+            return None
+        cell_data = self._parse_schematic_cell(self._parse_span(*span))
+        self.schematic_cells[cell_name] = cell_data
+        return cell_data
 
     def _parse_layout_cell(self, cell_list: List) -> Dict:
         """
@@ -2,10 +2,18 @@
 """
 KLayout DRC XML report to dictionary converter using lxml.
 Handles nested categories, cells, and DRC violations with polygons.
+
+The report is read incrementally. Violation coordinates are kept in flat
+NumPy arrays and the polygon items of a violation are only created when it
+is looked at, so large reports stay small in memory.
 """
 
+import re
 import sys
-from typing import Dict, Any, List
+from array import array
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 from PySide6.QtCore import (
     QPoint,
@@ -22,6 +30,11 @@ from revedaEditor.backend.pdkLoader import importPDKModule
 
 process = importPDKModule("process")
 
+# "x,y" points of polygon and edge-pair values
+_POINT_RE = re.compile(r"([^,;()/\s]+),([^,;()/\s]+)")
+# top-level report sections and violation items; other elements are skipped
+_REPORT_TAGS = ("description", "generator", "top-cell", "categories", "cells", "item")
+
 
 class DRCErrorPolygon(QGraphicsPolygonItem):
     def __init__(self, polygon: QPolygonF) -> None:
@@ -56,11 +69,167 @@ class DRCErrorPolygon(QGraphicsPolygonItem):
         self._cell = value
 
 
+class drcViolations:
+    """
+    Columnar store of the violations of a DRC report. Indexing returns a
+    drcViolation row view; coordinates are only turned into points and
+    DRCErrorPolygon items when a row asks for them.
+    """
+
+    valueKinds = ("polygon", "edge-pair")
+
+    def __init__(self):
+        self._names: List[Optional[str]] = []
+        self._nameCodes: Dict[Optional[str], int] = {}
+        self._categories = array("i")
+        self._cells = array("i")
+        self._multiplicity = array("q")
+        self.visited = bytearray()
+        # item -> its first value, value -> its kind and its first point
+        self._valueStarts = array("q", [0])
+        self._kinds = array("b")
+        self._pointStarts = array("q", [0])
+        self._coords = array("d")
+
+    def __len__(self) -> int:
+        return len(self._categories)
+
+    def __getitem__(self, row: int) -> "drcViolation":
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return drcViolation(self, row)
+
+    def __iter__(self) -> Iterator["drcViolation"]:
+        return (drcViolation(self, row) for row in range(len(self)))
+
+    def _code(self, name: Optional[str]) -> int:
+        code = self._nameCodes.get(name)
+        if code is None:
+            code = self._nameCodes[name] = len(self._names)
+            self._names.append(name)
+        return code
+
+    def append(self, category: Optional[str], cell: Optional[str], visited: bool,
+               multiplicity: int, values: List[Tuple[int, List[float]]]):
+        """Add a violation; values are (kind, flat x, y coordinates) pairs."""
+        self._categories.append(self._code(category))
+        self._cells.append(self._code(cell))
+        self.visited.append(visited)
+        self._multiplicity.append(multiplicity)
+        for kind, coords in values:
+            self._kinds.append(kind)
+            self._coords.extend(coords)
+            self._pointStarts.append(len(self._coords) // 2)
+        self._valueStarts.append(len(self._kinds))
+
+    def freeze(self):
+        """Turn the growing buffers into NumPy arrays once the report is read."""
+        self._categories = np.frombuffer(self._categories, dtype=np.int32)
+        self._cells = np.frombuffer(self._cells, dtype=np.int32)
+        self._multiplicity = np.frombuffer(self._multiplicity, dtype=np.int64)
+        self._valueStarts = np.frombuffer(self._valueStarts, dtype=np.int64)
+        self._kinds = np.frombuffer(self._kinds, dtype=np.int8)
+        self._pointStarts = np.frombuffer(self._pointStarts, dtype=np.int64)
+        self._coords = np.frombuffer(self._coords, dtype=np.float64).reshape(-1, 2)
+
+    def category(self, row: int) -> Optional[str]:
+        return self._names[self._categories[row]]
+
+    def cell(self, row: int) -> Optional[str]:
+        return self._names[self._cells[row]]
+
+    def multiplicity(self, row: int) -> int:
+        return int(self._multiplicity[row])
+
+    def rowsInCategory(self, category: str) -> np.ndarray:
+        """Rows of the violations of a category."""
+        code = self._nameCodes.get(category)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(np.asarray(self._categories) == code)
+
+    def _values(self, row: int) -> Iterator[Tuple[str, np.ndarray]]:
+        coords = np.asarray(self._coords).reshape(-1, 2)
+        for value in range(self._valueStarts[row], self._valueStarts[row + 1]):
+            yield (self.valueKinds[self._kinds[value]],
+                   coords[self._pointStarts[value]:self._pointStarts[value + 1]])
+
+    @staticmethod
+    def _formatNumber(number: float) -> str:
+        text = repr(float(number))
+        return text[:-2] if text.endswith(".0") else text
+
+    def points(self, row: int) -> List[List[str]]:
+        """The "x,y" points of each value of a violation."""
+        return [[f"{self._formatNumber(x)},{self._formatNumber(y)}" for x, y in coords]
+                for _, coords in self._values(row)]
+
+    def polygons(self, row: int) -> List[DRCErrorPolygon]:
+        """Build the error polygon items of a violation."""
+        cell = self.cell(row)
+        toolTip = f"{cell}, {self.category(row)}, {self.points(row)}"
+        polygons = []
+        for errorType, coords in self._values(row):
+            # Truncated to integers like QPoint does.
+            scaled = (coords * process.dbu).astype(np.int64)
+            polygonItem = DRCErrorPolygon(
+                QPolygonF([QPoint(int(x), int(y)) for x, y in scaled]))
+            polygonItem.cell = cell
+            polygonItem.errorCategory = errorType
+            polygonItem.setToolTip(toolTip)
+            polygons.append(polygonItem)
+        return polygons
+
+
+class drcViolation:
+    """
+    Dictionary-like view of one violation with the keys category, cell,
+    visited, multiplicity, points and polygons.
+    """
+
+    __slots__ = ("_violations", "_row")
+    _keys = ("category", "cell", "visited", "multiplicity", "polygons", "points")
+
+    def __init__(self, violations: drcViolations, row: int):
+        self._violations = violations
+        self._row = row
+
+    def __getitem__(self, key: str):
+        violations, row = self._violations, self._row
+        if key == "category":
+            return violations.category(row)
+        elif key == "cell":
+            return violations.cell(row)
+        elif key == "visited":
+            return bool(violations.visited[row])
+        elif key == "multiplicity":
+            return violations.multiplicity(row)
+        elif key == "points":
+            return violations.points(row)
+        elif key == "polygons":
+            return violations.polygons(row)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key != "visited":
+            raise KeyError(key)
+        self._violations.visited[self._row] = bool(value)
+
+    def __contains__(self, key) -> bool:
+        return key in self._keys
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self._keys else default
+
+    def keys(self):
+        return self._keys
+
+
 class DRCOutput:
     def __init__(self, path: str) -> None:
         self.path = path
-        self.tree = etree.parse(path)
-        self.root = self.tree.getroot()
         self.result = {}
 
     def parseDRCOutput(self) -> Dict[str, Any]:
@@ -68,24 +237,38 @@ class DRCOutput:
             "metadata": {},
             "categories": {},
             "cells": {},
-            "violations": [],  # list of dicts for DRC items
+            "violations": drcViolations(),
         }
 
-        # Parse top-level metadata
-        for child in self.root:
-            tag = child.tag
-            if tag == "description":
-                result["metadata"]["description"] = child.text
-            elif tag == "generator":
-                result["metadata"]["generator"] = child.text
-            elif tag == "top-cell":
-                result["metadata"]["top_cell"] = child.text
-            elif tag == "categories":
-                result["categories"] = self.parseCategories(child)
-            elif tag == "cells":
-                result["cells"] = self.parseCells(child)
-            elif tag == "items":
-                result["violations"] = self.parseViolations(child)
+        # Elements are handled as they are closed and then cleared, so only
+        # the item being read is held in memory.
+        context = etree.iterparse(self.path, events=("end",), tag=_REPORT_TAGS,
+                                  huge_tree=True)
+        for _, element in context:
+            parent = element.getparent()
+            if parent is None:
+                continue
+            tag = element.tag
+            if parent.getparent() is None:
+                if tag == "description":
+                    result["metadata"]["description"] = element.text
+                elif tag == "generator":
+                    result["metadata"]["generator"] = element.text
+                elif tag == "top-cell":
+                    result["metadata"]["top_cell"] = element.text
+                elif tag == "categories":
+                    result["categories"] = self.parseCategories(element)
+                elif tag == "cells":
+                    result["cells"] = self.parseCells(element)
+            elif tag == "item" and parent.tag == "items":
+                self.parseViolation(element, result["violations"])
+            else:
+                continue
+            element.clear()
+            while element.getprevious() is not None:
+                del parent[0]
+        del context
+        result["violations"].freeze()
         self.result = result
         return result
 
@@ -144,72 +327,54 @@ class DRCOutput:
 
         return result
 
-    def parseViolations(self, items_el: etree._Element):
-        def parsePolygon(valueStr: str) -> tuple[str, List[QPoint], List[str]]:
-            def parseCoords(point_list: List[str]) -> List[QPoint]:
-                coords = []
-                for pt in point_list:
-                    pt = pt.strip()
-                    if "," in pt:
-                        try:
-                            x, y = map(float, pt.split(","))
-                            coords.append(QPoint(x * process.dbu, y * process.dbu))
-                        except ValueError:
-                            continue
-                return coords
-
-            if valueStr.startswith("polygon:"):
-                points = valueStr[9:].strip("()").split(";")
-                return ("polygon", parseCoords(points), points)
-            elif valueStr.startswith("edge-pair:"):
-                edge_str = valueStr[10:].strip()
-                points = []
-                for pair in edge_str.split("/"):
-                    points.extend(pair.strip("()").split(";"))
-                return ("edge-pair", parseCoords(points), points)
-            return ("", [], [])
-
-        """Parse violations/items section."""
-        violations = []
-        for item in items_el.findall("item"):
-            violation = {
-                "category": (
-                    item.find("category").text.strip("'")
-                    if item.find("category") is not None
-                    else None
-                ),
-                "cell": (item.find("cell").text if item.find("cell") is not None else None),
-                "visited": (
-                    item.find("visited").text == "true"
-                    if item.find("visited") is not None
-                    else False
-                ),
-                "multiplicity": (
-                    int(item.find("multiplicity").text)
-                    if item.find("multiplicity") is not None
-                    else 1
-                ),
-                "polygons": [],
-                "points": [],
-            }
-
-            # Parse values (polygons)
-            values = item.find("values")
-            if values is not None:
-                for value_el in values.findall("value"):
-                    errorType, polyCoords, points = parsePolygon(value_el.text)
-                    if polyCoords:
-                        violation["points"].append(points)
-                        polygonItem = DRCErrorPolygon(QPolygonF(polyCoords))
-                        polygonItem.cell = violation["cell"]
-                        polygonItem.errorCategory = errorType
-                        polygonItem.setToolTip(
-                            f"{violation['cell']}, {violation['category']}, {violation['points']}"
-                        )
-                        violation["polygons"].append(polygonItem)
-
-            violations.append(violation)
-        return violations
+    @staticmethod
+    def parseValue(valueStr: str) -> Tuple[int, List[float]]:
+        """
+        Parse a polygon or edge-pair value into its kind, an index of
+        drcViolations.valueKinds, and flat x, y coordinates.
+        """
+        if valueStr.startswith("polygon:"):
+            kind = 0
+        elif valueStr.startswith("edge-pair:"):
+            kind = 1
+        else:
+            return -1, []
+        points = _POINT_RE.findall(valueStr)
+        try:
+            return kind, [float(number) for point in points for number in point]
+        except ValueError:
+            # Skip the malformed points only.
+            coords = []
+            for x, y in points:
+                try:
+                    coords.extend((float(x), float(y)))
+                except ValueError:
+                    continue
+            return kind, coords
+
+    def parseViolation(self, item: etree._Element, violations: drcViolations):
+        """Parse one violation item and append it to violations."""
+        category = cell = None
+        visited = False
+        multiplicity = 1
+        values = []
+        for child in item:
+            tag = child.tag
+            if tag == "category":
+                category = child.text.strip("'")
+            elif tag == "cell":
+                cell = child.text
+            elif tag == "visited":
+                visited = child.text == "true"
+            elif tag == "multiplicity":
+                multiplicity = int(child.text)
+            elif tag == "values":
+                for valueElement in child:
+                    if valueElement.tag == "value":
+                        kind, coords = self.parseValue(valueElement.text or "")
+                        if coords:
+                            values.append((kind, coords))
+        violations.append(category, cell, visited, multiplicity, values)
 
 
 def main(file_path: str):
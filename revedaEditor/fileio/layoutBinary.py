@@ -0,0 +1,424 @@
+#
+# Revolution EDA
+#
+# Copyright (c) 2026 Revolution Semiconductor
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0.
+# If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+##
+
+"""Columnar binary form of layout cell views.
+
+A layout view may be stored in this format under its usual file name instead
+of a JSON array. The file starts with a magic string and the length of a JSON
+header, followed by the raw little-endian arrays the header points to:
+
+* Rects are rows of ``x1, y1, x2, y2`` int32 coordinates, polygons are int32
+  point rows with int64 start offsets. Both are sorted by layer number and the
+  header keeps the row range of every layer, so a layer is a zero-copy slice
+  of the memory mapped file.
+* Every other record (view header, instances, pcells, paths, pins, labels,
+  vias, rulers and any rect or polygon the columns cannot hold exactly) is
+  kept verbatim in the JSON header.
+* The position of every record in the original JSON array is stored too, so
+  ``readLayoutFile`` returns exactly the records of the JSON file.
+
+``isLayoutBinary`` tells the formats apart by the magic string, so readers of
+layout files can accept both.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+MAGIC = b"REVLAYB1"
+_PREAMBLE = struct.Struct("<8sQ")  # magic, header length
+_ALIGN = 8
+
+_INT32_MIN, _INT32_MAX = -(2**31), 2**31 - 1
+
+# Bits of the per-row flags: the JSON had float coordinates or a float angle.
+FLOAT_COORDS = 1
+FLOAT_ANGLE = 2
+
+_RECT_KEYS = frozenset(("type", "tl", "br", "ang", "ln", "fl"))
+_POLYGON_KEYS = frozenset(("type", "ps", "ang", "ln", "fl"))
+
+
+def isLayoutBinary(filePath) -> bool:
+    """True if the file at filePath is a binary layout file."""
+    try:
+        with open(filePath, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class _columnRows:
+    """
+    Rect or polygon records gathered for the columns while writing. The
+    values are only checked, all at once, when the columns are built.
+    """
+
+    __slots__ = ("values", "counts", "meta", "order")
+
+    def __init__(self):
+        self.values = []  # flattened point coordinates
+        self.counts = []  # number of coordinate values of each row
+        self.meta = []  # layer, angle, flip x, flip y of each row
+        self.order = []  # index of each row in the JSON array
+
+    def columns(self) -> Tuple[Dict[str, np.ndarray], list, np.ndarray]:
+        """
+        Return the arrays of the rows that fit the columns, sorted by layer,
+        their layer ranges and the order of the rows that do not fit.
+        """
+        counts = np.array(self.counts, dtype=np.int64)
+        order = np.array(self.order, dtype=np.int64)
+        starts = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=starts[1:])
+
+        values, isInt, isFloat = _numbers(self.values)
+        valid = (isInt | isFloat) & (values == np.floor(values)) & (
+            values >= _INT32_MIN) & (values <= _INT32_MAX)
+        meta, metaInt, metaFloat = _numbers(self.meta)
+        meta, metaInt, metaFloat = (meta.reshape(-1, 4), metaInt.reshape(-1, 4),
+                                    metaFloat.reshape(-1, 4))
+        layers, angles, flips = meta[:, 0], meta[:, 1], meta[:, 2:]
+        rowValid = (
+            metaInt[:, 0] & (layers >= 0) & (layers <= _INT32_MAX)
+            & (metaInt[:, 1] | metaFloat[:, 1]) & (angles == np.floor(angles))
+            & (angles >= _INT32_MIN) & (angles <= _INT32_MAX)
+            & metaInt[:, 2:].all(axis=1) & (np.abs(flips) <= 127).all(axis=1))
+        floatRows = np.zeros(len(counts), dtype=np.int64)
+        if len(values):
+            rowStarts = starts[:-1]
+            rowValid &= np.logical_and.reduceat(valid, rowStarts)
+            floatRows = np.add.reduceat(isFloat.astype(np.int64), rowStarts)
+        # A row of mixed int and float coordinates cannot be restored exactly.
+        rowValid &= (floatRows == 0) | (floatRows == counts)
+
+        rows = np.flatnonzero(rowValid)
+        rows = rows[np.argsort(layers[rows], kind="stable")]
+        rowCounts = counts[rows]
+        newStarts = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(rowCounts, out=newStarts[1:])
+        gather = np.repeat(starts[rows] - newStarts[:-1], rowCounts) + np.arange(
+            newStarts[-1], dtype=np.int64)
+        rowLayers = layers[rows].astype(np.int64)
+        layerNumbers, firstRows = np.unique(rowLayers, return_index=True)
+        layerRanges = [(int(layer), int(start), int(stop)) for layer, start, stop in
+                       zip(layerNumbers, firstRows, [*firstRows[1:], len(rows)])]
+        flags = np.where(floatRows[rows] > 0, FLOAT_COORDS, 0) | np.where(
+            metaFloat[rows, 1], FLOAT_ANGLE, 0)
+        arrays = {
+            "Coords": values[gather].astype(np.int32).reshape(-1, 2),
+            "Attrs": meta[rows, 1:].astype(np.int32),
+            "Flags": flags.astype(np.uint8),
+            "Order": order[rows],
+            "Starts": newStarts // 2,
+        }
+        return arrays, layerRanges, order[~rowValid]
+
+
+def _numbers(values: list) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """values as float64, with masks of the ints and floats among them."""
+    kinds = np.fromiter(map(type, values), dtype=object, count=len(values))
+    isInt, isFloat = kinds == int, kinds == float
+    numbers = np.zeros(len(values), dtype=np.float64)
+    isNumber = isInt | isFloat
+    if isNumber.any():
+        objects = np.fromiter(values, dtype=object, count=len(values))[isNumber]
+        try:
+            numbers[isNumber] = objects.astype(np.float64)
+        except OverflowError:
+            # Ints too large for a float can never fit the int32 columns.
+            numbers[isNumber] = [float(value) if -1e300 < value < 1e300 else np.inf
+                                 for value in objects]
+    return numbers, isInt, isFloat
+
+
+def writeLayoutBinary(file: BinaryIO, records: list) -> None:
+    """Write the records of a layout JSON array to file in binary form."""
+    rects, polygons = _columnRows(), _columnRows()
+    jsonIndices = []
+    # Bound methods of the rect lists, as rects are most of a large layout.
+    rectValues, rectMeta = rects.values.extend, rects.meta.extend
+    rectCount, rectOrder = rects.counts.append, rects.order.append
+    for index, record in enumerate(records):
+        if type(record) is dict:
+            recordType = record.get("type")
+            try:
+                if recordType == "Rect" and record.keys() == _RECT_KEYS:
+                    topLeft, bottomRight, flip = record["tl"], record["br"], record["fl"]
+                    if len(topLeft) == 2 and len(bottomRight) == 2 and len(flip) == 2:
+                        rectValues(topLeft)
+                        rectValues(bottomRight)
+                        rectMeta((record["ln"], record["ang"], *flip))
+                        rectCount(4)
+                        rectOrder(index)
+                        continue
+                elif recordType == "Polygon" and record.keys() == _POLYGON_KEYS:
+                    points, flip = record["ps"], record["fl"]
+                    if points and len(flip) == 2 and all(
+                            len(point) == 2 for point in points):
+                        polygons.values.extend(
+                            [value for point in points for value in point])
+                        polygons.meta.extend((record["ln"], record["ang"], *flip))
+                        polygons.counts.append(2 * len(points))
+                        polygons.order.append(index)
+                        continue
+            except TypeError:
+                pass
+        jsonIndices.append(index)
+
+    arrays = {}
+    header = {"count": len(records)}
+    for name, rows in (("rect", rects), ("polygon", polygons)):
+        columns, layerRanges, rejected = rows.columns()
+        jsonIndices.extend(rejected.tolist())
+        header[f"{name}Layers"] = layerRanges
+        if name == "rect":
+            columns["Coords"] = columns["Coords"].reshape(-1, 4)
+            del columns["Starts"]
+        arrays.update((f"{name}{key}", value) for key, value in columns.items())
+    header["records"] = [(index, records[index]) for index in sorted(jsonIndices)]
+
+    offset = 0
+    header["arrays"] = {}
+    for name, data in arrays.items():
+        data = data.astype(data.dtype.newbyteorder("<"), copy=False)
+        arrays[name] = data
+        header["arrays"][name] = (data.dtype.str, data.shape, offset)
+        offset = _aligned(offset + data.nbytes)
+
+    headerBytes = orjson.dumps(header, option=orjson.OPT_SERIALIZE_NUMPY)
+    file.write(_PREAMBLE.pack(MAGIC, len(headerBytes)))
+    file.write(headerBytes)
+    position = _PREAMBLE.size + len(headerBytes)
+    file.write(bytes(_aligned(position) - position))
+    written = 0
+    for name, data in arrays.items():
+        _, _, start = header["arrays"][name]
+        file.write(bytes(start - written))
+        file.write(np.ascontiguousarray(data).reshape(-1).view(np.uint8))
+        written = start + data.nbytes
+
+
+def _aligned(position: int) -> int:
+    return -(-position // _ALIGN) * _ALIGN
+
+
+def _concatenate(parts: list, dtype) -> np.ndarray:
+    return np.concatenate(parts) if parts else np.empty(0, dtype)
+
+
+class layoutBinaryFile:
+    """
+    A binary layout file opened for reading. The arrays are views of the
+    memory mapped file, so opening a file does not read its shapes.
+    """
+
+    def __init__(self, filePath, useMmap: bool = True):
+        self.filePath = filePath
+        self._file = open(filePath, "rb")
+        self._buffer = None
+        try:
+            if useMmap:
+                try:
+                    self._buffer = mmap.mmap(self._file.fileno(), 0,
+                                             access=mmap.ACCESS_READ)
+                except ValueError:  # empty file
+                    pass
+            if self._buffer is None:
+                self._buffer = self._file.read()
+            if len(self._buffer) < _PREAMBLE.size:
+                raise ValueError(f"{filePath} is not a binary layout file")
+            magic, length = _PREAMBLE.unpack_from(self._buffer, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{filePath} is not a binary layout file")
+            header = orjson.loads(self._buffer[_PREAMBLE.size:_PREAMBLE.size + length])
+            dataStart = _aligned(_PREAMBLE.size + length)
+            self.count: int = header["count"]
+            self._records: list = header["records"]
+            self.rectLayers: List[Tuple[int, int, int]] = [
+                tuple(entry) for entry in header["rectLayers"]]
+            self.polygonLayers: List[Tuple[int, int, int]] = [
+                tuple(entry) for entry in header["polygonLayers"]]
+            self.arrays: Dict[str, np.ndarray] = {}
+            for name, (dtype, shape, offset) in header["arrays"].items():
+                count = int(np.prod(shape))
+                self.arrays[name] = np.frombuffer(
+                    self._buffer, dtype=dtype, count=count,
+                    offset=dataStart + offset).reshape(shape)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.arrays = {}
+        if isinstance(self._buffer, mmap.mmap):
+            try:
+                self._buffer.close()
+            except BufferError:
+                # Arrays handed out are still alive; the map goes with them.
+                pass
+        self._buffer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def jsonRecords(self) -> list:
+        """Records kept as JSON, in file order. The view header comes first."""
+        return [record for _, record in self._records]
+
+    @staticmethod
+    def _layerSlice(layers, layer: Optional[int]) -> slice:
+        if layer is None:
+            return slice(0, layers[-1][2] if layers else 0)
+        for layerNumber, start, stop in layers:
+            if layerNumber == layer:
+                return slice(start, stop)
+        return slice(0, 0)
+
+    def rects(self, layer: Optional[int] = None) -> np.ndarray:
+        """(n, 4) x1, y1, x2, y2 rows of the rects on layer, or of all rects."""
+        return self.arrays["rectCoords"][self._layerSlice(self.rectLayers, layer)]
+
+    def polygons(self, layer: Optional[int] = None) -> List[np.ndarray]:
+        """(n, 2) point arrays of the polygons on layer, or of all polygons."""
+        rows = self._layerSlice(self.polygonLayers, layer)
+        starts = self.arrays["polygonStarts"]
+        points = self.arrays["polygonCoords"]
+        return [points[starts[row]:starts[row + 1]]
+                for row in range(rows.start, rows.stop)]
+
+    def columnRecords(self):
+        """
+        Yield (kind, layer, coordinates, angle, flip, flags, index) for every
+        rect and polygon row, with plain Python values. Rect coordinates are
+        (x1, y1, x2, y2), polygon coordinates a list of (x, y) pairs.
+        """
+        arrays = self.arrays
+        for kind, layers in (("Rect", self.rectLayers),
+                             ("Polygon", self.polygonLayers)):
+            prefix = kind.lower()
+            attrs = arrays[f"{prefix}Attrs"]
+            flags = arrays[f"{prefix}Flags"]
+            order = arrays[f"{prefix}Order"]
+            if kind == "Rect":
+                coords = arrays["rectCoords"]
+            else:
+                starts = arrays["polygonStarts"]
+                points = arrays["polygonCoords"]
+            for layer, start, stop in layers:
+                if kind == "Rect":
+                    rows = coords[start:stop].tolist()
+                else:
+                    pointRows = points[starts[start]:starts[stop]].tolist()
+                    offsets = (starts[start:stop + 1] - starts[start]).tolist()
+                    rows = [pointRows[offsets[row]:offsets[row + 1]]
+                            for row in range(stop - start)]
+                for row, (angle, flipX, flipY), flag, index in zip(
+                        rows, attrs[start:stop].tolist(),
+                        flags[start:stop].tolist(), order[start:stop].tolist()):
+                    yield kind, layer, row, angle, (flipX, flipY), flag, index
+
+    def toRecords(self) -> list:
+        """The records of the equivalent layout JSON array."""
+        records = [None] * self.count
+        for index, record in self._records:
+            records[index] = record
+        arrays = self.arrays
+        for layer, start, stop in self.rectLayers:
+            coords = arrays["rectCoords"][start:stop]
+            flags = arrays["rectFlags"][start:stop]
+            attrs = arrays["rectAttrs"][start:stop]
+            topLefts = _jsonValues(coords[:, :2], flags & FLOAT_COORDS)
+            bottomRights = _jsonValues(coords[:, 2:], flags & FLOAT_COORDS)
+            angles = _jsonValues(attrs[:, 0], flags & FLOAT_ANGLE)
+            for index, topLeft, bottomRight, angle, flip in zip(
+                    arrays["rectOrder"][start:stop].tolist(), topLefts, bottomRights,
+                    angles, attrs[:, 1:].tolist()):
+                records[index] = {"type": "Rect", "tl": topLeft, "br": bottomRight,
+                                  "ang": angle, "ln": layer, "fl": flip}
+        starts = arrays["polygonStarts"]
+        for layer, start, stop in self.polygonLayers:
+            flags = arrays["polygonFlags"][start:stop]
+            attrs = arrays["polygonAttrs"][start:stop]
+            offsets = (starts[start:stop + 1] - starts[start]).tolist()
+            pointFlags = np.repeat(flags & FLOAT_COORDS, np.diff(offsets))
+            points = _jsonValues(
+                arrays["polygonCoords"][starts[start]:starts[stop]], pointFlags)
+            angles = _jsonValues(attrs[:, 0], flags & FLOAT_ANGLE)
+            for row, (index, angle, flip) in enumerate(zip(
+                    arrays["polygonOrder"][start:stop].tolist(), angles,
+                    attrs[:, 1:].tolist())):
+                records[index] = {"type": "Polygon",
+                                  "ps": points[offsets[row]:offsets[row + 1]],
+                                  "ln": layer, "ang": angle, "fl": flip}
+        return records
+
+
+def _jsonValues(values: np.ndarray, floatRows: np.ndarray) -> list:
+    """values as nested lists, with the flagged rows as floats."""
+    if not floatRows.any():
+        return values.tolist()
+    if floatRows.all():
+        return values.astype(np.float64).tolist()
+    result = values.astype(object)
+    rows = floatRows.astype(bool)
+    result[rows] = values[rows].astype(np.float64).astype(object)
+    return result.tolist()
+
+
+def readLayoutFile(filePath) -> list:
+    """Return the records of a layout file in either format as a JSON array."""
+    if isLayoutBinary(filePath):
+        with layoutBinaryFile(filePath) as layoutFile:
+            return layoutFile.toRecords()
+    with open(filePath, "rb") as file:
+        return orjson.loads(file.read())
+
+
+def convertLayoutFile(sourcePath, targetPath, binary: bool = True) -> None:
+    """Write the layout file at sourcePath to targetPath as binary or JSON."""
+    writeLayoutFile(targetPath, readLayoutFile(sourcePath), binary)
+
+
+def writeLayoutFile(targetPath, records: list, binary: bool = True) -> None:
+    """Replace the layout file at targetPath with records as binary or JSON."""
+    tempPath = f"{targetPath}.tmp"
+    try:
+        with open(tempPath, "wb") as file:
+            if binary:
+                writeLayoutBinary(file, records)
+            else:
+                file.write(orjson.dumps(records))
+        os.replace(tempPath, targetPath)
+    finally:
+        if os.path.exists(tempPath):
+            os.unlink(tempPath)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in ("binary", "json"):
+        print("Usage: python layoutBinary.py binary|json <source> <target>")
+        sys.exit(1)
+    convertLayoutFile(sys.argv[2], sys.argv[3], sys.argv[1] == "binary")
@@ -9,7 +9,6 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 ##
 
-import inspect
 import json
 from typing import Dict, Any
 
@@ -149,9 +148,6 @@ class layoutEncoder(json.JSONEncoder):
         }
 
     def _encodePcell(self, item) -> Dict[str, Any]:
-        init_args = inspect.signature(item.__class__.__init__).parameters
-        args_used = [param for param in init_args if (param != "self")]
-        argDict = {arg: getattr(item, arg) for arg in args_used if hasattr(item, arg)}
         return {
             "type": "Pcell",
             "lib": item.libraryName,
@@ -162,7 +158,7 @@ class layoutEncoder(json.JSONEncoder):
             "loc": item.pos().toPoint().toTuple(),
             "ang": item.angle,
             "fl": item.flipTuple,
-            "params": argDict,
+            "params": item.pcellParams(),
         }
 
     @staticmethod
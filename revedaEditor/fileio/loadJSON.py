@@ -13,7 +13,6 @@
 # import pathlib
 
 import functools
-import json
 import pathlib
 from typing import Any, Dict, List, Optional, Union
 
@@ -29,6 +28,8 @@ import revedaEditor.common.labels as lbl
 import revedaEditor.common.layoutShapes as lshp
 import revedaEditor.common.net as net
 import revedaEditor.common.shapes as shp
+from revedaEditor.common.fileCache import designCache, fileStamp
+import revedaEditor.fileio.layoutBinary as lbin
 import revedaEditor.fileio.symbolEncoder as se
 from revedaEditor.backend.pdkLoader import importPDKModule
 
@@ -36,9 +37,8 @@ laylyr = importPDKModule('layoutLayers')
 pcells = importPDKModule('pcells')
 fabproc = importPDKModule('process')
 
-def clear_symbol_cache():
-    """Clear the symbol JSON loading cache."""
-    schematicItems._load_sym_json.cache_clear()
+# Estimated memory of one layout shape item in a cached master cell.
+MASTER_SHAPE_SIZE = 1024
 
 
 class symbolItems:
@@ -206,16 +206,6 @@ class schematicItems:
         self.libraryDict = scene.libraryDict
         self.snapTuple = scene.snapTuple
 
-    @staticmethod
-    @functools.lru_cache(maxsize=256)
-    def _load_sym_json(file_path_str: str):
-        """Cache symbol file contents keyed by path to avoid repeated I/O for repeated cells."""
-        try:
-            with open(file_path_str, "rb") as f:
-                return orjson.loads(f.read())
-        except (orjson.JSONDecodeError, FileNotFoundError, OSError):
-            return None
-
     def create(self, item: dict):
         if isinstance(item, dict):
             match item["type"]:
@@ -321,7 +311,7 @@ class schematicItems:
             else:
                 # load json file and create shapes
                 file_path_str = str(file)
-                jsonItems = self._load_sym_json(file_path_str)
+                jsonItems = designCache().getJson(file_path_str)
                 if jsonItems is None:
                     self.scene.logger.error("Error: Invalid or missing Symbol file")
                     return None
@@ -391,44 +381,6 @@ class schematicItems:
         return rectItem
 
 
-class PCellCache:
-    _instance = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(PCellCache, cls).__new__(cls)
-            cls._instance.layout_file_cache = {}
-        return cls._instance
-
-    @classmethod
-    @functools.lru_cache(maxsize=100)
-    def getPCellDef(cls, file_path: str) -> dict:
-        try:
-            with open(file_path, "r") as temp:
-                return json.load(temp)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
-
-    @classmethod
-    @functools.lru_cache(maxsize=100)
-    def getPCellClass(cls, pcell_class_name: str) -> Any:
-        return pcells.pcells.get(pcell_class_name)
-
-    @classmethod
-    def getLayoutFileContents(cls, file_path: str) -> List:
-        return cls._instance.layout_file_cache.get(file_path)
-
-    @classmethod
-    def setLayoutFileContents(cls, file_path: str, contents: List):
-        cls._instance.layout_file_cache[file_path] = contents
-
-    @classmethod
-    def clear_caches(cls):
-        cls.getPCellDef.cache_clear()
-        cls.getPCellClass.cache_clear()
-        cls._instance.layout_file_cache.clear()
-
-
 class layoutItems:
     def __init__(self, scene):
         self.scene = scene
@@ -438,7 +390,8 @@ class layoutItems:
         self.snapTuple = scene.snapTuple
         self.rulerWidth = scene.rulerWidth
         self.rulerTickGap = scene.rulerTickGap
-        self.cache = PCellCache()
+        # masters already validated during this batch of item creation
+        self._masters = {}
 
         # Pre-create method mapping for faster dispatch
         self._creators = {
@@ -471,16 +424,6 @@ class layoutItems:
             return None
         return library_path
 
-    @staticmethod
-    @functools.lru_cache(maxsize=128)
-    def _load_json_file(file_path_str):
-        """Cached JSON file loading with error handling"""
-        try:
-            with open(file_path_str, "rb") as f:
-                return orjson.loads(f.read())
-        except (orjson.JSONDecodeError, FileNotFoundError):
-            return None
-
     def _set_common_attrs(self, obj, item):
         """Set common attributes for layout objects"""
         obj.angle = item.get("ang", 0)
@@ -492,7 +435,7 @@ class layoutItems:
             return None
 
         file_path = library_path / item["cell"] / f"{item['view']}.json"
-        pcell_def = self._load_json_file(str(file_path))
+        pcell_def = designCache().getJson(file_path)
         if not pcell_def or pcell_def[0].get("cellView") != "pcell":
             self.scene.logger.error("Not a PCell cell")
             return None
@@ -518,37 +461,70 @@ class layoutItems:
             self.scene.logger.error(f"Error creating PCell instance: {e}")
             return None
 
-    def createLayoutInstance(self, item):
-        library_path = self._get_library_path(item["lib"])
+    def getLayoutMaster(
+            self, lib_name: str, cell_name: str, view_name: str
+    ) -> Optional[lshp.layoutMasterCell]:
+        """Return the shared master of a layout cell, building it on first use."""
+        key = (lib_name, cell_name, view_name)
+        master = self._masters.get(key)
+        if master is not None:
+            return master
+
+        library_path = self._get_library_path(lib_name)
         if not library_path:
             return None
+        file_path_str = str(library_path / cell_name / f"{view_name}.json")
+
+        # Libraries of the same name may live at different paths.
+        cacheKey = ("master", file_path_str)
+        master = designCache().load(
+            cacheKey, file_path_str, self._buildLayoutMaster, self._masterSize)
+        if master is not None and not master.isCurrent():
+            # A cell placed in this one was saved after the master was built.
+            designCache().invalidate(cacheKey)
+            master = designCache().load(
+                cacheKey, file_path_str, self._buildLayoutMaster, self._masterSize)
+        if master is None:
+            return None
+        self._masters[key] = master
+        return master
 
-        file_path = library_path / item["cell"] / f"{item['view']}.json"
-        file_path_str = str(file_path)
-
-        # Use cache
-        file_contents = self.cache.getLayoutFileContents(file_path_str)
-        if file_contents is None:
-            file_contents = self._load_json_file(file_path_str)
-            if file_contents is None:
-                return None
-            self.cache.setLayoutFileContents(file_path_str, file_contents)
-
-        # Create shapes with cached factory and pre-allocated list
-        shapes_data = file_contents[2:]
-        item_shapes = []
-        item_shapes_append = item_shapes.append  # Cache method
+    @staticmethod
+    def _masterSize(master: lshp.layoutMasterCell, stamp) -> int:
+        return len(master.shapes) * MASTER_SHAPE_SIZE
 
-        for shape in shapes_data:
+    def _buildLayoutMaster(self, file_path_str: str) -> Optional[lshp.layoutMasterCell]:
+        stamp = fileStamp(file_path_str)
+        layout_file = None
+        try:
+            if lbin.isLayoutBinary(file_path_str):
+                layout_file = lbin.layoutBinaryFile(file_path_str)
+                file_contents = layout_file.jsonRecords()
+            else:
+                with open(file_path_str, "rb") as f:
+                    file_contents = orjson.loads(f.read())
+        except (orjson.JSONDecodeError, OSError, ValueError):
+            return None
+
+        item_shapes = []
+        for shape in file_contents[2:]:
             try:
-                created_shape = self.create(
-                    shape)  # Reuse self instead of creating new instance
+                created_shape = self.create(shape)
                 if created_shape:
-                    item_shapes_append(created_shape)
+                    item_shapes.append(created_shape)
             except Exception:
                 pass  # Skip logging for performance
+        if layout_file is not None:
+            with layout_file:
+                item_shapes.extend(self.createColumnShapes(layout_file))
+        return lshp.layoutMasterCell(item_shapes, {file_path_str: stamp})
+
+    def createLayoutInstance(self, item):
+        master = self.getLayoutMaster(item["lib"], item["cell"], item["view"])
+        if master is None:
+            return None
 
-        instance = lshp.layoutInstance(item_shapes)
+        instance = lshp.layoutInstance([], master)
         loc = item["loc"]
         instance.libraryName = item["lib"]
         instance.cellName = item["cell"]
@@ -605,6 +581,21 @@ class layoutItems:
         self._set_common_attrs(pin, item)
         return pin
 
+    def createColumnShapes(self, layout_file: lbin.layoutBinaryFile) -> list:
+        """Create the rects and polygons held in the columns of a binary file."""
+        shapes = []
+        layers = laylyr.pdkAllLayers
+        for kind, ln, row, angle, flip, flags, _ in layout_file.columnRecords():
+            if kind == "Rect":
+                shape = lshp.layoutRect(QPoint(row[0], row[1]),
+                                        QPoint(row[2], row[3]), layers[ln])
+            else:
+                shape = lshp.layoutPolygon([QPoint(x, y) for x, y in row], layers[ln])
+            shape.angle = float(angle) if flags & lbin.FLOAT_ANGLE else angle
+            shape.flipTuple = flip
+            shapes.append(shape)
+        return shapes
+
     @functools.lru_cache(maxsize=64)
     def _create_polygon_points(self, points_tuple):
         """Cache polygon point creation for repeated patterns"""
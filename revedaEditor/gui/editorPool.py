@@ -0,0 +1,80 @@
+#
+# Revolution EDA
+#
+# Copyright (c) 2026 Revolution Semiconductor
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0.
+# If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+##
+
+"""Hidden editor windows kept for going down the design hierarchy again.
+
+Going up from an editor hides its window instead of closing it, and
+``editorPool`` keeps it under its (library, cell, view) name. Opening the same
+cell view again, with Go Down or from the library browser, shows the kept
+window with its scene as it was left instead of loading the design from disk.
+A kept editor is only reused while its file, and the files of the symbols or
+layout cells placed in it, are unchanged on disk since it was hidden. The
+least recently hidden editors are released once more than ``maxEditors`` are
+kept.
+"""
+
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from revedaEditor.common.fileCache import FileStamp, fileStamp
+
+DEFAULT_EDITORS = 8
+# (path, stamp) of each design file of a kept editor when it was hidden
+DesignStamps = Tuple[Tuple[object, Optional[FileStamp]], ...]
+
+
+class editorPool:
+    def __init__(self, maxEditors: int = DEFAULT_EDITORS):
+        self.maxEditors = maxEditors
+        # view name tuple -> (editor, stamps of its design files)
+        self._editors: OrderedDict[Hashable, Tuple[object, DesignStamps]] = (
+            OrderedDict())
+
+    def __len__(self) -> int:
+        return len(self._editors)
+
+    def __contains__(self, viewNameT: Hashable) -> bool:
+        return viewNameT in self._editors
+
+    def park(self, viewNameT: Hashable, editor) -> None:
+        """Keep a hidden editor whose design has been saved to editor.file."""
+        previous = self._editors.pop(viewNameT, None)
+        if previous is not None and previous[0] is not editor:
+            self._release(previous[0])
+        self._editors[viewNameT] = (editor, tuple(
+            (file, fileStamp(file)) for file in editor.designFiles()))
+        while len(self._editors) > self.maxEditors:
+            _, (oldEditor, _) = self._editors.popitem(last=False)
+            self._release(oldEditor)
+
+    def take(self, viewNameT: Hashable):
+        """
+        Remove and return the editor kept for the view, or None if there is
+        none or one of its design files was changed since it was hidden.
+        """
+        entry = self._editors.pop(viewNameT, None)
+        if entry is None:
+            return None
+        editor, stamps = entry
+        if any(fileStamp(file) != stamp for file, stamp in stamps):
+            self._release(editor)
+            return None
+        return editor
+
+    def clear(self) -> None:
+        editors, self._editors = self._editors, OrderedDict()
+        for editor, _ in editors.values():
+            self._release(editor)
+
+    @staticmethod
+    def _release(editor) -> None:
+        # Kept editors were saved when they were hidden; no close handling.
+        editor.deleteLater()
@@ -8,7 +8,6 @@
 # If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 ##
-from collections import Counter
 
 from PySide6.QtCore import (
     QLine,
@@ -469,30 +468,8 @@ class schematicView(editorView):
     def drawBackground(self, painter, rect):
         super().drawBackground(painter, rect)
 
-        # Early exit for large views to avoid performance issues
-        if (self._right - self._left) > 2000 and (
-                self._bottom - self._top) > 2000:
-            return
-
-        # Get nets in view with type filtering
-        netsInView = [
-            item
-            for item in self.viewScene.items(rect)
-            if isinstance(item, net.schematicNet)
-        ]
-
-        if not netsInView:
-            return
-
-        # Collect and count endpoints in one pass
-        pointCounts = Counter()
-        for netItem in netsInView:
-            pointCounts.update(netItem.sceneEndPoints)
-
-        # Filter junction points (count >= 3) and draw
-        junctionPoints = [point for point, count in pointCounts.items() if
-                          count >= 3]
-
+        # Junctions are kept up to date by the scene's connectivity index.
+        junctionPoints = self.viewScene.connectivity.junctionsIn(rect)
         if junctionPoints:
             painter.setPen(schlyr.wirePen)
             painter.setBrush(schlyr.wireBrush)
@@ -1074,10 +1074,52 @@ class editorWindow(QMainWindow):
         dlg.show()
 
     def goUpHierarchy(self):
-        self.saveCell()
-        if self.parentEditor is not None:
-            self.parentEditor.raise_()
-        self.close()
+        """
+        Return to the parent editor. The window is hidden and kept in the
+        editor pool instead of being closed, so going down into this cell view
+        again shows it as it was left. The cell is saved and the parent
+        reloaded only if the scene was modified.
+        """
+        scene = self.centralW.scene
+        modified = scene.savedRecords.isModified
+        if modified:
+            self.saveCell()
+        parentEditor = self.parentEditor
+        self.parentEditor = None
+        self.parentObj = None
+        if parentEditor is not None:
+            if modified:
+                parentScene = parentEditor.centralW.scene
+                parentScene.reloadScene()
+                if hasattr(parentScene, 'reapplyProbesAfterReload'):
+                    parentScene.reapplyProbesAfterReload()
+            parentEditor.raise_()
+        if hasattr(scene, 'clearLocalProbes'):
+            scene.clearLocalProbes()
+        cellViewNameTuple = ddef.viewNameTuple(self.libName, self.cellName,
+                                               self.viewName)
+        self.appMainW.openViews.pop(cellViewNameTuple, None)
+        self.hide()
+        self.appMainW.editorPool.park(cellViewNameTuple, self)
+
+    def designFiles(self) -> list:
+        """The file of the cell view and the files of the cells placed in it."""
+        return [self.file, *self.centralW.scene.dependencyFiles()]
+
+    def leaveHierarchy(self):
+        """
+        Undo what Go Down set on this editor: its parent, the Go Up button and
+        a read-only open, so that a kept editor shown again from the editor
+        pool starts as a top level editor.
+        """
+        self.parentEditor = None
+        self.parentObj = None
+        for toolbar in self.findChildren(QToolBar):
+            toolbar.removeAction(self.goUpAction)
+        scene = self.centralW.scene
+        scene.readOnly = self.readOnlyCellAction.isChecked()
+        if hasattr(scene, 'hierarchyTrail'):
+            scene.hierarchyTrail = ""
 
     def fitToWindow(self):
         self.centralW.scene.fitItemsInView()
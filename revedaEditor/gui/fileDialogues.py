@@ -559,19 +559,20 @@ class importCellDialogue(QDialog):
 
         # Handle initial cell names
         try:
+            libItem = libm.getLibItem(self._model, self.libNamesCB.currentText())
             if self.file_type == "Verilog-A":
                 try:
                     initialCellNames = [
-                        self._model.item(0).child(i).cellName
-                        for i in range(self._model.item(0).rowCount())
+                        libItem.child(i).cellName
+                        for i in range(libItem.rowCount())
                     ]
                 except Exception as e:
                     initialCellNames = []
                     print(f'No libraries could be found.')
             else:  # Spice
                 initialCellNames = [
-                    self._model.item(0).child(i).cellName
-                    for i in range(self._model.item(0).rowCount())
+                    libItem.child(i).cellName
+                    for i in range(libItem.rowCount())
                 ]
         except (AttributeError, IndexError):
             initialCellNames = []
@@ -598,12 +599,10 @@ class importCellDialogue(QDialog):
         self.setLayout(mainLayout)
 
     def changeCells(self):
-        selectedLibItemRow = self._model.findItems(self.libNamesCB.currentText())[
-            0
-        ].row()
+        libItem = libm.getLibItem(self._model, self.libNamesCB.currentText())
         libCellNames = [
-            self._model.item(selectedLibItemRow).child(i).cellName
-            for i in range(self._model.item(selectedLibItemRow).rowCount())
+            libItem.child(i).cellName
+            for i in range(libItem.rowCount())
         ]
         self.cellNamesCB.clear()
         self.cellNamesCB.addItems(libCellNames)
@@ -35,6 +35,7 @@ import revedaEditor.backend.dataDefinitions as ddef
 import revedaEditor.backend.libBackEnd as libb
 import revedaEditor.backend.libraryMethods as libm
 import revedaEditor.backend.libraryModelView as lmview
+import revedaEditor.common.layoutShapes as lshp
 import revedaEditor.gui.editorViews as edv
 import revedaEditor.gui.editorWindow as edw
 import revedaEditor.gui.fileDialogues as fd
@@ -532,7 +533,7 @@ class layoutEditor(edw.editorWindow):
 
         GDS cell naming conventions (from exportGDS.py):
           - Regular instances: {libraryName}_{cellName}_{viewName}
-          - Pcells: {libraryName}_{className}_{params}_{counter}
+          - Pcells: {libraryName}_{className}_{params}
 
         Returns the QTransform of the first matching instance, or None.
         """
@@ -700,20 +701,21 @@ class layoutContainer(edw.editorContainer):
         selectedLayer = self.findSelectedLayer(layerName, layerPurpose)
         selectedLayer.selectable = layerSelectable
 
-        for item in self.scene.items():
-            if (
-                hasattr(item, "layer")
-                and item.layer == selectedLayer
-                and item.parentItem() is None
-            ):
+        for item in self.scene.layerRegistry.items(selectedLayer.name,
+                                                   selectedLayer.purpose):
+            if item.parentItem() is None and not isinstance(item, lshp.layoutInstance):
                 item.setEnabled(layerSelectable)
 
     def layerVisibleChange(self, layerName: str, layerPurpose: str, layerVisible: bool):
         selectedLayer = self.findSelectedLayer(layerName, layerPurpose)
         selectedLayer.visible = layerVisible
 
-        for item in self.scene.items():
-            if hasattr(item, "layer") and item.layer == selectedLayer:
+        for item in self.scene.layerRegistry.items(selectedLayer.name,
+                                                   selectedLayer.purpose):
+            if isinstance(item, lshp.layoutInstance):
+                # master geometry is painted by the instance; refresh its cache.
+                item.update()
+            else:
                 item.setVisible(layerVisible)
 
 
@@ -865,15 +867,9 @@ class lswWindow(QWidget):
         self._proxyModel.setUsedLayersOnly(checked)
 
     def _getUsedLayerRows(self) -> set:
-        """Scan the layout scene and return source-model rows for layers that
-        have at least one shape on them (including inside instances)."""
-        scene = self.lswTable.layoutScene
-        # Collect (name, purpose) tuples — always hashable
-        usedLayerKeys: set = set()
-        for item in scene.items():
-            if hasattr(item, "layer"):
-                layer = item.layer
-                usedLayerKeys.add((layer.name, layer.purpose))
+        """Return source-model rows for layers that have at least one shape on
+        them (including inside instances)."""
+        usedLayerKeys = self.lswTable.layoutScene.layerRegistry
 
         # Map used layer keys back to source model row indices
         sourceModel = self._proxyModel.sourceModel()
@@ -26,6 +26,7 @@ from PySide6.QtGui import (
 from PySide6.QtWidgets import (QTableView, QStyledItemDelegate,
                                QStyle)
 
+import revedaEditor.common.layoutShapes as lshp
 from revedaEditor.backend.pdkLoader import importPDKModule
 
 fabproc = importPDKModule('process')
@@ -33,7 +34,6 @@ laylyr = importPDKModule('layoutLayers')
 
 
 class layerDataModel(QStandardItemModel):
-    _file_content_cache = {}
     _pixmap_cache = {}
 
     def __init__(self, data: list):
@@ -95,17 +95,14 @@ class layerDataModel(QStandardItemModel):
 
     @classmethod
     def readFileContent(cls, filePath):
-        if filePath not in cls._file_content_cache:
-            try:
-                with open(filePath, "r") as file:
-                    cls._file_content_cache[filePath] = file.read()
-            except FileNotFoundError:
-                print(f"Error: Stipple not found: {filePath}")
-                return ""
-            except Exception as e:
-                print(f"Error reading Stipple file {filePath}: {e}")
-                return ""
-        return cls._file_content_cache[filePath]
+        try:
+            return lshp.textureCache.readFileContent(filePath)
+        except FileNotFoundError:
+            print(f"Error: Stipple not found: {filePath}")
+            return ""
+        except Exception as e:
+            print(f"Error reading Stipple file {filePath}: {e}")
+            return ""
 
     @classmethod
     def createImage(cls, filePath: Path, color: QColor, scale: int = 1):
@@ -258,8 +255,9 @@ class layerViewTable(QTableView):
             for layer in laylyr.pdkAllLayers:
                 layer.selectable = selectable
             # Update scene items selectability
-            for item in self.layoutScene.items():
-                if item.parentItem() is None and hasattr(item, 'layer'):
+            for item in self.layoutScene.layerRegistry.allItems():
+                if item.parentItem() is None and not isinstance(
+                        item, lshp.layoutInstance):
                     item.setEnabled(selectable)
 
         for row in range(self._model.rowCount()):
@@ -247,7 +247,7 @@ class lvsResultsDialogue(QDialog):
         """
         try:
             scene = schematic_editor.centralW.scene
-            scene.nameSceneNets()
+            scene.updateNetNames()
             nets_set = scene.findSceneNetsSet()
             seen_names: set[str] = set()
             result = []
@@ -275,9 +275,8 @@ class lvsResultsDialogue(QDialog):
         """
         try:
             scene = schematic_editor.centralW.scene
-            scene.nameSceneNets()
+            scene.updateNetNames()
             symbol_set = scene.findSceneSymbolSet()
-            scene.generatePinNetMap(symbol_set)
             seen_names: set[str] = set()
             result = []
             for sym in sorted(symbol_set, key=lambda s: s.instanceName or ''):
@@ -48,6 +48,7 @@ import revedaEditor.gui.libraryBrowser as libw
 import revedaEditor.gui.pythonConsole as pcon
 import revedaEditor.gui.revinit as revinit
 import revedaEditor.gui.stippleEditor as stip
+from revedaEditor.gui.editorPool import editorPool
 from revedaEditor.backend.pdkLoader import importPDKModule
 from revedaEditor.backend.projectManager import ProjectManager
 
@@ -153,6 +154,7 @@ class MainWindow(QMainWindow):
         self.switchViewList: List[str] = self.VIEW_TYPES["switch"]
         self.stopViewList: List[str] = self.VIEW_TYPES["stop"]
         self.openViews: Dict = {}
+        self.editorPool = editorPool()
         self._restartingForProjectSwitch: bool = False
 
     def _initPaths(self) -> None:
@@ -653,6 +655,7 @@ class MainWindow(QMainWindow):
             for window in list(self.openViews.values()):
                 window.close()
             self.openViews.clear()
+            self.editorPool.clear()
             event.accept()
             return
 
@@ -671,6 +674,7 @@ class MainWindow(QMainWindow):
             for window in list(self.openViews.values()):
                 window.close()
             self.openViews.clear()
+            self.editorPool.clear()
             self.app.closeAllWindows()
             event.accept()
         else:
@@ -291,7 +291,7 @@ class schematicEditor(edw.editorWindow):
         self.centralW.scene.renumberInstances()
 
     def checkSaveCell(self):
-        self.centralW.scene.nameSceneNets()
+        self.centralW.scene.updateNetNames()
         self.centralW.scene.saveSchematic(self.file)
         self.centralW.scene.reloadScene()
         if hasattr(self.centralW.scene, 'reapplyProbesAfterReload'):
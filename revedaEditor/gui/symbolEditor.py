@@ -156,6 +156,13 @@ class symbolEditor(edw.editorWindow):
     def saveCell(self):
         self.centralW.scene.saveSymbolCell(self.file)
 
+    def goUpHierarchy(self):
+        modified = self.centralW.scene.savedRecords.isModified
+        super().goUpHierarchy()
+        if modified:
+            self.appMainW.symbolChanged.emit(self.libName, self.cellName,
+                                             self.viewName)
+
     def createRectClick(self, s):
         self.centralW.scene.editModes.setMode("drawRect")
         self.messageLine.setText("Press left mouse button for the first point.")
@@ -0,0 +1,469 @@
+# SPDX-License-Identifier: MPL-2.0
+#
+# Copyright (c) 2024-2026 Revolution Semiconductor (Registered in the Netherlands)
+# This Source Code Form is subject to the terms of the Mozilla Public License, v. 2.0.
+# If a copy of the MPL was not distributed with this file, You can obtain one at
+# https://mozilla.org/MPL/2.0/.
+#
+# Add-ons and extensions developed for this software may be distributed
+# under their own separate licenses.
+
+"""GUI-free schematic connectivity for hierarchical netlisting.
+
+The netlisters used to construct a full ``schematicEditor`` (window, scene and
+graphics items) for every sub-schematic they descend into, only to read back
+instance names, attributes and pin-to-net maps. This module extracts the same
+information directly from the schematic and symbol JSON files:
+
+* symbol pin locations are transformed by the instance location, rotation and
+  flip,
+* net connectivity is computed from wire end points with a hash index and a
+  union-find structure,
+* nets are named with the same priority as ``schematicScene.nameSceneNets``:
+  global pins, schematic pins, user set names and finally ``netN``.
+
+``netlistSymbol`` exposes the attributes the netlist formatters read from a
+``schematicSymbol`` (``libraryName``, ``cellName``, ``instanceName``,
+``symattrs``, ``labels``, ``pinNetMap``, ``netlistIgnore``) so that the
+existing Xyce, Spectre and VACASK line generators can be used unchanged.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import pathlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from revedaEditor.common.fileCache import designCache
+from revedaEditor.common.labels import evaluateLabel
+
+# Half size of the symbol pin square (see shp.symbolPin.PIN_WIDTH).
+SYMBOL_PIN_HALF = 5
+# Half extents of the schematic pin collision shape (see shp.schematicPin.shape).
+SCHEMATIC_PIN_HALF_WIDTH = 25
+SCHEMATIC_PIN_HALF_HEIGHT = 15
+# Side of the grid cells of the wire index used to find the wires at a pin.
+WIRE_CELL_SIZE = 100
+
+Point = Tuple[float, float]
+
+
+def _transformPoint(point: Point, origin: Point, angle: float,
+                    flipTuple: Tuple[int, int]) -> Point:
+    """Map a point from item coordinates to parent coordinates.
+
+    Mirrors QGraphicsItem: item transform (flip) first, then rotation, then
+    translation to the item position.
+    """
+    x = point[0] * flipTuple[0]
+    y = point[1] * flipTuple[1]
+    if angle:
+        radians = math.radians(angle)
+        cosA = round(math.cos(radians), 12)
+        sinA = round(math.sin(radians), 12)
+        x, y = x * cosA - y * sinA, x * sinA + y * cosA
+    return x + origin[0], y + origin[1]
+
+
+def _segmentIntersectsRect(p1: Point, p2: Point, left: float, top: float,
+                           right: float, bottom: float) -> bool:
+    """Liang-Barsky test for a line segment touching an axis aligned rectangle."""
+    dx = p2[0] - p1[0]
+    dy = p2[1] - p1[1]
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, p1[0] - left), (dx, right - p1[0]),
+                 (-dy, p1[1] - top), (dy, bottom - p1[1])):
+        if p == 0:
+            if q < 0:
+                return False
+        else:
+            t = q / p
+            if p < 0:
+                if t > t1:
+                    return False
+                t0 = max(t0, t)
+            else:
+                if t < t0:
+                    return False
+                t1 = min(t1, t)
+    return t0 <= t1
+
+
+def parseBusNotation(name: str) -> tuple[str, tuple[int, int]]:
+    """Parse 'name<0:5>' or 'name<3>' into base name and index range."""
+    if '<' not in name or '>' not in name:
+        return name, (0, 0)
+    baseName, rest = name.split('<', 1)
+    indexRange = rest.split('>')[0]
+    if ':' not in indexRange:
+        index = int(indexRange)
+        return baseName, (index, index)
+    start, end = map(int, indexRange.split(':'))
+    return baseName, (start, end)
+
+
+class netlistLabel:
+    """Symbol label value holder evaluated like ``symbolLabel.labelDefs``."""
+
+    __slots__ = ("labelName", "labelDefinition", "labelType", "labelValue",
+                 "labelText", "labelVisible")
+
+    def __init__(self, labelName: str, labelDefinition: str, labelType: str,
+                 labelValue: str = "", labelVisible: bool = False):
+        self.labelName = labelName
+        self.labelDefinition = labelDefinition
+        self.labelType = labelType
+        self.labelValue = labelValue
+        self.labelText = ""
+        self.labelVisible = labelVisible
+
+    def __repr__(self):
+        return f"netlistLabel({self.labelName}={self.labelValue})"
+
+    def labelDefs(self, parent: "netlistSymbol"):
+        """Evaluate label name, value and text for the label's parent instance."""
+        label = evaluateLabel(self.labelType, self.labelDefinition, self.labelValue,
+                              parent, parent.logger)
+        if label is not None:
+            self.labelName, self.labelText, self.labelValue = label
+
+
+class netlistSymbol:
+    """Lightweight stand-in for a ``schematicSymbol`` used by the netlisters."""
+
+    def __init__(self, libraryName: str, cellName: str, viewName: str,
+                 instanceName: str, counter: int = 0,
+                 netlistIgnore: bool = False,
+                 logger: Optional[logging.Logger] = None):
+        self.libraryName = libraryName
+        self.cellName = cellName
+        self.viewName = viewName
+        self.instanceName = instanceName
+        self.counter = counter
+        self.netlistIgnore = netlistIgnore
+        self.symattrs: Dict[str, str] = {}
+        self.labels: Dict[str, netlistLabel] = {}
+        # pinName: connection point in schematic coordinates
+        self.pinLocations: Dict[str, Point] = {}
+        self.pinNetMap: Dict[str, str] = {}
+        self.draft = False
+        self.logger = logger or logging.getLogger("reveda")
+
+    def __repr__(self):
+        return f"netlistSymbol({self.instanceName})"
+
+    @property
+    def pinOrderNames(self) -> List[str]:
+        """Pin names in netlist order, honouring the pinOrder attribute."""
+        pinOrder = self.symattrs.get("pinOrder")
+        if not pinOrder:
+            return list(self.pinLocations)
+        return [name.strip() for name in pinOrder.split(",")
+                if name.strip() in self.pinLocations]
+
+
+class _unionFind:
+    __slots__ = ("parent",)
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, index: int) -> int:
+        parent = self.parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def union(self, first: int, second: int):
+        rootFirst, rootSecond = self.find(first), self.find(second)
+        if rootFirst != rootSecond:
+            self.parent[rootSecond] = rootFirst
+
+
+class schematicNetlistData:
+    """Connectivity of a schematic cell view built straight from its JSON file.
+
+    Attributes:
+        libName, cellName, viewName: Identify the cell view.
+        symbols: Symbol instances in file order with ``pinNetMap`` filled in.
+        schematicPins: (pinName, pinDir) of schematic pins in file order.
+    """
+
+    def __init__(self, filePathObj: pathlib.Path, libraryDict: dict,
+                 libName: str = "", cellName: str = "", viewName: str = "",
+                 logger: Optional[logging.Logger] = None):
+        self.filePathObj = pathlib.Path(filePathObj)
+        self.libraryDict = libraryDict
+        self.libName = libName
+        self.cellName = cellName or self.filePathObj.parent.name
+        self.viewName = viewName or self.filePathObj.stem
+        self.logger = logger or logging.getLogger("reveda")
+        self.symbols: List[netlistSymbol] = []
+        self.schematicPins: List[Tuple[str, str]] = []
+        # (name, nameStrength, start, end)
+        self._nets: List[Tuple[str, int, Point, Point]] = []
+        # (pinName, position, angle)
+        self._schematicPinGeometry: List[Tuple[str, Point, float]] = []
+        # grid cell -> indices of the wires whose bounding box overlaps it
+        self._wireCells: Optional[Dict[Tuple[int, int], List[int]]] = None
+        self.netCounter = 0
+        self._load()
+        self.nameNets()
+
+    def __repr__(self):
+        return (f"schematicNetlistData({self.libName}/{self.cellName}/"
+                f"{self.viewName})")
+
+    @classmethod
+    def fromViewItem(cls, viewItem, libraryDict: dict,
+                     logger: Optional[logging.Logger] = None):
+        cellItem = viewItem.parent()
+        libItem = cellItem.parent() if cellItem is not None else None
+        return cls(viewItem.viewPath, libraryDict,
+                   libItem.libraryName if libItem is not None else "",
+                   cellItem.cellName if cellItem is not None else "",
+                   viewItem.viewName, logger)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        decodedData = designCache().getJson(self.filePathObj)
+        if not decodedData:
+            self.logger.error(f"Cannot read schematic file {self.filePathObj}")
+            return
+        for item in decodedData[2:]:
+            if not isinstance(item, dict):
+                continue
+            match item.get("type"):
+                case "sys":
+                    symbol = self._createSymbol(item)
+                    if symbol is not None:
+                        self.symbols.append(symbol)
+                case "scn":
+                    self._nets.append((item.get("nam", ""), item.get("ns", 0),
+                                       tuple(item["st"]), tuple(item["end"])))
+                case "scp":
+                    self.schematicPins.append((item["pn"], item["pd"]))
+                    self._schematicPinGeometry.append(
+                        (item["pn"], tuple(item["st"]), item.get("ang", 0)))
+
+    def _createSymbol(self, item: dict) -> Optional[netlistSymbol]:
+        symbol = netlistSymbol(item["lib"], item["cell"], item["view"],
+                               item["nam"], item.get("ic", 0),
+                               bool(item.get("ign", 0)), self.logger)
+        libraryPath = self.libraryDict.get(item["lib"])
+        symbolItems = None
+        if libraryPath is not None:
+            symbolFile = pathlib.Path(libraryPath).joinpath(
+                item["cell"], f'{item["view"]}.json')
+            symbolItems = designCache().getJson(symbolFile)
+        if symbolItems is None:
+            self.logger.warning(
+                f"{item['lib']}/{item['cell']}/{item['view']} cannot be found.")
+            symbol.draft = True
+            return symbol
+
+        location = tuple(item["loc"])
+        angle = item.get("ang", 0)
+        flipTuple = tuple(item.get("fl", (1, 1)))
+        for symbolItem in symbolItems[2:]:
+            match symbolItem.get("type"):
+                case "attr":
+                    symbol.symattrs[symbolItem["nam"]] = symbolItem["def"]
+                case "pin":
+                    pinPoint = _transformPoint(
+                        tuple(symbolItem["st"]), tuple(symbolItem["loc"]),
+                        symbolItem.get("ang", 0),
+                        tuple(symbolItem.get("fl", (1, 1))))
+                    symbol.pinLocations[symbolItem["nam"]] = _transformPoint(
+                        pinPoint, location, angle, flipTuple)
+                case "label":
+                    symbol.labels[symbolItem["nam"]] = netlistLabel(
+                        symbolItem["nam"], symbolItem["def"], symbolItem["lt"],
+                        symbolItem.get("val", ""), symbolItem.get("vis", False))
+
+        labelDict = item.get("ld", {})
+        for label in symbol.labels.values():
+            if label.labelName in labelDict:
+                label.labelValue = labelDict[label.labelName][0]
+        for label in symbol.labels.values():
+            label.labelDefs(symbol)
+        return symbol
+
+    # ------------------------------------------------------------------
+    # Connectivity
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _endPointKeys(point: Point) -> Iterable[Tuple[int, int]]:
+        """Hash keys within the one unit Manhattan tolerance of checkNetConnect."""
+        x, y = round(point[0]), round(point[1])
+        return ((x, y), (x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+
+    def _netGroups(self) -> Tuple[List[int], List[List[int]]]:
+        """Group net indices into connected components.
+
+        Returns the component root for every net and the component members.
+        """
+        unionFind = _unionFind(len(self._nets))
+        endPointIndex: Dict[Tuple[int, int], int] = {}
+        for index, (_, _, start, end) in enumerate(self._nets):
+            for point in (start, end):
+                for key in self._endPointKeys(point):
+                    other = endPointIndex.get(key)
+                    if other is not None:
+                        unionFind.union(other, index)
+                endPointIndex.setdefault((round(point[0]), round(point[1])),
+                                         index)
+        roots = [unionFind.find(index) for index in range(len(self._nets))]
+        groups: Dict[int, List[int]] = {}
+        for index, root in enumerate(roots):
+            groups.setdefault(root, []).append(index)
+        return roots, list(groups.values())
+
+    @staticmethod
+    def _cellRange(low: float, high: float) -> range:
+        return range(math.floor(low / WIRE_CELL_SIZE),
+                     math.floor(high / WIRE_CELL_SIZE) + 1)
+
+    def _wiresNear(self, left: float, top: float, right: float,
+                   bottom: float) -> List[int]:
+        """Indices of the wires whose grid cells overlap the rectangle, in order.
+
+        The wires are put in a grid of WIRE_CELL_SIZE cells on first use, so
+        finding the wires at all the pins of a schematic does not test every
+        pin against every wire.
+        """
+        if self._wireCells is None:
+            self._wireCells = {}
+            for index, (_, _, start, end) in enumerate(self._nets):
+                for cellX in self._cellRange(min(start[0], end[0]),
+                                             max(start[0], end[0])):
+                    for cellY in self._cellRange(min(start[1], end[1]),
+                                                 max(start[1], end[1])):
+                        self._wireCells.setdefault((cellX, cellY), []).append(index)
+        found = set()
+        for cellX in self._cellRange(left, right):
+            for cellY in self._cellRange(top, bottom):
+                found.update(self._wireCells.get((cellX, cellY), ()))
+        return sorted(found)
+
+    def _netsAtSymbolPin(self, point: Point) -> List[int]:
+        left, top = point[0] - SYMBOL_PIN_HALF, point[1] - SYMBOL_PIN_HALF
+        right, bottom = point[0] + SYMBOL_PIN_HALF, point[1] + SYMBOL_PIN_HALF
+        return [index for index in self._wiresNear(left, top, right, bottom)
+                if _segmentIntersectsRect(*self._nets[index][2:], left, top,
+                                          right, bottom)]
+
+    def _netsAtSchematicPin(self, position: Point, angle: float) -> List[int]:
+        connected = []
+        # Any rotation of the pin shape lies within the circle through its corners.
+        reach = math.hypot(SCHEMATIC_PIN_HALF_WIDTH, SCHEMATIC_PIN_HALF_HEIGHT)
+        for index in self._wiresNear(position[0] - reach, position[1] - reach,
+                                     position[0] + reach, position[1] + reach):
+            start, end = self._nets[index][2:]
+            # move the wire into the pin's frame; the pin shape is symmetric
+            # so flips can be ignored.
+            localStart = _transformPoint(
+                (start[0] - position[0], start[1] - position[1]), (0, 0),
+                -angle, (1, 1))
+            localEnd = _transformPoint(
+                (end[0] - position[0], end[1] - position[1]), (0, 0), -angle,
+                (1, 1))
+            if _segmentIntersectsRect(localStart, localEnd,
+                                      -SCHEMATIC_PIN_HALF_WIDTH,
+                                      -SCHEMATIC_PIN_HALF_HEIGHT,
+                                      SCHEMATIC_PIN_HALF_WIDTH,
+                                      SCHEMATIC_PIN_HALF_HEIGHT):
+                connected.append(index)
+        return connected
+
+    def nameNets(self):
+        """Name connected wire groups and fill ``pinNetMap`` of every symbol."""
+        roots, groups = self._netGroups()
+        groupNames: Dict[int, str] = {}
+
+        symbolPinNets: Dict[Tuple[int, str], List[int]] = {}
+        for symbolIndex, symbol in enumerate(self.symbols):
+            for pinName, point in symbol.pinLocations.items():
+                symbolPinNets[(symbolIndex, pinName)] = self._netsAtSymbolPin(
+                    point)
+
+        # 1. global pins
+        for (symbolIndex, pinName), netIndices in symbolPinNets.items():
+            if pinName.endswith("!"):
+                for netIndex in netIndices:
+                    self._setGroupName(groupNames, roots[netIndex], pinName,
+                                       compareBase=False)
+        # 2. schematic pins
+        for pinName, position, angle in self._schematicPinGeometry:
+            for netIndex in self._netsAtSchematicPin(position, angle):
+                self._setGroupName(groupNames, roots[netIndex], pinName,
+                                   compareBase=True)
+        # 3. user set net names
+        for netIndex, (name, strength, _, _) in enumerate(self._nets):
+            root = roots[netIndex]
+            if strength == 3 and name:
+                if root not in groupNames:
+                    groupNames[root] = name
+                elif groupNames[root] != name:
+                    self.logger.error(
+                        f"Net name conflict in {self.cellName}: "
+                        f"'{name}' vs '{groupNames[root]}'")
+        # 4. automatic names
+        netCounter = 0
+        for group in groups:
+            root = roots[group[0]]
+            if root not in groupNames:
+                groupNames[root] = f"net{netCounter}"
+                netCounter += 1
+
+        for symbolIndex, symbol in enumerate(self.symbols):
+            pinNetMap = {}
+            for pinName in symbol.pinLocations:
+                netIndices = symbolPinNets[(symbolIndex, pinName)]
+                if netIndices:
+                    pinNetMap[pinName] = groupNames[roots[netIndices[0]]]
+                else:
+                    pinNetMap[pinName] = f"dnet{netCounter}"
+                    netCounter += 1
+            symbol.pinNetMap = {pinName: pinNetMap[pinName] for pinName in
+                                symbol.pinOrderNames}
+        self.netCounter = netCounter
+        self._groupNames = groupNames
+        self._roots = roots
+
+    def _setGroupName(self, groupNames: Dict[int, str], root: int, name: str,
+                      compareBase: bool):
+        current = groupNames.get(root)
+        if current is None:
+            groupNames[root] = name
+            return
+        if compareBase:
+            if parseBusNotation(current)[0] == parseBusNotation(name)[0]:
+                return
+        elif current == name:
+            return
+        self.logger.error(
+            f"Net name conflict in {self.cellName}: '{current}' vs '{name}'")
+
+    def netNames(self) -> set[str]:
+        """Names of all wire groups in the schematic."""
+        return set(self._groupNames.values())
+
+
+def netlistSymbols(schematic) -> Iterable:
+    """Return the symbol instances of *schematic* with their pin-net maps.
+
+    Sub-schematics are read as ``schematicNetlistData`` which already carries
+    named nets; an open schematic editor is named through its scene.
+    """
+    if isinstance(schematic, schematicNetlistData):
+        return schematic.symbols
+    schematicScene = schematic.centralW.scene
+    schematicScene.updateNetNames()
+    return schematicScene.findSceneSymbolSet()
@@ -41,6 +41,7 @@ import revedaEditor.backend.dataDefinitions as ddef
 import revedaEditor.backend.libBackEnd as libb
 import revedaEditor.backend.libraryMethods as libm
 import revedaEditor.common.shapes as shp
+import revedaEditor.netlisting.schematicNetlistData as snd
 from revedaEditor.scenes.schematicScene import schematicScene
 
 if TYPE_CHECKING:
@@ -191,7 +192,8 @@ class spectreNetlist:
             for line in self.vahdlLines:
                 cirFile.write(f"{line}\n")
 
-    def collectSubcircuitContent(self, schematic: schematicEditor, content: list):
+    def collectSubcircuitContent(
+        self, schematic: schematicEditor | snd.schematicNetlistData, content: list):
         """Collect subcircuit content without writing to file.
 
         Traverses *schematic*, netlists each element, and recursively processes
@@ -201,12 +203,7 @@ class spectreNetlist:
             schematic: The schematic editor to collect content from.
             content: List to append netlist lines to.
         """
-        schematicScene = schematic.centralW.scene
-        schematicScene.nameSceneNets()
-        sceneSymbolSet = schematicScene.findSceneSymbolSet()
-        schematicScene.generatePinNetMap(sceneSymbolSet)
-
-        for elementSymbol in sceneSymbolSet:
+        for elementSymbol in snd.netlistSymbols(schematic):
             if elementSymbol.symattrs.get("NetlistIgnore") != "1" and (
                 not elementSymbol.netlistIgnore
             ):
@@ -227,11 +224,12 @@ class spectreNetlist:
                         if viewTuple not in self.netlistedViewsSet:
                             self.netlistedViewsSet.add(viewTuple)
                             schematicItem = libm.getViewItem(cellItem, netlistView)
-                            from revedaEditor.gui.schematicEditor import schematicEditor
-                            schematicObj = schematicEditor(
-                                schematicItem, self.libraryDict, self.libraryView
-                            )
-                            schematicObj.loadSchematic()
+                            if schematicItem is None:
+                                self._scene.logger.warning(
+                                    f"View {netlistView} not found for {elementSymbol.cellName}")
+                                continue
+                            schematicObj = snd.schematicNetlistData.fromViewItem(
+                                schematicItem, self.libraryDict, self._scene.logger)
                             expandedPinsString = self.expandPinNames(
                                 list(elementSymbol.pinNetMap.keys())
                             )
@@ -289,9 +287,8 @@ class spectreNetlist:
             self.subcircuitDefs.append(subcktDef)
         else:
             schScene = schematicEdObj.centralW.scene
-            schScene.nameSceneNets()
+            schScene.updateNetNames()
             sceneSymbolSet = schScene.findSceneSymbolSet()
-            schScene.generatePinNetMap(sceneSymbolSet)
             for elementSymbol in sceneSymbolSet:
                 self.processElementSymbol(elementSymbol, schematicEdObj, cirFile)
 
@@ -437,11 +434,8 @@ class spectreNetlist:
                             f"View {netlistView} not found for {elementSymbol.cellName}"
                         )
                         return
-                    from revedaEditor.gui.schematicEditor import schematicEditor
-                    schematicObj = schematicEditor(
-                        schematicItem, self.libraryDict, self.libraryView
-                    )
-                    schematicObj.loadSchematic()
+                    schematicObj = snd.schematicNetlistData.fromViewItem(
+                        schematicItem, self.libraryDict, self._scene.logger)
                     expandedPinsString = self.expandPinNames(
                         list(elementSymbol.pinNetMap.keys())
                     )
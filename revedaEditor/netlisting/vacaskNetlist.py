@@ -56,6 +56,7 @@ import revedaEditor.backend.dataDefinitions as ddef
 import revedaEditor.backend.libBackEnd as libb
 import revedaEditor.backend.libraryMethods as libm
 import revedaEditor.common.shapes as shp
+import revedaEditor.netlisting.schematicNetlistData as snd
 from revedaEditor.scenes.schematicScene import schematicScene
 
 if TYPE_CHECKING:
@@ -249,7 +250,8 @@ class vacaskNetlist:
             for line in self.vahdlLines:
                 cirFile.write(f"{line}\n")
 
-    def collectSubcircuitContent(self, schematic: schematicEditor, content: list):
+    def collectSubcircuitContent(
+        self, schematic: schematicEditor | snd.schematicNetlistData, content: list):
         """Collect subcircuit content without writing to file.
 
         Traverses *schematic*, netlists each element, and recursively processes
@@ -259,12 +261,7 @@ class vacaskNetlist:
             schematic: The schematic editor to collect content from.
             content: List to append netlist lines to.
         """
-        schematicScene = schematic.centralW.scene
-        schematicScene.nameSceneNets()
-        sceneSymbolSet = schematicScene.findSceneSymbolSet()
-        schematicScene.generatePinNetMap(sceneSymbolSet)
-
-        for elementSymbol in sceneSymbolSet:
+        for elementSymbol in snd.netlistSymbols(schematic):
             if elementSymbol.symattrs.get("NetlistIgnore") != "1" and (
                 not elementSymbol.netlistIgnore
             ):
@@ -292,11 +289,12 @@ class vacaskNetlist:
                         if viewTuple not in self.netlistedViewsSet:
                             self.netlistedViewsSet.add(viewTuple)
                             schematicItem = libm.getViewItem(cellItem, netlistView)
-                            from revedaEditor.gui.schematicEditor import schematicEditor
-                            schematicObj = schematicEditor(
-                                schematicItem, self.libraryDict, self.libraryView
-                            )
-                            schematicObj.loadSchematic()
+                            if schematicItem is None:
+                                self._scene.logger.warning(
+                                    f"View {netlistView} not found for {elementSymbol.cellName}")
+                                continue
+                            schematicObj = snd.schematicNetlistData.fromViewItem(
+                                schematicItem, self.libraryDict, self._scene.logger)
                             expandedPinsString = self.expandPinNames(
                                 list(elementSymbol.pinNetMap.keys())
                             )
@@ -363,9 +361,8 @@ class vacaskNetlist:
             self.subcircuitDefs.append(subcktDef)
         else:
             schScene = schematicEdObj.centralW.scene
-            schScene.nameSceneNets()
+            schScene.updateNetNames()
             sceneSymbolSet = schScene.findSceneSymbolSet()
-            schScene.generatePinNetMap(sceneSymbolSet)
             for elementSymbol in sceneSymbolSet:
                 self.processElementSymbol(elementSymbol, schematicEdObj, cirFile)
 
@@ -629,11 +626,8 @@ class vacaskNetlist:
                             f"View {netlistView} not found for {elementSymbol.cellName}"
                         )
                         return
-                    from revedaEditor.gui.schematicEditor import schematicEditor
-                    schematicObj = schematicEditor(
-                        schematicItem, self.libraryDict, self.libraryView
-                    )
-                    schematicObj.loadSchematic()
+                    schematicObj = snd.schematicNetlistData.fromViewItem(
+                        schematicItem, self.libraryDict, self._scene.logger)
                     expandedPinsString = self.expandPinNames(
                         list(elementSymbol.pinNetMap.keys())
                     )
@@ -30,6 +30,7 @@ import revedaEditor.backend.dataDefinitions as ddef
 import revedaEditor.backend.libBackEnd as libb
 import revedaEditor.backend.libraryMethods as libm
 import revedaEditor.common.shapes as shp
+import revedaEditor.netlisting.schematicNetlistData as snd
 from revedaEditor.scenes.schematicScene import schematicScene
 
 if TYPE_CHECKING:
@@ -148,7 +149,8 @@ class xyceNetlist:
             for line in self.includeLines:
                 cirFile.write(f"{line}\n")
 
-    def collectSubcircuitContent(self, schematic: schematicEditor, content):
+    def collectSubcircuitContent(
+        self, schematic: schematicEditor | snd.schematicNetlistData, content):
         """Collect subcircuit content without writing to file.
 
         This is used when building subcircuit definitions for hierarchical cells.
@@ -159,11 +161,7 @@ class xyceNetlist:
             schematic: The schematic editor to collect content from.
             content: List to append netlist lines to.
         """
-        schematicScene = schematic.centralW.scene
-        schematicScene.nameSceneNets()
-        sceneSymbolSet = schematicScene.findSceneSymbolSet()
-        schematicScene.generatePinNetMap(sceneSymbolSet)
-        for elementSymbol in sceneSymbolSet:
+        for elementSymbol in snd.netlistSymbols(schematic):
             # Check for ignore conditions based on mode (consistent with processElementSymbol)
             should_ignore = False
             if self._lvsMode:
@@ -191,10 +189,12 @@ class xyceNetlist:
                         if viewTuple not in self.netlistedViewsSet:
                             self.netlistedViewsSet.add(viewTuple)
                             schematicItem = libm.getViewItem(cellItem, netlistView)
-                            from revedaEditor.gui.schematicEditor import schematicEditor
-                            schematicObj = schematicEditor(schematicItem, self.libraryDict,
-                                                           self.libraryView)
-                            schematicObj.loadSchematic()
+                            if schematicItem is None:
+                                self._scene.logger.warning(
+                                    f"View {netlistView} not found for {elementSymbol.cellName}")
+                                continue
+                            schematicObj = snd.schematicNetlistData.fromViewItem(
+                                schematicItem, self.libraryDict, self._scene.logger)
                             expandedPinsString = self.expandPinNames(
                                 list(elementSymbol.pinNetMap.keys()))
                             subcktContent = []
@@ -236,9 +236,8 @@ class xyceNetlist:
 
             # Name nets and generate pin-net map first
             schematicScene = schematicEdObj.centralW.scene
-            schematicScene.nameSceneNets()
+            schematicScene.updateNetNames()
             sceneSymbolSet = schematicScene.findSceneSymbolSet()
-            schematicScene.generatePinNetMap(sceneSymbolSet)
 
             # Then get schematic pins
             schematicPinsSet = schematicScene.findSceneSchemPinsSet()
@@ -254,9 +253,8 @@ class xyceNetlist:
             self.subcircuitDefs.append(subcktDef)
         else:
             schematicScene = schematicEdObj.centralW.scene
-            schematicScene.nameSceneNets()  # name all nets in the schematic
+            schematicScene.updateNetNames()  # name all nets in the schematic
             sceneSymbolSet = schematicScene.findSceneSymbolSet()
-            schematicScene.generatePinNetMap(sceneSymbolSet)
             for elementSymbol in sceneSymbolSet:
                 self.processElementSymbol(elementSymbol, schematicEdObj, cirFile)
 
@@ -397,10 +395,8 @@ class xyceNetlist:
                     if schematicItem is None:
                         self._scene.logger.warning(f"View {netlistView} not found for {elementSymbol.cellName}")
                         return
-                    from revedaEditor.gui.schematicEditor import schematicEditor
-                    schematicObj = schematicEditor(schematicItem, self.libraryDict,
-                                                   self.libraryView)
-                    schematicObj.loadSchematic()
+                    schematicObj = snd.schematicNetlistData.fromViewItem(
+                        schematicItem, self.libraryDict, self._scene.logger)
                     expandedPinsString = self.expandPinNames(
                         list(elementSymbol.pinNetMap.keys()))
                     subcktContent = []
@@ -22,6 +22,7 @@ from PySide6.QtWidgets import (QApplication, QCompleter, QDialog, QGraphicsItem,
 import revedaEditor.backend.dataDefinitions as ddef
 import revedaEditor.backend.undoStack as us
 import revedaEditor.gui.propertyDialogues as pdlg
+from revedaEditor.scenes.sceneRecords import sceneRecords
 
 if TYPE_CHECKING:
     import revedaEditor.common.layoutShapes as lshp
@@ -32,6 +33,9 @@ class editorScene(QGraphicsScene):
     # Define MOUSE_EVENTS as a class attribute to avoid recreating it on every call
     MOUSE_EVENTS = {QEvent.Type.GraphicsSceneMouseMove, QEvent.Type.GraphicsSceneMousePress,
                     QEvent.Type.GraphicsSceneMouseRelease, }
+    # Item classes saved to the design file. Other items, such as the rubber
+    # band and the zoom rectangle, do not modify the design.
+    DESIGN_SHAPES: tuple = ()
 
     def __init__(self, parent):
         super().__init__(parent)
@@ -68,6 +72,8 @@ class editorScene(QGraphicsScene):
         self.undoStack = us.undoStack()
         self.undoStack.setUndoLimit(99)
         self.itemsRefSet: set[QGraphicsItem] = set()
+        # Records of the items as last saved, re-encoded only when changed.
+        self.savedRecords = sceneRecords()
 
         # Group selection-related attributes
         self.partialSelection = False
@@ -280,6 +286,7 @@ class editorScene(QGraphicsScene):
             _groupItems = self.selectedItemGroup.childItems()
             self.destroyItemGroup(self.selectedItemGroup)
             self.selectedItemGroup = None
+            self.itemsPlaced(_groupItems)
             for item in _groupItems:
                 item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
             self.editModes.setMode("selectItem")
@@ -323,6 +330,12 @@ class editorScene(QGraphicsScene):
         self.messageLine.setText(self.messages.get(self.editModes.mode(), ""))
         super().mouseReleaseEvent(event)
 
+    def itemsPlaced(self, items) -> None:
+        """
+        Items were moved without an undo command, as copies are when they
+        are placed. Scenes keeping position indexes override this.
+        """
+
     def _filterBySelectModes(self, items: set) -> set:
         """Filter items by the scene's active selectModes.
 
@@ -389,13 +402,42 @@ class editorScene(QGraphicsScene):
         Will be implemented in the subclasses.
         """
 
+    def isDesignItem(self, item: QGraphicsItem) -> bool:
+        return item.parentItem() is None and isinstance(item, self.DESIGN_SHAPES)
+
+    def addItem(self, item: QGraphicsItem) -> None:
+        super().addItem(item)
+        if self.isDesignItem(item):
+            self.savedRecords.itemsChanged((item,))
+
+    def removeItem(self, item: QGraphicsItem) -> None:
+        if self.isDesignItem(item):
+            self.savedRecords.itemsRemoved((item,))
+        super().removeItem(item)
+
+    def clear(self) -> None:
+        super().clear()
+        self.savedRecords.invalidate()
+
+    def dependencyFiles(self) -> list[pathlib.Path]:
+        """Files of the cell views placed in the design."""
+        return []
+
+    def itemsChanged(self, items) -> None:
+        """Report items edited outside the undo stack, so they are saved."""
+        self.savedRecords.itemsChanged(items)
+
     def flipHorizontal(self) -> None:
-        for item in self.selectedItems():
+        items = self.selectedItems()
+        for item in items:
             item.flipTuple = (-1, 1)
+        self.itemsChanged(items)
 
     def flipVertical(self) -> None:
-        for item in self.selectedItems():
+        items = self.selectedItems()
+        for item in items:
             item.flipTuple = (1, -1)
+        self.itemsChanged(items)
 
     def selectAll(self) -> None:
         """
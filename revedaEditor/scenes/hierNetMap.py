@@ -0,0 +1,241 @@
+#
+# Revolution EDA
+#
+# Copyright (c) 2026 Revolution Semiconductor
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0.
+# If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+##
+
+"""Hierarchical net aliases for the schematic editors of a design.
+
+``hierNetMap`` belongs to the top level schematic scene of a design. It maps
+any (instance path, net name) to the names the net has at every other level of
+the design, where the instance path is "" for the top level and "I1.I3." for
+instance I3 inside instance I1.
+
+The connections between two levels come from the netlisting connectivity:
+each schematic cell of the design is read once as ``schematicNetlistData``.
+The parent side of a connection is the pin-net map of a symbol instance, and
+the child side is the net of the instance's schematic named after the pin.
+The map therefore covers the whole design whichever editors are open; a cell
+is read again only when its schematic or one of its symbol files changes.
+
+The schematic scenes opened below the top level with Go Down are recorded
+with ``attach`` under their instance path, so that probes can be shown on
+the levels that have an open editor.
+"""
+
+import pathlib
+from typing import Dict, FrozenSet, Iterator, Optional, Set, Tuple
+
+import revedaEditor.common.net as snet
+from revedaEditor.common.fileCache import fileStamp
+from revedaEditor.netlisting.schematicNetlistData import schematicNetlistData
+
+PathNet = Tuple[str, str]
+# (file stamps it was read from, instance name -> (schematic file, pin-net
+# map), net names)
+CellEntry = Tuple[Dict[pathlib.Path, object],
+                  Dict[str, Tuple[pathlib.Path, Dict[str, str]]], Set[str]]
+
+# View read for the instances of a cell when the map descends into it.
+SCHEMATIC_VIEW = "schematic"
+
+
+class hierNetMap:
+    def __init__(self, topScene):
+        # instance path -> scene
+        self._scenes: Dict[str, object] = {"": topScene}
+        # child path -> (parent path, instance name, parent symbol)
+        self._links: Dict[str, Tuple[str, str, object]] = {}
+        # schematic file -> connectivity read from it
+        self._cells: Dict[pathlib.Path, CellEntry] = {}
+        # instance path -> schematic file, None if not a schematic
+        self._files: Dict[str, Optional[pathlib.Path]] = {}
+        self._aliases: Dict[PathNet, Dict[str, FrozenSet[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._scenes)
+
+    def levels(self) -> Iterator[Tuple[str, object]]:
+        """(instance path, scene) of the open levels, top level first."""
+        self._validate()
+        return iter(list(self._scenes.items()))
+
+    def pathOf(self, scene) -> Optional[str]:
+        for path, levelScene in self._scenes.items():
+            if levelScene is scene:
+                return path
+        return None
+
+    def sceneAt(self, path: str):
+        return self._scenes.get(path)
+
+    def attach(self, childScene, parentScene, symbol) -> Optional[str]:
+        """
+        Record childScene as the schematic of symbol placed in parentScene and
+        return its instance path, or None if parentScene is not recorded.
+        """
+        parentPath = self.pathOf(parentScene)
+        if parentPath is None or childScene is parentScene:
+            return None
+        self.detach(childScene)
+        path = f"{parentPath}{symbol.instanceName}."
+        self.detach(self._scenes.get(path))
+        self._scenes[path] = childScene
+        self._links[path] = (parentPath, symbol.instanceName, symbol)
+        return path
+
+    def detach(self, scene) -> None:
+        """Forget scene and the levels below it."""
+        path = self.pathOf(scene)
+        if not path:
+            return
+        for levelPath in [levelPath for levelPath in self._scenes
+                          if levelPath.startswith(path)]:
+            del self._scenes[levelPath]
+            self._links.pop(levelPath, None)
+
+    def aliases(self, path: str, netName: str) -> Dict[str, FrozenSet[str]]:
+        """
+        Map the instance path of every level of the design the net reaches to
+        the names it has there, starting with {path: {netName}}. Bus names
+        match if their index ranges overlap. The result is shared and must not
+        be modified.
+        """
+        self._refresh()
+        key = (path, netName)
+        result = self._aliases.get(key)
+        if result is None:
+            result = self._findAliases(path, netName)
+            self._aliases[key] = result
+        return result
+
+    def _findAliases(self, path: str, netName: str) -> Dict[str, FrozenSet[str]]:
+        found = {path: {netName}}
+        stack = [(path, netName)]
+        while stack:
+            levelPath, name = stack.pop()
+            for otherPath, otherName in self._connections(levelPath, name):
+                # Nets of the starting level are only the probed one; do not
+                # widen a bit probe to the whole bus it was connected by.
+                if otherPath == path:
+                    continue
+                names = found.setdefault(otherPath, set())
+                if otherName not in names:
+                    names.add(otherName)
+                    stack.append((otherPath, otherName))
+        return {levelPath: frozenset(names) for levelPath, names in found.items()}
+
+    def _connections(self, path: str, name: str) -> Iterator[PathNet]:
+        """(instance path, net name) of the nets name connects to one level
+        up or down."""
+        filePath = self._fileAt(path)
+        if filePath is not None:
+            for instanceName in self._cell(filePath)[1]:
+                for parentNet, childNet in self._pinNets(filePath, instanceName):
+                    if snet.schematicNet._namesMatch(parentNet, name):
+                        yield f"{path}{instanceName}.", childNet
+        if path:
+            parentPath, instanceName = self._parentOf(path)
+            for parentNet, childNet in self._pinNets(self._fileAt(parentPath),
+                                                     instanceName):
+                if snet.schematicNet._namesMatch(childNet, name):
+                    yield parentPath, parentNet
+
+    def _pinNets(self, filePath: Optional[pathlib.Path],
+                 instanceName: str) -> Iterator[Tuple[str, str]]:
+        """(parent net, child net) pairs an instance connects."""
+        link = self._cell(filePath)[1].get(instanceName) if filePath else None
+        if link is None:
+            return
+        childNets = self._cell(link[0])[2]
+        # Unconnected pins get dnet names; they reach no other level.
+        for pinName, netName in link[1].items():
+            if not netName.startswith("dnet") and pinName in childNets:
+                yield netName, pinName
+
+    @staticmethod
+    def _parentOf(path: str) -> Tuple[str, str]:
+        parentPath, _, instanceName = path[:-1].rpartition(".")
+        return f"{parentPath}." if parentPath else "", instanceName
+
+    def _fileAt(self, path: str) -> Optional[pathlib.Path]:
+        """The schematic file of the instance at path, None if it has none."""
+        if path in self._files:
+            return self._files[path]
+        if not path:
+            filePath = pathlib.Path(self._scenes[""].editorWindow.file)
+        else:
+            parentPath, instanceName = self._parentOf(path)
+            parentFile = self._fileAt(parentPath)
+            link = self._cell(parentFile)[1].get(instanceName) if parentFile else None
+            filePath = link[0] if link else None
+        self._files[path] = filePath
+        return filePath
+
+    def _cell(self, filePath: pathlib.Path) -> CellEntry:
+        """The connectivity of a schematic file, read once until it changes."""
+        entry = self._cells.get(filePath)
+        if entry is not None:
+            return entry
+        libraryDict = self._scenes[""].libraryDict
+        data = schematicNetlistData(filePath, libraryDict)
+        stamps = {filePath: fileStamp(filePath)}
+        links = {}
+        for symbol in data.symbols:
+            libraryPath = libraryDict.get(symbol.libraryName)
+            if symbol.draft or symbol.netlistIgnore or libraryPath is None:
+                continue
+            cellPath = pathlib.Path(libraryPath) / symbol.cellName
+            symbolFile = cellPath / f"{symbol.viewName}.json"
+            childFile = cellPath / f"{SCHEMATIC_VIEW}.json"
+            stamps[symbolFile] = fileStamp(symbolFile)
+            # Kept when missing too, so that a new schematic is picked up.
+            stamps[childFile] = fileStamp(childFile)
+            if stamps[childFile] is not None:
+                links[symbol.instanceName] = (childFile, symbol.pinNetMap)
+        entry = (stamps, links, data.netNames())
+        self._cells[filePath] = entry
+        return entry
+
+    def _refresh(self) -> None:
+        """Forget the cells whose schematic or symbol files have changed."""
+        stale = [filePath for filePath, (stamps, _, _) in self._cells.items()
+                 if any(fileStamp(path) != stamp for path, stamp in stamps.items())]
+        for filePath in stale:
+            del self._cells[filePath]
+        if stale:
+            self._files.clear()
+            self._aliases.clear()
+
+    def _validate(self) -> None:
+        """
+        Drop levels whose editor has left the hierarchy and follow parent
+        reloads, which replace the symbol instances.
+        """
+        for path in sorted(self._links, key=len):
+            if path not in self._links:
+                continue
+            parentPath, instanceName, symbol = self._links[path]
+            parentScene = self._scenes[parentPath]
+            childEditor = self._scenes[path].editorWindow
+            if childEditor.parentEditor is not parentScene.editorWindow:
+                self.detach(self._scenes[path])
+                continue
+            try:
+                placed = symbol.scene() is parentScene
+            except RuntimeError:
+                placed = False
+            if placed:
+                continue
+            symbol = next((item for item in parentScene.findSceneSymbolSet()
+                           if item.instanceName == instanceName), None)
+            if symbol is None:
+                self.detach(self._scenes[path])
+                continue
+            self._links[path] = (parentPath, instanceName, symbol)
+            childEditor.parentObj = symbol
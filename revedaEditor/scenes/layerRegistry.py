@@ -0,0 +1,121 @@
+#
+# Revolution EDA
+#
+# Copyright (c) 2026 Revolution Semiconductor
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0.
+# If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+##
+
+"""Layout scene items by layer.
+
+``layerRegistry`` maps every (layer name, purpose) pair used in a layout scene
+to the items drawn on it. Shapes are registered on their own layer, children
+of instances and via arrays included, and instances painting a shared master
+cell on every layer of the master. Layout shapes report themselves when they
+enter or leave the scene and when their layer changes, so layer visibility and
+selectability changes only visit the items of that layer.
+
+The registry also keeps the scene-space edges of the shapes in an edge index
+for ruler and cursor snapping. Shapes also report when they move or change
+shape; their edges are indexed again on the next snap query.
+"""
+
+from typing import Dict, Iterable, Tuple
+
+from PySide6.QtCore import QPointF
+from PySide6.QtWidgets import QGraphicsItem
+
+import revedaEditor.common.edgeIndex as eidx
+import revedaEditor.common.layoutShapes as lshp
+
+layerKey = Tuple[str, str]
+
+
+class layerRegistry:
+    def __init__(self, cellSize: float = 1000.0):
+        # layer key -> items on the layer, in registration order
+        self._items: Dict[layerKey, Dict[QGraphicsItem, None]] = {}
+        # item -> layer keys it was registered with
+        self._itemKeys: Dict[QGraphicsItem, Tuple[layerKey, ...]] = {}
+        self.edges = eidx.edgeIndex(cellSize)
+        # items whose edges are to be indexed again
+        self._edgesChanged: Dict[QGraphicsItem, None] = {}
+
+    @staticmethod
+    def layerKeys(item: QGraphicsItem) -> Tuple[layerKey, ...]:
+        if isinstance(item, lshp.layoutInstance):
+            master = item.master
+            return tuple(master.layerKeys) if master is not None else ()
+        layer = getattr(item, "layer", None)
+        if layer is None:
+            return ()
+        return ((layer.name, layer.purpose),)
+
+    def add(self, item: QGraphicsItem):
+        if item in self._itemKeys:
+            self.remove(item)
+        self._edgesChanged[item] = None
+        keys = self.layerKeys(item)
+        if not keys:
+            return
+        self._itemKeys[item] = keys
+        for key in keys:
+            self._items.setdefault(key, {})[item] = None
+
+    def remove(self, item: QGraphicsItem):
+        self._edgesChanged.pop(item, None)
+        self.edges.remove(item)
+        for key in self._itemKeys.pop(item, ()):
+            layerItems = self._items.get(key)
+            if layerItems is not None:
+                layerItems.pop(item, None)
+                if not layerItems:
+                    del self._items[key]
+
+    def clear(self):
+        self._items.clear()
+        self._itemKeys.clear()
+        self.edges.clear()
+        self._edgesChanged.clear()
+
+    def geometryChanged(self, item: QGraphicsItem):
+        """The item or its place in the scene changed; so did its children."""
+        changed = self._edgesChanged
+        stack = [item]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, lshp.layoutShape):
+                changed[item] = None
+            stack.extend(item.childItems())
+
+    def closestEdgePoint(self, point: QPointF, maxDistance: float) -> QPointF:
+        """
+        The point of a shape edge on a visible layer closest to point, or
+        point itself if there is none within maxDistance.
+        """
+        if self._edgesChanged:
+            changed, self._edgesChanged = self._edgesChanged, {}
+            for item in changed:
+                self.edges.remove(item)
+                if item.scene() is not None:
+                    lshp.layoutRuler.indexItemEdges(self.edges, item)
+        closest = self.edges.closestPoint(point, maxDistance,
+                                          lambda layer: layer.visible)
+        return point if closest is None else closest
+
+    def items(self, layerName: str, layerPurpose: str) -> Iterable[QGraphicsItem]:
+        """Items on the layer, instances painting it included."""
+        return tuple(self._items.get((layerName, layerPurpose), ()))
+
+    def allItems(self) -> Iterable[QGraphicsItem]:
+        return tuple(self._itemKeys)
+
+    @property
+    def usedLayers(self) -> set[layerKey]:
+        return set(self._items)
+
+    def __contains__(self, key: layerKey) -> bool:
+        return key in self._items
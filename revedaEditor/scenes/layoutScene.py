@@ -10,7 +10,6 @@
 ##
 
 import inspect
-import json
 import pathlib
 # import time
 from typing import Any, Dict, List, Union, Optional
@@ -31,6 +30,7 @@ from PySide6.QtWidgets import (
     QGraphicsLineItem,
     QGraphicsScene,
     QGraphicsSceneMouseEvent,
+    QProgressDialog,
 )
 
 import revedaEditor.backend.dataDefinitions as ddef
@@ -39,6 +39,7 @@ import revedaEditor.backend.libraryModelView as lmview
 import revedaEditor.backend.undoStack as us
 import revedaEditor.common.layoutShapes as lshp  # import layout shapes
 import revedaEditor.fileio.exportGDS as gdse
+import revedaEditor.fileio.layoutBinary as lbin
 import revedaEditor.fileio.layoutEncoder as layenc
 import revedaEditor.fileio.loadJSON as lj
 import revedaEditor.fileio.schemaValidation as sv
@@ -47,8 +48,10 @@ import revedaEditor.gui.fileDialogues as fd
 import revedaEditor.gui.layoutDialogues as ldlg
 import revedaEditor.gui.propertyDialogues as pdlg
 from revedaEditor.backend.pdkLoader import importPDKModule
+from revedaEditor.common.fileCache import designCache
 from revedaEditor.gui.alignItems import alignItemsDialogue, alignToLine
 from revedaEditor.scenes.editorScene import editorScene
+from revedaEditor.scenes.layerRegistry import layerRegistry
 
 fabproc = importPDKModule("process")
 laylyr = importPDKModule("layoutLayers")
@@ -68,10 +71,12 @@ class layoutScene(editorScene):
         lshp.layoutPcell,
         lshp.layoutRuler,
     )
+    DESIGN_SHAPES = LAYOUT_SHAPES
     alignLineFinished = Signal(lshp.alignLine)
 
     def __init__(self, parent):
         super().__init__(parent)
+        self.layerRegistry = layerRegistry(fabproc.dbu)
         self.selectEdLayer = laylyr.pdkAllLayers[0] if laylyr else None
         # draw modes
         self.editModes = ddef.layoutModes(
@@ -154,6 +159,9 @@ class layoutScene(editorScene):
         self._newRuler = None
         self._newCutLine = None
         self._selectionRectItem = None
+        self._exportWorker = None
+        self._exportProgress = None
+        self._exportFormat = "GDS"
         self.rulersSet = set()
         self.rulerFont = self.setRulerFont(12 * fabproc.dbu)
         self.rulerFont.setKerning(False)
@@ -368,30 +376,8 @@ class layoutScene(editorScene):
         else:
             maxDistance = snapScreenPx
 
-        if ruler is not None:
-            snapped = ruler.snapPointToClosestEdge(pointF, maxDistance)
-            if snapped != pointF:
-                return snapped
-        searchRect = QRectF(
-            pointF.x() - maxDistance,
-            pointF.y() - maxDistance,
-            2 * maxDistance,
-            2 * maxDistance,
-        )
-        items = self.items(searchRect)
-        bestDist = maxDistance
-        closestPoint = pointF
-        for item in items:
-            if isinstance(item, lshp.layoutRuler) or item is ruler:
-                continue
-            edges = lshp.layoutRuler._extractItemEdges(item)
-            for p1, p2 in edges:
-                ptOnEdge = lshp.layoutRuler._closestPointOnSegment(pointF, p1, p2)
-                dist = QLineF(pointF, ptOnEdge).length()
-                if dist < bestDist:
-                    bestDist = dist
-                    closestPoint = ptOnEdge
-        return closestPoint
+        # Rulers are not in the edge index, the one being drawn included.
+        return self.layerRegistry.closestEdgePoint(pointF, maxDistance)
 
     def drawLayoutRuler(self):
         if self._newRuler:
@@ -638,8 +624,14 @@ class layoutScene(editorScene):
     ) -> Union[lshp.layoutInstance, lshp.layoutPcell]:
         """Read a layout file and create layoutShape objects from it."""
         try:
-            with layoutInstanceTuple.viewItem.viewPath.open("rb") as temp:
-                decodedData = orjson.loads(temp.read())
+            viewPath = layoutInstanceTuple.viewItem.viewPath
+            if lbin.isLayoutBinary(viewPath):
+                # Only the view header is needed; the shapes stay on disk.
+                with lbin.layoutBinaryFile(viewPath) as layoutFile:
+                    decodedData = layoutFile.jsonRecords()[:2]
+            else:
+                with viewPath.open("rb") as temp:
+                    decodedData = orjson.loads(temp.read())
 
             # Common instance setup
             def setup_instance(instance):
@@ -658,12 +650,17 @@ class layoutScene(editorScene):
                     and decodedData
                     and decodedData[0].get("viewType") == "layout"
             ):
-                factory_create = lj.layoutItems(self).create
-                # valid_items = filter(
-                #     lambda item: isinstance(item, dict) and item.get(
-                #         "type") in self.LAYOUT_SHAPES, decodedData[2:])
-                instanceShapes = [factory_create(item) for item in decodedData[2:]]
-                return setup_instance(lshp.layoutInstance(instanceShapes))
+                master = lj.layoutItems(self).getLayoutMaster(
+                    layoutInstanceTuple.libraryItem.libraryName,
+                    layoutInstanceTuple.cellItem.cellName,
+                    layoutInstanceTuple.viewItem.viewName,
+                )
+                if master is None:
+                    self.logger.error(
+                        f"Cannot load layout cell {layoutInstanceTuple.viewItem.viewPath}"
+                    )
+                    return None
+                return setup_instance(lshp.layoutInstance([], master))
 
             elif (
                     viewType == "pcell"
@@ -703,6 +700,14 @@ class layoutScene(editorScene):
         """
         return {item for item in self.items() if isinstance(item, lshp.layoutInstance)}
 
+    def dependencyFiles(self) -> list[pathlib.Path]:
+        # Masters record the files of the cells nested in them as well.
+        files = set()
+        for instance in self.findScenelayoutCellSet():
+            if instance.master is not None:
+                files.update(instance.master.sources)
+        return [pathlib.Path(file) for file in files]
+
     def _filterBySelectModes(self, items: set) -> set:
         """Filter rubber-band selected items by the active selection filter."""
         if self.selectModes.selectAll:
@@ -891,8 +896,20 @@ class layoutScene(editorScene):
             # Restore original tuple
             self.layoutInstanceTuple = oldTuple
 
+    def _saveHeader(self) -> list:
+        """View and grid records written at the top of the file."""
+        return [
+            {"viewType": "layout", "schemaVersion": "1.0"},
+            {"snapGrid": (self.majorGrid, self.snapGrid),
+             "snapConnectDistance": self.editorWindow.snapConnectDistance,
+             "lodThreshold": self.editorWindow.lodThreshold},
+        ]
+
     def saveLayoutCell(self, filePathObj: pathlib.Path) -> None:
-        """Save the layout cell to a JSON file.
+        """Save the layout cell to a JSON file, or to a binary layout file if
+        the cell is already stored in that format. Only the items changed
+        since the last save are encoded again, and an unchanged cell is not
+        written at all.
 
         Args:
             filePathObj (pathlib.Path): Path object for the output file
@@ -901,53 +918,44 @@ class layoutScene(editorScene):
             IOError: If there are issues writing to the file
             ValueError: If the layout data is invalid
         """
-
-        def safeJsonWrite(file_obj, data: list) -> None:
-            """Write JSON data with optimized settings.
-
-            Args:
-                file_obj: File object to write to
-                data: Data to be written
-
-            Raises:
-                JSONEncodeError: If JSON encoding fails
-            """
-            json.dump(
-                data,
-                file_obj,
-                cls=layenc.layoutEncoder,
-                separators=(",", ":"),  # Minimize JSON size
-                check_circular=False,  # Optimize for non-circular references
-            )
-
         try:
+            # Prepare data before file operation
+            self.itemsRefSet = set(self.items())
+            header = self._saveHeader()
+            headerKey = tuple(orjson.dumps(record) for record in header)
+            if self.savedRecords.isSaved(filePathObj, headerKey):
+                self.logger.info(
+                    f"{self.editorWindow.cellName}:{self.editorWindow.viewName} "
+                    f"is unchanged, not saved")
+                return
             # Create parentW directory if it doesn't exist
             filePathObj.parent.mkdir(parents=True, exist_ok=True)
 
-            # Prepare data before file operation
-            self.itemsRefSet = set(self.items())
+            layoutShapes = tuple(self.LAYOUT_SHAPES)
             topLevelItems = [
                 item
                 for item in self.itemsRefSet
-                if item.parentItem() is None
-                   and isinstance(item, tuple(self.LAYOUT_SHAPES))
-            ]
-            layoutData = [
-                {"viewType": "layout", "schemaVersion": "1.0"},
-                {"snapGrid": (self.majorGrid, self.snapGrid),
-                 "snapConnectDistance": self.editorWindow.snapConnectDistance,
-                 "lodThreshold": self.editorWindow.lodThreshold},
-                *topLevelItems,
+                if item.parentItem() is None and isinstance(item, layoutShapes)
             ]
+            encoder = layenc.layoutEncoder()
+            # Edits on the selection may bypass the undo stack.
+            self.savedRecords.itemsChanged(self.selectedItems())
+            layoutData = header + self.savedRecords.encode(topLevelItems,
+                                                           encoder.default)
 
             # Use temporary file for atomic write
             temp_path = filePathObj.with_suffix(".tmp")
             try:
-                with temp_path.open(mode="w", buffering=65536) as f:  # 64KB buffer
-                    safeJsonWrite(f, layoutData)
+                if lbin.isLayoutBinary(filePathObj):
+                    with temp_path.open(mode="wb", buffering=1 << 20) as f:
+                        lbin.writeLayoutBinary(f, layoutData)
+                else:
+                    with temp_path.open(mode="wb") as f:
+                        f.write(orjson.dumps(layoutData, default=encoder.default))
 
                 # Atomic rename for safer file writing
                 temp_path.replace(filePathObj)
+                self.savedRecords.saved(filePathObj, headerKey)
 
             finally:
                 # Clean up temp file if it still exists
@@ -957,8 +965,7 @@ class layoutScene(editorScene):
             self.logger.info(
                 f"Saved layout to {self.editorWindow.cellName}:{self.editorWindow.viewName}"
             )
-            lj.PCellCache.clear_caches()
-            lj.layoutItems._load_json_file.cache_clear()
+            designCache().invalidatePath(filePathObj)
 
         except ValueError as e:
             self.logger.error(f"Invalid layout data: {str(e)}")
@@ -981,7 +988,7 @@ class layoutScene(editorScene):
         export_path = export_dir / f"{self.cellName}{file_extension}"
 
         try:
-            # reprocess the layout to get the layout positions right.
+            # The exporter maps top-level items through their scene transforms.
             topLevelItems = [
                 item
                 for item in self.itemsRefSet
@@ -989,24 +996,31 @@ class layoutScene(editorScene):
                    and isinstance(item, tuple(self.LAYOUT_SHAPES))
             ]
 
-            decodedData = json.loads(
-                json.dumps(topLevelItems, cls=layenc.layoutEncoder)
-            )
-
-            layoutItems = [lj.layoutItems(self).create(item) for item in decodedData]
-
-            exportObj = gdse.gdsExporter(self.cellName, layoutItems, export_path)
+            exportObj = gdse.gdsExporter(self.cellName, topLevelItems, export_path,
+                                         self.libraryDict)
             exportObj.unit = unit
             exportObj.precision = precision
             exportObj.dbu = dbu
 
+            if self._exportWorker is not None:
+                self.logger.warning("An export is already running.")
+                return
+            # Only the record snapshot is taken here; conversion and writing
+            # run in the thread pool.
+            self._exportWorker = exportObj.exportWorker(format_upper)
+            self._exportFormat = format_upper
+            signals = self._exportWorker.signals
+            signals.progress.connect(self._exportProgressed)
+            signals.result.connect(self._exportFinished)
+            signals.cancelled.connect(self._exportCancelled)
+            signals.error.connect(self._exportFailed)
+            signals.finished.connect(self._exportDone)
+            self._exportProgress = QProgressDialog(
+                f"Exporting {export_path.name}...", "Cancel", 0, 0, self.editorWindow)
+            self._exportProgress.setMinimumDuration(500)
+            self._exportProgress.canceled.connect(self._exportWorker.cancel)
             self.logger.info(f"{format_upper} Export started.")
-            with self.measureDuration():
-                if format_upper == "OAS":
-                    exportObj.oasExportThreaded(self.appMainW.threadPool)
-                else:
-                    exportObj.gdsExportThreaded(self.appMainW.threadPool)
-            self.logger.info(f"{format_upper} Export finished.")
+            self.appMainW.threadPool.start(self._exportWorker)
 
         except ValueError as e:
             self.logger.error(f"Invalid layout data: {str(e)}")
@@ -1020,6 +1034,27 @@ class layoutScene(editorScene):
             self.logger.error(f"Unexpected error while exporting layout: {str(e)}")
             raise
 
+    def _exportProgressed(self, done: int, total: int):
+        if self._exportProgress is not None:
+            self._exportProgress.setMaximum(total)
+            self._exportProgress.setValue(done)
+
+    def _exportFinished(self, exportPath: pathlib.Path):
+        self.logger.info(f"{self._exportFormat} Export finished: {exportPath}")
+
+    def _exportCancelled(self):
+        self.logger.warning(f"{self._exportFormat} Export cancelled.")
+
+    def _exportFailed(self, error: tuple):
+        self.logger.error(f"Failed to export layout: {error[2]}")
+
+    def _exportDone(self):
+        if self._exportProgress is not None:
+            self._exportProgress.close()
+            self._exportProgress.deleteLater()
+        self._exportProgress = None
+        self._exportWorker = None
+
     def exportCellGDS(
             self, gdsExportDir: pathlib.Path, gdsUnit: float, gdsPrecision: float, dbu: int
     ):
@@ -1032,11 +1067,21 @@ class layoutScene(editorScene):
         """Export cell as OAS format."""
         self._exportCell(oasExportDir, gdsUnit, gdsPrecision, dbu, "OAS")
 
+    def clear(self) -> None:
+        super().clear()
+        self.layerRegistry.clear()
+
     def loadDesign(self, filePathObj: pathlib.Path) -> bool:
         """Load the layout cell from the given JSON file."""
+        layoutFile = None
         try:
-            with filePathObj.open("rb") as file:
-                decodedData = orjson.loads(file.read())
+            if lbin.isLayoutBinary(filePathObj):
+                # Rects and polygons are created from the file columns below.
+                layoutFile = lbin.layoutBinaryFile(filePathObj)
+                decodedData = layoutFile.jsonRecords()
+            else:
+                with filePathObj.open("rb") as file:
+                    decodedData = orjson.loads(file.read())
             # Validate file structure before processing
             is_valid, errors = sv.validate_design_file(
                 decodedData, "layout", str(filePathObj)
@@ -1069,14 +1114,22 @@ class layoutScene(editorScene):
                         pass
                 if len(decodedData) > 2:
                     self.createLayoutItems(decodedData[2:])
+                if layoutFile is not None:
+                    for item in lj.layoutItems(self).createColumnShapes(layoutFile):
+                        self.addItem(item)
             self.itemsRefSet = set(self.items())
+            self.savedRecords.loaded(filePathObj, tuple(
+                orjson.dumps(record) for record in self._saveHeader()))
             return True
-        except orjson.JSONDecodeError:
+        except (orjson.JSONDecodeError, ValueError):
             self.logger.error("Invalid file format.")
             return False
         except Exception as e:
             self.logger.error(f"Unexpected error loading layout: {e}")
             return False
+        finally:
+            if layoutFile is not None:
+                layoutFile.close()
 
     def createLayoutItems(self, decoded_data: List[Dict[str, Any]]) -> None:
         if not decoded_data:
@@ -1592,15 +1645,14 @@ class layoutScene(editorScene):
         copyShapesList = []
         if selectedItems:
             for item in selectedItems:
-                selectedItemJson = json.dumps(item, cls=layenc.layoutEncoder)
-                itemCopyDict = json.loads(selectedItemJson)
-                shape = lj.layoutItems(self).create(itemCopyDict)
-                if shape is not None:
-                    if isinstance(shape, (lshp.layoutInstance, lshp.layoutPcell)):
-                        self.itemCounter += 1
-                        shape.instanceName = f"I{self.itemCounter}"
-                        shape.counter = int(self.itemCounter)
-                    copyShapesList.append(shape)
+                if not isinstance(item, lshp.layoutShape):
+                    continue
+                shape = item.clone()
+                if isinstance(shape, lshp.layoutInstance):
+                    self.itemCounter += 1
+                    shape.instanceName = f"I{self.itemCounter}"
+                    shape.counter = int(self.itemCounter)
+                copyShapesList.append(shape)
 
             self.addListUndoStack(copyShapesList)
             self.selectedItemGroup = self.createItemGroup(copyShapesList)
@@ -1652,8 +1704,8 @@ class layoutScene(editorScene):
                             childWindow.parentEditor = self.editorWindow
                             childWindow.parentObj = item
                             childWindow.layoutToolbar.addAction(childWindow.goUpAction)
-                            if dlg.buttonId == 2:
-                                childWindow.centralW.scene.readOnly = True
+                            childWindow.centralW.scene.readOnly = (
+                                dlg.buttonId == 2)
 
     def stretchPath(self, pathItem: lshp.layoutPath, stretchEnd: str):
         match stretchEnd:
@@ -0,0 +1,120 @@
+#
+# Revolution EDA
+#
+# Copyright (c) 2026 Revolution Semiconductor
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0.
+# If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+##
+
+"""Saved records of the items of an editor scene.
+
+``sceneRecords`` keeps the serialized JSON record of every top-level item as
+it was last saved. Scene item additions and removals, the undo commands and
+the edits made outside the undo stack report the items they change, and only
+those items are encoded again on the next save; the records of the others are
+reused as they are. When nothing was reported since the file was loaded or
+written, and the file has not changed on disk, saving is skipped altogether.
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from PySide6.QtWidgets import QGraphicsItem
+
+
+class sceneRecords:
+    def __init__(self):
+        # id(item) -> (item, record bytes of the last save)
+        self._records: Dict[int, Tuple[QGraphicsItem, bytes]] = {}
+        self._dirty: Dict[int, QGraphicsItem] = {}
+        self._modified = True
+        # header records and (path, size, mtime) of the file last written
+        self._header: Optional[Tuple[bytes, ...]] = None
+        self._fileState: Optional[tuple] = None
+        # changes reported while held are dropped, see heldChanges
+        self._held = 0
+
+    @property
+    def isModified(self) -> bool:
+        return self._modified
+
+    def itemsChanged(self, items: Iterable[QGraphicsItem]):
+        if self._held:
+            return
+        for item in items:
+            self._dirty[id(item)] = item
+            self._modified = True
+
+    @contextmanager
+    def heldChanges(self) -> Iterator[None]:
+        """
+        Drop the item changes reported inside the block, for edits that go
+        through intermediate states and report the items that ended up
+        different themselves.
+        """
+        self._held += 1
+        try:
+            yield
+        finally:
+            self._held -= 1
+
+    def itemsRemoved(self, items: Iterable[QGraphicsItem]):
+        for item in items:
+            self._dirty.pop(id(item), None)
+            entry = self._records.get(id(item))
+            if entry is not None and entry[0] is item:
+                del self._records[id(item)]
+        self._modified = True
+
+    def invalidate(self):
+        """Forget all records; the next save encodes every item."""
+        self._records.clear()
+        self._dirty.clear()
+        self._modified = True
+
+    @staticmethod
+    def _stat(filePath) -> Optional[tuple]:
+        try:
+            stat = os.stat(filePath)
+        except OSError:
+            return None
+        return os.fspath(filePath), stat.st_size, stat.st_mtime_ns
+
+    def isSaved(self, filePath, header: Tuple[bytes, ...]) -> bool:
+        """True if filePath already holds the scene as it would be saved."""
+        return (not self._modified and self._header == header
+                and self._fileState is not None
+                and self._fileState == self._stat(filePath))
+
+    def encode(self, items: Iterable[QGraphicsItem],
+               encodeItem: Callable[[QGraphicsItem], bytes]) -> List[bytes]:
+        """
+        Return the records of items, encoding only the items that are new or
+        were reported as changed. Records of the items not given are dropped.
+        """
+        records, dirty = self._records, self._dirty
+        current = {}
+        for item in items:
+            entry = records.get(id(item))
+            if entry is None or entry[0] is not item or id(item) in dirty:
+                entry = (item, encodeItem(item))
+            current[id(item)] = entry
+        self._records = current
+        self._dirty = {}
+        return [entry[1] for entry in current.values()]
+
+    def saved(self, filePath, header: Tuple[bytes, ...]):
+        """Record that filePath now holds the scene with the given header."""
+        self._header = header
+        self._fileState = self._stat(filePath)
+        self._modified = False
+        self._dirty.clear()
+
+    def loaded(self, filePath, header: Tuple[bytes, ...]):
+        """The scene was just loaded from filePath; no records are known yet."""
+        self._records.clear()
+        self.saved(filePath, header)
@@ -0,0 +1,327 @@
+#
+# Revolution EDA
+#
+# Copyright (c) 2026 Revolution Semiconductor
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0.
+# If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+##
+
+"""Live wire connectivity for schematic scenes.
+
+``schematicConnectivity`` keeps an end point index of every wire in a
+``schematicScene``. Scene item additions and removals, net geometry changes
+and the move/rotate undo commands report to it, and the changed wires are
+remembered as dirty. ``refresh`` then renames only the wire groups that
+contain a dirty wire and recomputes the pin-net maps of the symbols touching
+them, instead of running ``nameSceneNets`` over the whole scene after every
+edit. Each such refresh increments ``revision``, so indexes derived from
+the net names can tell when to update. A base-name index of the wires is
+kept as well, so the wires carrying a (bus) net name are found without
+scanning the scene, and the junctions (end points shared by three or more
+wires) are bucketed on a coarse grid so that views can find the ones they
+show without collecting wires.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QPoint, QRectF
+
+import revedaEditor.common.net as snet
+import revedaEditor.common.shapes as shp
+
+PointKey = Tuple[int, int]
+
+# Side of the grid cells the junction points are bucketed in.
+JUNCTION_BUCKET = 1024
+
+
+class schematicConnectivity:
+    def __init__(self, scene):
+        self._scene = scene
+        # end point -> {id(net): net}
+        self._endPoints: Dict[PointKey, Dict[int, snet.schematicNet]] = {}
+        # id(net) -> (net, end point keys currently indexed)
+        self._netPoints: Dict[int, Tuple[snet.schematicNet, Tuple[PointKey, ...]]] = {}
+        # id(item) -> (item, last known scene bounding rect) for symbols and pins
+        self._itemRects: Dict[int, Tuple[object, QRectF]] = {}
+        self._dirtyNets: Dict[int, snet.schematicNet] = {}
+        self._dirtyItems: Dict[int, object] = {}
+        self._dirtyRects: List[QRectF] = []
+        # base net name -> {id(net): net}, rebuilt on demand after names change
+        self._nameIndex: Optional[Dict[str, Dict[int, snet.schematicNet]]] = None
+        # bucket -> junction points in it
+        self._junctions: Dict[PointKey, Set[PointKey]] = {}
+        # The scene starts empty and reports every added item, so the index
+        # only needs rebuilding after invalidate().
+        self._rebuild = False
+        self._renameAll = True  # every wire must be renamed
+        # counts the refreshes that renamed wires or remapped symbol pins
+        self.revision = 0
+
+    @property
+    def isDirty(self) -> bool:
+        return bool(self._renameAll or self._dirtyNets or self._dirtyItems
+                    or self._dirtyRects)
+
+    def invalidate(self):
+        """Discard the index; the next refresh renames the whole scene."""
+        self._rebuild = True
+        self._renameAll = True
+        self._nameIndex = None
+
+    def namesChanged(self):
+        """Net names were set; the name index is rebuilt on the next lookup."""
+        self._nameIndex = None
+
+    # ------------------------------------------------------------------
+    # Change notifications
+    # ------------------------------------------------------------------
+
+    def itemsAdded(self, items: Iterable):
+        for item in items:
+            if isinstance(item, snet.schematicNet):
+                self._indexNet(item)
+                self._dirtyNets[id(item)] = item
+                self._nameIndex = None
+            elif isinstance(item, (shp.schematicSymbol, shp.schematicPin)):
+                self._dirtyItems[id(item)] = item
+
+    def itemsRemoved(self, items: Iterable):
+        for item in items:
+            if isinstance(item, snet.schematicNet):
+                for neighbour in self._neighbours(item):
+                    self._dirtyNets[id(neighbour)] = neighbour
+                self._unindexNet(item)
+                self._dirtyNets.pop(id(item), None)
+                self._nameIndex = None
+            elif isinstance(item, (shp.schematicSymbol, shp.schematicPin)):
+                self._dirtyItems.pop(id(item), None)
+                entry = self._itemRects.pop(id(item), None)
+                if entry is not None:
+                    self._dirtyRects.append(entry[1])
+
+    def itemsMoved(self, items: Iterable):
+        for item in items:
+            if isinstance(item, snet.schematicNet):
+                if id(item) not in self._netPoints:
+                    continue
+                for neighbour in self._neighbours(item):
+                    self._dirtyNets[id(neighbour)] = neighbour
+                self._indexNet(item)
+                self._dirtyNets[id(item)] = item
+            elif isinstance(item, (shp.schematicSymbol, shp.schematicPin)):
+                entry = self._itemRects.get(id(item))
+                if entry is not None:
+                    self._dirtyRects.append(entry[1])
+                self._dirtyItems[id(item)] = item
+
+    def netRenamed(self, netItem: snet.schematicNet):
+        if id(netItem) in self._netPoints:
+            self._dirtyNets[id(netItem)] = netItem
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def connectedNets(self, netItem: snet.schematicNet) -> List[snet.schematicNet]:
+        """Return the wires connected to netItem through wire end points."""
+        self._ensureIndex()
+        group = self._group([netItem])
+        return [otherNet for otherNet in group if otherNet is not netItem]
+
+    def junctionPoints(self) -> List[QPoint]:
+        """End points shared by three or more wires."""
+        self._ensureIndex()
+        return [QPoint(*key) for key, nets in self._endPoints.items()
+                if len(nets) > 2]
+
+    def junctionsIn(self, rect: QRectF) -> List[QPoint]:
+        """Junction points inside rect, found through the junction buckets."""
+        self._ensureIndex()
+        left, top = self._bucket(rect.left(), rect.top())
+        right, bottom = self._bucket(rect.right(), rect.bottom())
+        if (right - left + 1) * (bottom - top + 1) > len(self._junctions):
+            buckets = self._junctions.values()
+        else:
+            buckets = (self._junctions.get((bx, by), ())
+                       for bx in range(left, right + 1)
+                       for by in range(top, bottom + 1))
+        return [QPoint(x, y) for bucket in buckets for x, y in bucket
+                if rect.left() <= x <= rect.right() and rect.top() <= y <= rect.bottom()]
+
+    def endPointDegree(self, point: QPoint) -> int:
+        self._ensureIndex()
+        nets = self._endPoints.get((point.x(), point.y()))
+        return len(nets) if nets else 0
+
+    def netsNamed(self, name: str) -> List[snet.schematicNet]:
+        """
+        Return the wires whose name matches name, where bus names match if
+        their index ranges overlap. Call refresh first for current names.
+        """
+        candidates = self.nameIndex().get(self._baseName(name), {})
+        return [netItem for netItem in candidates.values()
+                if snet.schematicNet._namesMatch(netItem.name, name)]
+
+    def nameIndex(self) -> Dict[str, Dict[int, snet.schematicNet]]:
+        """
+        Map base net names to the wires carrying them, as {id(net): net}. The
+        index is replaced rather than changed when names change, so callers
+        may hold on to it as a snapshot.
+        """
+        if self._nameIndex is None:
+            self._rebuildNameIndex()
+        return self._nameIndex
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def refresh(self):
+        """Bring net names and symbol pin-net maps up to date."""
+        scene = self._scene
+        if self._renameAll:
+            self._ensureIndex()
+            self._renameAll = False
+            self._dirtyNets.clear()
+            self._dirtyItems.clear()
+            self._dirtyRects.clear()
+            self.revision += 1
+            scene.nameSceneNets()
+            symbolSet = scene.findSceneSymbolSet()
+            scene.generatePinNetMap(symbolSet)
+            for item in symbolSet | scene.findSceneSchemPinsSet():
+                self._itemRects[id(item)] = (item, item.sceneBoundingRect())
+            return
+        if not self.isDirty:
+            return
+
+        dirtyNets = [netItem for netItem in self._dirtyNets.values()
+                     if id(netItem) in self._netPoints]
+        dirtyItems = [item for item in self._dirtyItems.values()
+                      if item.scene() is scene]
+        rects = list(self._dirtyRects)
+        rects.extend(item.sceneBoundingRect() for item in dirtyItems)
+        for rect in rects:
+            dirtyNets.extend(item for item in scene.items(rect)
+                             if isinstance(item, snet.schematicNet)
+                             and id(item) in self._netPoints)
+        self._dirtyNets.clear()
+        self._dirtyItems.clear()
+        self._dirtyRects.clear()
+        self.revision += 1
+
+        affectedNets = self._group(dirtyNets)
+        symbols = {item for item in dirtyItems
+                   if isinstance(item, shp.schematicSymbol)}
+        schemPins = {item for item in dirtyItems
+                     if isinstance(item, shp.schematicPin)}
+        # Symbols and pins whose outline meets a renamed wire; the recorded
+        # rects avoid a collision query against every item in the scene.
+        netRects = [netItem.sceneBoundingRect() for netItem in affectedNets]
+        for item, rect in self._itemRects.values():
+            if any(rect.intersects(netRect) for netRect in netRects):
+                if isinstance(item, shp.schematicSymbol):
+                    symbols.add(item)
+                else:
+                    schemPins.add(item)
+
+        if affectedNets:
+            scene.nameNetGroup(set(affectedNets), symbols, schemPins)
+            self._nameIndex = None
+        for symbolItem in symbols:
+            scene.genSymbolPinNetMap(symbolItem)
+        for item in symbols | schemPins:
+            self._itemRects[id(item)] = (item, item.sceneBoundingRect())
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _baseName(name: str) -> str:
+        try:
+            return snet.schematicNet.parseArrayNotation(name)[0]
+        except ValueError:
+            return name
+
+    def _rebuildNameIndex(self):
+        self._nameIndex = {}
+        for netItem, _ in self._netPoints.values():
+            self._nameIndex.setdefault(self._baseName(netItem.name), {})[
+                id(netItem)] = netItem
+
+    @staticmethod
+    def _bucket(x: float, y: float) -> PointKey:
+        return int(x // JUNCTION_BUCKET), int(y // JUNCTION_BUCKET)
+
+    def _ensureIndex(self):
+        if self._rebuild:
+            self._rebuildIndex()
+
+    def _rebuildIndex(self):
+        self._endPoints.clear()
+        self._junctions.clear()
+        self._netPoints.clear()
+        self._itemRects.clear()
+        self._dirtyNets.clear()
+        self._dirtyItems.clear()
+        self._dirtyRects.clear()
+        self._nameIndex = None
+        for netItem in self._scene.findSceneNetsSet():
+            self._indexNet(netItem)
+        self._rebuild = False
+
+    def _indexNet(self, netItem: snet.schematicNet):
+        self._unindexNet(netItem)
+        keys = tuple((point.x(), point.y()) for point in netItem.sceneEndPoints)
+        for key in keys:
+            netsAtPoint = self._endPoints.setdefault(key, {})
+            netsAtPoint[id(netItem)] = netItem
+            if len(netsAtPoint) == 3:
+                self._junctions.setdefault(self._bucket(*key), set()).add(key)
+        self._netPoints[id(netItem)] = (netItem, keys)
+
+    def _unindexNet(self, netItem: snet.schematicNet):
+        entry = self._netPoints.pop(id(netItem), None)
+        if entry is None:
+            return
+        for key in entry[1]:
+            netsAtPoint = self._endPoints.get(key)
+            if netsAtPoint is not None and id(netItem) in netsAtPoint:
+                del netsAtPoint[id(netItem)]
+                if len(netsAtPoint) == 2:
+                    bucket = self._bucket(*key)
+                    self._junctions[bucket].discard(key)
+                    if not self._junctions[bucket]:
+                        del self._junctions[bucket]
+                elif not netsAtPoint:
+                    del self._endPoints[key]
+
+    def _neighbours(self, netItem: snet.schematicNet) -> List[snet.schematicNet]:
+        """Wires with an end point within one unit of netItem's end points."""
+        entry = self._netPoints.get(id(netItem))
+        if entry is None:
+            return []
+        neighbours = {}
+        for x, y in entry[1]:
+            for key in ((x, y), (x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                neighbours.update(self._endPoints.get(key, {}))
+        neighbours.pop(id(netItem), None)
+        return list(neighbours.values())
+
+    def _group(self, nets: Iterable[snet.schematicNet]) -> List[snet.schematicNet]:
+        """All wires reachable from nets through shared end points."""
+        visited: Dict[int, snet.schematicNet] = {}
+        stack = [netItem for netItem in nets if id(netItem) in self._netPoints]
+        while stack:
+            netItem = stack.pop()
+            if id(netItem) in visited:
+                continue
+            visited[id(netItem)] = netItem
+            stack.extend(neighbour for neighbour in self._neighbours(netItem)
+                         if id(neighbour) not in visited)
+        return list(visited.values())
@@ -13,6 +13,7 @@
 import json
 import os
 import pathlib
+import re
 
 import orjson
 from typing import Dict, List, Optional, Set, Tuple, Union
@@ -39,11 +40,16 @@ import revedaEditor.gui.alignItems as alg
 import revedaEditor.gui.fileDialogues as fd
 import revedaEditor.gui.propertyDialogues as pdlg
 from revedaEditor.backend.pdkLoader import importPDKModule
-from revedaEditor.common.fileCache import FileCache
+from revedaEditor.common.fileCache import designCache
 from revedaEditor.scenes.editorScene import editorScene
+from revedaEditor.scenes.hierNetMap import hierNetMap
+from revedaEditor.scenes.schematicConnectivity import schematicConnectivity
 
 schlyr = importPDKModule('schLayers')
 
+# names given to wire groups without a pin, label or global net
+AUTO_NET_NAME = re.compile(r"net(\d+)")
+
 
 class schematicScene(editorScene):
     wireEditFinished = Signal(snet.schematicNet)
@@ -51,6 +57,7 @@ class schematicScene(editorScene):
     stretchNet = Signal(snet.schematicNet, str)
     SCHEMATIC_SHAPES = (snet.schematicNet, shp.schematicPin, shp.text,
                         shp.schematicSymbol)
+    DESIGN_SHAPES = SCHEMATIC_SHAPES
 
     def __init__(self, parent):
         super().__init__(parent)
@@ -59,6 +66,10 @@ class schematicScene(editorScene):
         self.instCounter = 0
         self.instanceCounter = 0
         self.netCounter = 0
+        # net -> end point connected nets, rebuilt by nameSceneNets
+        self._netAdjacency: Dict[snet.schematicNet, Set[snet.schematicNet]] = {}
+        # live wire connectivity, patched as items are added, removed or moved
+        self.connectivity = schematicConnectivity(self)
 
         # Initialize modes with default values
         self.editModes = ddef.schematicModes(selectItem=True, deleteItem=False,
@@ -120,10 +131,11 @@ class schematicScene(editorScene):
         # Probe state
         self.probeMode = False
         self.removeProbeMode_ = False
-        self.probePinNames: Set[str] = set()
         self._probedNets: Dict[str, Set[snet.schematicNet]] = dict()
         self._probeColorIndex: int = 0
         self._probeColorMap: Dict[str, int] = dict()
+        # net aliases across the levels below this scene, if it is the top
+        self._hierNetMap: Optional[hierNetMap] = None
 
         # Font initialization
         self._initializeFont()
@@ -133,9 +145,6 @@ class schematicScene(editorScene):
         self.stretchNet.connect(self._handleStretchNet)
         self.alignLineFinished.connect(alg.alignToLine)
 
-        # Initialize cache
-        self._symbolCache = FileCache()
-
         # Connect to main window's symbol changed signal
         if self.appMainW:
             self.appMainW.symbolChanged.connect(self._handleSymbolChanged)
@@ -170,6 +179,21 @@ class schematicScene(editorScene):
 
         return snapPointRect
 
+    def addItem(self, item: QGraphicsItem) -> None:
+        super().addItem(item)
+        self.connectivity.itemsAdded((item,))
+
+    def removeItem(self, item: QGraphicsItem) -> None:
+        self.connectivity.itemsRemoved((item,))
+        super().removeItem(item)
+
+    def itemsPlaced(self, items) -> None:
+        self.connectivity.itemsMoved(items)
+
+    def clear(self) -> None:
+        super().clear()
+        self.connectivity.invalidate()
+
     def _ensureSnapPointRect(self):
         """Return a valid _snapPointRect, recreating it if the C++ object was deleted."""
         try:
@@ -526,6 +550,7 @@ class schematicScene(editorScene):
                 clickedNet.name = self.netNameString
                 clickedNet.nameStrength = snet.netNameStrengthEnum.SET
                 clickedNet.setSelected(False)
+                self.connectivity.netRenamed(clickedNet)
             self.netNameString = None
             self._newNetNameObj = None
             self.editModes.setMode("selectItem")
@@ -780,8 +805,10 @@ class schematicScene(editorScene):
     @Slot(str, str, str)
     def _handleSymbolChanged(self, libName: str, cellName: str, viewName: str):
         """Reload symbol instances when their definition changes."""
-        from revedaEditor.fileio.loadJSON import clear_symbol_cache
-        clear_symbol_cache()
+        libraryPath = self.libraryDict.get(libName)
+        if libraryPath is not None:
+            designCache().invalidatePath(
+                pathlib.Path(libraryPath).joinpath(cellName, f"{viewName}.json"))
         for item in self.items():
             if isinstance(item, shp.schematicSymbol):
                 if (item.libraryName == libName and
@@ -927,6 +954,15 @@ class schematicScene(editorScene):
         return {item for item in self.items() if
                 isinstance(item, shp.schematicSymbol)}
 
+    def dependencyFiles(self) -> list[pathlib.Path]:
+        files = set()
+        for symbol in self.findSceneSymbolSet():
+            libraryPath = self.libraryDict.get(symbol.libraryName)
+            if libraryPath is not None:
+                files.add(pathlib.Path(libraryPath).joinpath(
+                    symbol.cellName, f"{symbol.viewName}.json"))
+        return list(files)
+
     def findSceneNetsSet(self) -> set[snet.schematicNet]:
         return {item for item in self.items() if
                 isinstance(item, snet.schematicNet)}
@@ -1057,8 +1093,7 @@ class schematicScene(editorScene):
             return None
         viewPath = viewItem.viewPath
         try:
-            # Use FileCache with mtime invalidation
-            items = self._symbolCache.get_json(viewPath)
+            items = designCache().getJson(viewPath)
             if items is None:
                 self.logger.error(f"Cannot load symbol file: {viewPath}")
                 return
@@ -1110,23 +1145,31 @@ class schematicScene(editorScene):
         copyShapesList = []
         if selectedItems:
             for item in selectedItems:
-                selectedItemJson = json.dumps(item, cls=schenc.schematicEncoder)
-                itemCopyDict = json.loads(selectedItemJson)
-                shape = lj.schematicItems(self).create(itemCopyDict)
-                if shape is not None:
-                    if isinstance(shape, shp.schematicSymbol):
-                        self.instanceCounter += 1
-                        shape.instanceName = f"I{self.instanceCounter}"
-                        shape.counter = int(self.instanceCounter)
-                        [label.labelDefs() for label in shape.labels.values()]
-                    copyShapesList.append(shape)
+                if not isinstance(item, (shp.schematicSymbol, snet.schematicNet,
+                                         shp.schematicPin, shp.text)):
+                    continue
+                shape = item.clone()
+                if isinstance(shape, shp.schematicSymbol):
+                    self.instanceCounter += 1
+                    shape.instanceName = f"I{self.instanceCounter}"
+                    shape.counter = int(self.instanceCounter)
+                    shape.relabelInstance()
+                copyShapesList.append(shape)
             self.addListUndoStack(copyShapesList)
             self.selectedItemGroup = self.createItemGroup(copyShapesList)
             self.selectedItemGroup.setSelected(True)
 
+    def _saveHeader(self) -> tuple:
+        """Serialized view and grid records written at the top of the file."""
+        return (orjson.dumps({"viewType": "schematic", "schemaVersion": "1.0"}),
+                orjson.dumps({"snapGrid": (self.majorGrid, self.snapGrid),
+                              "snapConnectDistance": self.snapConnectDistance}))
+
     def saveSchematic(self, file: pathlib.Path) -> bool:
         """
         Save the schematic to a file with optimized memory usage and error handling.
+        Only the items changed since the last save are encoded again, and an
+        unchanged schematic is not written at all.
 
         Args:
             file (pathlib.Path): The file path to save the schematic to.
@@ -1135,54 +1178,49 @@ class schematicScene(editorScene):
             IOError: If there are file operation errors
             JSONEncodeError: If there are JSON serialization errors
         """
+        # Create temporary file in the same directory
+        tempFile = file.with_suffix(".tmp")
         try:
             self.cleanUpNets()
             self.itemsRefSet = set(self.items())
+            header = self._saveHeader()
+            if self.savedRecords.isSaved(file, header):
+                self.logger.info(
+                    f"{self.editorWindow.cellName}:{self.editorWindow.viewName} "
+                    f"is unchanged, not saved")
+                return True
             # Ensure parentW directory exists
             file.parent.mkdir(parents=True, exist_ok=True)
 
-            # Create temporary file in the same directory
-            tempFile = file.with_suffix(".tmp")
-            # Write to temporary file first
             with self.measureDuration():
-                with tempFile.open(mode="w", buffering=8192) as f:
-                    # Start array
-                    f.write("[\n")
-
-                    header_items = [{"viewType": "schematic",
-                                     "schemaVersion": "1.0"}, {
-                        "snapGrid": (self.majorGrid, self.snapGrid),
-                        "snapConnectDistance": self.snapConnectDistance}, ]
-                    json.dump(header_items[0], f)
-                    f.write(",\n")
-                    json.dump(header_items[1], f)
-                    topLevelItems = filter(
-                        lambda item: isinstance(item, self.SCHEMATIC_SHAPES),
-                        self.items())
-                    # Stream items
-                    for item in list(topLevelItems):
-                        f.write(",\n")
-                        try:
-                            json.dump(item, f, cls=schenc.schematicEncoder)
-                        except Exception as json_err:
-                            self.logger.error(
-                                f"Failed to serialize item: {str(json_err)}")
-                            return
-
-                    # Close array
-                    f.write("\n]")
-
+                encoder = schenc.schematicEncoder()
+                # Edits on the selection may bypass the undo stack.
+                self.savedRecords.itemsChanged(self.selectedItems())
+                topLevelItems = [item for item in self.items()
+                                 if isinstance(item, self.SCHEMATIC_SHAPES)]
+                try:
+                    records = self.savedRecords.encode(
+                        topLevelItems, lambda item: orjson.dumps(
+                            encoder.default(item), default=encoder.default))
+                except TypeError as json_err:
+                    self.logger.error(
+                        f"Failed to serialize item: {str(json_err)}")
+                    return False
+                # Write to temporary file first
+                with tempFile.open(mode="wb") as f:
+                    f.write(b"[\n" + b",\n".join((*header, *records)) + b"\n]")
                     # Ensure all data is written to disk
                     f.flush()
                     os.fsync(f.fileno())
 
                 # Atomic file replacement
                 tempFile.replace(file)
+                self.savedRecords.saved(file, header)
 
                 self.logger.info(
                     f"Saved schematic to {self.editorWindow.cellName}:"
                     f"{self.editorWindow.viewName}")
-                lj.schematicItems._load_sym_json.cache_clear()
+                designCache().invalidatePath(file)
                 self.undoStack.clear()
                 return True
         except IOError as io_err:
@@ -1257,6 +1295,8 @@ class schematicScene(editorScene):
                 finally:
                     self.blockSignals(False)
             self.itemsRefSet = set(self.items())
+            self.connectivity.invalidate()
+            self.savedRecords.loaded(filePathObj, self._saveHeader())
 
         except (orjson.JSONDecodeError, FileNotFoundError) as e:
             self.logger.error(f"File error while loading schematic: {e}")
@@ -1518,36 +1558,20 @@ class schematicScene(editorScene):
 
     def clearProbe(self):
         """Clear all probes and reset probe state. Also clears probes
-        from related editors in the hierarchy."""
-        from PySide6.QtWidgets import QApplication
-        # Clear local probes
+        from the other levels of the design hierarchy."""
+        self.clearLocalProbes()
+        for _, levelScene in self.netMap.levels():
+            if levelScene is not self:
+                levelScene.clearLocalProbes()
+
+    def clearLocalProbes(self):
+        """Clear the probes of this scene only."""
         for netSet in self._probedNets.values():
             for netItem in netSet:
                 if netItem.scene():
                     netItem.unprobe()
         self._probedNets.clear()
         self._probeColorMap.clear()
-        self.probePinNames.clear()
-        # Clear probes from related editors
-        editor = self.editorWindow
-        openWindows = {w for w in QApplication.topLevelWidgets()
-                       if hasattr(w, 'centralW') and hasattr(w.centralW, 'scene')}
-        relatedEditors = set()
-        editor.findRelated(editor, relatedEditors, openWindows)
-        for w in relatedEditors:
-            if w == editor:
-                continue
-            relatedScene = w.centralW.scene
-            if not hasattr(relatedScene, '_probedNets'):
-                continue
-            if relatedScene._probedNets:
-                for netSet in relatedScene._probedNets.values():
-                    for netItem in netSet:
-                        if netItem.scene():
-                            netItem.unprobe()
-                relatedScene._probedNets.clear()
-                relatedScene._probeColorMap.clear()
-                relatedScene.probePinNames.clear()
 
     def reapplyProbesAfterReload(self):
         """Reapply probes after a scene reload. The reload destroys all
@@ -1558,7 +1582,6 @@ class schematicScene(editorScene):
         savedProbes = dict(self._probeColorMap)
         self._probedNets.clear()
         self._probeColorMap.clear()
-        self.probePinNames.clear()
         for netName, colorIndex in savedProbes.items():
             self.addProbe(netName, propagate=False, colorIndex=colorIndex)
 
@@ -1576,19 +1599,14 @@ class schematicScene(editorScene):
             self._probeColorIndex = (self._probeColorIndex + 1) % len(
                 schlyr.probePens)
         probePen = schlyr.probePens[colorIndex % len(schlyr.probePens)]
-        self.nameSceneNets()
-        sceneNetsSet = self.findSceneNetsSet()
-        matchingNets = {
-            net for net in sceneNetsSet
-            if snet.schematicNet._namesMatch(net.name, netName)
-        }
+        self.updateNetNames()
+        matchingNets = set(self.connectivity.netsNamed(netName))
         self._probedNets[netName] = matchingNets
         self._probeColorMap[netName] = colorIndex
         for netItem in matchingNets:
             netItem.probe(probePen)
         if propagate:
-            self._propagateProbeHierarchy(netName, {self.editorWindow},
-                                          colorIndex)
+            self._propagateProbeHierarchy(netName, colorIndex)
 
     def removeProbe(self, netName: str, propagate: bool = True):
         """Remove a specific probe by net name. When propagate is True,
@@ -1600,181 +1618,46 @@ class schematicScene(editorScene):
                 if netItem.scene():
                     netItem.unprobe()
         if propagate:
-            self._propagateRemoveProbe(netName, {self.editorWindow})
-
-    def _propagateProbeHierarchy(self, netName: str, visited: set,
-                                 colorIndex: int = 0):
-        """Propagate a probe to all related editors in the hierarchy."""
-        editor = self.editorWindow
-        # Propagate up to parent
-        if editor.parentEditor and editor.parentEditor not in visited:
-            parentScene = editor.parentEditor.centralW.scene
-            if hasattr(parentScene, 'addProbe'):
-                visited.add(editor.parentEditor)
-                parentNetNames = self._mapNetToParent(netName, editor)
-                for parentNetName in parentNetNames:
-                    parentScene.addProbe(parentNetName, propagate=False,
-                                         colorIndex=colorIndex)
-                    parentScene._propagateProbeHierarchy(
-                        parentNetName, visited, colorIndex)
-                    parentScene._propagateProbeDown(
-                        parentNetName, visited, colorIndex)
-
-        # Propagate down to children
-        self._propagateProbeDown(netName, visited, colorIndex)
-
-    def _propagateProbeDown(self, netName: str, visited: set,
-                             colorIndex: int = 0):
-        """Propagate probe down to child editors by finding which pins of
-        the parent symbol are connected to the probed net, then probing
-        the matching schematic pins in the child scene."""
-        from PySide6.QtWidgets import QApplication
-        editor = self.editorWindow
-        self.nameSceneNets()
-        for w in QApplication.topLevelWidgets():
-            if not hasattr(w, 'centralW') or not hasattr(w.centralW, 'scene'):
-                continue
-            if w in visited:
-                continue
-            if not hasattr(w, 'parentEditor') or w.parentEditor != editor:
-                continue
-            if not hasattr(w, 'parentObj'):
-                continue
-            visited.add(w)
-            childScene = w.centralW.scene
-            if not hasattr(childScene, 'probeMode'):
-                continue
-            parentSymbol = w.parentObj
-            if not hasattr(parentSymbol, 'pins'):
-                continue
-            # Find which pins of the parent symbol are connected to the probed net
-            childPinNames = set()
-            for pinName, pinItem in parentSymbol.pins.items():
-                try:
-                    connectedNets = [
-                        n for n in pinItem.collidingItems(
-                            Qt.IntersectsItemBoundingRect)
-                        if isinstance(n, snet.schematicNet)
-                    ]
-                except RuntimeError:
-                    continue
-                for netItem in connectedNets:
-                    if (snet.schematicNet._namesMatch(netItem.name, netName)
-                            and not netItem.name.startswith("dnet")):
-                        childPinNames.add(pinName)
-                        break
-            if childPinNames:
-                childScene.probePinNames |= childPinNames
-                childScene.applyProbe(colorIndex)
-                # Continue propagating from child for the current probe only
-                for childProbeName in list(childScene._probedNets.keys()):
-                    if snet.schematicNet._namesMatch(childProbeName, netName):
-                        childScene._propagateProbeDown(
-                            childProbeName, visited, colorIndex)
-
-    def _mapNetToParent(self, netName: str, editor) -> set:
-        """Map a net name in the current scene to net name(s) in the parent
-        scene by finding schematic pins connected to the probed net, then
-        finding nets connected to the matching pins on the parent symbol."""
-        parentNetNames = set()
-        self.nameSceneNets()
-        # Find child schematic pins connected to the probed net
-        matchingPinNames = set()
-        for pinItem in self.findSceneSchemPinsSet():
-            try:
-                connectedNets = [
-                    n for n in pinItem.collidingItems(
-                        Qt.IntersectsItemBoundingRect)
-                    if isinstance(n, snet.schematicNet)
-                ]
-            except RuntimeError:
-                continue
-            if connectedNets and snet.schematicNet._namesMatch(
-                    connectedNets[0].name, netName):
-                matchingPinNames.add(pinItem.pinName)
-
-        if not matchingPinNames or not editor.parentEditor:
-            return parentNetNames
-
-        # Find nets connected to matching pins on the parent symbol
-        parentScene = editor.parentEditor.centralW.scene
-        parentScene.nameSceneNets()
-        parentSymbol = editor.parentObj
-        if not hasattr(parentSymbol, 'pins'):
-            return parentNetNames
-
-        for pinName, pinItem in parentSymbol.pins.items():
-            if pinName in matchingPinNames:
-                try:
-                    connectedNets = [
-                        n for n in pinItem.collidingItems(
-                            Qt.IntersectsItemBoundingRect)
-                        if isinstance(n, snet.schematicNet)
-                    ]
-                except RuntimeError:
-                    continue
-                for netItem in connectedNets:
-                    if not netItem.name.startswith("dnet"):
-                        parentNetNames.add(netItem.name)
-        return parentNetNames
-
-    def _propagateRemoveProbe(self, netName: str, visited: set):
-        """Remove corresponding probes from related editors."""
-        from PySide6.QtWidgets import QApplication
-        editor = self.editorWindow
-        # Remove from parent
-        if editor.parentEditor and editor.parentEditor not in visited:
-            parentScene = editor.parentEditor.centralW.scene
-            if hasattr(parentScene, '_probedNets'):
-                visited.add(editor.parentEditor)
-                parentNetNames = self._mapNetToParent(netName, editor)
-                for parentNetName in parentNetNames:
-                    parentScene.removeProbe(parentNetName, propagate=False)
-                    parentScene._propagateRemoveProbe(parentNetName, visited)
-        # Remove from children
-        for w in QApplication.topLevelWidgets():
-            if not hasattr(w, 'centralW') or not hasattr(w.centralW, 'scene'):
-                continue
-            if w in visited:
-                continue
-            if not hasattr(w, 'parentEditor') or w.parentEditor != editor:
-                continue
-            visited.add(w)
-            childScene = w.centralW.scene
-            if not hasattr(childScene, '_probedNets'):
-                continue
-            # Remove all probes in child that match through pin mapping
-            for childProbeName in list(childScene._probedNets.keys()):
-                childScene.removeProbe(childProbeName, propagate=False)
-                childScene._propagateRemoveProbe(childProbeName, visited)
-
-    def applyProbe(self, colorIndex: int = 0):
-        """Apply probe from parent pin names. Called after child scene is loaded."""
-        if not self.probePinNames:
+            self._propagateRemoveProbe(netName)
+
+    @property
+    def netMap(self) -> hierNetMap:
+        """The net alias map of the design hierarchy this scene is in."""
+        scene = self
+        while True:
+            parentEditor = scene.editorWindow.parentEditor
+            if parentEditor is None or not isinstance(
+                    parentEditor.centralW.scene, schematicScene):
+                break
+            scene = parentEditor.centralW.scene
+        if scene._hierNetMap is None:
+            scene._hierNetMap = hierNetMap(scene)
+        return scene._hierNetMap
+
+    def _netAliases(self, netName: str):
+        """Yield (scene, net names) of netName at the other open hierarchy
+        levels."""
+        netMap = self.netMap
+        levelScenes = dict(netMap.levels())
+        path = netMap.pathOf(self)
+        if path is None:
             return
-        probePen = schlyr.probePens[colorIndex % len(schlyr.probePens)]
-        self.nameSceneNets()
-        sceneNetsSet = self.findSceneNetsSet()
-        schemPinsSet = self.findSceneSchemPinsSet()
-
-        for pinItem in schemPinsSet:
-            if pinItem.pinName in self.probePinNames:
-                connectedNets = [
-                    netItem for netItem in pinItem.collidingItems(
-                        Qt.IntersectsItemBoundingRect)
-                    if isinstance(netItem, snet.schematicNet)
-                ]
-                if connectedNets:
-                    probeName = connectedNets[0].name
-                    if probeName in self._probedNets:
-                        continue
-                    matchingNets = {
-                        net for net in sceneNetsSet
-                        if snet.schematicNet._namesMatch(net.name, probeName)
-                    }
-                    self._probedNets[probeName] = matchingNets
-                    for netItem in matchingNets:
-                        netItem.probe(probePen)
+        for levelPath, names in netMap.aliases(path, netName).items():
+            if levelPath != path and levelPath in levelScenes:
+                yield levelScenes[levelPath], names
+
+    def _propagateProbeHierarchy(self, netName: str, colorIndex: int = 0):
+        """Probe the nets connected to netName at the other hierarchy levels."""
+        for levelScene, names in self._netAliases(netName):
+            for name in names:
+                levelScene.addProbe(name, propagate=False,
+                                    colorIndex=colorIndex)
+
+    def _propagateRemoveProbe(self, netName: str):
+        """Remove the probes of netName from the other hierarchy levels."""
+        for levelScene, names in self._netAliases(netName):
+            for name in names:
+                levelScene.removeProbe(name, propagate=False)
 
     def goDownHier(self):
         """
@@ -1800,7 +1683,8 @@ class schematicScene(editorScene):
                 dlg.viewListCB.addItems(viewNames)
                 if dlg.exec() == QDialog.DialogCode.Accepted:
                     selectedSymbol.setSelected(False)
-                    self.saveSchematic(self.editorWindow.file)
+                    if self.savedRecords.isModified:
+                        self.saveSchematic(self.editorWindow.file)
                     viewItem = libm.getViewItem(
                         cellItem, dlg.viewListCB.currentText()
                     )
@@ -1826,57 +1710,27 @@ class schematicScene(editorScene):
                         if childWindowType == "symbolEditor":
                             childWindow.symbolToolbar.addAction(
                                 childWindow.goUpAction)
-                            if dlg.buttonId == 2:
-                                childWindow.centralW.scene.readOnly = True
+                            childWindow.centralW.scene.readOnly = (
+                                dlg.buttonId == 2)
                         elif childWindowType == "schematicEditor":
                             childWindow.schematicToolbar.addAction(
                                 childWindow.goUpAction)
-                            if dlg.buttonId == 2:
-                                childWindow.centralW.scene.readOnly = True
-
-                        # Propagate probes to child scene
-                        if self.probeMode and self._probedNets:
+                            childWindow.centralW.scene.readOnly = (
+                                dlg.buttonId == 2)
                             childScene = childWindow.centralW.scene
-                            if hasattr(childScene, 'probePinNames'):
-                                self._propagateProbeToChild(
-                                    childScene, selectedSymbol)
+                            self.netMap.attach(childScene, self, selectedSymbol)
+                            if self.probeMode and self._probedNets:
+                                self._propagateProbeToChild(childScene)
 
         except IndexError:
             pass
 
-    def _propagateProbeToChild(self, childScene, selectedSymbol):
-        """Propagate all active probes to a child scene by finding which
-        pins of the selected symbol are connected to each probed net and
-        passing those pin names to the child scene. Each probe retains
-        its own color."""
-        self.nameSceneNets()
-        if not hasattr(selectedSymbol, 'pins'):
-            return
-        # Build a map of pin name → connected net name for the symbol
-        pinToNet = {}
-        for pinName, pinItem in selectedSymbol.pins.items():
-            try:
-                connectedNets = [
-                    n for n in pinItem.collidingItems(
-                        Qt.IntersectsItemBoundingRect)
-                    if isinstance(n, snet.schematicNet)
-                ]
-            except RuntimeError:
-                continue
-            for netItem in connectedNets:
-                if not netItem.name.startswith("dnet"):
-                    pinToNet[pinName] = netItem.name
-                    break
-        # For each probed net, find matching pins and apply probe to child
+    def _propagateProbeToChild(self, childScene):
+        """Probe the nets of a child scene connected to the probed nets of
+        this scene. Each probe retains its own color."""
         childScene.probeMode = True
-        for idx, probedNetName in enumerate(self._probedNets):
-            childPinNames = set()
-            for pinName, netName in pinToNet.items():
-                if snet.schematicNet._namesMatch(netName, probedNetName):
-                    childPinNames.add(pinName)
-            if childPinNames:
-                childScene.probePinNames |= childPinNames
-                childScene.applyProbe(idx % len(schlyr.probePens))
+        for netName, colorIndex in list(self._probeColorMap.items()):
+            self._propagateProbeHierarchy(netName, colorIndex)
 
     def ignoreSymbol(self):
         if self.selectedItems() is not None:
@@ -1938,12 +1792,79 @@ class schematicScene(editorScene):
                 ordered_map[pinName] = symbolItem.pinNetMap[pinName]
             symbolItem.pinNetMap = ordered_map
 
+    @staticmethod
+    def buildNetAdjacency(nets: Set[snet.schematicNet]) -> Dict[
+        snet.schematicNet, Set[snet.schematicNet]]:
+        """
+        Build net-to-net adjacency from an end point hash index.
+
+        Two nets are adjacent when any of their end points are within one unit
+        Manhattan distance, the same rule as checkNetConnect.
+        """
+        endPointIndex: Dict[Tuple[int, int], List[snet.schematicNet]] = {}
+        for netItem in nets:
+            for point in netItem.sceneEndPoints:
+                endPointIndex.setdefault((point.x(), point.y()), []).append(netItem)
+
+        adjacency = {netItem: set() for netItem in nets}
+        for (x, y), netsAtPoint in endPointIndex.items():
+            # same point and the two "forward" neighbours cover every pair once
+            for key in ((x, y), (x + 1, y), (x, y + 1)):
+                otherNets = endPointIndex.get(key)
+                if not otherNets:
+                    continue
+                for netItem in netsAtPoint:
+                    for otherNet in otherNets:
+                        if otherNet is not netItem:
+                            adjacency[netItem].add(otherNet)
+                            adjacency[otherNet].add(netItem)
+        return adjacency
+
+    @staticmethod
+    def netComponents(nets: Set[snet.schematicNet],
+                      adjacency: Dict[snet.schematicNet, Set[snet.schematicNet]]
+                      ) -> Dict[snet.schematicNet, Set[snet.schematicNet]]:
+        """
+        Group nets into connected components with a disjoint-set structure.
+
+        Only edges between members of nets are followed. Returns a mapping from
+        every net to the set of nets in its component.
+        """
+        netList = list(nets)
+        # index by identity; schematicNet hashing is comparatively expensive
+        indexOf = {id(netItem): index for index, netItem in enumerate(netList)}
+        parent = list(range(len(netList)))
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        for index, netItem in enumerate(netList):
+            for otherNet in adjacency.get(netItem, ()):
+                otherIndex = indexOf.get(id(otherNet))
+                if otherIndex is not None:
+                    root, otherRoot = find(index), find(otherIndex)
+                    if root != otherRoot:
+                        parent[otherRoot] = root
+
+        groups: Dict[int, Set[snet.schematicNet]] = {}
+        for index, netItem in enumerate(netList):
+            groups.setdefault(find(index), set()).add(netItem)
+        return {netItem: group for group in groups.values() for netItem in group}
+
     def _processNetGroup(self, namedNets: Set[snet.schematicNet],
                          remainingNets: Set[snet.schematicNet]):
         """Process a group of named nets and their connections."""
+        adjacency = self._netAdjacency
+        components = self.netComponents(remainingNets, adjacency)
         while namedNets:
             net = namedNets.pop()
-            connectedNets = self.findConnectedNets(net, remainingNets)
+            connectedNets = set()
+            for neighbour in adjacency.get(net, ()):
+                if neighbour in remainingNets and neighbour not in connectedNets:
+                    connectedNets |= components[neighbour]
             for connectedNet in connectedNets:
                 connectedNet.mergeNetName(net)
             remainingNets -= connectedNets
@@ -1951,36 +1872,71 @@ class schematicScene(editorScene):
     def findConnectedNets(self, startNet: snet.schematicNet,
                           candidateNets: Set[snet.schematicNet]) -> Set[
         snet.schematicNet]:
-        """Find all nets connected to startNet using DFS without mutating input."""
+        """Find all nets connected to startNet through candidateNets."""
+        adjacency = self._netAdjacency
+        if startNet not in adjacency or not candidateNets <= adjacency.keys():
+            adjacency = self.buildNetAdjacency(candidateNets | {startNet})
         connected = set()
         stack = [startNet]
-        visited = {startNet}
-
         while stack:
             currentNet = stack.pop()
-            for candidateNet in candidateNets:
-                if candidateNet not in visited and self.checkNetConnect(
-                        currentNet, candidateNet):
+            for candidateNet in adjacency[currentNet]:
+                if candidateNet not in connected and candidateNet in candidateNets:
                     connected.add(candidateNet)
                     stack.append(candidateNet)
-                    visited.add(candidateNet)
-
+        connected.discard(startNet)
         return connected
 
     def nameSceneNets(self):
         """
         Name all nets in the scene.
         """
-        netCounter = 0
-        schematicSymbolSet = self.findSceneSymbolSet()
-        sceneNetsSet: Set[snet.schematicNet] = self.findSceneNetsSet()
+        self.netCounter = 0
+        self.nameNetGroup(self.findSceneNetsSet(), self.findSceneSymbolSet(),
+                          self.findSceneSchemPinsSet())
+
+    def nameNetGroup(self, netsSet: Set[snet.schematicNet],
+                     symbolSet: Set[shp.schematicSymbol],
+                     schemPinsSet: Set[shp.schematicPin]):
+        """
+        Name netsSet, which must be closed under wire connectivity, using the
+        global pins of symbolSet and the schematic pins in schemPinsSet.
+
+        A wire group left without a name keeps the automatic name one of its
+        wires had, unless another group has it, and the other groups get the
+        lowest free netN names. Automatic names thus do not depend on the
+        order of the edits, and renaming a few wire groups leaves the names
+        of the others alone.
+
+        Only the nets whose name or name strength ends up different are
+        reported to the saved records.
+        """
+        previousNames = {netItem: (netItem.name, netItem.nameStrength)
+                         for netItem in netsSet}
+        with self.savedRecords.heldChanges():
+            self._nameNetGroup(set(netsSet), symbolSet, schemPinsSet)
+        self.savedRecords.itemsChanged(
+            [netItem for netItem, previous in previousNames.items()
+             if (netItem.name, netItem.nameStrength) != previous])
+
+    def _nameNetGroup(self, netsSet: Set[snet.schematicNet],
+                      symbolSet: Set[shp.schematicSymbol],
+                      schemPinsSet: Set[shp.schematicPin]):
+        sceneNetsSet = set(netsSet)
+        self._netAdjacency = self.buildNetAdjacency(sceneNetsSet)
+        autoNames = {netItem: netItem.name for netItem in sceneNetsSet
+                     if netItem.nameStrength == snet.netNameStrengthEnum.WEAK
+                     and AUTO_NET_NAME.fullmatch(netItem.name)}
+        # The name index is replaced, not changed, as names are set below.
+        nameIndex = self.connectivity.nameIndex()
+        netIds = {id(netItem) for netItem in netsSet}
 
         # Clear existing names
         for netItem in sceneNetsSet:
             netItem.clearName()
 
         # Process in priority order
-        result, globalNetsSet = self.findGlobalNets(schematicSymbolSet)
+        result, globalNetsSet = self.findGlobalNets(symbolSet, netsSet)
         if not result:
             self.logger.error("Net name conflict in global pins.")
             return
@@ -1988,7 +1944,7 @@ class schematicScene(editorScene):
         # now follow all the connected nets to globalNetsSet nets
         self._processNetGroup(globalNetsSet, sceneNetsSet)
 
-        result, schemPinConNetsSet = self.findSchPinNets()
+        result, schemPinConNetsSet = self.findSchPinNets(schemPinsSet, netsSet)
         if not result:
             self.logger.error("Net name conflict in schematic pins.")
             return
@@ -2000,24 +1956,71 @@ class schematicScene(editorScene):
         sceneNetsSet -= namedNetsSet
         self._processNetGroup(namedNetsSet, sceneNetsSet)
 
-        # Auto-name remaining nets
+        # Auto-name remaining nets, one name per connected component
+        takenNames = {netItem.name for netItem in netsSet - sceneNetsSet}
+
+        def isFree(name: str) -> bool:
+            return name not in takenNames and all(
+                key in netIds for key in nameIndex.get(name, ()))
+
+        components = self.netComponents(sceneNetsSet, self._netAdjacency)
+        groups = []
         while sceneNetsSet:
-            net = sceneNetsSet.pop()
-            net.name = f"net{netCounter}"
-            net.nameStrength = snet.netNameStrengthEnum.WEAK
-            connectedNets = self.findConnectedNets(net, sceneNetsSet)
-            for connectedNet in connectedNets:
-                connectedNet.mergeNetName(net)
-            sceneNetsSet -= connectedNets
-            netCounter += 1
+            group = components[next(iter(sceneNetsSet))]
+            sceneNetsSet -= group
+            groups.append(group)
+        groups.sort(key=self._netGroupOrigin)
+        groupNames = []
+        for group in groups:
+            keptNames = sorted((autoNames[netItem] for netItem in group
+                                if netItem in autoNames), key=self._autoNetNumber)
+            name = next((name for name in keptNames if isFree(name)), None)
+            if name is not None:
+                takenNames.add(name)
+            groupNames.append(name)
+        netNumber = 0
+        for index, (group, name) in enumerate(zip(groups, groupNames)):
+            if name is None:
+                while not isFree(f"net{netNumber}"):
+                    netNumber += 1
+                name = groupNames[index] = f"net{netNumber}"
+                takenNames.add(name)
+            # the wire that carried the name before stays its source
+            sourceNet = min(group, key=lambda netItem: (
+                autoNames.get(netItem) != name, self._netGroupOrigin({netItem})))
+            sourceNet.name = name
+            sourceNet.nameStrength = snet.netNameStrengthEnum.WEAK
+            for connectedNet in group - {sourceNet}:
+                connectedNet.mergeNetName(sourceNet)
+
+        if groupNames:
+            self.netCounter = max(self.netCounter, 1 + max(
+                map(self._autoNetNumber, groupNames)))
 
-        self.netCounter = netCounter
+    @staticmethod
+    def _autoNetNumber(name: str) -> int:
+        return int(AUTO_NET_NAME.fullmatch(name).group(1))
+
+    @staticmethod
+    def _netGroupOrigin(group: Set[snet.schematicNet]) -> Tuple[int, int]:
+        """Top left end point of a wire group, to name groups in scene order."""
+        return min((point.x(), point.y()) for netItem in group
+                   for point in netItem.sceneEndPoints)
+
+    def updateNetNames(self):
+        """
+        Bring net names and symbol pin-net maps up to date, renaming only the
+        wire groups changed since the last call.
+        """
+        self.connectivity.refresh()
 
     # Net finding methods
-    def findGlobalNets(self, symbolSet: set[shp.schematicSymbol]) -> tuple[
+    def findGlobalNets(self, symbolSet: set[shp.schematicSymbol],
+                       netsSet: Optional[Set[snet.schematicNet]] = None) -> tuple[
         bool, set[snet.schematicNet]]:
         """
-        This method finds all nets connected to global pins.
+        This method finds all nets connected to global pins. If netsSet is
+        given, only nets in it are considered.
         """
         globalNetsSet = set()
 
@@ -2030,7 +2033,8 @@ class schematicScene(editorScene):
                 # Get nets connected to this global pin
                 connectedNets = (netItem for netItem in
                                  pinItem.collidingItems(Qt.IntersectsItemShape) if
-                                 isinstance(netItem, snet.schematicNet))
+                                 isinstance(netItem, snet.schematicNet) and (
+                                         netsSet is None or netItem in netsSet))
 
                 for netItem in connectedNets:
                     if netItem.nameStrength.value == 3:  # Strong name
@@ -2057,17 +2061,22 @@ class schematicScene(editorScene):
         return {pinItem for pinItem in net.collidingItems(Qt.IntersectsItemShape)
                 if isinstance(pinItem, shp.schematicPin)}
 
-    def findSchPinNets(self) -> tuple[bool, set[snet.schematicNet]]:
-        """Find nets connected to schematic pins."""
+    def findSchPinNets(self, schemPinsSet: Optional[Set[shp.schematicPin]] = None,
+                       netsSet: Optional[Set[snet.schematicNet]] = None) -> tuple[
+        bool, set[snet.schematicNet]]:
+        """Find nets connected to schematic pins, optionally limited to netsSet."""
         connectedNetsSet = set()
+        if schemPinsSet is None:
+            schemPinsSet = self.findSceneSchemPinsSet()
 
-        for sceneSchemPin in self.findSceneSchemPinsSet():
+        for sceneSchemPin in schemPinsSet:
             try:
                 # Use collision detection for better performance
                 connectedNets = (netItem for netItem in
                                  sceneSchemPin.collidingItems(
                                      Qt.IntersectsItemShape) if
-                                 isinstance(netItem, snet.schematicNet))
+                                 isinstance(netItem, snet.schematicNet) and (
+                                         netsSet is None or netItem in netsSet))
 
                 # Parse pin name once
                 pinBaseName, pinIndices = self.parseBusNotation(
@@ -2121,10 +2130,20 @@ class schematicScene(editorScene):
         self.logger.info("Checking for errors...")
         symbolSet = self.findSceneSymbolSet()
         overlapExists, overlapRects = schk.checkSymbolOverlaps(symbolSet)
+        errorPen = QPen(Qt.red, 1, Qt.DashDotLine)
         if overlapExists:
-            errorPen = QPen(Qt.red, 1, Qt.DashDotLine)
             for rect in overlapRects:
                 self.overlapRectSet.add(self.addRect(rect, errorPen))
+        connectorSet = self.findSceneSchemPinsSet()
+        for symbolItem in symbolSet:
+            connectorSet.update(symbolItem.pins.values())
+        danglingExists, danglingEnds = schk.checkUnconnectedNets(
+            self.findSceneNetsSet(), connectorSet)
+        if danglingExists:
+            self.logger.warning(f"{len(danglingEnds)} unconnected net ends.")
+            for point in danglingEnds:
+                self.overlapRectSet.add(self.addRect(
+                    QRectF(point.x() - 5, point.y() - 5, 10, 10), errorPen))
 
     def deleteErrors(self):
         self.logger.info("Deleting errors...")
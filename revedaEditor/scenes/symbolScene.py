@@ -46,6 +46,7 @@ import revedaEditor.fileio.symbolEncoder as symenc
 import revedaEditor.gui.alignItems as alg
 import revedaEditor.gui.propertyDialogues as pdlg
 from revedaEditor.backend.pdkLoader import importPDKModule
+from revedaEditor.common.fileCache import designCache
 from revedaEditor.scenes.editorScene import editorScene
 
 symlyr = importPDKModule('symLayers')
@@ -57,6 +58,10 @@ class symbolScene(editorScene):
     Scene for Symbol editor.
     """
     alignLineFinished = Signal(shp.alignLine)
+    SYMBOL_SHAPES = (shp.symbolPolygon, shp.symbolRectangle, shp.symbolArc,
+                     shp.symbolLine, shp.symbolPin, lbl.symbolLabel,
+                     shp.symbolCircle, shp.text)
+    DESIGN_SHAPES = SYMBOL_SHAPES
 
     def __init__(self, parent):
         super().__init__(parent)
@@ -638,6 +643,7 @@ class symbolScene(editorScene):
                 self.attributeList = []
                 self.createSymbolItems(itemData)
             self.itemsRef = set(self.items())
+            self.savedRecords.loaded(filePathObj, self._saveHeader())
         except (orjson.JSONDecodeError, FileNotFoundError) as e:
             self.logger.error(f"File error while loading symbol: {e}")
             self.attributeList = []
@@ -671,9 +677,15 @@ class symbolScene(editorScene):
                 if itemType == "attr":
                     self.attributeList.append(factory.createSymbolAttribute(itemDict))
 
+    def _saveHeader(self) -> tuple:
+        """Serialized view and grid records written at the top of the file."""
+        return (orjson.dumps({"viewType": "symbol", "schemaVersion": "1.0"}),
+                orjson.dumps({"snapGrid": (self.majorGrid, self.snapGrid),
+                              "snapConnectDistance": self.snapConnectDistance}))
+
     def saveSymbolCell(self, fileName: pathlib.Path) -> bool:
         """
-        Save symbol cell to file.
+        Save symbol cell to file. An unchanged symbol is not written again.
 
         Args:
             fileName: Path to save the symbol cell
@@ -684,13 +696,13 @@ class symbolScene(editorScene):
 
         try:
             self.itemsRefSet = set(self.items())
+            header = self._saveHeader()
+            if self.savedRecords.isSaved(fileName, header):
+                return True
             # Filter items and process labels in one pass
 
-            symbolClasses = (shp.symbolPolygon, shp.symbolRectangle, shp.symbolArc,
-                             shp.symbolLine, shp.symbolPin, lbl.symbolLabel,
-                             shp.symbolCircle, shp.text)
             sceneItems = [item for item in self.items() if isinstance(item,
-                                                                      symbolClasses)]
+                                                                      self.SYMBOL_SHAPES)]
             # Build save data
             save_data = [
                 {"viewType": "symbol", "schemaVersion": "1.0"},
@@ -704,8 +716,9 @@ class symbolScene(editorScene):
             with fileName.open("w") as f:
                 json.dump(save_data, f, cls=symenc.symbolEncoder, indent=4)
 
+            self.savedRecords.saved(fileName, header)
             self.undoStack.clear()
-            lj.schematicItems._load_sym_json.cache_clear()
+            designCache().invalidatePath(fileName)
             return True
 
         except Exception as e:
@@ -745,20 +758,21 @@ class symbolScene(editorScene):
                         )
                     )
             self.attributeList = deepcopy(localAttributeList)
+            self.itemsChanged(symbolPropDialogue.labelItemList)
+            # the attributes are not scene items; mark the symbol modified
+            self.savedRecords.invalidate()
+
+    _copiedTypes = (shp.symbolRectangle, shp.symbolLine, shp.symbolCircle,
+                    shp.symbolArc, shp.symbolPolygon, shp.symbolPin, shp.text,
+                    lbl.symbolLabel)
 
     def copySelectedItems(self):
         # Only consider top-level items (same as schematic/layout editors)
         selectedItems = [item for item in self.selectedItems() if item.parentItem() is None]
         if not selectedItems:
             return
-        copyShapesList = []
-        factory = lj.symbolItems(self)
-        for item in selectedItems:
-            selectedItemJson = json.dumps(item, cls=symenc.symbolEncoder)
-            itemCopyDict = json.loads(selectedItemJson)
-            shape = factory.create(itemCopyDict)
-            if shape is not None:
-                copyShapesList.append(shape)
+        copyShapesList = [item.clone() for item in selectedItems
+                          if isinstance(item, self._copiedTypes)]
         if copyShapesList:
             # Add to undo stack before grouping (matches schematic/layout pattern)
             self.addListUndoStack(copyShapesList)
@@ -0,0 +1,45 @@
+import os
+
+from revedaEditor.common.fileCache import designCache
+
+
+def test_design_cache_budget_and_invalidation(qtbot, tmp_path):
+    cache = designCache()
+    cache.clear()
+    budget = cache.budget
+    try:
+        cache.budget = 300
+        cache.put("a", 1, 100)
+        cache.put("b", 2, 100)
+        cache.put("c", 3, 100)
+        assert cache.get("a") == 1
+        # "b" is now the least recently used entry.
+        cache.put("d", 4, 100)
+        assert cache.get("b") is None
+        assert cache.size == 300 and cache.stats["evictions"] == 1
+        cache.put("huge", 5, 301)
+        assert cache.get("huge") is None
+
+        symbolPath = tmp_path / "symbol.json"
+        symbolPath.write_text('[{"cellView": "symbol"}]')
+        cache.budget = 1 << 20
+        assert cache.getJson(symbolPath) == [{"cellView": "symbol"}]
+        assert cache.getJson(str(symbolPath)) == [{"cellView": "symbol"}]
+        hits = cache.stats["hits"]
+
+        # A file rewritten on disk is read again.
+        symbolPath.write_text('[{"cellView": "symbol"}, {}]')
+        stat = symbolPath.stat()
+        os.utime(symbolPath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert len(cache.getJson(symbolPath)) == 2
+        assert cache.stats["hits"] == hits
+
+        # Saving a file drops only the entries made from it.
+        cache.put(("pixmap", str(symbolPath)), "pixmap", 10, symbolPath)
+        cache.invalidatePath(symbolPath)
+        assert cache.get(("pixmap", str(symbolPath))) is None
+        assert cache.get(("json", str(symbolPath))) is None
+        assert cache.get("d") == 4
+    finally:
+        cache.clear()
+        cache.budget = budget
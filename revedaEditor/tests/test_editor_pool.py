@@ -0,0 +1,65 @@
+import os
+
+from revedaEditor.gui.editorPool import editorPool
+
+
+class parkedEditor:
+    def __init__(self, file, placedFiles=()):
+        self.file = file
+        self.placedFiles = list(placedFiles)
+        self.released = False
+
+    def designFiles(self):
+        return [self.file, *self.placedFiles]
+
+    def deleteLater(self):
+        self.released = True
+
+
+def test_pool_evicts_least_recent(tmp_path):
+    editors = {}
+    for name in ("a", "b", "c"):
+        file = tmp_path / f"{name}.json"
+        file.write_text("[]")
+        editors[name] = parkedEditor(file)
+    pool = editorPool(maxEditors=2)
+    for name, editor in editors.items():
+        pool.park(name, editor)
+
+    assert len(pool) == 2 and "a" not in pool
+    assert editors["a"].released
+    assert pool.take("b") is editors["b"] and "b" not in pool
+    assert pool.take("b") is None
+
+    pool.clear()
+    assert len(pool) == 0 and editors["c"].released
+
+
+def test_pool_drops_editor_of_changed_file(tmp_path):
+    file = tmp_path / "schematic.json"
+    file.write_text("[]")
+    editor = parkedEditor(file)
+    pool = editorPool()
+    pool.park("schematic", editor)
+
+    file.write_text('[{"type": "net"}]')
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert pool.take("schematic") is None
+    assert editor.released
+
+
+def test_pool_drops_editor_of_changed_symbol(tmp_path):
+    file = tmp_path / "schematic.json"
+    file.write_text("[]")
+    symbolFile = tmp_path / "symbol.json"
+    symbolFile.write_text("[]")
+    editor = parkedEditor(file, [symbolFile])
+    pool = editorPool()
+    pool.park("schematic", editor)
+    assert pool.take("schematic") is editor
+
+    pool.park("schematic", editor)
+    symbolFile.write_text('[{"type": "rect"}]')
+    assert pool.take("schematic") is None
+    assert editor.released
@@ -0,0 +1,188 @@
+import logging
+import os
+
+import gdstk
+import orjson
+from PySide6.QtCore import QThreadPool
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QGraphicsScene
+
+import revedaEditor.fileio.exportGDS as gdse
+import revedaEditor.fileio.loadJSON as lj
+from defaultPDK import pcells as pdkPcells
+
+HEADER = [{"viewType": "layout"}, {"snapGrid": [10, 5]}]
+
+
+def _writeCell(libraryPath, cellName, items):
+    cellPath = libraryPath / cellName
+    cellPath.mkdir(parents=True, exist_ok=True)
+    (cellPath / "layout.json").write_bytes(orjson.dumps(HEADER + items))
+    return cellPath / "layout.json"
+
+
+def _rectRecord(width):
+    return {"type": "Rect", "tl": [0, 0], "br": [width, 50], "ln": 1, "ang": 0,
+            "fl": [1, 1]}
+
+
+def _instRecord(cellName, instName, location):
+    return {"type": "Inst", "lib": "lib", "cell": cellName, "view": "layout",
+            "nam": instName, "ic": 1, "loc": location, "ang": 0, "fl": [1, 1]}
+
+
+def _labelRecord(text):
+    return {"type": "Label", "st": [100, 100], "lt": text, "ff": "Arial",
+            "fs": "Regular", "fh": "20", "la": "Left", "lo": "R0", "ln": 1,
+            "ang": 0, "fl": [1, 1]}
+
+
+def _pcellRecord(location):
+    return {"type": "Pcell", "lib": "lib", "cell": "nmos", "view": "layout",
+            "nam": "M1", "ic": 1, "loc": location, "ang": 0, "fl": [1, 1],
+            "params": {"width": "2.0", "length": "0.13", "nf": "2"}}
+
+
+def _viaRecord():
+    return {"type": "Via", "st": [0, 300], "xs": 10, "ys": 20, "xn": 3, "yn": 2,
+            "via": {"vdt": "con", "st": [0, 0], "w": 40, "h": 30, "ang": 0,
+                    "fl": [1, 1]}}
+
+
+def _library(tmp_path, monkeypatch):
+    libraryPath = tmp_path / "lib"
+    (libraryPath / "nmos").mkdir(parents=True)
+    (libraryPath / "nmos" / "layout.json").write_bytes(
+        orjson.dumps([{"cellView": "pcell"}, {"reference": "nmos"}]))
+    monkeypatch.setattr(gdse.pcells, "pcells", {"nmos": pdkPcells.nmos},
+                        raising=False)
+    return libraryPath
+
+
+def _scene(libraryPath, records):
+    scene = QGraphicsScene()
+    scene.libraryDict = {"lib": libraryPath}
+    scene.rulerFont = QFont()
+    scene.rulerTickLength = 1
+    scene.snapTuple = (10, 10)
+    scene.rulerWidth = 1
+    scene.rulerTickGap = 1
+    scene.logger = logging.getLogger(__name__)
+    factory = lj.layoutItems(scene)
+    for record in records:
+        scene.addItem(factory.create(record))
+    return scene
+
+
+def _exporter(scene, outputPath, exporterClass=gdse.gdsExporter):
+    items = [item for item in scene.items() if item.parentItem() is None]
+    return exporterClass("top", items, outputPath, scene.libraryDict)
+
+
+def _cells(outputPath):
+    return {cell.name: cell for cell in gdstk.read_gds(str(outputPath)).cells}
+
+
+def test_export_scene_contents(qtbot, tmp_path, monkeypatch):
+    libraryPath = _library(tmp_path, monkeypatch)
+    _writeCell(libraryPath, "leaf", [_rectRecord(100)])
+    scene = _scene(libraryPath, [_rectRecord(70), _labelRecord("VDD"), _viaRecord(),
+                                 _instRecord("leaf", "I1", [500, 0]),
+                                 _pcellRecord([1000, 0])])
+    outputPath = tmp_path / "out" / "top.gds"
+    _exporter(scene, outputPath).exportWorker("GDS").run()
+
+    cells = _cells(outputPath)
+    top = cells["top"]
+    assert [label.text for label in top.labels] == ["VDD"]
+    assert top.labels[0].magnification == 20 * gdse.gdsExporter.DEFAULT_DBU
+    assert len(top.polygons) == 1
+    references = {reference.cell.name: reference for reference in top.references}
+    assert references["lib_leaf_layout"].origin == (500, 0)
+    assert len(cells["lib_leaf_layout"].polygons) == 1
+    via = next(reference for name, reference in references.items()
+               if name.startswith("via_"))
+    assert via.origin == (0, 300)
+    assert (via.repetition.columns, via.repetition.rows) == (3, 2)
+    assert (via.repetition.v1, via.repetition.v2) == ((50, 0), (0, 50))
+    pcellName = next(name for name in references if name.startswith("lib_nmos_"))
+    assert references[pcellName].origin == (1000, 0)
+    assert cells[pcellName].polygons
+
+
+def test_export_worker_reads_cells_in_thread_pool(qtbot, tmp_path, monkeypatch):
+    libraryPath = _library(tmp_path, monkeypatch)
+    # The label and pcell of the leaf need the GUI thread while the worker
+    # reads the leaf file.
+    _writeCell(libraryPath, "leaf", [_rectRecord(100), _labelRecord("workerLabel"),
+                                     _pcellRecord([300, 0])])
+    scene = _scene(libraryPath, [_instRecord("leaf", "I1", [0, 0])])
+    outputPath = tmp_path / "top.gds"
+    worker = _exporter(scene, outputPath).exportWorker("GDS")
+    progress = []
+    worker.signals.progress.connect(lambda done, total: progress.append((done, total)))
+    with qtbot.waitSignal(worker.signals.result, timeout=10000, raising=True):
+        QThreadPool.globalInstance().start(worker)
+    QThreadPool.globalInstance().waitForDone()
+
+    cells = _cells(outputPath)
+    leaf = cells["lib_leaf_layout"]
+    assert [label.text for label in leaf.labels] == ["workerLabel"]
+    assert any(reference.cell.name.startswith("lib_nmos_")
+               for reference in leaf.references)
+    assert progress[-1][0] == progress[-1][1] == len(cells) + 1
+
+
+def test_cancelled_export_leaves_no_file(qtbot, tmp_path, monkeypatch):
+    libraryPath = _library(tmp_path, monkeypatch)
+    _writeCell(libraryPath, "leaf", [_rectRecord(100)])
+    scene = _scene(libraryPath, [_instRecord("leaf", "I1", [0, 0])])
+    outputPath = tmp_path / "top.gds"
+    worker = _exporter(scene, outputPath).exportWorker("GDS")
+    events = []
+    worker.signals.cancelled.connect(lambda: events.append("cancelled"))
+    worker.signals.result.connect(lambda path: events.append("result"))
+    worker.cancel()
+    worker.run()
+    assert events == ["cancelled"]
+    assert not outputPath.exists()
+
+
+def test_export_rebuilds_only_edited_cells(qtbot, tmp_path, monkeypatch):
+    libraryPath = _library(tmp_path, monkeypatch)
+    leafFile = _writeCell(libraryPath, "leaf", [_rectRecord(100)])
+    _writeCell(libraryPath, "other", [_rectRecord(100), _pcellRecord([0, 0])])
+    _writeCell(libraryPath, "mid", [_instRecord("leaf", "I1", [0, 0]),
+                                    _instRecord("other", "I2", [500, 0])])
+    scene = _scene(libraryPath, [_instRecord("mid", "I1", [0, 0])])
+    built = []
+
+    class countingExporter(gdse.gdsExporter):
+        def _buildDiskCell(self, key, filePath, records):
+            built.append(key[1])
+            return super()._buildDiskCell(key, filePath, records)
+
+    def export(dbu=gdse.gdsExporter.DEFAULT_DBU):
+        built.clear()
+        exporter = _exporter(scene, tmp_path / "top.gds", countingExporter)
+        exporter.dbu = dbu
+        exporter.exportWorker("GDS").run()
+        return sorted(built)
+
+    assert export() == ["leaf", "mid", "other"]
+    assert export() == []
+
+    _writeCell(libraryPath, "leaf", [_rectRecord(900)])
+    os.utime(leafFile, ns=(0, 0))
+    assert export() == ["leaf"]
+    assert _cells(tmp_path / "top.gds")["lib_leaf_layout"].bounding_box()[1] == (
+        900, 50)
+
+    # A new pcell definition regenerates the cells placing it.
+    pcellFile = libraryPath / "nmos" / "layout.json"
+    pcellFile.write_bytes(orjson.dumps([{"cellView": "pcell"}, {"reference": "nmos"}]))
+    os.utime(pcellFile, ns=(0, 0))
+    assert export() == ["other"]
+
+    # The cached cells were converted with other settings.
+    assert export(dbu=2000) == ["leaf", "mid", "other"]
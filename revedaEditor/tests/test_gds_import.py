@@ -0,0 +1,91 @@
+import logging
+import types
+
+import gdstk
+import orjson
+from PySide6.QtGui import QStandardItemModel
+
+import revedaEditor.backend.libBackEnd as libb
+import revedaEditor.fileio.importGDS as igds
+
+
+def _parent():
+    designView = types.SimpleNamespace(
+        libraryModel=types.SimpleNamespace(libraryDict={}),
+        reworkDesignLibrariesView=lambda libraryDict: None)
+    return types.SimpleNamespace(
+        logger=logging.getLogger(__name__),
+        libraryBrowser=types.SimpleNamespace(designView=designView))
+
+
+def _importLibrary(tmp_path, gdsLibrary):
+    gdsFile = tmp_path / "design.gds"
+    gdsLibrary.write_gds(gdsFile)
+    libraryPath = tmp_path / "importLib"
+    libraryPath.mkdir()
+    model = QStandardItemModel()
+    libItem = libb.libraryItem(libraryPath)
+    model.appendRow(libItem)
+    igds.gdsImporter(_parent(), gdsFile, libItem, workers=1).importGDS()
+    return model, libItem
+
+
+def _records(libItem, cellName):
+    return orjson.loads(
+        (libItem.libraryPath / cellName / "layout.json").read_bytes())[2:]
+
+
+def test_gds_import_converts_each_cell_once(qtbot, tmp_path):
+    gdsLibrary = gdstk.Library()
+    leaf = gdstk.Cell("leaf")
+    leaf.add(gdstk.rectangle((0, 0), (1, 1), layer=1, datatype=0))
+    mid = gdstk.Cell("mid")
+    for index in range(5):
+        mid.add(gdstk.Reference(leaf, (index, 0)))
+    top = gdstk.Cell("top")
+    for index in range(10):
+        top.add(gdstk.Reference(mid, (0, 2 * index)))
+    for cell in (leaf, mid, top):
+        gdsLibrary.add(cell)
+
+    model, libItem = _importLibrary(tmp_path, gdsLibrary)
+
+    cellNames = [libItem.child(row).text() for row in range(libItem.rowCount())]
+    assert sorted(cellNames) == ["leaf", "mid", "top"]
+    topRecords = _records(libItem, "top")
+    assert [record["cell"] for record in topRecords] == ["mid"] * 10
+    assert [record["cell"] for record in _records(libItem, "mid")] == ["leaf"] * 5
+
+
+def test_gds_import_writes_layout_records(qtbot, tmp_path):
+    layer = igds.laylyr.pdkAllLayers[0]
+    layerNumber = igds.laylyr.pdkAllLayers.index(layer)
+    scale = igds.dbu
+    gdsLibrary = gdstk.Library()
+    leaf = gdstk.Cell("leaf")
+    leaf.add(gdstk.rectangle((0, 0), (1.25, 0.5), layer=layer.gdsLayer,
+                             datatype=layer.datatype))
+    # Shapes on layers the PDK does not define are skipped.
+    leaf.add(gdstk.rectangle((0, 0), (1, 1), layer=999, datatype=99))
+    top = gdstk.Cell("top")
+    top.add(gdstk.FlexPath([(0, 0), (3, 0)], 0.2, layer=layer.gdsLayer,
+                           datatype=layer.datatype))
+    top.add(gdstk.Reference(leaf, (2.5, 0.3), rotation=igds.pi / 2))
+    gdsLibrary.add(leaf, top)
+
+    model, libItem = _importLibrary(tmp_path, gdsLibrary)
+
+    (polygon,) = _records(libItem, "leaf")
+    assert polygon["type"] == "Polygon" and polygon["ln"] == layerNumber
+    assert sorted(map(tuple, polygon["ps"])) == sorted(
+        [(0, 0), (round(1.25 * scale), 0), (round(1.25 * scale), round(0.5 * scale)),
+         (0, round(0.5 * scale))])
+    instance, path = _records(libItem, "top")
+    assert instance == {"type": "Inst", "lib": "importLib", "cell": "leaf",
+                        "view": "layout", "nam": "I1", "ic": 1,
+                        "loc": [round(2.5 * scale), round(0.3 * scale)],
+                        "ang": 90.0, "fl": [1, 1]}
+    assert path["type"] == "Polygon" and path["ln"] == layerNumber
+    assert sorted(map(tuple, path["ps"])) == sorted(
+        [(0, round(-0.1 * scale)), (round(3 * scale), round(-0.1 * scale)),
+         (round(3 * scale), round(0.1 * scale)), (0, round(0.1 * scale))])
@@ -0,0 +1,120 @@
+import json
+import os
+from types import SimpleNamespace
+
+from revedaEditor.scenes.hierNetMap import hierNetMap
+
+
+def _symbolFile(libraryPath, cellName, pinNames):
+    items = [{"cellView": "symbol"}, {"snapGrid": [10, 10]}]
+    items.extend({"type": "pin", "st": [0, 40 * index], "nam": pinName,
+                  "pd": "Inout", "pt": "Signal", "loc": [0, 0], "ang": 0,
+                  "fl": [1, 1]} for index, pinName in enumerate(pinNames))
+    (libraryPath / cellName).mkdir(parents=True, exist_ok=True)
+    (libraryPath / cellName / "symbol.json").write_text(json.dumps(items))
+
+
+def _schematicFile(libraryPath, cellName, items):
+    filePath = libraryPath / cellName / "schematic.json"
+    filePath.parent.mkdir(parents=True, exist_ok=True)
+    filePath.write_text(json.dumps(
+        [{"viewType": "schematic"}, {"snapGrid": [10, 10]}] + items))
+    return filePath
+
+
+def _instance(cellName, instanceName, location):
+    return {"type": "sys", "lib": "lib", "cell": cellName, "view": "symbol",
+            "nam": instanceName, "ic": 1, "ld": {}, "loc": location, "ang": 0,
+            "ign": 0, "br": [0, 0, 1, 1], "fl": [1, 1]}
+
+
+def _wire(start, end, name=""):
+    return {"type": "scn", "st": start, "end": end, "nam": name,
+            "ns": 3 if name else 0}
+
+
+def _pin(pinName, location):
+    return {"type": "scp", "st": location, "pn": pinName, "pd": "Inout",
+            "pt": "Signal", "ang": 0, "fl": [1, 1]}
+
+
+def _topItems(inNet):
+    # I1 pins: in at (0, 0), d<3:0> at (0, 40), out at (0, 80)
+    return [_instance("amp", "I1", [0, 0]),
+            _wire([0, 0], [-100, 0], inNet),
+            _wire([0, 40], [-100, 40], "bus<3:0>"),
+            _wire([300, 0], [400, 0], "vdd")]
+
+
+def _design(libraryPath):
+    _symbolFile(libraryPath, "amp", ["in", "d<3:0>", "out"])
+    _symbolFile(libraryPath, "stage", ["x"])
+    _symbolFile(libraryPath, "res", ["a"])
+    _schematicFile(libraryPath, "stage", [_pin("x", [-100, 0]),
+                                          _wire([-100, 0], [0, 0])])
+    _schematicFile(libraryPath, "amp", [
+        _pin("in", [-100, 0]), _wire([-100, 0], [0, 0]),
+        _pin("d<3:0>", [-100, 40]), _wire([-100, 40], [0, 40]),
+        _instance("stage", "I7", [200, 0]), _wire([200, 0], [100, 0], "n1"),
+        # res has no schematic; its instance is not a level.
+        _instance("res", "R1", [500, 0]), _wire([500, 0], [600, 0], "n1")])
+    return _schematicFile(libraryPath, "top", _topItems("vin"))
+
+
+class levelScene:
+    def __init__(self, libraryPath, file=None, parentScene=None):
+        self.libraryDict = {"lib": libraryPath}
+        self.editorWindow = SimpleNamespace(
+            file=file,
+            parentEditor=parentScene.editorWindow if parentScene else None,
+            parentObj=None)
+        self.symbols = set()
+
+    def findSceneSymbolSet(self):
+        return self.symbols
+
+
+class placedSymbol:
+    def __init__(self, scene, instanceName):
+        self._scene = scene
+        self.instanceName = instanceName
+        scene.symbols.add(self)
+
+    def scene(self):
+        return self._scene
+
+
+def test_aliases_across_levels(tmp_path):
+    libraryPath = tmp_path / "lib"
+    topFile = _design(libraryPath)
+    netMap = hierNetMap(levelScene(libraryPath, topFile))
+
+    # The map covers the design whichever levels have an open editor.
+    assert netMap.aliases("", "vin") == {"": {"vin"}, "I1.": {"in"}}
+    assert netMap.aliases("I1.I7.", "x") == {"I1.I7.": {"x"}, "I1.": {"n1"}}
+    assert netMap.aliases("", "bus<2>")["I1."] == {"d<3:0>"}
+    assert netMap.aliases("", "bus<6>") == {"": {"bus<6>"}}
+    assert set(netMap.aliases("", "vdd")) == {""}
+    assert set(netMap.aliases("I1.", "n1")) == {"I1.", "I1.I7."}
+
+    # An edited schematic is read again.
+    _schematicFile(libraryPath, "top", _topItems("vdd"))
+    os.utime(topFile, ns=(0, 0))
+    assert netMap.aliases("", "vdd") == {"": {"vdd"}, "I1.": {"in"}}
+
+
+def test_open_levels(tmp_path):
+    libraryPath = tmp_path / "lib"
+    top = levelScene(libraryPath, _design(libraryPath))
+    amp = levelScene(libraryPath, parentScene=top)
+    stage = levelScene(libraryPath, parentScene=amp)
+    netMap = hierNetMap(top)
+    assert netMap.attach(amp, top, placedSymbol(top, "I1")) == "I1."
+    assert netMap.attach(stage, amp, placedSymbol(amp, "I7")) == "I1.I7."
+    assert [path for path, _ in netMap.levels()] == ["", "I1.", "I1.I7."]
+
+    # Going up detaches the level and everything below it.
+    amp.editorWindow.parentEditor = None
+    assert [path for path, _ in netMap.levels()] == [""]
+    assert netMap.sceneAt("I1.I7.") is None
+    assert netMap.aliases("", "vin")["I1."] == {"in"}
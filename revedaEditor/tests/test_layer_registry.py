@@ -0,0 +1,76 @@
+from PySide6.QtCore import QPoint, QPointF
+from PySide6.QtWidgets import QGraphicsScene
+
+import revedaEditor.common.layoutShapes as lshp
+from revedaEditor.backend.pdkLoader import importPDKModule
+from revedaEditor.scenes.layerRegistry import layerRegistry
+
+laylyr = importPDKModule("layoutLayers")
+
+
+class registryScene(QGraphicsScene):
+    def __init__(self):
+        super().__init__()
+        self.layerRegistry = layerRegistry()
+
+
+def test_registry_follows_scene_items(qtbot):
+    layer0, layer1 = laylyr.pdkAllLayers[:2]
+    key0, key1 = (layer0.name, layer0.purpose), (layer1.name, layer1.purpose)
+    scene = registryScene()
+    registry = scene.layerRegistry
+
+    rect = lshp.layoutRect(QPoint(0, 0), QPoint(10, 10), layer0)
+    scene.addItem(rect)
+    assert registry.items(*key0) == (rect,)
+
+    rect.layer = layer1
+    assert key0 not in registry and registry.items(*key1) == (rect,)
+
+    # Children of instances owning their shapes are registered with them.
+    child = lshp.layoutRect(QPoint(0, 0), QPoint(5, 5), layer0)
+    pcell = lshp.layoutInstance([child])
+    scene.addItem(pcell)
+    assert registry.items(*key0) == (child,)
+
+    master = lshp.layoutMasterCell(
+        [lshp.layoutRect(QPoint(0, 0), QPoint(5, 5), layer0)])
+    instance = lshp.layoutInstance([], master)
+    scene.addItem(instance)
+    assert registry.items(*key0) == (child, instance)
+    assert registry.usedLayers == {key0, key1}
+
+    scene.removeItem(pcell)
+    scene.removeItem(rect)
+    assert registry.items(*key0) == (instance,)
+    assert key1 not in registry
+
+
+def test_edge_snapping_follows_edits(qtbot):
+    layer = laylyr.pdkAllLayers[0]
+    scene = registryScene()
+    registry = scene.layerRegistry
+
+    rect = lshp.layoutRect(QPoint(100, 100), QPoint(300, 250), layer)
+    scene.addItem(rect)
+    assert registry.closestEdgePoint(QPointF(150, 95), 20) == QPointF(150, 100)
+
+    rect.setPos(0, 50)
+    assert registry.closestEdgePoint(QPointF(150, 95), 20) == QPointF(150, 95)
+    assert registry.closestEdgePoint(QPointF(150, 145), 20) == QPointF(150, 150)
+
+    master = lshp.layoutMasterCell(
+        [lshp.layoutRect(QPoint(0, 0), QPoint(50, 50), layer)])
+    instance = lshp.layoutInstance([], master)
+    instance.setPos(1000, 0)
+    scene.addItem(instance)
+    assert registry.closestEdgePoint(QPointF(1025, -5), 20) == QPointF(1025, 0)
+
+    visible = layer.visible
+    layer.visible = False
+    try:
+        assert registry.closestEdgePoint(QPointF(1025, -5), 20) == QPointF(1025, -5)
+    finally:
+        layer.visible = visible
+    scene.removeItem(instance)
+    assert registry.closestEdgePoint(QPointF(1025, -5), 20) == QPointF(1025, -5)
@@ -0,0 +1,58 @@
+import io
+
+import numpy as np
+
+import revedaEditor.backend.libBackEnd as libb
+from revedaEditor.fileio import layoutBinary as lbin
+
+RECORDS = [
+    {"viewType": "layout", "schemaVersion": "1.0"},
+    {"snapGrid": [10, 5], "snapConnectDistance": 10, "lodThreshold": 0.1},
+    {"type": "Rect", "tl": [0.0, 0.0], "br": [100.0, 50.0], "ang": 0, "ln": 3,
+     "fl": [1, 1]},
+    {"type": "Inst", "lib": "lib", "cell": "inv", "view": "layout", "nam": "I1",
+     "ic": 1, "loc": [0, 0], "ang": 0, "fl": [1, 1]},
+    {"type": "Polygon", "ps": [[0, 0], [10, 0], [10, 10]], "ln": 1, "ang": 90.0,
+     "fl": [1, -1]},
+    {"type": "Rect", "tl": [-5, -5], "br": [5, 5], "ang": 0, "ln": 1, "fl": [1, 1]},
+    # Not representable in the int32 columns, kept as JSON.
+    {"type": "Rect", "tl": [0.5, 0], "br": [5, 5], "ang": 0, "ln": 1, "fl": [1, 1]},
+]
+
+
+def test_binary_round_trip(tmp_path):
+    path = tmp_path / "layout.json"
+    with path.open("wb") as file:
+        lbin.writeLayoutBinary(file, RECORDS)
+    assert lbin.isLayoutBinary(path)
+    with lbin.layoutBinaryFile(path) as layoutFile:
+        assert layoutFile.toRecords() == RECORDS
+        assert [type(value) for value in layoutFile.toRecords()[2]["tl"]] == [float, float]
+        assert layoutFile.rects(1).tolist() == [[-5, -5, 5, 5]]
+        assert layoutFile.rects(3).dtype == np.int32
+        assert [points.tolist() for points in layoutFile.polygons()] == [
+            [[0, 0], [10, 0], [10, 10]]]
+        assert len(layoutFile.jsonRecords()) == 4
+
+    jsonPath = tmp_path / "copy.json"
+    lbin.convertLayoutFile(path, jsonPath, binary=False)
+    assert not lbin.isLayoutBinary(jsonPath)
+    assert lbin.readLayoutFile(jsonPath) == RECORDS
+
+
+def test_empty_layout():
+    file = io.BytesIO()
+    lbin.writeLayoutBinary(file, RECORDS[:2])
+    assert file.getvalue().startswith(lbin.MAGIC)
+
+
+def test_rename_updates_binary_layout(tmp_path):
+    path = tmp_path / "layout.json"
+    lbin.writeLayoutFile(path, RECORDS)
+    assert libb.updateViewField(path, "lib", "lib", "renamedLib")
+    assert lbin.isLayoutBinary(path)
+    records = lbin.readLayoutFile(path)
+    assert records[3]["lib"] == "renamedLib"
+    assert [record for index, record in enumerate(records) if index != 3] == [
+        record for index, record in enumerate(RECORDS) if index != 3]
+    assert not libb.updateViewField(path, "cell", "missing", "other")
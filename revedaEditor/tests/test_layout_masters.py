@@ -0,0 +1,83 @@
+import logging
+import os
+
+import orjson
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QGraphicsScene
+
+import revedaEditor.fileio.loadJSON as lj
+
+HEADER = [{"viewType": "layout"}, {"snapGrid": [10, 5]}]
+
+
+def _writeCell(libraryPath, cellName, items):
+    cellPath = libraryPath / cellName
+    cellPath.mkdir(parents=True, exist_ok=True)
+    (cellPath / "layout.json").write_bytes(orjson.dumps(HEADER + items))
+    return cellPath / "layout.json"
+
+
+def _instRecord(cellName, instName, location):
+    return {"type": "Inst", "lib": "lib", "cell": cellName, "view": "layout",
+            "nam": instName, "ic": 1, "loc": location, "ang": 0, "fl": [1, 1]}
+
+
+def _scene(libraryPath):
+    scene = QGraphicsScene()
+    scene.libraryDict = {"lib": libraryPath}
+    scene.rulerFont = QFont()
+    scene.rulerTickLength = 1
+    scene.snapTuple = (10, 10)
+    scene.rulerWidth = 1
+    scene.rulerTickGap = 1
+    scene.logger = logging.getLogger(__name__)
+    return scene
+
+
+def test_layout_instances_share_master(qtbot, tmp_path):
+    libraryPath = tmp_path / "lib"
+    leafFile = _writeCell(libraryPath, "leaf", [
+        {"type": "Rect", "tl": [0, 0], "br": [100, 50], "ln": 1, "ang": 0,
+         "fl": [1, 1]}])
+    _writeCell(libraryPath, "top", [_instRecord("leaf", "I1", [500, 0])])
+    scene = _scene(libraryPath)
+
+    factory = lj.layoutItems(scene)
+    instances = [factory.create(_instRecord("top", f"I{index}", [index * 1000, 0]))
+                 for index in range(5)]
+    master = instances[0].master
+    assert master is not None
+    assert all(instance.master is master for instance in instances)
+    leaves = [factory.create(_instRecord("leaf", "L1", [0, 0])),
+              lj.layoutItems(scene).create(_instRecord("leaf", "L2", [0, 0]))]
+    assert leaves[0].master is leaves[1].master
+    assert lj.layoutItems(scene).create(
+        _instRecord("top", "I9", [0, 0])).master is master
+
+    # An edited cell is read again instead of reusing the stale master.
+    _writeCell(libraryPath, "leaf", [
+        {"type": "Rect", "tl": [0, 0], "br": [200, 50], "ln": 1, "ang": 0,
+         "fl": [1, 1]}])
+    os.utime(leafFile, ns=(0, 0))
+    assert lj.layoutItems(scene).create(
+        _instRecord("leaf", "L3", [0, 0])).master is not leaves[0].master
+
+
+def test_edited_nested_cell_rebuilds_parent_master(qtbot, tmp_path):
+    libraryPath = tmp_path / "lib"
+    leafFile = _writeCell(libraryPath, "leaf", [
+        {"type": "Rect", "tl": [0, 0], "br": [100, 50], "ln": 1, "ang": 0,
+         "fl": [1, 1]}])
+    _writeCell(libraryPath, "top", [_instRecord("leaf", "I1", [0, 0])])
+    scene = _scene(libraryPath)
+    master = lj.layoutItems(scene).create(_instRecord("top", "I1", [0, 0])).master
+    assert master.boundingRect.width() == 100
+
+    _writeCell(libraryPath, "leaf", [
+        {"type": "Rect", "tl": [0, 0], "br": [900, 50], "ln": 1, "ang": 0,
+         "fl": [1, 1]}])
+    os.utime(leafFile, ns=(0, 0))
+    assert not master.isCurrent()
+    rebuilt = lj.layoutItems(scene).create(_instRecord("top", "I2", [0, 0])).master
+    assert rebuilt is not master
+    assert rebuilt.boundingRect.width() == 900
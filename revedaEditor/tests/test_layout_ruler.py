@@ -1,5 +1,5 @@
 import pytest
-from PySide6.QtCore import QPoint, QPointF, QRectF, QLineF, Qt
+from PySide6.QtCore import QPoint, QPointF, QLineF, Qt
 from PySide6.QtGui import QFont, QColor
 from PySide6.QtWidgets import QApplication, QGraphicsScene
 
@@ -93,3 +93,17 @@ def test_ruler_text_angle_upright():
     p1_2 = r2.mapToScene(r2._draftLine.p1())
     p2_2 = r2.mapToScene(r2._draftLine.p2())
     assert QLineF(p1_2, p2_2).angle() == 180.0
+
+
+def test_ruler_snap_to_via_array_cut():
+    from defaultPDK.process import processVias
+
+    scene = QGraphicsScene()
+    via = lshp.layoutVia(QPoint(0, 0), processVias[0], 10, 10)
+    viaArray = lshp.layoutViaArray(QPoint(0, 0), via, 5, 5, 100, 100)
+    scene.addItem(viaArray)
+
+    ruler = lshp.layoutRuler(QLineF(-500, -500, -450, -450), 1.0, 10.0, 5, QFont())
+    scene.addItem(ruler)
+    snapped = ruler.snapPointToClosestEdge(QPoint(762, 755), maxDistance=4.0)
+    assert snapped == QPointF(760, 755)
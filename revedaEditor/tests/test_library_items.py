@@ -0,0 +1,73 @@
+import revedaEditor.backend.libBackEnd as libb
+import revedaEditor.backend.libraryMethods as libm
+
+
+def makeLibrary(path, cells):
+    path.mkdir()
+    path.joinpath("reveda.lib").touch()
+    for cellName, viewNames in cells.items():
+        path.joinpath(cellName).mkdir()
+        for viewName in viewNames:
+            path.joinpath(cellName, viewName).write_text("[]")
+    return path
+
+
+def test_model_loads_pending_items(qtbot, tmp_path):
+    libraryPath = makeLibrary(tmp_path / "lib", {
+        "inv": ["schematic.json", "symbol.json", "notes.txt"], "nand2": []})
+    model = libb.indexedLibraryModel()
+    libraryItem = libb.libraryItem(libraryPath)
+    libraryItem.cellsPending = True
+    model.appendRow(libraryItem)
+
+    libraryIndex = libraryItem.index()
+    assert libraryItem.rowCount() == 0 and model.hasChildren(libraryIndex)
+    assert model.canFetchMore(libraryIndex)
+    model.fetchMore(libraryIndex)
+    assert not model.canFetchMore(libraryIndex) and libraryItem.rowCount() == 2
+    cellItem = libraryItem.child(0)
+    assert cellItem.cellName == "inv" and model.canFetchMore(cellItem.index())
+    model.fetchMore(cellItem.index())
+    assert [cellItem.child(row).viewName for row in range(cellItem.rowCount())] == [
+        "schematic", "symbol"]
+    # Late scan results do not add the cells or views a second time.
+    assert libraryItem.addCells(["inv", "nand2"]) == []
+    cellItem.addViews(["schematic.json"])
+    assert cellItem.rowCount() == 2
+
+
+def test_scan_results_fill_pending_items(qtbot, tmp_path):
+    libraryPath = makeLibrary(tmp_path / "lib", {"inv": ["layout.json"]})
+    libraryItem = libb.libraryItem(libraryPath)
+    libraryItem.cellsPending = True
+    libb.createNewCellItem(libraryItem, libraryPath.joinpath("buf"))
+    cellItems = libraryItem.addCells(libb.scanCellNames(libraryPath))
+    assert [item.cellName for item in cellItems] == ["inv"]
+    cellItems[0].addViews(libb.scanViewNames(cellItems[0].cellPath))
+    assert not cellItems[0].viewsPending
+    assert cellItems[0].child(0).viewName == "layout"
+
+
+def test_indexed_model_lookups(qtbot, tmp_path):
+    libraryPath = makeLibrary(tmp_path / "lib", {
+        "inv": ["schematic.json", "layout.json"], "nand2": ["symbol.json"]})
+    model = libb.indexedLibraryModel()
+    libraryItem = libb.libraryItem(libraryPath)
+    libraryItem.cellsPending = True
+    model.appendRow(libraryItem)
+
+    assert libm.getLibItem(model, "lib") is libraryItem
+    cellItem = libm.getCellItem(libraryItem, "inv")
+    viewItem = libm.getViewItem(cellItem, "layout")
+    assert viewItem.viewName == "layout"
+
+    viewItem.setText("layout2")
+    assert libm.getViewItem(cellItem, "layout") is None
+    assert libm.getViewItem(cellItem, "layout2") is viewItem
+    cellItem.removeRow(viewItem.row())
+    assert libm.getViewItem(cellItem, "layout2") is None
+
+    newCellItem = libb.createNewCellItem(libraryItem, libraryPath.joinpath("buf"))
+    assert libm.getCellItem(libraryItem, "buf") is newCellItem
+    model.removeRow(libraryItem.row())
+    assert libm.getLibItem(model, "lib") is None
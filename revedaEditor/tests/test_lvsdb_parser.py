@@ -0,0 +1,49 @@
+from revedaEditor.fileio.importlvsdb import LVSDBParser
+
+LVSDB = """#%lvsdb-klayout
+J(
+ W(top)
+ U(0.001)
+ L(l1 '8/0')
+ X(inv R((0 0) (100 200))
+  N(1 I(in) R(l1 (0 0) (10 10)))
+  N(2 I('out (x)'))
+  D(1 nmos T(S 1) T(D 2))
+ )
+ X(top R((0 0) (500 500))
+  N(1 I(vdd))
+ )
+)
+H(
+ X(inv N(1 I(in)) N(2 I(out)))
+)
+Z(
+ X(inv inv 1 Z(N(1 1 1) N(2 2 1)))
+)
+"""
+
+
+def test_cells_parsed_on_demand(tmp_path):
+    path = tmp_path / "design.lvsdb"
+    path.write_text(LVSDB)
+    parser = LVSDBParser(str(path))
+    parser.load()
+    assert parser.unit_scale == 0.001
+    assert parser.layer_map == {"l1": "8/0"}
+    assert parser.get_all_layout_cells() == ["inv", "top"]
+    assert parser.get_all_schematic_cells() == ["inv"]
+    assert parser.crossrefs["inv"]["equivalent"]
+    assert parser.layout_cells == {}
+    assert [net["name"] for net in parser.get_nets("inv")] == ["in", "out (x)"]
+    assert list(parser.layout_cells) == ["inv"]
+    assert parser.get_nets("missing") == []
+    parser.close()
+
+
+def test_deep_nesting(tmp_path):
+    path = tmp_path / "deep.lvsdb"
+    path.write_text("#%lvsdb-klayout\nJ(X(deep " + "(" * 5000 + ")" * 5000 + "))\n")
+    parser = LVSDBParser(str(path))
+    parser.load()
+    assert parser.get_all_layout_cells() == ["deep"]
+    assert parser.get_nets("deep") == []
@@ -0,0 +1,62 @@
+from revedaEditor.fileio.importlyrdb import DRCOutput, process
+
+LYRDB = """<?xml version="1.0" encoding="utf-8"?>
+<report-database>
+ <description>DRC</description>
+ <top-cell>top</top-cell>
+ <categories>
+  <category>
+   <name>M1.a</name>
+   <description>Metal1 width</description>
+  </category>
+ </categories>
+ <cells>
+  <cell>
+   <name>top</name>
+  </cell>
+ </cells>
+ <items>
+  <item>
+   <category>'M1.a'</category>
+   <cell>top</cell>
+   <visited>false</visited>
+   <multiplicity>2</multiplicity>
+   <values>
+    <value>polygon: (0,0;0.16,0;0.16,1;0,1)</value>
+    <value>edge-pair: (0,0;1,0)/(0,0.1;1,0.1)</value>
+   </values>
+  </item>
+  <item>
+   <category>'M1.a'</category>
+   <cell>top</cell>
+   <values>
+    <value>text: 'x'</value>
+   </values>
+  </item>
+ </items>
+</report-database>
+"""
+
+
+def test_violations_loaded_lazily(qtbot, tmp_path):
+    path = tmp_path / "drc.lyrdb"
+    path.write_text(LYRDB)
+    result = DRCOutput(str(path)).parseDRCOutput()
+    assert result["metadata"]["top_cell"] == "top"
+    assert result["categories"] == {"M1.a": "Metal1 width"}
+    violations = result["violations"]
+    assert len(violations) == 2
+    assert list(violations.rowsInCategory("M1.a")) == [0, 1]
+
+    row = violations[0]
+    assert (row["category"], row["cell"], row["multiplicity"]) == ("M1.a", "top", 2)
+    assert row["points"] == [["0,0", "0.16,0", "0.16,1", "0,1"],
+                             ["0,0", "1,0", "0,0.1", "1,0.1"]]
+    polygons = row["polygons"]
+    assert [polygon.errorCategory for polygon in polygons] == ["polygon", "edge-pair"]
+    assert polygons[0].polygon().boundingRect().height() == process.dbu
+    assert violations[1]["polygons"] == []
+    assert violations[1]["multiplicity"] == 1
+
+    row["visited"] = True
+    assert violations[0]["visited"]
@@ -0,0 +1,99 @@
+import logging
+from unittest.mock import Mock
+
+from PySide6.QtCore import QEvent, QPoint, QPointF, Qt
+from PySide6.QtWidgets import QGraphicsRectItem, QGraphicsSceneMouseEvent, QWidget
+
+import revedaEditor.common.shapes as shp
+from revedaEditor.scenes.sceneRecords import sceneRecords
+from revedaEditor.scenes.symbolScene import symbolScene
+
+
+def test_only_changed_items_encoded(qtbot, tmp_path):
+    path = tmp_path / "schematic.json"
+    path.write_text("[]")
+    items = [QGraphicsRectItem(0, 0, index, index) for index in range(3)]
+    encoded = []
+
+    def encodeItem(item):
+        encoded.append(item)
+        return str(item.rect().width()).encode()
+
+    records = sceneRecords()
+    assert not records.isSaved(path, (b"h",))
+    assert records.encode(items, encodeItem) == [b"0.0", b"1.0", b"2.0"]
+    records.saved(path, (b"h",))
+    assert records.isSaved(path, (b"h",))
+    assert not records.isSaved(path, (b"other",))
+
+    items[1].setRect(0, 0, 5, 5)
+    records.itemsChanged([items[1]])
+    assert not records.isSaved(path, (b"h",))
+    encoded.clear()
+    assert records.encode(items, encodeItem) == [b"0.0", b"5.0", b"2.0"]
+    assert encoded == [items[1]]
+
+    records.itemsRemoved([items[0]])
+    assert records.encode(items[1:], encodeItem) == [b"5.0", b"2.0"]
+    assert encoded == [items[1]]
+
+    # A file changed by someone else is written again.
+    records.saved(path, (b"h",))
+    path.write_text("[1]")
+    assert not records.isSaved(path, (b"h",))
+
+
+def _symbolScene(path):
+    container = QWidget()
+    container.editorWindow = Mock(
+        majorGrid=10, snapGrid=10, snapTuple=(10, 10), snapConnectDistance=10,
+        parentEditor=None, file=path, libraryDict={})
+    container.editorWindow.appMainW.logger = logging.getLogger(__name__)
+    return symbolScene(container)
+
+
+def test_symbol_scene_tracks_saves(qtbot, tmp_path):
+    path = tmp_path / "cell" / "symbol.json"
+    path.parent.mkdir()
+    scene = _symbolScene(path)
+    scene.addItem(shp.symbolRectangle(QPoint(0, 0), QPoint(40, 60)))
+    assert scene.savedRecords.isModified
+    assert scene.saveSymbolCell(path)
+    assert not scene.savedRecords.isModified
+
+    loaded = _symbolScene(path)
+    loaded.loadDesign(path)
+    assert len(loaded.items()) == 1
+    assert not loaded.savedRecords.isModified
+    loaded.addItem(shp.symbolLine(QPoint(0, 0), QPoint(0, 40)))
+    assert loaded.savedRecords.isModified
+
+
+def _mouseEvent(scene, eventType, point, buttons):
+    event = QGraphicsSceneMouseEvent(eventType)
+    event.setScenePos(QPointF(point))
+    event.setButton(Qt.MouseButton.LeftButton)
+    event.setButtons(buttons)
+    {QEvent.Type.GraphicsSceneMousePress: scene.mousePressEvent,
+     QEvent.Type.GraphicsSceneMouseMove: scene.mouseMoveEvent,
+     QEvent.Type.GraphicsSceneMouseRelease: scene.mouseReleaseEvent}[eventType](event)
+
+
+def test_rubber_band_select_leaves_scene_clean(qtbot, tmp_path):
+    path = tmp_path / "cell" / "symbol.json"
+    path.parent.mkdir()
+    scene = _symbolScene(path)
+    scene.addItem(shp.symbolRectangle(QPoint(0, 0), QPoint(40, 60)))
+    assert scene.saveSymbolCell(path)
+    stamp = path.stat().st_mtime_ns
+
+    pressed = Qt.MouseButton.LeftButton
+    _mouseEvent(scene, QEvent.Type.GraphicsSceneMousePress, QPoint(-20, -20), pressed)
+    assert scene.selectionRectItem is not None
+    _mouseEvent(scene, QEvent.Type.GraphicsSceneMouseMove, QPoint(100, 100), pressed)
+    _mouseEvent(scene, QEvent.Type.GraphicsSceneMouseRelease, QPoint(100, 100),
+                Qt.MouseButton.NoButton)
+    assert scene.selectionRectItem is None
+    assert not scene.savedRecords.isModified
+    assert scene.saveSymbolCell(path)
+    assert path.stat().st_mtime_ns == stamp
@@ -0,0 +1,38 @@
+from itertools import combinations
+
+from PySide6.QtCore import QPoint, QRectF
+from PySide6.QtWidgets import QGraphicsRectItem, QGraphicsScene
+
+from revedaEditor.checks.schematic import checkUnconnectedNets, sceneRectIndex
+from revedaEditor.common.net import schematicNet
+
+
+def test_candidate_pairs_match_brute_force(qtbot):
+    scene = QGraphicsScene()
+    items = []
+    for index in range(60):
+        item = QGraphicsRectItem(QRectF((index * 37) % 400, (index * 53) % 300,
+                                        20 + index % 7 * 15, 20 + index % 5 * 25))
+        scene.addItem(item)
+        items.append(item)
+    expected = {frozenset((id(item1), id(item2)))
+                for item1, item2 in combinations(items, 2)
+                if item1.sceneBoundingRect().intersects(item2.sceneBoundingRect())}
+    pairs = [frozenset((id(item1), id(item2)))
+             for item1, item2 in sceneRectIndex(items).candidatePairs()]
+    assert len(pairs) == len(set(pairs))
+    assert expected <= set(pairs)
+
+
+def test_unconnected_net_ends(qtbot):
+    scene = QGraphicsScene()
+    nets = [schematicNet(QPoint(0, 0), QPoint(100, 0)),
+            schematicNet(QPoint(50, 0), QPoint(50, 100)),
+            schematicNet(QPoint(100, 0), QPoint(200, 0))]
+    for netItem in nets:
+        scene.addItem(netItem)
+    pin = QGraphicsRectItem(QRectF(195, -5, 10, 10))
+    scene.addItem(pin)
+    dangling, ends = checkUnconnectedNets(set(nets), {pin})
+    assert dangling
+    assert ends == {QPoint(0, 0), QPoint(50, 100)}
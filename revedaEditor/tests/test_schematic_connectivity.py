@@ -0,0 +1,220 @@
+import logging
+from unittest.mock import Mock
+
+import pytest
+from PySide6.QtCore import QEvent, QPoint, QPointF, QRectF, Qt
+from PySide6.QtWidgets import QGraphicsScene, QGraphicsSceneMouseEvent, QWidget
+
+import revedaEditor.common.shapes as shp
+from revedaEditor.common.net import netNameStrengthEnum, schematicNet
+from revedaEditor.scenes.schematicConnectivity import schematicConnectivity
+from revedaEditor.scenes.schematicScene import schematicScene
+
+
+@pytest.fixture
+def connectivity(qtbot):
+    scene = QGraphicsScene()
+    graph = schematicConnectivity(scene)
+    scene.connectivity = graph
+    nets = [schematicNet(QPoint(0, 0), QPoint(100, 0)),
+            schematicNet(QPoint(100, 0), QPoint(100, 100)),
+            schematicNet(QPoint(100, 0), QPoint(200, 0)),
+            schematicNet(QPoint(300, 0), QPoint(400, 0))]
+    for netItem in nets:
+        scene.addItem(netItem)
+    graph.itemsAdded(nets)
+    return graph, nets, scene
+
+
+@pytest.fixture
+def scene(qtbot, tmp_path):
+    container = QWidget()
+    container.editorWindow = Mock(
+        majorGrid=10, snapGrid=10, snapTuple=(10, 10), snapConnectDistance=10,
+        parentEditor=None, file=tmp_path / "cell" / "schematic.json",
+        libraryDict={})
+    container.editorWindow.appMainW.logger = logging.getLogger(__name__)
+    return schematicScene(container)
+
+
+def test_connected_nets(connectivity):
+    graph, nets, _ = connectivity
+    assert set(map(id, graph.connectedNets(nets[0]))) == {id(nets[1]), id(nets[2])}
+    assert graph.connectedNets(nets[3]) == []
+
+
+def test_junction_points(connectivity):
+    graph, _, _ = connectivity
+    assert graph.junctionPoints() == [QPoint(100, 0)]
+    assert graph.endPointDegree(QPoint(100, 0)) == 3
+    assert graph.endPointDegree(QPoint(0, 0)) == 1
+
+
+def test_remove_and_move(connectivity):
+    graph, nets, _ = connectivity
+    graph.itemsRemoved([nets[2]])
+    assert graph.junctionPoints() == []
+    nets[3].setPos(QPoint(-200, 100))
+    graph.itemsMoved([nets[3]])
+    connected = {id(netItem) for netItem in graph.connectedNets(nets[3])}
+    assert connected == {id(nets[0]), id(nets[1])}
+
+
+def test_nets_named(connectivity):
+    graph, nets, _ = connectivity
+    nets[0].name = "data<7:0>"
+    nets[1].name = "data<3>"
+    nets[2].name = "data<9:8>"
+    nets[3].name = "clk"
+    assert {id(netItem) for netItem in graph.netsNamed("data<3>")} == {
+        id(nets[0]), id(nets[1])}
+    assert graph.netsNamed("clk") == [nets[3]]
+    nets[3].name = "data<8>"
+    assert {id(netItem) for netItem in graph.netsNamed("data<8>")} == {
+        id(nets[2]), id(nets[3])}
+
+
+def test_junctions_in_rect(connectivity):
+    graph, nets, _ = connectivity
+    assert graph.junctionsIn(QRectF(50, -50, 100, 100)) == [QPoint(100, 0)]
+    assert graph.junctionsIn(QRectF(150, -50, 100, 100)) == []
+    assert graph.junctionsIn(QRectF(-1e6, -1e6, 2e6, 2e6)) == [QPoint(100, 0)]
+    nets[1].setPos(QPoint(0, 50))
+    graph.itemsMoved([nets[1]])
+    assert graph.junctionsIn(QRectF(-1e6, -1e6, 2e6, 2e6)) == []
+
+
+def test_net_names_are_stable(scene):
+    wire = [schematicNet(QPoint(0, 0), QPoint(100, 0)),
+            schematicNet(QPoint(100, 0), QPoint(100, 100))]
+    other = schematicNet(QPoint(300, 0), QPoint(400, 0))
+    for netItem in wire + [other]:
+        scene.addItem(netItem)
+    scene.updateNetNames()
+    names = [netItem.name for netItem in wire + [other]]
+    assert names == ["net0", "net0", "net1"]
+    scene.updateNetNames()
+    assert [netItem.name for netItem in wire + [other]] == names
+
+    # Incremental renaming keeps untouched names and fills the freed one.
+    scene.removeItem(other)
+    added = schematicNet(QPoint(0, 500), QPoint(100, 500))
+    scene.addItem(added)
+    scene.updateNetNames()
+    assert [netItem.name for netItem in wire] == ["net0", "net0"]
+    assert added.name == "net1"
+    scene.connectivity.invalidate()
+    scene.updateNetNames()
+    assert [netItem.name for netItem in wire + [added]] == ["net0", "net0", "net1"]
+
+
+def test_copied_wires_are_indexed_where_placed(scene):
+    original = schematicNet(QPoint(0, 0), QPoint(100, 0))
+    scene.addItem(original)
+    scene.updateNetNames()
+    original.setSelected(True)
+    scene.editModes.setMode("copyItem")
+    scene.copySelectedItems()
+    scene.selectedItemGroup.setPos(0, 200)
+    release = QGraphicsSceneMouseEvent(QEvent.Type.GraphicsSceneMouseRelease)
+    release.setButton(Qt.MouseButton.LeftButton)
+    release.setScenePos(QPointF(0, 200))
+    scene.mouseReleaseEvent(release)
+
+    copy = next(netItem for netItem in scene.findSceneNetsSet()
+                if netItem is not original)
+    assert copy.sceneEndPoints == [QPoint(0, 200), QPoint(100, 200)]
+    assert scene.connectivity.endPointDegree(QPoint(0, 200)) == 1
+    assert scene.connectivity.endPointDegree(QPoint(0, 0)) == 1
+    scene.updateNetNames()
+    assert copy.name != original.name
+
+
+def test_unchanged_names_leave_scene_saved(scene, tmp_path):
+    wire = [schematicNet(QPoint(0, 0), QPoint(100, 0)),
+            schematicNet(QPoint(100, 0), QPoint(100, 100))]
+    for netItem in wire:
+        scene.addItem(netItem)
+    scene.updateNetNames()
+    scene.savedRecords.saved(tmp_path / "schematic.json", ())
+
+    # a full rename, as after loading, ends with the same names
+    scene.connectivity.invalidate()
+    scene.updateNetNames()
+    assert not scene.savedRecords.isModified
+
+    wire[1].name = "out"
+    scene.connectivity.netRenamed(wire[1])
+    scene.updateNetNames()
+    assert scene.savedRecords.isModified
+    assert [netItem.name for netItem in wire] == ["out", "out"]
+
+
+def _setName(scene, netItem, name):
+    netItem.name = name
+    netItem.nameStrength = netNameStrengthEnum.SET
+    scene.connectivity.netRenamed(netItem)
+
+
+def test_set_names_cross_junctions(scene):
+    # a T junction at (100, 0) with a wire continuing down from its stem
+    wire = [schematicNet(QPoint(0, 0), QPoint(100, 0)),
+            schematicNet(QPoint(100, 0), QPoint(200, 0)),
+            schematicNet(QPoint(100, 0), QPoint(100, 100)),
+            schematicNet(QPoint(100, 100), QPoint(100, 200))]
+    other = schematicNet(QPoint(300, 0), QPoint(400, 0))
+    for netItem in wire + [other]:
+        scene.addItem(netItem)
+    _setName(scene, wire[3], "out")
+    scene.updateNetNames()
+    assert [netItem.name for netItem in wire] == ["out"] * 4
+    assert wire[3].nameStrength == netNameStrengthEnum.SET
+    assert {netItem.nameStrength for netItem in wire[:3]} == {
+        netNameStrengthEnum.INHERIT}
+    assert other.name == "net0"
+
+
+def test_name_conflicts(scene):
+    # Neither of two set names meeting at a junction overrides the other.
+    first = schematicNet(QPoint(0, 0), QPoint(100, 0))
+    second = schematicNet(QPoint(100, 0), QPoint(200, 0))
+    for netItem in (first, second):
+        scene.addItem(netItem)
+    _setName(scene, first, "a")
+    _setName(scene, second, "b")
+    scene.updateNetNames()
+    assert (first.name, second.name) == ("a", "b")
+
+    # A schematic pin does not rename a wire the user has named.
+    pin = shp.schematicPin(QPoint(0, 300), "in", "Input", "Signal")
+    scene.addItem(pin)
+    wire = schematicNet(QPoint(0, 300), QPoint(100, 300))
+    scene.addItem(wire)
+    _setName(scene, wire, "out")
+    scene.nameSceneNets()
+    assert wire.name == "out"
+    assert wire.nameConflict
+
+
+def test_net_numbers_survive_renames(scene):
+    groups = [schematicNet(QPoint(0, 100 * index), QPoint(100, 100 * index))
+              for index in range(3)]
+    for netItem in groups:
+        scene.addItem(netItem)
+    scene.updateNetNames()
+    assert [netItem.name for netItem in groups] == ["net0", "net1", "net2"]
+
+    # Naming one group leaves the numbers of the others alone ...
+    _setName(scene, groups[1], "sig")
+    scene.updateNetNames()
+    assert [netItem.name for netItem in groups] == ["net0", "sig", "net2"]
+
+    # ... and the freed number goes to the next new group.
+    added = schematicNet(QPoint(0, 500), QPoint(100, 500))
+    scene.addItem(added)
+    scene.updateNetNames()
+    assert added.name == "net1"
+    scene.connectivity.invalidate()
+    scene.updateNetNames()
+    assert [netItem.name for netItem in groups + [added]] == [
+        "net0", "sig", "net2", "net1"]
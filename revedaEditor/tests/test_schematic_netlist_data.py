@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from revedaEditor.netlisting.schematicNetlistData import schematicNetlistData
+
+SYMBOL = [
+    {"cellView": "symbol"},
+    {"snapGrid": [10, 10]},
+    {"type": "pin", "st": [0, -40], "nam": "PLUS", "pd": "Inout", "pt": "Signal",
+     "loc": [0, 0], "ang": 0, "fl": [1, 1]},
+    {"type": "pin", "st": [0, 40], "nam": "MINUS", "pd": "Inout", "pt": "Signal",
+     "loc": [0, 0], "ang": 0, "fl": [1, 1]},
+    {"type": "label", "st": [15, -10], "def": "[@instName]", "lt": "NLPLabel",
+     "ht": "8", "al": "Left", "or": "R0", "use": "Instance", "loc": [0, 0],
+     "nam": "@instName", "txt": "", "vis": True, "val": ""},
+    {"type": "label", "st": [15, 10], "def": "[@R:R=%:R=1k]", "lt": "NLPLabel",
+     "ht": "8", "al": "Left", "or": "R0", "use": "Instance", "loc": [0, 0],
+     "nam": "@R", "txt": "", "vis": True, "val": ""},
+    {"type": "attr", "nam": "SpiceNetlistLine", "def": "R@instName %pinOrder @R"},
+    {"type": "attr", "nam": "pinOrder", "def": "PLUS, MINUS"},
+]
+
+
+def _symbol(name, loc, ang=0, fl=(1, 1), labels=None):
+    return {"type": "sys", "lib": "testLib", "cell": "res", "view": "symbol",
+            "nam": name, "ic": int(name[1:]), "ld": labels or {}, "loc": loc,
+            "ang": ang, "ign": 0, "br": [0, 0, 1, 1], "fl": fl}
+
+
+def _net(start, end, name="", strength=0):
+    return {"type": "scn", "st": start, "end": end, "nam": name, "ns": strength}
+
+
+@pytest.fixture
+def library(tmp_path):
+    libPath = tmp_path / "testLib"
+    (libPath / "res").mkdir(parents=True)
+    (libPath / "top").mkdir()
+    (libPath / "res" / "symbol.json").write_text(json.dumps(SYMBOL))
+    schematic = [
+        {"viewType": "schematic"},
+        {"snapGrid": [10, 10]},
+        _symbol("I0", [0, 0], labels={"@R": ["2k", True]}),
+        _symbol("I1", [0, 200], ang=90),
+        _symbol("I2", [300, 0], ang=180, fl=(-1, 1)),
+        _symbol("I3", [500, 0]),
+        _net([0, -40], [0, -100]),
+        _net([0, -100], [-100, -100]),
+        {"type": "scp", "st": [-100, -100], "pn": "in", "pd": "Input",
+         "pt": "Signal", "ang": 0, "fl": [1, 1]},
+        _net([0, 40], [0, 100]),
+        _net([0, 100], [200, 100]),
+        _net([200, 100], [200, 200]),
+        _net([40, 200], [200, 200]),
+        _net([300, 40], [300, 100], "mid", 3),
+        _net([300, 100], [200, 100]),
+        _net([300, -40], [300, -80]),
+        _net([300, -80], [400, -80], "vdd", 3),
+        _net([500, -40], [500, -80]),
+        # I4 PLUS touches the middle of a wire spanning several grid cells.
+        _symbol("I4", [1030, 0]),
+        _net([700, -40], [1500, -40], "bias", 3),
+    ]
+    (libPath / "top" / "schematic.json").write_text(json.dumps(schematic))
+    return libPath
+
+
+def test_pin_net_map(library):
+    data = schematicNetlistData(library / "top" / "schematic.json",
+                                {"testLib": library}, "testLib")
+    pinNetMaps = {symbol.instanceName: symbol.pinNetMap for symbol in data.symbols}
+    assert pinNetMaps["I0"] == {"PLUS": "in", "MINUS": "mid"}
+    assert pinNetMaps["I1"]["PLUS"] == "mid"
+    assert pinNetMaps["I1"]["MINUS"].startswith("dnet")
+    assert pinNetMaps["I2"] == {"PLUS": "mid", "MINUS": "vdd"}
+    assert pinNetMaps["I3"]["PLUS"] == "net0"
+    assert pinNetMaps["I4"]["PLUS"] == "bias"
+    assert pinNetMaps["I4"]["MINUS"].startswith("dnet")
+    assert data.schematicPins == [("in", "Input")]
+
+
+def test_label_values(library):
+    data = schematicNetlistData(library / "top" / "schematic.json",
+                                {"testLib": library}, "testLib")
+    symbols = {symbol.instanceName: symbol for symbol in data.symbols}
+    assert symbols["I0"].labels["@R"].labelValue == "2k"
+    assert symbols["I1"].labels["@R"].labelValue == "1k"
+    assert symbols["I1"].labels["@instName"].labelValue == "I1"
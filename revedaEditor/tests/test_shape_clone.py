@@ -0,0 +1,82 @@
+from PySide6.QtCore import QLineF, QPoint
+from PySide6.QtWidgets import QGraphicsScene
+
+import revedaEditor.common.layoutShapes as lshp
+import revedaEditor.common.shapes as shp
+from revedaEditor.backend.pdkLoader import importPDKModule
+from revedaEditor.common.fileCache import designCache
+from revedaEditor.common.labels import symbolLabel
+
+laylyr = importPDKModule("layoutLayers")
+
+
+def _instLabel():
+    label = symbolLabel(QPoint(0, -10), "[@instName]", "NLPLabel", 8, "Left",
+                        "R0", "Instance")
+    label.labelName = "@instName"
+    label.labelVisible = True
+    return label
+
+
+def test_symbol_clone_copies_instance_state(qtbot):
+    symattrs = {"modelName": "nch"}
+    symbol = shp.schematicSymbol(
+        [shp.symbolRectangle(QPoint(0, 0), QPoint(40, 60)),
+         shp.symbolPin(QPoint(0, 30), "D", "Inout", "Signal"), _instLabel()],
+        symattrs)
+    symbol.instanceName, symbol.counter = "I1", 1
+    for label in symbol.labels.values():
+        label.labelDefs()
+    symbol.setPos(100, 200)
+    symbol.angle = 90
+    symbol.flipTuple = (-1, 1)
+    stats = dict(designCache().stats)
+
+    copy = symbol.clone()
+    assert copy.symattrs is symattrs
+    assert copy.pos() == symbol.pos() and copy.transform() == symbol.transform()
+    assert (copy.angle, copy.flipTuple) == (90, (-1, 1))
+    assert set(copy.pins) == {"D"} and copy.pins["D"] is not symbol.pins["D"]
+    assert copy.labels["@instName"].labelText == "I1"
+
+    copy.instanceName, copy.counter = "I2", 2
+    copy.relabelInstance()
+    assert copy.labels["@instName"].labelText == "I2"
+    assert symbol.labels["@instName"].labelText == "I1"
+    assert designCache().stats == stats
+
+
+def test_layout_instance_clone_shares_master(qtbot):
+    layer = laylyr.pdkAllLayers[0]
+    master = lshp.layoutMasterCell(
+        [lshp.layoutRect(QPoint(0, 0), QPoint(50, 50), layer)])
+    instance = lshp.layoutInstance([], master)
+    instance.cellName, instance.instanceName = "inv", "I3"
+    instance.setPos(10, 20)
+    instance.angle = 180
+
+    copy = instance.clone()
+    assert copy.master is master
+    assert (copy.cellName, copy.instanceName) == ("inv", "I3")
+    assert copy.sceneTransform() == instance.sceneTransform()
+
+    path = lshp.layoutPath(QLineF(QPoint(0, 0), QPoint(0, 100)), layer, 10)
+    scene = QGraphicsScene()
+    scene.addItem(path)
+    pathCopy = path.clone()
+    scene.addItem(pathCopy)
+    assert pathCopy.sceneBoundingRect() == path.sceneBoundingRect()
+
+
+def _subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def test_every_shape_class_clones():
+    # clone() is abstract in the shape base classes.
+    missing = [subclass.__name__
+               for base in (shp.symbolShape, lshp.layoutShape)
+               for subclass in _subclasses(base) if subclass.clone is base.clone]
+    assert missing == []
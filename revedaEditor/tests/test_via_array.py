@@ -0,0 +1,53 @@
+import pytest
+from PySide6.QtCore import QPoint, QRectF
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import (QApplication, QGraphicsScene,
+                               QStyleOptionGraphicsItem)
+
+from revedaEditor.common import layoutShapes as lshp
+from defaultPDK.process import processVias
+
+
+@pytest.fixture(scope="module", autouse=True)
+def init_qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+
+def _viaArray():
+    via = lshp.layoutVia(QPoint(0, 0), processVias[0], 10, 10)
+    return lshp.layoutViaArray(QPoint(0, 0), via, 5, 5, 100, 100)
+
+
+def test_via_array_is_one_item():
+    scene = QGraphicsScene()
+    scene.addItem(_viaArray())
+    assert len(scene.items()) == 1
+
+
+def test_via_array_cut_rects():
+    viaArray = _viaArray()
+    assert len(viaArray.cutRects()) == 10000
+    assert viaArray.cutRects(QRectF(16, 16, 2, 2)) == [QRectF(15, 15, 10, 10)]
+    assert viaArray.cutRects(QRectF(11, 11, 3, 3)) == []
+
+
+def _paints(viaArray):
+    image = QImage(200, 200, QImage.Format_ARGB32)
+    image.fill(0)
+    option = QStyleOptionGraphicsItem()
+    option.exposedRect = QRectF(0, 0, 200, 200)
+    painter = QPainter(image)
+    viaArray.paint(painter, option, None)
+    painter.end()
+    return image.pixel(20, 20) != 0
+
+
+def test_via_array_paints_without_view():
+    assert _paints(_viaArray())
+    viaArray = _viaArray()
+    scene = QGraphicsScene()
+    scene.addItem(viaArray)
+    assert _paints(viaArray)